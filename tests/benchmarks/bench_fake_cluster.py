@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Harness overhead benchmark on an in-memory fake cluster (no VMs needed)
+
+Builds FakeCluster.testbed() with CELLS gNBs and UES UEs per cell, then times
+the harness layers the suites lean on:
+  - component lookups through ComponentValidator (first call and memoized)
+  - per-pod exec sweeps with exec_many (scripted `ip link show`)
+  - a delete -> wait_for_pod recovery round trip
+
+Usage:
+    python benchmarks/bench_fake_cluster.py [-c CELLS] [-u UES] [-r ROUNDS] [--profile]
+"""
+import sys
+import os
+import time
+import argparse
+import cProfile
+import pstats
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.fake_cluster import FakeCluster, FakeK8sClient
+from utils.test_helpers import ComponentValidator, TestConfig
+
+
+def bench(label: str, fn, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"  {label:<44} {best * 1000:9.1f} ms")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Harness overhead benchmark on a fake cluster")
+    parser.add_argument("-c", "--cells", type=int, default=100, help="gNBs (one UE StatefulSet each)")
+    parser.add_argument("-u", "--ues", type=int, default=50, help="UE pods per cell")
+    parser.add_argument("-r", "--rounds", type=int, default=3, help="Rounds per step (best is reported)")
+    parser.add_argument("--profile", action="store_true", help="cProfile the whole run, print top 25")
+    args = parser.parse_args()
+
+    profiler = cProfile.Profile() if args.profile else None
+    if profiler:
+        profiler.enable()
+
+    start = time.perf_counter()
+    cluster = FakeCluster.testbed(cells=args.cells, ues_per_cell=args.ues)
+    pods, _ = cluster.list("pods")
+    print(f"Fake testbed: {len(pods)} pods, built in {time.perf_counter() - start:.2f} s")
+
+    k8s = FakeK8sClient(cluster, max_exec_inflight=64)
+    components = ComponentValidator(k8s, TestConfig())
+
+    bench("get_component_pods('ue') first call", lambda: components.get_component_pods("ue"), 1)
+    bench("get_component_pods('ue') memoized", lambda: components.get_component_pods("ue"), args.rounds)
+    bench("list_pods(component=ue) PodView", lambda: k8s.list_pods("5g", "component=ue"), args.rounds)
+    bench("list_pods(component=ue,cell=0)", lambda: k8s.list_pods("5g", "component=ue,cell=0"), args.rounds)
+    gnbs = k8s.list_pods("5g", "component=gnb")
+    bench(f"exec_many ip link show ({len(gnbs)} gNBs)",
+          lambda: list(k8s.exec_many(gnbs, ["ip", "link", "show"], concurrency=32)), args.rounds)
+
+    def recover():
+        old = k8s.list_pods("5g", "app=amf")[0]
+        k8s.delete_pod(old.name, "5g")
+        k8s.wait_for_pod(lambda p: p.ready and p.uid != old.uid, "5g", "app=amf", timeout=10)
+
+    bench("delete_pod + wait_for_pod (amf)", recover, args.rounds)
+    print()
+    print(k8s.calls.summary())
+
+    if profiler:
+        profiler.disable()
+        print()
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(25)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+IPAM analyzer benchmark (utils/ipam.py), no VMs needed
+
+Times analyze_cluster() on FakeCluster.testbed() with CELLS gNBs and UES UEs
+per cell, then analyze() alone on PODS synthetic pods with one Whereabouts
+attachment each on a /16 pool, an IPPool lease per pod, and a handful of
+injected duplicates and stale leases.
+
+Usage:
+    python benchmarks/bench_ipam.py [-c CELLS] [-u UES] [-p PODS] [-r ROUNDS]
+"""
+import sys
+import os
+import json
+import time
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.addresses import NETWORK_STATUS, PodAddresses
+from utils.fake_cluster import FakeCluster, FakeK8sClient
+from utils.ipam import analyze, analyze_cluster
+from utils.test_helpers import TestConfig
+
+
+def bench(label: str, fn, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"  {label:<44} {best * 1000:9.1f} ms")
+    return best
+
+
+def synthetic(pods: int):
+    """(nads, pods, ip_pools): one whereabouts /16 NAD, `pods` attached pods, one lease each."""
+    nad = {
+        "metadata": {"name": "bench-net", "namespace": "bench"},
+        "spec": {"config": json.dumps({"cniVersion": "0.3.1", "type": "ovs", "ipam": {
+            "type": "whereabouts", "range": "10.240.0.0/16", "gateway": "10.240.0.1",
+        }})},
+    }
+    records, allocations = [], {}
+    for i in range(pods):
+        offset = 2 + i
+        if i % 1000 == 999:
+            offset -= 1  # every 1000th pod reuses its neighbour's address
+        ip = f"10.240.{offset >> 8}.{offset & 255}"
+        status = [{"name": "bench/bench-net", "interface": "net1", "ips": [ip]}]
+        records.append(PodAddresses({
+            "metadata": {"name": f"pod-{i}", "namespace": "bench", "uid": str(i), "resourceVersion": "1",
+                         "annotations": {NETWORK_STATUS: json.dumps(status)}},
+            "status": {"podIP": f"10.42.{i >> 8 & 255}.{i & 255}"},
+        }))
+        allocations[str(offset)] = {"id": str(i), "podref": f"bench/pod-{i}"}
+    for i in range(pods // 1000):
+        allocations[str(60000 + i)] = {"id": f"gone-{i}", "podref": f"bench/gone-{i}"}
+    ip_pools = [{"metadata": {"name": "10.240.0.0-16"},
+                 "spec": {"range": "10.240.0.0/16", "allocations": allocations}}]
+    return [nad], records, ip_pools
+
+
+def main():
+    parser = argparse.ArgumentParser(description="IPAM analyzer benchmark")
+    parser.add_argument("-c", "--cells", type=int, default=100, help="gNBs (one UE StatefulSet each)")
+    parser.add_argument("-u", "--ues", type=int, default=50, help="UE pods per cell")
+    parser.add_argument("-p", "--pods", type=int, default=50000, help="Synthetic attached pods (max 60000)")
+    parser.add_argument("-r", "--rounds", type=int, default=3, help="Rounds per step (best is reported)")
+    args = parser.parse_args()
+
+    cluster = FakeCluster.testbed(cells=args.cells, ues_per_cell=args.ues)
+    k8s = FakeK8sClient(cluster)
+    config = TestConfig()
+    pods, _ = cluster.list("pods")
+    print(f"Fake testbed: {len(pods)} pods")
+    bench("analyze_cluster() first call", lambda: analyze_cluster(k8s, config), 1)
+    bench("analyze_cluster() warm informers", lambda: analyze_cluster(k8s, config), args.rounds)
+
+    nads, records, ip_pools = synthetic(min(args.pods, 60000))
+    print(f"Synthetic: {len(records)} pods on one /16 Whereabouts pool")
+    bench("analyze() pods + leases", lambda: analyze(nads, records, ip_pools), args.rounds)
+    report = analyze(nads, records, ip_pools)
+    kinds = {}
+    for finding in report.findings:
+        kinds[finding.kind] = kinds.get(finding.kind, 0) + 1
+    print(f"  findings: {kinds or 'none'}")
+    print()
+    print(k8s.calls.summary())
+
+
+if __name__ == "__main__":
+    main()
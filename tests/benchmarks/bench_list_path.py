@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+List-path benchmark: swagger deserialization + .to_dict() vs raw JSON + PodView
+
+Builds a synthetic PodList response (default 5000 pods) and times, offline:
+  - legacy: ApiClient deserialization into V1PodList, then .to_dict()
+  - fast:   raw bytes decoded with orjson (json fallback) into PodView records
+
+Usage:
+    python benchmarks/bench_list_path.py [-n PODS] [-r ROUNDS]
+"""
+import sys
+import os
+import json
+import time
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kubernetes import client
+
+from utils.k8s_client import PodView, _RawResponse, _loads
+
+
+def synthetic_pod(i: int) -> dict:
+    """One pod shaped like the 5G NF deployments (Multus annotations, 1 container)."""
+    name = f"ue-cell-{i // 100}-{i % 100}"
+    return {
+        "metadata": {
+            "name": name,
+            "namespace": "5g",
+            "uid": f"00000000-0000-0000-0000-{i:012d}",
+            "resourceVersion": str(100000 + i),
+            "creationTimestamp": "2025-01-01T00:00:00Z",
+            "labels": {"app": "ue", "component": "ue", "cell-id": str(i // 100)},
+            "annotations": {
+                "k8s.v1.cni.cncf.io/networks": '[{"name": "n2-cell-1", "interface": "n2"}]',
+                "k8s.v1.cni.cncf.io/network-status": json.dumps([
+                    {"name": "cbr0", "interface": "eth0", "ips": [f"10.42.{i // 250}.{i % 250}"], "default": True},
+                    {"name": "5g/n2-cell-1", "interface": "n2", "ips": [f"10.202.{i // 250}.{i % 250}"]},
+                ]),
+            },
+            "ownerReferences": [{
+                "apiVersion": "apps/v1", "kind": "StatefulSet", "name": "ue-cell-1",
+                "uid": "11111111-1111-1111-1111-111111111111", "controller": True,
+            }],
+        },
+        "spec": {
+            "nodeName": "edge",
+            "nodeSelector": {"kubernetes.io/hostname": "edge"},
+            "containers": [{
+                "name": "ue",
+                "image": "gradiant/ueransim:3.2.6",
+                "command": ["/bin/sh", "-c"],
+                "args": ["nr-ue -c /etc/ueransim/ue.yaml"],
+                "resources": {"limits": {"cpu": "200m", "memory": "256Mi"}},
+                "securityContext": {"capabilities": {"add": ["NET_ADMIN"]}},
+                "volumeMounts": [{"name": "ue-config-runtime", "mountPath": "/etc/ueransim"}],
+            }],
+            "volumes": [{"name": "ue-config-runtime", "emptyDir": {}}],
+        },
+        "status": {
+            "phase": "Running",
+            "hostIP": "192.168.56.12",
+            "podIP": f"10.42.{i // 250}.{i % 250}",
+            "startTime": "2025-01-01T00:00:05Z",
+            "conditions": [
+                {"type": t, "status": "True", "lastTransitionTime": "2025-01-01T00:00:10Z"}
+                for t in ("Initialized", "Ready", "ContainersReady", "PodScheduled")
+            ],
+            "containerStatuses": [{
+                "name": "ue",
+                "ready": True,
+                "restartCount": i % 3,
+                "image": "gradiant/ueransim:3.2.6",
+                "imageID": "docker.io/gradiant/ueransim@sha256:" + "ab" * 32,
+                "containerID": f"containerd://{i:064x}",
+                "started": True,
+                "state": {"running": {"startedAt": "2025-01-01T00:00:08Z"}},
+                "lastState": {},
+            }],
+        },
+    }
+
+
+def bench(label: str, fn, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"  {label:<40} {best * 1000:9.1f} ms")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="K8sClient list-path benchmark")
+    parser.add_argument("-n", "--pods", type=int, default=5000, help="Pods in the synthetic response")
+    parser.add_argument("-r", "--rounds", type=int, default=3, help="Rounds per path (best is reported)")
+    args = parser.parse_args()
+
+    body = json.dumps({
+        "apiVersion": "v1",
+        "kind": "PodList",
+        "metadata": {"resourceVersion": "200000"},
+        "items": [synthetic_pod(i) for i in range(args.pods)],
+    }).encode()
+    print(f"Synthetic PodList: {args.pods} pods, {len(body) / 1e6:.1f} MB")
+
+    api_client = client.ApiClient()
+
+    def legacy():
+        text = body.decode()
+        try:
+            pod_list = api_client.deserialize(text, "V1PodList", "application/json")
+        except TypeError:
+            pod_list = api_client.deserialize(_RawResponse(text), "V1PodList")
+        return pod_list.to_dict()["items"]
+
+    def fast():
+        return [PodView(p) for p in _loads(body)["items"]]
+
+    slow = bench("swagger models + .to_dict()", legacy, args.rounds)
+    quick = bench(f"raw JSON ({_loads.__module__}) + PodView", fast, args.rounds)
+    print(f"Speedup: {slow / quick:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
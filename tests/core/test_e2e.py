@@ -4,20 +4,28 @@ Tests complete system integration and functionality
 """
 import sys
 import os
+from typing import Optional
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from utils.ipam import analyze_cluster, DUPLICATE, OUT_OF_RANGE, OVERLAP, EXHAUSTED, STALE
 from utils.k8s_client import K8sClient  # <-- use API client
+from utils.scheduler import TestScheduler, TestSpec, tally
 from utils.test_helpers import TestConfig, TestLogger, NetworkValidator, ComponentValidator
 
 
 class E2ETestSuite:
     """End-to-End test suite for 5G testbed"""
     
-    def __init__(self, verbose: bool = False):
+    def __init__(self, verbose: bool = False, kubectl: Optional[K8sClient] = None):
         self.config = TestConfig()
         self.logger = TestLogger(verbose)
-        # keep attribute name 'kubectl' to avoid wider refactors
-        self.kubectl = K8sClient(self.config.get("cluster.kubeconfig_path"))
+        # keep attribute name 'kubectl' to avoid wider refactors;
+        # run_tests.py passes one shared client to every suite when running in-process
+        self.kubectl = kubectl or K8sClient(
+            self.config.get("cluster.kubeconfig_path"),
+            rate_limits=self.config.get("global.api_rate_limits"),
+            probe_cache=self.config.get("global.probe_cache"),
+        )
         self.network_validator = NetworkValidator(self.kubectl, self.config)
         self.component_validator = ComponentValidator(self.kubectl, self.config)
         self.verbose = verbose
@@ -27,35 +35,36 @@ class E2ETestSuite:
         self.logger.info("Starting End-to-End Test Suite")
         
         tests = [
-            ("Infrastructure Connectivity", self.test_infrastructure_connectivity),
-            ("Kubernetes Cluster Health", self.test_kubernetes_cluster_health),
-            ("KubeEdge Integration", self.test_kubeedge_integration),
-            ("Overlay Network Setup", self.test_overlay_network_setup),
-            ("5G Core Deployment", self.test_5g_core_deployment),
-            ("Network Interfaces", self.test_network_interfaces),
-            ("5G Protocol Connectivity", self.test_5g_protocol_connectivity),
-            ("UERANSIM Deployment", self.test_ueransim_deployment),
-            ("MEC Deployment", self.test_mec_deployment),
-            ("End-to-End Connectivity", self.test_end_to_end_connectivity)
+            # inputs: the cluster state each test reads, for --changed-only (utils/selection.py)
+            TestSpec("Infrastructure Connectivity", self.test_infrastructure_connectivity, inputs=("nodes",)),
+            TestSpec("Kubernetes Cluster Health", self.test_kubernetes_cluster_health,
+                     inputs=("ns:kube-system",)),
+            TestSpec("KubeEdge Integration", self.test_kubeedge_integration,
+                     after=("Infrastructure Connectivity",), inputs=("component:cloudcore", "nodes")),
+            TestSpec("Overlay Network Setup", self.test_overlay_network_setup,
+                     inputs=("component:multus", "nads")),
+            TestSpec("IPAM Consistency", self.test_ipam_consistency,
+                     after=("Overlay Network Setup",), inputs=("nads", "ns:5g", "ns:mec")),
+            TestSpec("5G Core Deployment", self.test_5g_core_deployment,
+                     after=("Kubernetes Cluster Health",),
+                     inputs=("component:amf", "component:smf", "component:upf")),
+            TestSpec("Network Interfaces", self.test_network_interfaces,
+                     after=("5G Core Deployment", "Overlay Network Setup"), inputs=("component:amf", "ovs")),
+            TestSpec("5G Protocol Connectivity", self.test_5g_protocol_connectivity,
+                     after=("5G Core Deployment",), inputs=("component:amf", "component:smf")),
+            TestSpec("UERANSIM Deployment", self.test_ueransim_deployment,
+                     after=("5G Core Deployment",), inputs=("component:gnb", "component:ue")),
+            TestSpec("MEC Deployment", self.test_mec_deployment, inputs=("ns:mec",)),
+            TestSpec("End-to-End Connectivity", self.test_end_to_end_connectivity,
+                     after=("Network Interfaces",), inputs=("ns:5g", "ovs")),
         ]
         
-        passed = 0
-        failed = 0
+        self.results = TestScheduler.from_config(self.config, self.logger, "e2e").run(tests)
+        passed, failed, skipped = tally(self.results)
         
-        for test_name, test_func in tests:
-            self.logger.test_start(test_name)
-            try:
-                success = test_func()
-                if success:
-                    passed += 1
-                else:
-                    failed += 1
-            except Exception as e:
-                self.logger.error(f"{test_name} failed with exception: {e}")
-                failed += 1
-            self.logger.test_end(test_name, success)
-        
-        self.logger.info(f"E2E Test Results: {passed} passed, {failed} failed")
+        self.logger.info(f"E2E Test Results: {passed} passed, {failed} failed, {skipped} skipped")
+        self.logger.info(f"API limiter: {self.kubectl.limiter.summary()}")
+        self.logger.info(f"Probe cache: {self.kubectl.probes.summary()}")
         return failed == 0
     
     def test_infrastructure_connectivity(self) -> bool:
@@ -121,7 +130,7 @@ class E2ETestSuite:
                 self.logger.error("No KubeEdge pods found")
                 return False
             
-            cloudcore_pods = [p for p in kubeedge_pods if "cloudcore" in p["metadata"]["name"].lower()]
+            cloudcore_pods = self.component_validator.get_component_pods("cloudcore", "kubeedge")
             if not cloudcore_pods:
                 self.logger.error("No CloudCore pods found")
                 return False
@@ -151,8 +160,7 @@ class E2ETestSuite:
         self.logger.info("Testing overlay network setup...")
         
         try:
-            multus_pods = self.kubectl.get_pods("kube-system")
-            multus_pods = [p for p in multus_pods if "multus" in p["metadata"]["name"].lower()]
+            multus_pods = self.component_validator.get_component_pods("multus", "kube-system")
             
             if not multus_pods:
                 self.logger.error("Multus pods not found")
@@ -189,6 +197,36 @@ class E2ETestSuite:
             self.logger.error(f"Overlay network setup test failed: {e}")
             return False
     
+    def test_ipam_consistency(self) -> bool:
+        """Test Multus addresses against NAD pools (duplicates, ranges, overlaps, leases)"""
+        self.logger.info("Testing IPAM consistency...")
+        
+        try:
+            report = analyze_cluster(self.kubectl, self.config)
+            self.logger.info(f"[debug] IPAM report:\n{report.summary()}")
+            
+            for finding in report.findings:
+                who = f" ({', '.join(finding.pods)})" if finding.pods else ""
+                message = f"{finding.kind}: {finding.network} {finding.ip} {finding.detail}{who}"
+                if finding.kind in (DUPLICATE, OUT_OF_RANGE, OVERLAP):
+                    self.logger.error(message)
+                else:
+                    self.logger.warning(message)
+            
+            if not report.ok:
+                return False
+            
+            counts = {k: len(report.by_kind(k)) for k in (EXHAUSTED, STALE)}
+            self.logger.success(
+                f"{report.attachments} Multus addresses on {report.pods} pods consistent with "
+                f"{len(report.pools)} NAD pools ({counts[EXHAUSTED]} exhausted, {counts[STALE]} stale leases)"
+            )
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"IPAM consistency test failed: {e}")
+            return False
+    
     def test_5g_core_deployment(self) -> bool:
         """Test 5G Core deployment"""
         self.logger.info("Testing 5G Core deployment...")
@@ -201,7 +239,7 @@ class E2ETestSuite:
             
             components = ["amf", "smf", "upf"]
             for component in components:
-                component_pods = [p for p in fiveg_pods if component in p["metadata"]["name"].lower()]
+                component_pods = self.component_validator.get_component_pods(component)
                 if not component_pods:
                     self.logger.error(f"No {component.upper()} pods found")
                     return False
@@ -293,7 +331,7 @@ class E2ETestSuite:
         self.logger.info("Testing UERANSIM deployment...")
         
         try:
-            gnb_pods = [p for p in self.kubectl.get_pods("5g") if "gnb" in p["metadata"]["name"].lower()]
+            gnb_pods = self.component_validator.get_component_pods("gnb")
             if not gnb_pods:
                 self.logger.error("No gNB pods found")
                 return False
@@ -305,7 +343,7 @@ class E2ETestSuite:
             
             self.logger.success("gNB is running")
             
-            ue_pods = [p for p in self.kubectl.get_pods("5g") if "ue" in p["metadata"]["name"].lower()]
+            ue_pods = self.component_validator.get_component_pods("ue")
             if not ue_pods:
                 self.logger.error("No UE pods found")
                 return False
@@ -358,8 +396,8 @@ class E2ETestSuite:
             pod2 = fiveg_pods[1]["metadata"]["name"]
             
             # Exec returns ExecResult with .stdout attribute
-            pod1_ip = self.kubectl.exec_in_pod(pod1, "5g", ["hostname", "-i"]).stdout.strip()
-            pod2_ip = self.kubectl.exec_in_pod(pod2, "5g", ["hostname", "-i"]).stdout.strip()
+            pod1_ip = self.network_validator.pod_ip(pod1, "5g")
+            pod2_ip = self.network_validator.pod_ip(pod2, "5g")
             
             if not self.network_validator.check_connectivity(pod1, pod2, "5g", pod2_ip):
                 self.logger.error(f"Pod {pod1} cannot reach pod {pod2}")
@@ -51,6 +51,8 @@ except Exception:
         def info(self, *_, **__): pass
         def error(self, *_, **__): pass
 
+from utils import daemon  # stdlib-only client for the harness daemon
+
 try:
     from run_tests import check_vagrant_vms  # type: ignore
 except Exception:
@@ -96,6 +98,8 @@ PHASES = ["infrastructure", "5g-core", "ueransim", "e2e", "performance", "resili
 
 LOCAL_KUBECONFIG = ROOT / "kubeconfig"
 REMOTE_KUBECONFIG = "/home/vagrant/kubeconfig"   # matches your runner
+DAEMON_SOCKET = Path(os.environ.get("HARNESS_SOCKET", ROOT / ".harness.sock"))
+DAEMON_LOG = ROOT / "results" / "daemon.log"
 
 
 # -------- small helpers --------
@@ -149,6 +153,36 @@ def run_subprocess_stream(cmd: List[str], cwd: Optional[Path] = None, env: Optio
         console.print(f"[red]Error:[/red] {e}")
         return 1
 
+class _ConsoleLines:
+    """File-like sink for daemon output: prints whole lines like run_subprocess_stream."""
+    def __init__(self):
+        self.pending = ""
+    def write(self, text: str):
+        lines = (self.pending + text).split("\n")
+        self.pending = lines.pop()
+        for line in lines:
+            console.print(line.rstrip())
+    def flush(self):
+        pass
+
+def run_daemon_stream(args: List[str]) -> Optional[int]:
+    """Submit a run to the harness daemon (starting it if needed); None if it can't take the run."""
+    if not daemon.eligible(args):
+        return None
+    if not daemon.ping(DAEMON_SOCKET):
+        with console.status("[bold]Starting harness daemon...[/bold]", spinner="dots"):
+            if not daemon.start_background(DAEMON_SOCKET, DAEMON_LOG):
+                console.print(f"[yellow]Harness daemon did not start (see {DAEMON_LOG}); running directly[/yellow]")
+                return None
+    console.rule(f"[bold green]Running on harness daemon[/bold green] [dim]{' '.join(args)}[/dim]")
+    out = _ConsoleLines()
+    code = daemon.submit(DAEMON_SOCKET, args, out=out)
+    if out.pending:
+        console.print(out.pending)
+    if code is not None:
+        console.rule(f"[bold]Exit code:[/bold] {code}")
+    return code
+
 def run_quick(cmd: List[str], cwd: Optional[Path] = None, timeout: int = 10) -> subprocess.CompletedProcess:
     return subprocess.run(cmd, cwd=cwd, capture_output=True, text=True, timeout=timeout)
 
@@ -191,6 +225,12 @@ def show_status():
 
     table.add_row("Vagrant VMs", "✅ Running" if vagrant_ok else "❌ Not running")
     table.add_row("Virtualenv", "✅ Present" if venv_ok else "❌ Missing")
+    info = daemon.ping(DAEMON_SOCKET)
+    if info:
+        table.add_row("Harness daemon", f"✅ pid {info['pid']}, up {info['uptime'] / 60:.0f}m, "
+                                        f"{info['runs']} runs{' (busy)' if info['busy'] else ''}")
+    else:
+        table.add_row("Harness daemon", "⏸  Not running (starts with the first test run)")
 
     if local_kcfg_ok:
         table.add_row("Kubeconfig (local)", f"✅ Found  [dim]({LOCAL_KUBECONFIG})[/dim]")
@@ -275,8 +315,11 @@ def run_tests_flow():
     if LOCAL_KUBECONFIG.exists():
         test_env["KUBECONFIG"] = str(LOCAL_KUBECONFIG)
 
-    with console.status("[bold]Running tests...[/bold]", spinner="dots"):
-        code = run_subprocess_stream(cmd, cwd=ROOT, env=test_env)
+    # Warm path: the resident daemon keeps the client, watches and exec sessions
+    code = run_daemon_stream(args)
+    if code is None:
+        with console.status("[bold]Running tests...[/bold]", spinner="dots"):
+            code = run_subprocess_stream(cmd, cwd=ROOT, env=test_env)
 
     console.print(
         "[bold green]🎉 Tests completed successfully![/bold green]"
@@ -296,6 +339,11 @@ def show_help():
 • If missing but present on master VM, offers to copy it.
 • Uses a spinner while checking/copying so the terminal isn't idle.
 
+[bold]Harness daemon[/bold]
+• The first test run starts a background daemon (tests/.harness.sock)
+• Later runs reuse its warm Kubernetes client and start instantly
+• Stop it with: python3 run_tests.py --stop-daemon
+
 [bold]Configuration panel[/bold]
 • Paths (local/remote kubeconfig, repo root, python)
 • Cluster IPs if available from config
@@ -4,21 +4,29 @@ Tests network performance, throughput, and latency
 """
 import sys
 import os
+from typing import List, Optional
 import time
 import json
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from utils.exec_stream import iperf3_below, iperf3_rate, ping_loss_above
 from utils.kubectl_client import KubectlClient
+from utils.scheduler import TestScheduler, TestSpec, tally
 from utils.test_helpers import TestConfig, TestLogger, NetworkValidator, ComponentValidator
 
 
 class PerformanceTestSuite:
     """Performance test suite for 5G testbed"""
     
-    def __init__(self, verbose: bool = False):
+    def __init__(self, verbose: bool = False, kubectl: Optional[KubectlClient] = None):
         self.config = TestConfig()
         self.logger = TestLogger(verbose)
-        self.kubectl = KubectlClient(self.config.get("cluster.kubeconfig_path"))
+        # run_tests.py passes one shared client to every suite when running in-process
+        self.kubectl = kubectl or KubectlClient(
+            self.config.get("cluster.kubeconfig_path"),
+            rate_limits=self.config.get("global.api_rate_limits"),
+            probe_cache=self.config.get("global.probe_cache"),
+        )
         self.network_validator = NetworkValidator(self.kubectl, self.config)
         self.component_validator = ComponentValidator(self.kubectl, self.config)
         self.verbose = verbose
@@ -28,35 +36,26 @@ class PerformanceTestSuite:
         self.logger.info("Starting Performance Test Suite")
         
         tests = [
-            ("VXLAN Throughput", self.test_vxlan_throughput),
-            ("VXLAN Latency", self.test_vxlan_latency),
-            ("Packet Loss Test", self.test_packet_loss),
-            ("PFCP Performance", self.test_pfcp_performance),
-            ("NGAP Performance", self.test_ngap_performance),
-            ("Concurrent Connections", self.test_concurrent_connections),
-            ("Sustained Load", self.test_sustained_load),
-            ("CPU and Memory Usage", self.test_resource_usage),
-            ("Interface Throughput", self.test_interface_throughput),
-            ("End-to-End Performance", self.test_end_to_end_performance)
+            # iperf3 load owns the data plane; the read-only measurements overlap each other
+            # No inputs: measurements feed the run history, so --changed-only still runs them
+            TestSpec("VXLAN Throughput", self.test_vxlan_throughput, writes=("dataplane",)),
+            TestSpec("VXLAN Latency", self.test_vxlan_latency),
+            TestSpec("Packet Loss Test", self.test_packet_loss),
+            TestSpec("PFCP Performance", self.test_pfcp_performance),
+            TestSpec("NGAP Performance", self.test_ngap_performance),
+            TestSpec("Concurrent Connections", self.test_concurrent_connections),
+            TestSpec("Sustained Load", self.test_sustained_load, writes=("dataplane",)),
+            TestSpec("CPU and Memory Usage", self.test_resource_usage),
+            TestSpec("Interface Throughput", self.test_interface_throughput),
+            TestSpec("End-to-End Performance", self.test_end_to_end_performance),
         ]
         
-        passed = 0
-        failed = 0
+        self.results = TestScheduler.from_config(self.config, self.logger, "performance").run(tests)
+        passed, failed, skipped = tally(self.results)
         
-        for test_name, test_func in tests:
-            self.logger.test_start(test_name)
-            try:
-                success = test_func()
-                if success:
-                    passed += 1
-                else:
-                    failed += 1
-            except Exception as e:
-                self.logger.error(f"{test_name} failed with exception: {e}")
-                failed += 1
-            self.logger.test_end(test_name, success)
-        
-        self.logger.info(f"Performance Test Results: {passed} passed, {failed} failed")
+        self.logger.info(f"Performance Test Results: {passed} passed, {failed} failed, {skipped} skipped")
+        self.logger.info(f"API limiter: {self.kubectl.limiter.summary()}")
+        self.logger.info(f"Probe cache: {self.kubectl.probes.summary()}")
         return failed == 0
     
     def test_vxlan_throughput(self) -> bool:
@@ -71,8 +70,8 @@ class PerformanceTestSuite:
                 return False
             
             # Use AMF and SMF for testing
-            amf_pods = [p for p in fiveg_pods if "amf" in p["metadata"]["name"].lower()]
-            smf_pods = [p for p in fiveg_pods if "smf" in p["metadata"]["name"].lower()]
+            amf_pods = self.component_validator.get_component_pods("amf")
+            smf_pods = self.component_validator.get_component_pods("smf")
             
             if not amf_pods or not smf_pods:
                 self.logger.error("AMF or SMF pods not found for throughput testing")
@@ -95,11 +94,7 @@ class PerformanceTestSuite:
             time.sleep(2)  # Wait for server to start
             
             # Get server IP
-            server_ip_result = self.kubectl.exec_in_pod(
-                server_pod, "5g", 
-                ["hostname", "-i"]
-            )
-            server_ip = server_ip_result.stdout.strip()
+            server_ip = self.network_validator.pod_ip(server_pod, "5g")
             
             # Run iperf3 client
             self.logger.info("Running iperf3 client...")
@@ -115,6 +110,7 @@ class PerformanceTestSuite:
             try:
                 results = json.loads(client_result.stdout)
                 throughput = results["end"]["sum_received"]["bits_per_second"] / 1_000_000  # Convert to Mbps
+                self.logger.metric("throughput", throughput, "Mbps")
                 
                 min_throughput = self.config.get("performance.throughput.min_mbps", 10)
                 target_throughput = self.config.get("performance.throughput.target_mbps", 100)
@@ -151,11 +147,7 @@ class PerformanceTestSuite:
             pod2 = fiveg_pods[1]["metadata"]["name"]
             
             # Get pod2 IP
-            pod2_ip_result = self.kubectl.exec_in_pod(
-                pod2, "5g", 
-                ["hostname", "-i"]
-            )
-            pod2_ip = pod2_ip_result.stdout.strip()
+            pod2_ip = self.network_validator.pod_ip(pod2, "5g")
             
             # Test with different packet sizes
             packet_sizes = [64, 512, 1024, 1472]
@@ -175,6 +167,7 @@ class PerformanceTestSuite:
                     try:
                         avg_line = [line for line in ping_result.stdout.split('\n') if 'avg' in line][0]
                         avg_latency = float(avg_line.split('/')[4])
+                        self.logger.metric(f"rtt_{size}B", avg_latency, "ms", better="lower")
                         
                         if avg_latency <= max_latency:
                             self.logger.success(f"Latency with {size} bytes: {avg_latency:.2f} ms (max: {max_latency} ms)")
@@ -211,27 +204,31 @@ class PerformanceTestSuite:
             pod2 = fiveg_pods[1]["metadata"]["name"]
             
             # Get pod2 IP
-            pod2_ip_result = self.kubectl.exec_in_pod(
-                pod2, "5g", 
-                ["hostname", "-i"]
-            )
-            pod2_ip = pod2_ip_result.stdout.strip()
+            pod2_ip = self.network_validator.pod_ip(pod2, "5g")
+            
+            max_loss = self.config.get("performance.packet_loss.max_percent", 1)
+            target_loss = self.config.get("performance.packet_loss.target_percent", 0.1)
             
-            # High rate ping test
+            # High rate ping test, aborted once more probes are lost than the
+            # maximum allows over the whole run
             self.logger.info("Running high rate ping test...")
-            ping_result = self.kubectl.exec_in_pod(
+            count = 100
+            stream = self.kubectl.exec_stream(
                 pod1, "5g",
-                ["ping", "-c", "100", "-i", "0.01", "-W", "1", pod2_ip]
+                ["ping", "-c", str(count), "-i", "0.01", "-W", "1", pod2_ip],
+                stop=[ping_loss_above(max_loss, count)],
             )
+            ping_result = stream.result()
+            if stream.stopped is not None:
+                self.logger.error(f"Packet loss too high: {stream.stopped.reason}")
+                return False
             
             # Parse packet loss
             if "packet loss" in ping_result.stdout:
                 try:
                     loss_line = [line for line in ping_result.stdout.split('\n') if 'packet loss' in line][0]
                     loss_percent = float(loss_line.split('%')[0].split()[-1])
-                    
-                    max_loss = self.config.get("performance.packet_loss.max_percent", 1)
-                    target_loss = self.config.get("performance.packet_loss.target_percent", 0.1)
+                    self.logger.metric("packet_loss", loss_percent, "%", better="lower")
                     
                     if loss_percent <= max_loss:
                         self.logger.success(f"Packet loss: {loss_percent}% (max: {max_loss}%)")
@@ -285,11 +282,7 @@ class PerformanceTestSuite:
             self.logger.success("PFCP ports are listening")
             
             # Test connectivity between SMF and UPF
-            upf_ip_result = self.kubectl.exec_in_pod(
-                upf_pod, "5g", 
-                ["hostname", "-i"]
-            )
-            upf_ip = upf_ip_result.stdout.strip()
+            upf_ip = self.network_validator.pod_ip(upf_pod, "5g")
             
             if self.network_validator.check_connectivity(smf_pod, upf_pod, "5g", upf_ip):
                 self.logger.success("SMF can reach UPF for PFCP communication")
@@ -309,7 +302,7 @@ class PerformanceTestSuite:
         try:
             # Check AMF and gNB NGAP connectivity
             amf_pods = self.component_validator.get_component_pods("amf")
-            gnb_pods = [p for p in self.kubectl.get_pods("5g") if "gnb" in p["metadata"]["name"].lower()]
+            gnb_pods = self.component_validator.get_component_pods("gnb")
             
             if not amf_pods:
                 self.logger.error("AMF pods not found for NGAP testing")
@@ -359,11 +352,9 @@ class PerformanceTestSuite:
             pod3 = fiveg_pods[2]["metadata"]["name"]
             
             # Get IPs
-            pod2_ip_result = self.kubectl.exec_in_pod(pod2, "5g", ["hostname", "-i"])
-            pod2_ip = pod2_ip_result.stdout.strip()
+            pod2_ip = self.network_validator.pod_ip(pod2, "5g")
             
-            pod3_ip_result = self.kubectl.exec_in_pod(pod3, "5g", ["hostname", "-i"])
-            pod3_ip = pod3_ip_result.stdout.strip()
+            pod3_ip = self.network_validator.pod_ip(pod3, "5g")
             
             # Test concurrent connectivity
             if (self.network_validator.check_connectivity(pod1, pod2, "5g", pod2_ip) and
@@ -401,34 +392,46 @@ class PerformanceTestSuite:
             time.sleep(2)
             
             # Get server IP
-            server_ip_result = self.kubectl.exec_in_pod(server_pod, "5g", ["hostname", "-i"])
-            server_ip = server_ip_result.stdout.strip()
+            server_ip = self.network_validator.pod_ip(server_pod, "5g")
             
             # Run sustained load test
             duration = 120  # 2 minutes
+            min_throughput = self.config.get("performance.throughput.min_mbps", 10)
             self.logger.info(f"Running sustained load test for {duration} seconds...")
             
-            client_result = self.kubectl.exec_in_pod(
+            # Text reports every 10 s, streamed: logged as they come, and the run is
+            # cut short once three intervals in a row fall under the minimum
+            stream = self.kubectl.exec_stream(
                 client_pod, "5g",
-                ["iperf3", "-c", server_ip, "-t", str(duration), "-J"]
+                ["iperf3", "-c", server_ip, "-t", str(duration), "-i", "10", "-f", "m"]
+                + self._iperf3_flush_flag(client_pod),
+                timeout=duration + 30,
+                stop=[iperf3_below(min_throughput, intervals=3)],
             )
+            throughput = None
+            for line in stream.follow():
+                rate = iperf3_rate(line)
+                if rate is None:
+                    continue
+                end, mbps, role = rate
+                if role == "receiver":
+                    throughput = mbps
+                elif not role:
+                    self.logger.info(f"  {end:5.0f}s  {mbps:.2f} Mbps")
+            
+            if stream.stopped is not None:
+                self.logger.error(f"Sustained load aborted: {stream.stopped.reason}")
+                return False
+            if throughput is None:
+                self.logger.error(f"Failed to parse sustained load results (rc={stream.returncode})")
+                return False
             
-            # Parse results
-            try:
-                results = json.loads(client_result.stdout)
-                throughput = results["end"]["sum_received"]["bits_per_second"] / 1_000_000
-                
-                min_throughput = self.config.get("performance.throughput.min_mbps", 10)
-                
-                if throughput >= min_throughput:
-                    self.logger.success(f"Sustained load throughput: {throughput:.2f} Mbps")
-                    return True
-                else:
-                    self.logger.error(f"Sustained load throughput too low: {throughput:.2f} Mbps")
-                    return False
-                    
-            except json.JSONDecodeError:
-                self.logger.error("Failed to parse sustained load results")
+            self.logger.metric("throughput", throughput, "Mbps")
+            if throughput >= min_throughput:
+                self.logger.success(f"Sustained load throughput: {throughput:.2f} Mbps")
+                return True
+            else:
+                self.logger.error(f"Sustained load throughput too low: {throughput:.2f} Mbps")
                 return False
             
         except Exception as e:
@@ -449,24 +452,17 @@ class PerformanceTestSuite:
             total_cpu = 0
             total_memory = 0
             
-            for pod in fiveg_pods:
-                pod_name = pod["metadata"]["name"]
-                
-                # Get resource usage
-                try:
-                    result = self.kubectl.exec_in_pod(
-                        pod_name, "5g",
-                        ["top", "-bn1"]
-                    )
-                    
-                    # Parse top output (simplified)
-                    lines = result.stdout.split('\n')
-                    if len(lines) > 1:
-                        # This is a simplified parsing - in reality you'd want more sophisticated parsing
-                        self.logger.info(f"Resource usage for {pod_name}: {lines[1] if len(lines) > 1 else 'N/A'}")
-                    
-                except:
+            # One `top` per pod, fanned out so the sweep takes as long as the slowest pod
+            for (pod_name, _), result in self.kubectl.exec_many(fiveg_pods, ["top", "-bn1"]):
+                if result.returncode != 0:
                     self.logger.warning(f"Could not get resource usage for {pod_name}")
+                    continue
+                
+                # Parse top output (simplified)
+                lines = result.stdout.split('\n')
+                if len(lines) > 1:
+                    # This is a simplified parsing - in reality you'd want more sophisticated parsing
+                    self.logger.info(f"Resource usage for {pod_name}: {lines[1] if len(lines) > 1 else 'N/A'}")
             
             self.logger.success("Resource usage monitoring completed")
             return True
@@ -535,8 +531,7 @@ class PerformanceTestSuite:
                 pod1 = fiveg_pods[0]["metadata"]["name"]
                 pod2 = fiveg_pods[1]["metadata"]["name"]
                 
-                pod2_ip_result = self.kubectl.exec_in_pod(pod2, "5g", ["hostname", "-i"])
-                pod2_ip = pod2_ip_result.stdout.strip()
+                pod2_ip = self.network_validator.pod_ip(pod2, "5g")
                 
                 if self.network_validator.check_connectivity(pod1, pod2, "5g", pod2_ip):
                     self.logger.success("End-to-end connectivity working")
@@ -551,11 +546,19 @@ class PerformanceTestSuite:
             self.logger.error(f"End-to-end performance test failed: {e}")
             return False
     
+    def _iperf3_flush_flag(self, pod_name: str) -> List[str]:
+        """
+        ["--forceflush"] if the pod's iperf3 has it (3.1.5+; older builds reject
+        the flag). Without it the interval reports may only arrive at the end.
+        """
+        result = self.kubectl.probe(pod_name, "5g", ["iperf3", "--help"], ttl=600)
+        return ["--forceflush"] if "--forceflush" in result.stdout + result.stderr else []
+
     def _install_iperf3(self, pod_name: str):
         """Install iperf3 in pod if not available"""
         try:
             # Check if iperf3 is available
-            result = self.kubectl.exec_in_pod(pod_name, "5g", ["which", "iperf3"])
+            result = self.kubectl.probe(pod_name, "5g", ["which", "iperf3"])
             if result.returncode == 0:
                 return  # iperf3 already available
             
@@ -2,21 +2,30 @@
 5G Protocol Tests for K3s KubeEdge Testbed
 Tests specific 5G protocols: PFCP, NGAP, GTP-U, NAS
 """
+import asyncio
 import sys
 import os
+from typing import List, Optional
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils.k8s_client import K8sClient
+from utils.exec_stream import until_output
+from utils.k8s_client import AsyncK8sClient, K8sClient
+from utils.scheduler import TestScheduler, TestSpec, tally
 from utils.test_helpers import TestConfig, TestLogger, NetworkValidator, ComponentValidator
 
 
 class ProtocolTestSuite:
     """5G Protocol test suite"""
     
-    def __init__(self, verbose: bool = False):
+    def __init__(self, verbose: bool = False, kubectl: Optional[K8sClient] = None):
         self.config = TestConfig()
         self.logger = TestLogger(verbose)
-        self.kubectl = K8sClient(self.config.get("cluster.kubeconfig_path"))
+        # run_tests.py passes one shared client to every suite when running in-process
+        self.kubectl = kubectl or K8sClient(
+            self.config.get("cluster.kubeconfig_path"),
+            rate_limits=self.config.get("global.api_rate_limits"),
+            probe_cache=self.config.get("global.probe_cache"),
+        )
         self.network_validator = NetworkValidator(self.kubectl, self.config)
         self.component_validator = ComponentValidator(self.kubectl, self.config)
         self.verbose = verbose
@@ -26,36 +35,31 @@ class ProtocolTestSuite:
         self.logger.info("Starting 5G Protocol Test Suite")
         
         tests = [
-            ("PFCP Protocol (N4)", self.test_pfcp_protocol),
-            ("NGAP Protocol (N2)", self.test_ngap_protocol),
-            ("GTP-U Protocol (N3)", self.test_gtpu_protocol),
-            ("N3 Gateway Reachability", self.test_n3_gateway_reachability),
-            ("NAS Protocol (N1)", self.test_nas_protocol),
-            ("Network Interface IPs", self.test_network_interface_ips),
-            ("VXLAN Tunnel Configuration", self.test_vxlan_tunnels),
-            ("OVS Bridge Setup", self.test_ovs_bridges),
-            ("Protocol Message Exchange", self.test_protocol_message_exchange),
-            ("PDU Failure Signatures", self.test_pdu_failure_signatures)
+            # inputs: the cluster state each test reads, for --changed-only (utils/selection.py)
+            TestSpec("PFCP Protocol (N4)", self.test_pfcp_protocol, inputs=("component:smf", "component:upf")),
+            TestSpec("NGAP Protocol (N2)", self.test_ngap_protocol, inputs=("component:amf", "component:gnb")),
+            TestSpec("GTP-U Protocol (N3)", self.test_gtpu_protocol, inputs=("component:upf",)),
+            TestSpec("N3 Gateway Reachability", self.test_n3_gateway_reachability,
+                     after=("GTP-U Protocol (N3)",), inputs=("component:upf", "ovs")),
+            TestSpec("NAS Protocol (N1)", self.test_nas_protocol, inputs=("component:amf", "component:ue")),
+            TestSpec("Network Interface IPs", self.test_network_interface_ips,
+                     inputs=("component:amf", "component:smf", "ovs")),
+            TestSpec("VXLAN Tunnel Configuration", self.test_vxlan_tunnels,
+                     after=("OVS Bridge Setup",), inputs=("ovs",)),
+            TestSpec("OVS Bridge Setup", self.test_ovs_bridges, inputs=("ovs",)),
+            TestSpec("Protocol Message Exchange", self.test_protocol_message_exchange,
+                     after=("NGAP Protocol (N2)", "PFCP Protocol (N4)"),
+                     inputs=("component:amf", "component:smf", "component:gnb")),
+            # Log contents change without any object changing: always runs
+            TestSpec("PDU Failure Signatures", self.test_pdu_failure_signatures),
         ]
         
-        passed = 0
-        failed = 0
+        self.results = TestScheduler.from_config(self.config, self.logger, "protocols").run(tests)
+        passed, failed, skipped = tally(self.results)
         
-        for test_name, test_func in tests:
-            self.logger.test_start(test_name)
-            try:
-                success = test_func()
-                if success:
-                    passed += 1
-                else:
-                    failed += 1
-            except Exception as e:
-                self.logger.error(f"{test_name} failed with exception: {e}")
-                success = False
-                failed += 1
-            self.logger.test_end(test_name, success)
-        
-        self.logger.info(f"Protocol Test Results: {passed} passed, {failed} failed")
+        self.logger.info(f"Protocol Test Results: {passed} passed, {failed} failed, {skipped} skipped")
+        self.logger.info(f"API limiter: {self.kubectl.limiter.summary()}")
+        self.logger.info(f"Probe cache: {self.kubectl.probes.summary()}")
         return failed == 0
     
     def test_pfcp_protocol(self) -> bool:
@@ -97,7 +101,7 @@ class ProtocolTestSuite:
             ok, out = self.network_validator.check_interface_ip(smf_pod, "5g", "n4", smf_n4_ip, capture=True)
             if not ok:
                 self.logger.error(f"SMF N4 interface not configured with IP {smf_n4_ip}")
-                self.logger.info(f"[debug] ip addr show n4 (SMF {smf_pod}):\n{out}")
+                self.logger.info(f"[debug] addresses of n4 (SMF {smf_pod}):\n{out}")
                 self.component_validator.debug_pod(smf_pod, "5g", self.logger)
                 return False
             self.logger.success(f"SMF N4 interface configured with IP {smf_n4_ip}")
@@ -131,12 +135,12 @@ class ProtocolTestSuite:
             ok, out = self.network_validator.check_interface_ip(amf_pod, "5g", "n2", amf_n2_ip, capture=True)
             if not ok:
                 self.logger.error(f"AMF N2 interface not configured with IP {amf_n2_ip}")
-                self.logger.info(f"[debug] ip addr show n2 (AMF {amf_pod}):\n{out}")
+                self.logger.info(f"[debug] addresses of n2 (AMF {amf_pod}):\n{out}")
                 self.component_validator.debug_pod(amf_pod, "5g", self.logger)
                 return False
             self.logger.success(f"AMF N2 interface configured with IP {amf_n2_ip}")
             
-            gnb_pods = [p for p in self.kubectl.get_pods("5g") if "gnb" in p["metadata"]["name"].lower()]
+            gnb_pods = self.component_validator.get_component_pods("gnb")
             if gnb_pods:
                 gnb_pod = gnb_pods[0]["metadata"]["name"]
                 ok, out = self.network_validator.check_connectivity(gnb_pod, amf_pod, "5g", amf_n2_ip, capture=True)
@@ -177,7 +181,7 @@ class ProtocolTestSuite:
                 ok, out = self.network_validator.check_interface_ip(upf_name, "5g", "n3", expected_ip, capture=True)
                 if not ok:
                     self.logger.error(f"UPF {upf_name} N3 interface not configured with IP {expected_ip}")
-                    self.logger.info(f"[debug] ip addr show n3 ({upf_name}):\n{out}")
+                    self.logger.info(f"[debug] addresses of n3 ({upf_name}):\n{out}")
                     self.component_validator.debug_pod(upf_name, "5g", self.logger)
                     return False
                 self.logger.success(f"UPF {upf_name} N3 interface configured with IP {expected_ip}")
@@ -211,12 +215,12 @@ class ProtocolTestSuite:
             ok, out = self.network_validator.check_interface_ip(amf_pod, "5g", "n1", amf_n1_ip, capture=True)
             if not ok:
                 self.logger.error(f"AMF N1 interface not configured with IP {amf_n1_ip}")
-                self.logger.info(f"[debug] ip addr show n1 (AMF {amf_pod}):\n{out}")
+                self.logger.info(f"[debug] addresses of n1 (AMF {amf_pod}):\n{out}")
                 self.component_validator.debug_pod(amf_pod, "5g", self.logger)
                 return False
             self.logger.success(f"AMF N1 interface configured with IP {amf_n1_ip}")
             
-            ue_pods = [p for p in self.kubectl.get_pods("5g") if "ue" in p["metadata"]["name"].lower()]
+            ue_pods = self.component_validator.get_component_pods("ue")
             if ue_pods:
                 ue_pod = ue_pods[0]["metadata"]["name"]
                 ok, out = self.network_validator.check_connectivity(ue_pod, amf_pod, "5g", amf_n1_ip, capture=True)
@@ -243,25 +247,31 @@ class ProtocolTestSuite:
                 self.logger.error("No UPF pods found")
                 return False
 
-            for upf_pod in upf_pods:
-                upf_name = upf_pod["metadata"]["name"]
-                result = self.kubectl.exec_in_pod(
-                    upf_name,
-                    "5g",
-                    ["ping", "-c", "2", "-W", "2", "-I", "n3", n3_gateway],
-                )
-                if result.returncode != 0:
-                    self.logger.error(f"UPF {upf_name} cannot reach N3 gateway {n3_gateway}")
-                    self.logger.info(f"[debug] ping output ({upf_name}):\n{result.stdout}\n{result.stderr}")
-                    self.component_validator.debug_pod(upf_name, "5g", self.logger)
-                    return False
-                self.logger.success(f"UPF {upf_name} can reach N3 gateway {n3_gateway}")
-
-            return True
+            return asyncio.run(self._ping_n3_gateway([p["metadata"]["name"] for p in upf_pods], n3_gateway))
 
         except Exception as e:
             self.logger.error(f"N3 gateway reachability test failed: {e}")
             return False
+
+    async def _ping_n3_gateway(self, upf_names: List[str], n3_gateway: str) -> bool:
+        """Ping the gateway from every UPF at once, on the suite's shared client"""
+        async with AsyncK8sClient(sync_client=self.kubectl, max_workers=8) as k8s:
+            results = await asyncio.gather(*(
+                k8s.exec_until(name, "5g", ["ping", "-c", "2", "-W", "2", "-I", "n3", n3_gateway],
+                               [until_output("bytes from")])
+                for name in upf_names
+            ))
+
+        reachable = True
+        for upf_name, result in zip(upf_names, results):
+            if result.returncode != 0:
+                self.logger.error(f"UPF {upf_name} cannot reach N3 gateway {n3_gateway}")
+                self.logger.info(f"[debug] ping output ({upf_name}):\n{result.stdout}\n{result.stderr}")
+                self.component_validator.debug_pod(upf_name, "5g", self.logger)
+                reachable = False
+            else:
+                self.logger.success(f"UPF {upf_name} can reach N3 gateway {n3_gateway}")
+        return reachable
     
     def test_network_interface_ips(self) -> bool:
         """Test network interface IP assignments"""
@@ -279,7 +289,7 @@ class ProtocolTestSuite:
             ok, out = self.network_validator.check_interface_ip(amf_pod, "5g", "n1", n1_ip, capture=True)
             if not ok:
                 self.logger.error(f"AMF N1 interface IP mismatch: expected {n1_ip}")
-                self.logger.info(f"[debug] ip addr show n1 (AMF {amf_pod}):\n{out}")
+                self.logger.info(f"[debug] addresses of n1 (AMF {amf_pod}):\n{out}")
                 self.component_validator.debug_pod(amf_pod, "5g", self.logger)
                 return False
             
@@ -287,7 +297,7 @@ class ProtocolTestSuite:
             ok, out = self.network_validator.check_interface_ip(amf_pod, "5g", "n2", n2_ip, capture=True)
             if not ok:
                 self.logger.error(f"AMF N2 interface IP mismatch: expected {n2_ip}")
-                self.logger.info(f"[debug] ip addr show n2 (AMF {amf_pod}):\n{out}")
+                self.logger.info(f"[debug] addresses of n2 (AMF {amf_pod}):\n{out}")
                 self.component_validator.debug_pod(amf_pod, "5g", self.logger)
                 return False
             
@@ -303,7 +313,7 @@ class ProtocolTestSuite:
             ok, out = self.network_validator.check_interface_ip(smf_pod, "5g", "n4", n4_ip, capture=True)
             if not ok:
                 self.logger.error(f"SMF N4 interface IP mismatch: expected {n4_ip}")
-                self.logger.info(f"[debug] ip addr show n4 (SMF {smf_pod}):\n{out}")
+                self.logger.info(f"[debug] addresses of n4 (SMF {smf_pod}):\n{out}")
                 self.component_validator.debug_pod(smf_pod, "5g", self.logger)
                 return False
             
@@ -320,9 +330,7 @@ class ProtocolTestSuite:
         
         try:
             # OVS setup is done by ds-net-setup-* DaemonSets, not pods named "ovs"
-            ovs_pods = [p for p in self.kubectl.get_pods("kube-system") 
-                       if "ds-net-setup" in p["metadata"]["name"].lower() 
-                       or "ovs" in p["metadata"]["name"].lower()]
+            ovs_pods = self.component_validator.get_component_pods("ovs", "kube-system")
             
             if not ovs_pods:
                 # Not an error - OVS might be configured directly on nodes
@@ -333,16 +341,13 @@ class ProtocolTestSuite:
             if running_ovs:
                 self.logger.success(f"Found {len(running_ovs)} running OVS setup pods")
             
-            for ovs_pod in running_ovs:
-                pod_name = ovs_pod["metadata"]["name"]
-                try:
-                    result = self.kubectl.exec_in_pod(pod_name, "kube-system", ["ovs-vsctl", "show"])
-                    if "vxlan" in result.stdout.lower():
-                        self.logger.success(f"VXLAN interfaces found on {pod_name}")
-                    else:
-                        self.logger.warning(f"No VXLAN interfaces found on {pod_name}")
-                except Exception as e:
-                    self.logger.warning(f"Could not check VXLAN on {pod_name}: {e}")
+            for (pod_name, _), result in self.kubectl.probe_many(running_ovs, ["ovs-vsctl", "show"]):
+                if result.returncode != 0:
+                    self.logger.warning(f"Could not check VXLAN on {pod_name}: {result.stderr.strip()}")
+                elif "vxlan" in result.stdout.lower():
+                    self.logger.success(f"VXLAN interfaces found on {pod_name}")
+                else:
+                    self.logger.warning(f"No VXLAN interfaces found on {pod_name}")
             return True
             
         except Exception as e:
@@ -355,9 +360,7 @@ class ProtocolTestSuite:
         
         try:
             # OVS setup is done by ds-net-setup-* DaemonSets
-            ovs_pods = [p for p in self.kubectl.get_pods("kube-system") 
-                       if "ds-net-setup" in p["metadata"]["name"].lower()
-                       or "ovs" in p["metadata"]["name"].lower()]
+            ovs_pods = self.component_validator.get_component_pods("ovs", "kube-system")
             
             if not ovs_pods:
                 # Not an error - OVS is configured directly on nodes via DaemonSet
@@ -368,17 +371,15 @@ class ProtocolTestSuite:
             if running_ovs:
                 self.logger.success(f"Found {len(running_ovs)} OVS setup pods")
             
-            for ovs_pod in running_ovs:
-                pod_name = ovs_pod["metadata"]["name"]
-                try:
-                    result = self.kubectl.exec_in_pod(pod_name, "kube-system", ["ovs-vsctl", "list-br"])
-                    bridges = [b for b in result.stdout.strip().splitlines() if b]
-                    if bridges:
-                        self.logger.success(f"OVS bridges found on {pod_name}: {bridges}")
-                    else:
-                        self.logger.warning(f"No OVS bridges found on {pod_name}")
-                except Exception as e:
-                    self.logger.warning(f"Could not check OVS bridges on {pod_name}: {e}")
+            for (pod_name, _), result in self.kubectl.probe_many(running_ovs, ["ovs-vsctl", "list-br"]):
+                if result.returncode != 0:
+                    self.logger.warning(f"Could not check OVS bridges on {pod_name}: {result.stderr.strip()}")
+                    continue
+                bridges = [b for b in result.stdout.strip().splitlines() if b]
+                if bridges:
+                    self.logger.success(f"OVS bridges found on {pod_name}: {bridges}")
+                else:
+                    self.logger.warning(f"No OVS bridges found on {pod_name}")
             return True
             
         except Exception as e:
@@ -397,8 +398,7 @@ class ProtocolTestSuite:
                 amf_pod = amf_pods[0]["metadata"]["name"]
                 smf_pod = smf_pods[0]["metadata"]["name"]
                 
-                result = self.kubectl.exec_in_pod(amf_pod, "5g", ["hostname", "-i"])
-                amf_ip = result.stdout.strip()
+                amf_ip = self.network_validator.pod_ip(amf_pod, "5g")
                 
                 ok, out = self.network_validator.check_connectivity(smf_pod, amf_pod, "5g", amf_ip, capture=True)
                 if ok:
@@ -407,7 +407,7 @@ class ProtocolTestSuite:
                     self.logger.warning("SMF cannot reach AMF (might be normal during startup)")
                     self.logger.info(f"[debug] ping output (SMF {smf_pod} → AMF {amf_pod} {amf_ip}):\n{out}")
             
-            gnb_pods = [p for p in self.kubectl.get_pods("5g") if "gnb" in p["metadata"]["name"].lower()]
+            gnb_pods = self.component_validator.get_component_pods("gnb")
             if gnb_pods and amf_pods:
                 gnb_pod = gnb_pods[0]["metadata"]["name"]
                 amf_pod = amf_pods[0]["metadata"]["name"]
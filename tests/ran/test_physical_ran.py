@@ -4,20 +4,28 @@ Tests for femtocell/small cell connectivity via OVS bridge
 """
 import sys
 import os
+from typing import Optional
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import subprocess
 from utils.k8s_client import K8sClient
-from utils.test_helpers import TestConfig, TestLogger
+from utils.scheduler import TestScheduler, TestSpec, tally
+from utils.test_helpers import TestConfig, TestLogger, ComponentValidator
 
 
 class PhysicalRANTestSuite:
     """Test suite for physical RAN integration"""
     
-    def __init__(self, verbose: bool = False):
+    def __init__(self, verbose: bool = False, kubectl: Optional[K8sClient] = None):
         self.config = TestConfig()
         self.logger = TestLogger(verbose)
-        self.kubectl = K8sClient(self.config.get("cluster.kubeconfig_path"))
+        # run_tests.py passes one shared client to every suite when running in-process
+        self.kubectl = kubectl or K8sClient(
+            self.config.get("cluster.kubeconfig_path"),
+            rate_limits=self.config.get("global.api_rate_limits"),
+            probe_cache=self.config.get("global.probe_cache"),
+        )
+        self.component_validator = ComponentValidator(self.kubectl, self.config)
         self.verbose = verbose
         
         # RAN network config
@@ -30,39 +38,29 @@ class PhysicalRANTestSuite:
         self.logger.info("Starting Physical RAN Integration Tests")
         
         tests = [
-            ("OVS Bridge Configuration", self.test_ovs_bridge_config),
-            ("Overlay Gateway Ownership", self.test_overlay_gateway_ownership),
-            ("RAN Interface Detection", self.test_ran_interface),
-            ("OVS RAN Bridge Exists", self.test_ovs_ran_bridge),
-            ("Patch Ports Configured", self.test_patch_ports),
-            ("AMF Overlay IP Reachable", self.test_amf_overlay_reachable),
-            ("UPF Overlay IP Reachable", self.test_upf_overlay_reachable),
-            ("gNB Connection Status", self.test_gnb_connection),
+            # Host-side checks over `vagrant ssh worker`; all read-only. The
+            # physical RAN link and gNB are invisible to the API: those always run.
+            TestSpec("OVS Bridge Configuration", self.test_ovs_bridge_config, inputs=("ovs",)),
+            TestSpec("Overlay Gateway Ownership", self.test_overlay_gateway_ownership, inputs=("ovs",)),
+            TestSpec("RAN Interface Detection", self.test_ran_interface),
+            TestSpec("OVS RAN Bridge Exists", self.test_ovs_ran_bridge,
+                     after=("OVS Bridge Configuration",), inputs=("ovs",)),
+            TestSpec("Patch Ports Configured", self.test_patch_ports,
+                     after=("OVS RAN Bridge Exists",), inputs=("ovs",)),
+            TestSpec("AMF Overlay IP Reachable", self.test_amf_overlay_reachable,
+                     after=("OVS Bridge Configuration",), inputs=("component:amf", "ovs")),
+            TestSpec("UPF Overlay IP Reachable", self.test_upf_overlay_reachable,
+                     after=("OVS Bridge Configuration",), inputs=("component:upf", "ovs")),
+            TestSpec("gNB Connection Status", self.test_gnb_connection,
+                     after=("AMF Overlay IP Reachable",)),
         ]
         
-        passed = 0
-        failed = 0
-        skipped = 0
-        
-        for test_name, test_func in tests:
-            self.logger.test_start(test_name)
-            try:
-                result = test_func()
-                if result is None:
-                    skipped += 1
-                    self.logger.info(f"⏭️  {test_name}: SKIPPED (not configured)")
-                elif result:
-                    passed += 1
-                    self.logger.test_end(test_name, True)
-                else:
-                    failed += 1
-                    self.logger.test_end(test_name, False)
-            except Exception as e:
-                self.logger.error(f"{test_name} failed with exception: {e}")
-                failed += 1
-                self.logger.test_end(test_name, False)
+        self.results = TestScheduler.from_config(self.config, self.logger, "ran").run(tests)
+        passed, failed, skipped = tally(self.results)
         
         self.logger.info(f"Physical RAN Test Results: {passed} passed, {failed} failed, {skipped} skipped")
+        self.logger.info(f"API limiter: {self.kubectl.limiter.summary()}")
+        self.logger.info(f"Probe cache: {self.kubectl.probes.summary()}")
         return failed == 0
     
     def _ssh_worker(self, cmd: str) -> tuple:
@@ -178,8 +176,7 @@ class PhysicalRANTestSuite:
         
         # Get AMF pod and its N2 IP
         try:
-            pods = self.kubectl.get_pods("5g")
-            amf_pods = [p for p in pods if "amf" in p["metadata"]["name"].lower() and p["status"]["phase"] == "Running"]
+            amf_pods = self.component_validator.get_component_pods("amf", phase="Running")
             
             if not amf_pods:
                 self.logger.error("No AMF pod found")
@@ -231,8 +228,7 @@ class PhysicalRANTestSuite:
         self.logger.info("Checking UPF overlay IP reachability...")
         
         try:
-            pods = self.kubectl.get_pods("5g")
-            upf_pods = [p for p in pods if "upf" in p["metadata"]["name"].lower() and p["status"]["phase"] == "Running"]
+            upf_pods = self.component_validator.get_component_pods("upf", phase="Running")
             
             if not upf_pods:
                 self.logger.error("No UPF pod found")
@@ -284,8 +280,7 @@ class PhysicalRANTestSuite:
         self.logger.info("Checking gNB connection to AMF...")
         
         try:
-            pods = self.kubectl.get_pods("5g")
-            amf_pods = [p for p in pods if "amf" in p["metadata"]["name"].lower() and p["status"]["phase"] == "Running"]
+            amf_pods = self.component_validator.get_component_pods("amf", phase="Running")
             
             if not amf_pods:
                 self.logger.error("No AMF pod found")
@@ -4,20 +4,27 @@ Tests failure recovery and fault tolerance
 """
 import sys
 import os
+from typing import Optional
 import time
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils.kubectl_client import KubectlClient
+from utils.kubectl_client import KubectlClient, K8sClientError
+from utils.scheduler import TestScheduler, TestSpec, tally
 from utils.test_helpers import TestConfig, TestLogger, NetworkValidator, ComponentValidator
 
 
 class ResilienceTestSuite:
     """Resilience test suite for 5G testbed"""
     
-    def __init__(self, verbose: bool = False):
+    def __init__(self, verbose: bool = False, kubectl: Optional[KubectlClient] = None):
         self.config = TestConfig()
         self.logger = TestLogger(verbose)
-        self.kubectl = KubectlClient(self.config.get("cluster.kubeconfig_path"))
+        # run_tests.py passes one shared client to every suite when running in-process
+        self.kubectl = kubectl or KubectlClient(
+            self.config.get("cluster.kubeconfig_path"),
+            rate_limits=self.config.get("global.api_rate_limits"),
+            probe_cache=self.config.get("global.probe_cache"),
+        )
         self.network_validator = NetworkValidator(self.kubectl, self.config)
         self.component_validator = ComponentValidator(self.kubectl, self.config)
         self.verbose = verbose
@@ -27,37 +34,49 @@ class ResilienceTestSuite:
         self.logger.info("Starting Resilience Test Suite")
         
         tests = [
-            ("Pod Restart Recovery", self.test_pod_restart_recovery),
-            ("Network Interface Recovery", self.test_network_interface_recovery),
-            ("Node Failure Recovery", self.test_node_failure_recovery),
-            ("Network Partition Recovery", self.test_network_partition_recovery),
-            ("OVS Bridge Recovery", self.test_ovs_bridge_recovery),
-            ("VXLAN Tunnel Recovery", self.test_vxlan_tunnel_recovery),
-            ("Multus Recovery", self.test_multus_recovery),
-            ("KubeEdge Recovery", self.test_kubeedge_recovery),
-            ("Database Recovery", self.test_database_recovery),
-            ("Stress Test Cleanup", self.test_stress_cleanup)
+            # Chaos tests write what they break, so they run one at a time;
+            # declaration order is kept, which leaves the cleanup for last.
+            TestSpec("Pod Restart Recovery", self.test_pod_restart_recovery, writes=("ns:5g",)),
+            TestSpec("Network Interface Recovery", self.test_network_interface_recovery,
+                     after=("Pod Restart Recovery",), writes=("ns:5g",)),
+            TestSpec("Node Failure Recovery", self.test_node_failure_recovery,
+                     inputs=("component:amf", "component:smf", "component:upf", "nodes")),
+            TestSpec("Network Partition Recovery", self.test_network_partition_recovery,
+                     inputs=("component:amf", "component:smf", "component:gnb", "ovs")),
+            TestSpec("OVS Bridge Recovery", self.test_ovs_bridge_recovery, writes=("ns:kube-system", "dataplane")),
+            TestSpec("VXLAN Tunnel Recovery", self.test_vxlan_tunnel_recovery,
+                     after=("OVS Bridge Recovery",)),
+            TestSpec("Multus Recovery", self.test_multus_recovery, writes=("ns:kube-system",)),
+            TestSpec("KubeEdge Recovery", self.test_kubeedge_recovery, writes=("ns:kubeedge",)),
+            TestSpec("Database Recovery", self.test_database_recovery, writes=("ns:5g",)),
+            TestSpec("Stress Test Cleanup", self.test_stress_cleanup, writes=("*",)),
         ]
         
-        passed = 0
-        failed = 0
+        self.results = TestScheduler.from_config(self.config, self.logger, "resilience").run(tests)
+        passed, failed, skipped = tally(self.results)
         
-        for test_name, test_func in tests:
-            self.logger.test_start(test_name)
-            try:
-                success = test_func()
-                if success:
-                    passed += 1
-                else:
-                    failed += 1
-            except Exception as e:
-                self.logger.error(f"{test_name} failed with exception: {e}")
-                failed += 1
-            self.logger.test_end(test_name, success)
-        
-        self.logger.info(f"Resilience Test Results: {passed} passed, {failed} failed")
+        self.logger.info(f"Resilience Test Results: {passed} passed, {failed} failed, {skipped} skipped")
+        self.logger.info(f"API limiter: {self.kubectl.limiter.summary()}")
+        self.logger.info(f"Probe cache: {self.kubectl.probes.summary()}")
         return failed == 0
     
+    @staticmethod
+    def _replaces(old_uid: str):
+        """Predicate for a Ready replacement of the deleted pod."""
+        return lambda pod: pod.uid != old_uid and pod.ready and not pod.terminating
+    
+    def _wait_for_rollouts(self, daemonsets, timeout: float) -> bool:
+        """Wait for kube-system DaemonSet rollouts within one shared timeout."""
+        deadline = time.monotonic() + timeout
+        for ds in daemonsets:
+            result = self.kubectl.wait_for_rollout("daemonset", ds, "kube-system", timeout=max(0.0, deadline - time.monotonic()))
+            if not result:
+                self.logger.warning(f"DaemonSet {ds} rollout not complete")
+                return False
+            self.logger.info(f"DaemonSet {ds} rolled out in {result.elapsed:.1f}s")
+            self.logger.metric(f"{ds}_rollout", result.elapsed, "s", better="lower")
+        return True
+    
     def test_pod_restart_recovery(self) -> bool:
         """Test pod restart recovery"""
         self.logger.info("Testing pod restart recovery...")
@@ -70,27 +89,23 @@ class ResilienceTestSuite:
                 return False
             
             amf_pod = amf_pods[0]["metadata"]["name"]
+            old_uid = amf_pods[0]["metadata"]["uid"]
             
             # Delete AMF pod to trigger restart
             self.logger.info(f"Deleting AMF pod {amf_pod}...")
-            self.kubectl.run_command(["delete", "pod", amf_pod, "-n", "5g"])
+            self.kubectl.delete_pod(amf_pod, "5g")
             
-            # Wait for pod to be recreated and running
+            # Wait for the replacement pod to become Ready
             recovery_timeout = self.config.get("test_configs.resilience.recovery_timeout", 180)
             self.logger.info(f"Waiting for AMF pod recovery (timeout: {recovery_timeout}s)...")
             
-            start_time = time.time()
-            while time.time() - start_time < recovery_timeout:
-                pods = self.kubectl.get_pods("5g")
-                amf_pods = [p for p in pods if "amf" in p["metadata"]["name"].lower()]
-                
-                if amf_pods:
-                    amf_pod = amf_pods[0]
-                    if amf_pod["status"]["phase"] == "Running":
-                        self.logger.success("AMF pod recovered successfully")
-                        return True
-                
-                time.sleep(5)
+            recovered = self.component_validator.wait_for_component_pods(
+                "amf", self._replaces(old_uid), timeout=recovery_timeout
+            )
+            if recovered:
+                self.logger.metric("amf_recovery", recovered.elapsed, "s", better="lower")
+                self.logger.success(f"AMF pod recovered successfully in {recovered.elapsed:.1f}s")
+                return True
             
             self.logger.error("AMF pod did not recover within timeout")
             return False
@@ -124,28 +139,25 @@ class ResilienceTestSuite:
             
             # Restart pod
             self.logger.info("Restarting AMF pod...")
-            self.kubectl.run_command(["delete", "pod", amf_pod, "-n", "5g"])
+            old_uid = amf_pods[0]["metadata"]["uid"]
+            self.kubectl.delete_pod(amf_pod, "5g")
             
-            # Wait for recovery
+            # Wait for recovery; Multus attaches n1/n2 before the pod can turn Ready
             recovery_timeout = self.config.get("test_configs.resilience.recovery_timeout", 180)
-            start_time = time.time()
-            
-            while time.time() - start_time < recovery_timeout:
-                pods = self.kubectl.get_pods("5g")
-                amf_pods = [p for p in pods if "amf" in p["metadata"]["name"].lower()]
+            recovered = self.component_validator.wait_for_component_pods(
+                "amf", self._replaces(old_uid), timeout=recovery_timeout
+            )
+            if recovered:
+                new_amf_pod = recovered.items[0].name
                 
-                if amf_pods and amf_pods[0]["status"]["phase"] == "Running":
-                    new_amf_pod = amf_pods[0]["metadata"]["name"]
-                    
-                    # Check interface recovery
-                    n1_recovered = self.network_validator.check_interface_ip(new_amf_pod, "5g", "n1", n1_ip)
-                    n2_recovered = self.network_validator.check_interface_ip(new_amf_pod, "5g", "n2", n2_ip)
-                    
-                    if n1_recovered and n2_recovered:
-                        self.logger.success("Network interfaces recovered successfully")
-                        return True
+                # Check interface recovery
+                n1_recovered = self.network_validator.check_interface_ip(new_amf_pod, "5g", "n1", n1_ip)
+                n2_recovered = self.network_validator.check_interface_ip(new_amf_pod, "5g", "n2", n2_ip)
                 
-                time.sleep(5)
+                if n1_recovered and n2_recovered:
+                    self.logger.metric("interface_recovery", recovered.elapsed, "s", better="lower")
+                    self.logger.success(f"Network interfaces recovered successfully in {recovered.elapsed:.1f}s")
+                    return True
             
             self.logger.error("Network interfaces did not recover within timeout")
             return False
@@ -163,15 +175,14 @@ class ResilienceTestSuite:
             # For now, we'll check if pods can be rescheduled
             
             # Get all pods
-            all_pods = self.kubectl.get_pods()
-            running_pods = [p for p in all_pods if p["status"]["phase"] == "Running"]
+            running_pods = self.kubectl.get_pods(field_selector="status.phase=Running")
             
             self.logger.info(f"Found {len(running_pods)} running pods across all namespaces")
             
             # Check if critical pods are running
             critical_components = ["amf", "smf", "upf"]
             for component in critical_components:
-                component_pods = [p for p in running_pods if component in p["metadata"]["name"].lower()]
+                component_pods = self.component_validator.get_component_pods(component, phase="Running")
                 if not component_pods:
                     self.logger.error(f"No running {component.upper()} pods found")
                     return False
@@ -214,8 +225,7 @@ class ResilienceTestSuite:
                 smf_pod = smf_pods[0]["metadata"]["name"]
                 
                 # Get AMF IP
-                amf_ip_result = self.kubectl.exec_in_pod(amf_pod, "5g", ["hostname", "-i"])
-                amf_ip = amf_ip_result.stdout.strip()
+                amf_ip = self.network_validator.pod_ip(amf_pod, "5g")
                 
                 if self.network_validator.check_connectivity(smf_pod, amf_pod, "5g", amf_ip):
                     self.logger.success("AMF-SMF connectivity working")
@@ -223,7 +233,7 @@ class ResilienceTestSuite:
                     self.logger.warning("AMF-SMF connectivity issues (might be normal during startup)")
             
             # Test gNB-AMF connectivity
-            gnb_pods = [p for p in self.kubectl.get_pods("5g") if "gnb" in p["metadata"]["name"].lower()]
+            gnb_pods = self.component_validator.get_component_pods("gnb")
             if gnb_pods and amf_pods:
                 gnb_pod = gnb_pods[0]["metadata"]["name"]
                 amf_pod = amf_pods[0]["metadata"]["name"]
@@ -246,37 +256,25 @@ class ResilienceTestSuite:
         
         try:
             # Check OVS DaemonSets - they are named ds-net-setup-*
-            def get_ovs_pods():
-                all_pods = self.kubectl.get_pods("kube-system")
-                return [p for p in all_pods 
-                       if "ds-net-setup" in p["metadata"]["name"].lower()
-                       or "ovs" in p["metadata"]["name"].lower()]
-            
-            ovs_pods = get_ovs_pods()
+            ovs_pods = self.component_validator.get_component_pods("ovs", "kube-system")
             if not ovs_pods:
                 # OVS might be configured directly on nodes
                 self.logger.warning("No OVS setup pods found (OVS configured on nodes)")
                 return True
             
-            # Restart OVS DaemonSet
+            # Restart OVS DaemonSets (expected on worker and edge)
             self.logger.info("Restarting OVS DaemonSets...")
-            self.kubectl.run_command(["rollout", "restart", "daemonset", "ds-net-setup-worker", "-n", "kube-system"])
-            self.kubectl.run_command(["rollout", "restart", "daemonset", "ds-net-setup-edge", "-n", "kube-system"])
+            daemonsets = ["ds-net-setup-worker", "ds-net-setup-edge"]
+            for ds in daemonsets:
+                self.kubectl.rollout_restart("daemonset", ds, "kube-system")
             
-            # Wait for OVS pods to be ready
+            # Wait for the rollouts to complete
             recovery_timeout = self.config.get("test_configs.resilience.recovery_timeout", 180)
             self.logger.info(f"Waiting for OVS recovery (timeout: {recovery_timeout}s)...")
             
-            start_time = time.time()
-            while time.time() - start_time < recovery_timeout:
-                ovs_pods = get_ovs_pods()
-                running_ovs = [p for p in ovs_pods if p["status"]["phase"] == "Running"]
-                
-                if len(running_ovs) >= 2:  # Expected on worker and edge
-                    self.logger.success("OVS DaemonSets recovered successfully")
-                    return True
-                
-                time.sleep(5)
+            if self._wait_for_rollouts(daemonsets, recovery_timeout):
+                self.logger.success("OVS DaemonSets recovered successfully")
+                return True
             
             self.logger.error("OVS DaemonSets did not recover within timeout")
             return False
@@ -292,9 +290,7 @@ class ResilienceTestSuite:
         try:
             # Check VXLAN configuration after OVS recovery
             # OVS pods are named ds-net-setup-*
-            ovs_pods = [p for p in self.kubectl.get_pods("kube-system") 
-                       if "ds-net-setup" in p["metadata"]["name"].lower()
-                       or "ovs" in p["metadata"]["name"].lower()]
+            ovs_pods = self.component_validator.get_component_pods("ovs", "kube-system")
             
             if not ovs_pods:
                 # VXLAN might be configured on nodes directly
@@ -307,10 +303,7 @@ class ResilienceTestSuite:
                     continue
                 pod_name = ovs_pod["metadata"]["name"]
                 try:
-                    result = self.kubectl.exec_in_pod(
-                        pod_name, "kube-system",
-                        ["ovs-vsctl", "show"]
-                    )
+                    result = self.kubectl.probe(pod_name, "kube-system", ["ovs-vsctl", "show"])
                     if "vxlan" in result.stdout.lower():
                         self.logger.success(f"VXLAN interfaces found on {pod_name}")
                     else:
@@ -330,29 +323,24 @@ class ResilienceTestSuite:
         
         try:
             # Check Multus DaemonSet
-            multus_pods = [p for p in self.kubectl.get_pods("kube-system") if "multus" in p["metadata"]["name"].lower()]
+            multus_pods = self.component_validator.get_component_pods("multus", "kube-system")
             if not multus_pods:
                 self.logger.error("No Multus pods found")
                 return False
             
-            # Restart Multus DaemonSet
-            self.logger.info("Restarting Multus DaemonSet...")
-            self.kubectl.run_command(["rollout", "restart", "daemonset", "kube-multus-ds", "-n", "kube-system"])
+            # Restart Multus DaemonSets (one per node type, see multus_install role)
+            self.logger.info("Restarting Multus DaemonSets...")
+            daemonsets = ["multus-worker", "multus-edge"]
+            for ds in daemonsets:
+                self.kubectl.rollout_restart("daemonset", ds, "kube-system")
             
             # Wait for Multus recovery
             recovery_timeout = self.config.get("test_configs.resilience.recovery_timeout", 180)
             self.logger.info(f"Waiting for Multus recovery (timeout: {recovery_timeout}s)...")
             
-            start_time = time.time()
-            while time.time() - start_time < recovery_timeout:
-                multus_pods = [p for p in self.kubectl.get_pods("kube-system") if "multus" in p["metadata"]["name"].lower()]
-                running_multus = [p for p in multus_pods if p["status"]["phase"] == "Running"]
-                
-                if len(running_multus) >= 2:  # Expected on worker and edge
-                    self.logger.success("Multus DaemonSet recovered successfully")
-                    return True
-                
-                time.sleep(5)
+            if self._wait_for_rollouts(daemonsets, recovery_timeout):
+                self.logger.success("Multus DaemonSet recovered successfully")
+                return True
             
             self.logger.error("Multus DaemonSet did not recover within timeout")
             return False
@@ -373,26 +361,28 @@ class ResilienceTestSuite:
                 return False
             
             # Restart CloudCore
-            cloudcore_pods = [p for p in kubeedge_pods if "cloudcore" in p["metadata"]["name"].lower()]
+            cloudcore_pods = self.component_validator.get_component_pods("cloudcore", "kubeedge")
+            recovery_timeout = self.config.get("test_configs.resilience.recovery_timeout", 180)
             if cloudcore_pods:
                 cloudcore_pod = cloudcore_pods[0]["metadata"]["name"]
+                old_uid = cloudcore_pods[0]["metadata"]["uid"]
                 self.logger.info(f"Restarting CloudCore pod {cloudcore_pod}...")
-                self.kubectl.run_command(["delete", "pod", cloudcore_pod, "-n", "kubeedge"])
-            
-            # Wait for KubeEdge recovery
-            recovery_timeout = self.config.get("test_configs.resilience.recovery_timeout", 180)
-            self.logger.info(f"Waiting for KubeEdge recovery (timeout: {recovery_timeout}s)...")
-            
-            start_time = time.time()
-            while time.time() - start_time < recovery_timeout:
-                kubeedge_pods = self.kubectl.get_pods("kubeedge")
-                running_kubeedge = [p for p in kubeedge_pods if p["status"]["phase"] == "Running"]
-                
-                if running_kubeedge:
-                    self.logger.success("KubeEdge recovered successfully")
-                    return True
+                self.kubectl.delete_pod(cloudcore_pod, "kubeedge")
                 
-                time.sleep(5)
+                # Wait for KubeEdge recovery
+                self.logger.info(f"Waiting for KubeEdge recovery (timeout: {recovery_timeout}s)...")
+                recovered = self.component_validator.wait_for_component_pods(
+                    "cloudcore", self._replaces(old_uid), "kubeedge", timeout=recovery_timeout
+                )
+            else:
+                recovered = self.kubectl.wait_for_pod(
+                    lambda p: p.phase == "Running", "kubeedge", timeout=recovery_timeout
+                )
+            
+            if recovered:
+                self.logger.metric("kubeedge_recovery", recovered.elapsed, "s", better="lower")
+                self.logger.success(f"KubeEdge recovered successfully in {recovered.elapsed:.1f}s")
+                return True
             
             self.logger.error("KubeEdge did not recover within timeout")
             return False
@@ -407,29 +397,28 @@ class ResilienceTestSuite:
         
         try:
             # Check MongoDB pods
-            mongo_pods = [p for p in self.kubectl.get_pods("5g") if "mongo" in p["metadata"]["name"].lower()]
+            mongo_pods = self.component_validator.get_component_pods("mongodb")
             if not mongo_pods:
                 self.logger.warning("No MongoDB pods found (database might not be deployed)")
                 return True  # Database is optional
             
             mongo_pod = mongo_pods[0]["metadata"]["name"]
+            old_uid = mongo_pods[0]["metadata"]["uid"]
             
             # Restart MongoDB pod
             self.logger.info(f"Restarting MongoDB pod {mongo_pod}...")
-            self.kubectl.run_command(["delete", "pod", mongo_pod, "-n", "5g"])
+            self.kubectl.delete_pod(mongo_pod, "5g")
             
             # Wait for MongoDB recovery
             recovery_timeout = self.config.get("test_configs.resilience.recovery_timeout", 180)
             self.logger.info(f"Waiting for MongoDB recovery (timeout: {recovery_timeout}s)...")
             
-            start_time = time.time()
-            while time.time() - start_time < recovery_timeout:
-                mongo_pods = [p for p in self.kubectl.get_pods("5g") if "mongo" in p["metadata"]["name"].lower()]
-                if mongo_pods and mongo_pods[0]["status"]["phase"] == "Running":
-                    self.logger.success("MongoDB recovered successfully")
-                    return True
-                
-                time.sleep(5)
+            recovered = self.component_validator.wait_for_component_pods(
+                "mongodb", self._replaces(old_uid), timeout=recovery_timeout
+            )
+            if recovered:
+                self.logger.success(f"MongoDB recovered successfully in {recovered.elapsed:.1f}s")
+                return True
             
             self.logger.error("MongoDB did not recover within timeout")
             return False
@@ -450,10 +439,21 @@ class ResilienceTestSuite:
                 pod_name = pod["metadata"]["name"]
                 namespace = pod["metadata"]["namespace"]
                 self.logger.info(f"Cleaning up test pod {pod_name} in namespace {namespace}")
-                self.kubectl.run_command(["delete", "pod", pod_name, "-n", namespace])
+                try:
+                    self.kubectl.delete_pod(pod_name, namespace)
+                except K8sClientError as e:
+                    self.logger.warning(f"Could not delete test pod {pod_name}: {e}")
             
-            # Wait for cleanup
-            time.sleep(10)
+            # Wait for cleanup (10s budget shared by all pods)
+            deadline = time.monotonic() + 10
+            for pod in test_pods:
+                meta = pod["metadata"]
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.kubectl.wait_for_deleted(
+                    "pods", meta["name"], meta["namespace"], timeout=remaining, uid=meta["uid"]
+                )
             
             # Check if cleanup was successful
             remaining_test_pods = [p for p in self.kubectl.get_pods() if "test" in p["metadata"]["name"].lower()]
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Query the run history that run_tests.py saves to history.db
+
+    python3 run_history.py runs                  # latest runs
+    python3 run_history.py series rtt            # series names matching "rtt"
+    python3 run_history.py trend "E2E Connectivity"
+    python3 run_history.py regressions           # exit code 1 if any
+    python3 run_history.py diff 41 42            # what changed in the cluster between two runs
+
+Series and the regression test are described in utils/history.py. Needs
+only the standard library, no venv.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.resolve()))
+from utils.history import RunHistory, default_path, diff_fingerprints  # noqa: E402
+
+BAR_WIDTH = 30
+
+
+def cmd_runs(history, args):
+    rows = history.runs(args.limit)
+    if not rows:
+        print("No runs recorded yet")
+        return 0
+    print(f"{'run':>5}  {'started':<19} {'wall':>7}  {'pass':>4} {'fail':>4} {'skip':>4}  {'cluster':<12}  args")
+    for r in rows:
+        started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(r["started"]))
+        status = "✅" if r["exit_code"] == 0 else "❌"
+        print(f"{r['id']:>5}  {started:<19} {r['wall_s'] or 0:>6.0f}s  {r['passed']:>4} {r['failed']:>4} "
+              f"{r['skipped']:>4}  {r['fingerprint_id'] or '-':<12}  {status} {r['argv'] or ''}")
+    return 0
+
+
+def cmd_series(history, args):
+    names = history.series_names(args.pattern)
+    print("\n".join(names) if names else f"No series matching {args.pattern!r}")
+    return 0
+
+
+def cmd_trend(history, args):
+    names = history.series_names(args.pattern)
+    if not names:
+        print(f"No series matching {args.pattern!r}")
+        return 1
+    if len(names) > args.max_series:
+        print(f"{len(names)} series match {args.pattern!r}; showing {args.max_series} (narrow the pattern):")
+        names = names[:args.max_series]
+    for name in names:
+        points = history.trend(name, args.limit)
+        top = max(p["value"] for p in points) or 1.0
+        print(f"\n📈 {name}  ({points[-1]['unit']}, {points[-1]['better']} is better)")
+        previous_fp = None
+        for p in points:
+            bar = "█" * max(1, round(p["value"] / top * BAR_WIDTH)) if p["value"] > 0 else ""
+            deploy = "  ◀ cluster changed" if previous_fp and p["fingerprint_id"] != previous_fp else ""
+            print(f"  #{p['run_id']:<5} {p['value']:>10.3f}  {bar}{deploy}")
+            previous_fp = p["fingerprint_id"]
+    return 0
+
+
+def cmd_regressions(history, args):
+    found = history.regressions(args.recent, args.baseline, args.alpha, args.min_change, pattern=args.pattern)
+    if not found:
+        print(f"✅ No significant slowdowns (last {args.recent} runs vs the {args.baseline} before, "
+              f"p < {args.alpha}, >= {args.min_change:.0%} worse)")
+        return 0
+    print(f"⚠️  {len(found)} series got worse (last {args.recent} runs vs the {args.baseline} before):")
+    for r in found:
+        print(f"  {r.series}")
+        print(f"      {r.baseline_median:.3g} -> {r.recent_median:.3g} {r.unit}  "
+              f"({'+' if r.better == 'lower' else '-'}{r.change:.0%}, p={r.p_value:.4f}, "
+              f"{r.baseline_runs} vs {r.recent_runs} runs, last #{r.last_run_id})"
+              + ("  [cluster changed]" if r.deploy_changed else ""))
+    return 1
+
+
+def cmd_diff(history, args):
+    old, new = history.fingerprint(args.old), history.fingerprint(args.new)
+    if not old or not new:
+        print("❌ No fingerprint stored for " + " and ".join(
+            f"#{i}" for i, fp in ((args.old, old), (args.new, new)) if not fp))
+        return 1
+    changes = diff_fingerprints(old, new)
+    print("\n".join(changes) if changes else f"Same cluster in #{args.old} and #{args.new}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run history of the 5G testbed test suites")
+    parser.add_argument("--db", type=Path, default=None, help=f"History database (default {default_path()})")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("runs", help="List recent runs")
+    p.add_argument("-n", "--limit", type=int, default=20)
+    p.set_defaults(func=cmd_runs)
+
+    p = sub.add_parser("series", help="List series names (tests, metrics, API ops)")
+    p.add_argument("pattern", nargs="?", default="")
+    p.set_defaults(func=cmd_series)
+
+    p = sub.add_parser("trend", help="Show the values of matching series over recent runs")
+    p.add_argument("pattern")
+    p.add_argument("-n", "--limit", type=int, default=30)
+    p.add_argument("--max-series", type=int, default=10)
+    p.set_defaults(func=cmd_trend)
+
+    p = sub.add_parser("regressions", help="Flag series that got significantly worse")
+    p.add_argument("pattern", nargs="?", default="")
+    p.add_argument("--recent", type=int, default=3, help="Runs under test (default 3)")
+    p.add_argument("--baseline", type=int, default=10, help="Runs before them used as baseline (default 10)")
+    p.add_argument("--alpha", type=float, default=0.05, help="Significance level (default 0.05)")
+    p.add_argument("--min-change", type=float, default=0.10,
+                   help="Smallest relative slowdown worth reporting (default 0.10 = 10%%)")
+    p.set_defaults(func=cmd_regressions)
+
+    p = sub.add_parser("diff", help="Cluster fingerprint changes between two runs")
+    p.add_argument("old", type=int)
+    p.add_argument("new", type=int)
+    p.set_defaults(func=cmd_diff)
+
+    args = parser.parse_args()
+    with RunHistory(args.db) as history:
+        sys.exit(args.func(history, args))
+
+
+if __name__ == "__main__":
+    main()
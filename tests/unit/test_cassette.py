@@ -0,0 +1,62 @@
+"""
+Record -> replay round trip for utils/cassette.py against the fake cluster
+
+Usage:
+    python -m pytest -q unit
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from utils.cassette import Cassette, CassetteMiss, in_use
+from utils.fake_cluster import FakeK8sClient
+from utils.k8s_client import K8sClient
+from utils import scheduler, test_helpers
+from protocols.test_5g_protocols import ProtocolTestSuite
+from resilience.test_resilience import ResilienceTestSuite
+
+SUITES = (ProtocolTestSuite, ResilienceTestSuite)
+
+
+def outcomes(suite):
+    return [(r.name, r.status) for r in suite.results]
+
+
+def test_suites_replay_offline_what_they_recorded(tmp_path):
+    path = str(tmp_path / "session.cassette")
+    recording = FakeK8sClient(cassette=Cassette(path, "record"))
+    recorded = [S(kubectl=recording) for S in SUITES]
+    assert all(s.run_all_tests() for s in recorded)
+    recording.close()
+
+    tape = Cassette(path, "replay")
+    try:
+        replayed = [S(kubectl=K8sClient(cassette=tape)) for S in SUITES]
+        assert all(s.run_all_tests() for s in replayed)
+    finally:
+        tape.close()
+    assert [outcomes(s) for s in replayed] == [outcomes(s) for s in recorded]
+
+
+def test_replay_serves_a_key_in_order_then_repeats_the_last(tmp_path):
+    path = str(tmp_path / "t.cassette")
+    tape = Cassette(path, "record")
+    for phase in ("Pending", "Running"):
+        tape.record(("list", "pods"), {"value": phase})
+    tape.close()
+    tape = Cassette(path, "replay")
+    assert [tape.replay(("list", "pods"))["value"] for _ in range(3)] == ["Pending", "Running", "Running"]
+    with pytest.raises(CassetteMiss):
+        tape.replay(("list", "nodes"))
+    tape.close()
+
+
+def test_scheduler_runs_serially_while_a_cassette_is_open(tmp_path):
+    tape = Cassette(str(tmp_path / "t.cassette"), "record")
+    assert in_use()
+    assert scheduler.TestScheduler(test_helpers.TestLogger(False), workers=8).workers == 1
+    tape.close()
+    assert not in_use()
+    assert scheduler.TestScheduler(test_helpers.TestLogger(False), workers=8).workers == 8
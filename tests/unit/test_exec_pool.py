@@ -0,0 +1,229 @@
+"""
+Pooled shell sessions (utils/exec_pool.py) against a scripted fake websocket
+
+Usage:
+    python -m pytest -q unit
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import re
+
+import pytest
+
+from kubernetes.stream.ws_client import ERROR_CHANNEL, STDERR_CHANNEL, STDOUT_CHANNEL
+
+from utils.exec_pool import ExecSession, ExecSessionError, ExecSessionPool, ExecSessionUnavailable
+
+
+class FakeShell:
+    """
+    Stand-in for a WSClient running /bin/sh. respond(command) returns
+    (stdout, stderr, rc), or None to never answer; output is delivered
+    `chunk` characters per update() to exercise split markers.
+    """
+
+    def __init__(self, respond, chunk=1 << 20, status=""):
+        self.respond = respond
+        self.chunk = chunk
+        self.status = status
+        self.open = True
+        self.fail_write = False
+        self.fail_read = False
+        self.commands = []
+        self._pending = []  # (channel, text)
+        self._buffers = {STDOUT_CHANNEL: "", STDERR_CHANNEL: "", ERROR_CHANNEL: status}
+
+    def is_open(self):
+        return self.open
+
+    def close(self):
+        self.open = False
+
+    def write_stdin(self, script):
+        if self.fail_write:
+            raise ConnectionResetError("broken pipe")
+        command = re.match(r"\((.*)\) </dev/null", script).group(1)
+        marker = re.search(r"__k8s_exec_\w+?__", script).group(0)
+        self.commands.append(command)
+        answer = self.respond(command)
+        if answer is None:
+            return
+        out, err, rc = answer
+        for channel, text in ((STDOUT_CHANNEL, f"{out}\n{marker} {rc}\n"), (STDERR_CHANNEL, f"{err}\n{marker}\n")):
+            self._pending += [(channel, text[i:i + self.chunk]) for i in range(0, len(text), self.chunk)]
+
+    def update(self, timeout=0):
+        if self.fail_read:
+            raise ConnectionResetError("connection reset")
+        if self._pending:
+            channel, text = self._pending.pop(0)
+            self._buffers[channel] += text
+
+    def read_channel(self, channel, timeout=0):
+        data, self._buffers[channel] = self._buffers[channel], ""
+        return data
+
+    def read_all(self):
+        return ""
+
+
+def echo(command):
+    if command == "true":
+        return "", "", 0
+    return f"ran {command}", "warn", 3
+
+
+class Opener:
+    """Opener for ExecSessionPool recording every shell it handed out."""
+
+    def __init__(self, make=lambda: FakeShell(echo)):
+        self.make = make
+        self.shells = []
+
+    def __call__(self, pod, namespace, container):
+        shell = self.make()
+        self.shells.append(shell)
+        return shell
+
+
+def test_markers_split_across_chunks():
+    shell = FakeShell(lambda c: ("line one\nline two", "oops", 0), chunk=3)
+    assert ExecSession(shell, ("5g", "amf", "")).run(["ip", "addr"], 5) == ("line one\nline two", "oops", 0)
+
+
+def test_rc_line_and_the_next_command_on_the_same_session():
+    shell = FakeShell(echo, chunk=7)
+    session = ExecSession(shell, ("5g", "amf", ""))
+    assert session.run(["ss", "-lnt"], 5) == ("ran ss -lnt", "warn", 3)
+    assert session.run(["true"], 5) == ("", "", 0)
+    assert shell.open
+
+
+def test_timeout_returns_partial_output_and_closes_the_session():
+    shell = FakeShell(lambda c: None)
+    out, err, rc = ExecSession(shell, ("5g", "amf", "")).run(["sleep", "100"], 0.05)
+    assert (out, err, rc) == ("", "", None)
+    assert not shell.open
+
+
+def test_pool_reuses_an_idle_session():
+    opener = Opener()
+    pool = ExecSessionPool(opener)
+    for _ in range(3):
+        assert pool.run("amf", "5g", ["ss"], None, 5)[2] == 3
+    assert len(opener.shells) == 1
+
+
+def test_timed_out_session_is_not_returned_to_the_pool():
+    opener = Opener(lambda: FakeShell(lambda c: ("", "", 0) if c == "true" else None))
+    pool = ExecSessionPool(opener)
+    assert pool.run("amf", "5g", ["sleep", "100"], None, 0.05)[2] is None
+    pool.run("amf", "5g", ["sleep", "100"], None, 0.05)
+    assert len(opener.shells) == 2
+    assert not opener.shells[0].open
+
+
+def test_stale_session_reconnects_once_before_sending():
+    opener = Opener()
+    pool = ExecSessionPool(opener)
+    pool.run("amf", "5g", ["ss"], None, 5)
+    opener.shells[0].fail_write = True
+    assert pool.run("amf", "5g", ["ss"], None, 5) == ("ran ss", "warn", 3)
+    assert len(opener.shells) == 2
+    assert opener.shells[1].commands == ["true", "ss"]
+
+
+def test_unsent_command_on_two_dead_sessions_is_unavailable():
+    opener = Opener()
+    pool = ExecSessionPool(opener)
+    pool.run("amf", "5g", ["ss"], None, 5)
+    opener.shells[0].fail_write = True
+
+    def dies_after_handshake():
+        shell = FakeShell(echo)
+
+        def respond(command):
+            shell.fail_write = True
+            return echo(command)
+
+        shell.respond = respond
+        return shell
+
+    opener.make = dies_after_handshake
+    with pytest.raises(ExecSessionUnavailable):
+        pool.run("amf", "5g", ["ss"], None, 5)
+
+
+def test_read_failure_after_sending_is_never_retried():
+    opener = Opener()
+    pool = ExecSessionPool(opener)
+    pool.run("amf", "5g", ["true"], None, 5)
+    opener.shells[0].fail_read = True
+    with pytest.raises(ExecSessionError) as e:
+        pool.run("amf", "5g", ["reboot"], None, 5)
+    assert e.value.sent
+    assert len(opener.shells) == 1
+    assert opener.shells[0].commands.count("reboot") == 1
+
+
+def test_shell_that_cannot_run_true_is_remembered_as_unsupported():
+    opener = Opener(lambda: FakeShell(lambda c: ("", "", 127)))
+    pool = ExecSessionPool(opener)
+    for _ in range(2):
+        with pytest.raises(ExecSessionUnavailable):
+            pool.run("upf", "5g", ["ss"], None, 5)
+    assert len(opener.shells) == 1
+
+
+def test_missing_bin_sh_is_remembered_as_unsupported():
+    def no_shell():
+        shell = FakeShell(echo, status='exec: "/bin/sh": stat /bin/sh: no such file or directory')
+        shell.open = False
+        return shell
+
+    opener = Opener(no_shell)
+    pool = ExecSessionPool(opener)
+    for _ in range(2):
+        with pytest.raises(ExecSessionUnavailable):
+            pool.run("distroless", "5g", ["ss"], None, 5)
+    assert len(opener.shells) == 1
+
+
+def test_handshake_timeout_is_retried_next_time(monkeypatch):
+    monkeypatch.setattr(ExecSessionPool, "HANDSHAKE_TIMEOUT", 0.05)
+    opener = Opener(lambda: FakeShell(lambda c: None))
+    pool = ExecSessionPool(opener)
+    for _ in range(2):
+        with pytest.raises(ExecSessionUnavailable, match="timed out"):
+            pool.run("smf", "5g", ["ss"], None, 5)
+    assert len(opener.shells) == 2
+
+
+def test_handshake_dropped_without_a_status_is_retried_next_time():
+    def dropped():
+        shell = FakeShell(echo)
+        shell.fail_read = True
+        return shell
+
+    opener = Opener(dropped)
+    pool = ExecSessionPool(opener)
+    for _ in range(2):
+        with pytest.raises(ExecSessionUnavailable):
+            pool.run("smf", "5g", ["ss"], None, 5)
+    assert len(opener.shells) == 2
+
+
+def test_opener_failure_is_not_remembered():
+    calls = []
+
+    def opener(pod, namespace, container):
+        calls.append(pod)
+        raise RuntimeError("pod restarting")
+
+    pool = ExecSessionPool(opener)
+    for _ in range(2):
+        with pytest.raises(ExecSessionUnavailable):
+            pool.run("amf", "5g", ["ss"], None, 5)
+    assert len(calls) == 2
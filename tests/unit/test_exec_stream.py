@@ -0,0 +1,167 @@
+"""
+Unit tests for utils/exec_stream.py (no cluster needed)
+
+Usage:
+    python -m pytest -q unit
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.exec_stream import ExecStream, StreamStopped, iperf3_below, iperf3_rate, ping_loss_above, until_output
+
+
+def reply(seq: int) -> str:
+    return f"64 bytes from 10.42.0.13: icmp_seq={seq} ttl=64 time=0.081 ms"
+
+
+def interval(start: float, end: float, mbps: float, role: str = "") -> str:
+    return f"[  5] {start:6.2f}-{end:<6.2f} sec  {mbps * (end - start) / 8:6.1f} MBytes  {mbps:6.0f} Mbits/sec    0  {role}"
+
+
+class Source:
+    """Chunk source over fixed chunks that records how it was ended."""
+
+    def __init__(self, chunks, returncode=0):
+        self.chunks = chunks
+        self.returncode = returncode
+        self.ended = None
+        self.sent = 0
+
+    def __call__(self):
+        try:
+            for channel, data in self.chunks:
+                self.sent += 1
+                yield channel, data
+        except StreamStopped as e:
+            self.ended = f"stopped rc={e.returncode}"
+            return e.returncode
+        except GeneratorExit:
+            self.ended = "closed"
+            raise
+        self.ended = "exited"
+        return self.returncode
+
+
+# ---------- ping_loss_above ----------
+
+def test_ping_loss_one_lost_probe_within_budget():
+    # max 1% of 100: losing icmp_seq=1 is allowed, the full run measures exactly 1%
+    match = ping_loss_above(1, 100)
+    assert all(match(reply(seq)) is None for seq in range(2, 101))
+
+
+def test_ping_loss_stops_once_budget_cannot_hold():
+    match = ping_loss_above(1, 100)
+    assert match(reply(1)) is None
+    assert match(reply(3)) is None          # seq 2 lost: 1 of the 1 allowed
+    stop = match(reply(5))                  # seq 4 lost too: the run cannot end <= 1%
+    assert stop is not None and stop.returncode == 1
+    assert "2 of 100 probes lost" in stop.reason
+
+
+def test_ping_loss_busybox_seq_from_zero():
+    match = ping_loss_above(0, 10)
+    busybox = "64 bytes from 10.42.0.13: seq={} ttl=64 time=0.081 ms".format
+    assert all(match(busybox(seq)) is None for seq in range(0, 5))
+    stop = match(busybox(6))
+    assert stop is not None and "1 of 10 probes lost by seq=6" in stop.reason
+
+
+def test_ping_loss_ignores_other_lines_and_duplicates():
+    match = ping_loss_above(0, 10)
+    assert match("PING 10.42.0.13 (10.42.0.13) 56(84) bytes of data.") is None
+    assert match(reply(1)) is None
+    assert match(reply(1) + " (DUP!)") is None
+    assert match(reply(2)) is None
+    assert match(reply(4)) is not None
+
+
+# ---------- iperf3 ----------
+
+def test_iperf3_rate_interval_and_summary_lines():
+    assert iperf3_rate(interval(10, 20, 94)) == (20.0, 94.0, "")
+    assert iperf3_rate(interval(0, 120, 93, "sender")) == (120.0, 93.0, "sender")
+    assert iperf3_rate(interval(0, 120, 92, "receiver")) == (120.0, 92.0, "receiver")
+
+
+def test_iperf3_rate_units_and_noise():
+    end, mbps, role = iperf3_rate("[  5]   0.00-1.00   sec   112 MBytes  1.10 Gbits/sec    0")
+    assert (end, round(mbps, 6), role) == (1.0, 1100.0, "")
+    end, mbps, _ = iperf3_rate("[  5]   1.00-2.00   sec  12.0 KBytes  98.3 Kbits/sec    0")
+    assert round(mbps, 4) == 0.0983
+    assert iperf3_rate("Connecting to host 10.42.0.13, port 5201") is None
+    assert iperf3_rate("[ ID] Interval           Transfer     Bitrate         Retr") is None
+
+
+def test_iperf3_below_needs_consecutive_low_intervals():
+    match = iperf3_below(10, intervals=3)
+    assert match(interval(0, 10, 5)) is None
+    assert match(interval(10, 20, 5)) is None
+    assert match(interval(20, 30, 50)) is None      # recovered: the count restarts
+    assert match(interval(30, 40, 5)) is None
+    assert match(interval(40, 50, 5)) is None
+    stop = match(interval(50, 60, 5))
+    assert stop is not None and stop.returncode == 1
+
+
+def test_iperf3_below_ignores_summary_lines():
+    match = iperf3_below(10, intervals=1)
+    assert match(interval(0, 120, 5, "receiver")) is None
+
+
+# ---------- ExecStream ----------
+
+def test_stream_runs_to_exit_with_source_returncode():
+    source = Source([("stdout", "a\n"), ("stderr", "warn\n"), ("stdout", "b\n")], returncode=3)
+    stream = ExecStream(source())
+    assert [c.data for c in stream] == ["a\n", "warn\n", "b\n"]
+    result = stream.result()
+    assert (result.stdout, result.stderr, result.returncode) == ("a\nb\n", "warn\n", 3)
+    assert stream.stopped is None and source.ended == "exited"
+
+
+def test_stream_stop_matcher_ends_the_source():
+    source = Source([("stdout", "PING x\n" + reply(1)[:10]), ("stdout", reply(1)[10:] + "\n"),
+                     ("stdout", reply(2) + "\n")])
+    stream = ExecStream(source(), stop=[until_output("bytes from")])
+    result = stream.result()
+    assert result.returncode == 0
+    assert result.stdout == "PING x\n" + reply(1) + "\n"   # matched across a chunk boundary
+    assert stream.stopped.reason == "matched 'bytes from'"
+    assert source.ended == "stopped rc=0" and source.sent == 2
+
+
+def test_stream_failing_stop_reports_reason_in_stderr():
+    lines = "".join(reply(seq) + "\n" for seq in (1, 5))
+    stream = ExecStream(Source([("stdout", lines)])(), stop=[ping_loss_above(1, 100)])
+    result = stream.result()
+    assert result.returncode == 1
+    assert "packet loss > 1%" in result.stderr
+
+
+def test_stream_close_before_exit():
+    source = Source([("stdout", "a\n"), ("stdout", "b\n")])
+    with ExecStream(source()) as stream:
+        next(stream)
+    assert stream.returncode == 124
+    assert source.ended == "closed"
+    assert stream.result().stdout == "a\n"      # output stays readable
+    assert list(stream) == []
+
+
+def test_stream_spills_large_output_and_reads_lines_back():
+    chunks = [("stdout", f"line {i}\n") for i in range(1000)]
+    stream = ExecStream(Source(chunks)(), spill_bytes=256)
+    assert stream.wait() == 0
+    assert stream.spilled
+    assert stream.size() == sum(len(d) for _, d in chunks)
+    lines = list(stream.lines())
+    assert lines[0] == "line 0" and lines[-1] == "line 999" and len(lines) == 1000
+    assert not ExecStream(Source([("stdout", "x\n")])(), spill_bytes=256).spilled
+
+
+def test_follow_yields_whole_lines():
+    stream = ExecStream(Source([("stdout", "a\nb"), ("stderr", "e\n"), ("stdout", "c\nd")])())
+    assert list(stream.follow()) == ["a", "bc", "d"]
+    assert list(ExecStream(Source([("stderr", "e\nf\n")])()).follow("stderr")) == ["e", "f"]
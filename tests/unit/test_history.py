@@ -0,0 +1,99 @@
+"""
+Mann-Whitney U test and regression detection in utils/history.py
+
+Usage:
+    python -m pytest -q unit
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from itertools import combinations
+from math import comb
+
+import pytest
+
+from utils.history import RunHistory, _u_distribution, mann_whitney_greater
+
+
+def u_statistic(a, b):
+    return sum((x > y) + 0.5 * (x == y) for x in a for y in b)
+
+
+def permutation_p(a, b):
+    """Exact one-sided p over every split of the pooled sample (ties by mid-rank)."""
+    pooled, observed = list(a) + list(b), u_statistic(a, b)
+    hits = total = 0
+    for idx in combinations(range(len(pooled)), len(a)):
+        x = [pooled[i] for i in idx]
+        y = [pooled[i] for i in range(len(pooled)) if i not in idx]
+        total += 1
+        hits += u_statistic(x, y) >= observed
+    return hits / total
+
+
+@pytest.mark.parametrize("m,n", [(1, 1), (1, 4), (2, 3), (3, 3), (4, 2), (3, 5)])
+def test_u_distribution_matches_enumeration(m, n):
+    counts = [0] * (m * n + 1)
+    for idx in combinations(range(m + n), m):
+        a = [float(i) for i in idx]
+        b = [float(i) for i in range(m + n) if i not in idx]
+        counts[int(u_statistic(a, b))] += 1
+    assert list(_u_distribution(m, n)) == counts
+    assert sum(counts) == comb(m + n, m)
+
+
+def test_u_distribution_of_very_uneven_samples():
+    counts = _u_distribution(1, 3000)
+    assert counts == (1,) * 3001
+
+
+def test_exact_p_without_ties():
+    assert mann_whitney_greater([4, 5, 6], [1, 2, 3]) == pytest.approx(1 / 20)
+    assert mann_whitney_greater([1, 2, 3], [4, 5, 6]) == 1.0
+    a, b = [2.1, 3.5, 4.0, 6.2], [1.0, 2.5, 3.0, 5.1, 0.4]
+    assert mann_whitney_greater(a, b) == pytest.approx(permutation_p(a, b))
+
+
+def test_ties_use_the_normal_approximation():
+    a, b = [3, 4, 4, 5, 6, 6], [1, 2, 2, 3, 4, 5]
+    assert mann_whitney_greater(a, b) == pytest.approx(permutation_p(a, b), abs=0.01)
+    assert mann_whitney_greater([5, 5, 5], [5, 5, 5, 5]) == 1.0
+
+
+def test_empty_sample():
+    assert mann_whitney_greater([], [1.0]) == 1.0
+
+
+def record(history, values, better="higher", fingerprint=None):
+    for v in values:
+        history.record_run(0.0, 1.0, "run_tests.py", 0, {
+            "performance": [{"name": "iperf", "status": "passed", "elapsed": 1.0,
+                             "metrics": [{"name": "throughput", "value": v, "unit": "Mbps", "better": better}]}],
+        }, fingerprint=fingerprint)
+
+
+def test_regression_is_flagged_in_the_bad_direction_only(tmp_path):
+    with RunHistory(tmp_path / "h.db") as history:
+        record(history, [100, 101, 99, 102, 100, 98, 101, 100], fingerprint={"images": "a"})
+        record(history, [70, 72, 71], fingerprint={"images": "b"})
+        found = history.regressions(pattern="throughput")
+    assert [r.series for r in found] == ["metric/performance/iperf/throughput"]
+    r = found[0]
+    assert (r.baseline_median, r.recent_median, r.recent_runs) == (100, 71, 3)
+    assert r.change == pytest.approx(0.29)
+    assert r.deploy_changed
+
+    with RunHistory(tmp_path / "better.db") as history:
+        record(history, [100, 101, 99, 102, 100, 98, 101, 100, 130, 131, 129])
+        assert history.regressions(pattern="throughput") == []
+
+
+def test_small_moves_and_short_baselines_are_not_flagged(tmp_path):
+    with RunHistory(tmp_path / "h.db") as history:
+        record(history, [100, 101, 99, 102, 100, 98, 101, 100, 96, 95, 96])
+        assert history.regressions(pattern="throughput") == []
+        assert history.regressions(pattern="throughput", min_change=0.03) != []
+    with RunHistory(tmp_path / "short.db") as history:
+        record(history, [100, 101, 100, 50, 50, 50])
+        assert history.regressions(pattern="throughput") == []
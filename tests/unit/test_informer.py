@@ -0,0 +1,142 @@
+"""
+Informer resync in utils/k8s_client.py: a 410 Gone watch relists and resumes
+
+Usage:
+    python -m pytest -q unit
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+from kubernetes.client import ApiException
+
+from utils import k8s_client
+
+
+def pod(name, rv):
+    return {"metadata": {"namespace": "5g", "name": name, "resourceVersion": rv}}
+
+
+class Response:
+    def __init__(self, body):
+        self.data = json.dumps(body).encode()
+
+    def release_conn(self):
+        pass
+
+
+class FakeApi:
+    """list_namespaced_pod serving `lists` in turn; a None entry fails that list."""
+
+    def __init__(self, lists):
+        self.lists = list(lists)
+        self.calls = 0
+
+    def list_namespaced_pod(self, namespace, _preload_content=True, **kwargs):
+        self.calls += 1
+        body = self.lists.pop(0) if len(self.lists) > 1 else self.lists[0]
+        if body is None:
+            raise ApiException(status=503, reason="Service Unavailable")
+        return Response(body)
+
+
+class FakeWatch:
+    """
+    Scripted watch.Watch: each stream() call takes the next script, a list
+    of events ending in an exception to raise, or None to block until stop().
+    """
+
+    scripts = []
+    resumed_at = []
+
+    def __init__(self):
+        self._stop = threading.Event()
+
+    def stream(self, func, *args, resource_version=None, **kwargs):
+        FakeWatch.resumed_at.append(resource_version)
+        script = FakeWatch.scripts.pop(0) if FakeWatch.scripts else None
+        if script is None:
+            self._stop.wait(5)
+            return
+        for item in script:
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    def stop(self):
+        self._stop.set()
+
+
+def wait_for(predicate, timeout=2.0):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def start(monkeypatch, lists, scripts):
+    monkeypatch.setattr(k8s_client, "watch", SimpleNamespace(Watch=FakeWatch))
+    monkeypatch.setattr(k8s_client._Informer, "RETRY_DELAY", 0.01)
+    FakeWatch.scripts, FakeWatch.resumed_at = list(scripts), []
+    api = FakeApi(lists)
+    informer = k8s_client._Informer(api.list_namespaced_pod, "5g")
+    informer.start()
+    return informer, api
+
+
+def names(informer):
+    return [i["metadata"]["name"] for i in informer.items()]
+
+
+def test_gone_watch_relists_and_resumes_from_the_new_resource_version(monkeypatch):
+    first = {"metadata": {"resourceVersion": "10"}, "items": [pod("amf", "9")]}
+    relisted = {"metadata": {"resourceVersion": "20"}, "items": [pod("amf", "9"), pod("smf", "18")]}
+    informer, api = start(monkeypatch, [first, relisted], [
+        [{"type": "ADDED", "raw_object": pod("upf", "11")}, ApiException(status=410, reason="Gone")],
+        None,
+    ])
+    try:
+        assert wait_for(lambda: len(FakeWatch.resumed_at) == 2)
+        assert FakeWatch.resumed_at == ["10", "20"]
+        assert names(informer) == ["amf", "smf"]  # the relist replaced the store, upf was dropped
+        assert informer.resource_version == "20"
+        assert informer.healthy
+        assert api.calls == 2
+    finally:
+        informer.stop()
+
+
+def test_failed_relists_are_retried_before_the_watch_resumes(monkeypatch):
+    first = {"metadata": {"resourceVersion": "10"}, "items": [pod("amf", "9")]}
+    relisted = {"metadata": {"resourceVersion": "30"}, "items": []}
+    informer, api = start(monkeypatch, [first, None, None, relisted],
+                          [[ApiException(status=410, reason="Gone")], None])
+    try:
+        assert wait_for(lambda: len(FakeWatch.resumed_at) == 2)
+        assert api.calls == 4
+        assert FakeWatch.resumed_at == ["10", "30"]
+        assert informer.healthy and names(informer) == []
+    finally:
+        informer.stop()
+
+
+def test_watch_events_update_the_store(monkeypatch):
+    first = {"metadata": {"resourceVersion": "10"}, "items": [pod("amf", "9"), pod("smf", "9")]}
+    informer, _ = start(monkeypatch, [first], [[
+        {"type": "MODIFIED", "raw_object": pod("amf", "11")},
+        {"type": "DELETED", "raw_object": pod("smf", "12")},
+        {"type": "ADDED", "raw_object": pod("upf", "13")},
+    ]])
+    try:
+        assert wait_for(lambda: names(informer) == ["amf", "upf"])
+        assert informer.items()[0]["metadata"]["resourceVersion"] == "11"
+        assert wait_for(lambda: FakeWatch.resumed_at[-1] == "13")
+    finally:
+        informer.stop()
@@ -0,0 +1,109 @@
+"""
+IPAM conflict detection in utils/ipam.py
+
+Usage:
+    python -m pytest -q unit
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+
+from utils.addresses import NETWORK_STATUS, NETWORKS, PodAddresses
+from utils.ipam import DUPLICATE, EXHAUSTED, OUT_OF_RANGE, OVERLAP, STALE, analyze, parse_pool
+
+
+def nad(name, ipam=None, namespace="5g"):
+    config = {"cniVersion": "0.3.1", "type": "ovs", "ipam": ipam or {}}
+    return {"metadata": {"namespace": namespace, "name": name}, "spec": {"config": json.dumps(config)}}
+
+
+def pod(name, interfaces, pinned=(), namespace="5g"):
+    """interfaces: {interface: (network, ip)}"""
+    status = [{"name": "k8s-pod-network", "interface": "eth0", "ips": ["10.42.0.5"], "default": True}]
+    status += [{"name": net, "interface": iface, "ips": [ip]} for iface, (net, ip) in interfaces.items()]
+    annotations = {NETWORK_STATUS: json.dumps(status)}
+    if pinned:
+        annotations[NETWORKS] = json.dumps([{"name": "n2-net", "ips": [f"{ip}/24" for ip in pinned]}])
+    return PodAddresses({"metadata": {"namespace": namespace, "name": name, "annotations": annotations}})
+
+
+def whereabouts(network, cidr, start, end, gateway=None):
+    ipam = {"type": "whereabouts", "range": cidr, "range_start": start, "range_end": end}
+    if gateway:
+        ipam["gateway"] = gateway
+    return nad(network, ipam)
+
+
+N3 = whereabouts("n3-net", "10.203.0.0/24", "10.203.0.100", "10.203.0.199", "10.203.0.1")
+
+
+def kinds(report):
+    return [(f.kind, f.ip) for f in report.findings]
+
+
+def test_parse_pool_bounds_and_excludes():
+    pool = parse_pool(nad("n2-net", {"type": "whereabouts", "range": "10.202.0.0/24",
+                                     "exclude": ["10.202.0.128/30"], "gateway": "10.202.0.1"}))
+    assert pool.describe() == "10.202.0.1-10.202.0.254"
+    assert pool.size == 254 - 4 - 1
+    assert parse_pool(nad("static-net", {"type": "static"})) is None
+    assert parse_pool(nad("static-net", {"type": "static"}), "10.206.0.0/24").describe() == "10.206.0.1-10.206.0.254"
+
+
+def test_clean_cluster_has_no_findings():
+    report = analyze([N3], [pod("upf-1", {"n3": ("5g/n3-net", "10.203.0.101")}),
+                            pod("gnb-1", {"n3": ("5g/n3-net", "10.203.0.102")})])
+    assert report.ok and report.findings == []
+    assert report.usage == {"5g/n3-net": 2}
+
+
+def test_duplicate_address_on_two_pods():
+    report = analyze([N3], [pod("upf-1", {"n3": ("5g/n3-net", "10.203.0.101")}),
+                            pod("gnb-1", {"n3": ("5g/n3-net", "10.203.0.101")})])
+    assert kinds(report) == [(DUPLICATE, "10.203.0.101")]
+    assert report.findings[0].pods == ("5g/gnb-1:n3", "5g/upf-1:n3")
+    assert not report.ok
+
+
+def test_out_of_range_subnet_pool_and_gateway():
+    report = analyze([N3], [
+        pod("a", {"n3": ("5g/n3-net", "10.203.1.7")}),
+        pod("b", {"n3": ("5g/n3-net", "10.203.0.20")}),
+        pod("c", {"n3": ("5g/n3-net", "10.203.0.1")}),
+    ])
+    assert sorted(kinds(report)) == [(OUT_OF_RANGE, "10.203.0.1"), (OUT_OF_RANGE, "10.203.0.20"),
+                                     (OUT_OF_RANGE, "10.203.1.7")]
+
+
+def test_pinned_address_below_the_pool_is_fine():
+    report = analyze([N3], [pod("amf", {"n3": ("5g/n3-net", "10.203.0.20")}, pinned=("10.203.0.20",))])
+    assert report.findings == []
+
+
+def test_overlapping_pools():
+    wide = whereabouts("n3-cell2-net", "10.203.0.0/24", "10.203.0.150", "10.203.0.250")
+    other = whereabouts("n2-net", "10.202.0.0/24", "10.202.0.100", "10.202.0.199")
+    report = analyze([N3, wide, other], [])
+    assert [(f.kind, f.network) for f in report.findings] == [(OVERLAP, "5g/n3-cell2-net")]
+
+
+def test_exhausted_pool_and_stale_leases():
+    small = whereabouts("n4-net", "10.204.0.0/24", "10.204.0.10", "10.204.0.11")
+    pods = [pod("smf", {"n4": ("5g/n4-net", "10.204.0.10")})]
+    ip_pools = [{"metadata": {"name": "10.204.0.0-24"},
+                 "spec": {"range": "10.204.0.0/24", "allocations": {
+                     "10": {"podref": "5g/smf"},
+                     "11": {"podref": "5g/smf-old"},
+                     "12": {"podref": "5g/smf"},
+                 }}}]
+    report = analyze([small], pods, ip_pools)
+    assert report.leases == 3
+    assert sorted(kinds(report)) == [(EXHAUSTED, ""), (STALE, "10.204.0.11"), (STALE, "10.204.0.12")]
+    assert report.ok  # warnings only
+
+
+def test_attachment_without_a_namespace_finds_its_pool():
+    report = analyze([N3], [pod("upf-1", {"n3": ("n3-net", "10.203.0.30")})])
+    assert kinds(report) == [(OUT_OF_RANGE, "10.203.0.30")]
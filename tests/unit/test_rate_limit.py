@@ -0,0 +1,69 @@
+"""
+Deadline-capped waits in utils/rate_limit.py and the write bucket
+
+Usage:
+    python -m pytest -q unit
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import threading
+import time
+
+import pytest
+
+from utils.deadline import deadline
+from utils.fake_cluster import FakeK8sClient
+from utils.k8s_client import DeadlineExceeded, _limited
+from utils.rate_limit import RateLimiter
+
+
+def test_bucket_wait_stops_at_the_deadline():
+    limiter = RateLimiter({"list": (1, 1)})
+    with limiter.request("list") as granted:
+        assert granted
+    started = time.monotonic()
+    with deadline(0.2):
+        with pytest.raises(DeadlineExceeded):
+            with _limited(limiter, "list", "list pods"):
+                pass
+    assert time.monotonic() - started < 0.5
+
+
+def test_inflight_wait_stops_at_the_deadline():
+    limiter = RateLimiter(max_inflight=1)
+    held, release = threading.Event(), threading.Event()
+
+    def hold():
+        with limiter.request("list"):
+            held.set()
+            release.wait()
+
+    t = threading.Thread(target=hold)
+    t.start()
+    held.wait()
+    try:
+        with deadline(0.2):
+            with limiter.request("list") as granted:
+                assert not granted
+    finally:
+        release.set()
+        t.join()
+
+
+def test_request_timeout_is_what_is_left_after_the_wait():
+    limiter = RateLimiter({"list": (5, 1)})
+    with limiter.request("list"):
+        pass
+    with deadline(2.0):
+        with _limited(limiter, "list", "list pods") as request:
+            assert request["_request_timeout"] < 1.85
+
+
+def test_writes_are_charged_to_their_own_bucket():
+    kubectl = FakeK8sClient()
+    pod = kubectl.get_pods("5g")[0]
+    kubectl.delete_pod(pod["metadata"]["name"], "5g")
+    stats = kubectl.limiter.stats()
+    assert stats["write"]["calls"] == 1
@@ -0,0 +1,155 @@
+"""
+Lock ordering and nesting (utils/locks.py), budgets and abandoned tests
+(utils/scheduler.py)
+
+Usage:
+    python -m pytest -q unit
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import threading
+import time
+
+import pytest
+
+from utils import deadline, scheduler, test_helpers
+from utils.locks import LockManager, covers
+
+
+def make_scheduler(**kwargs):
+    return scheduler.TestScheduler(test_helpers.TestLogger(False), locks=LockManager(), **kwargs)
+
+
+def spec(name, func=lambda: True, **kwargs):
+    return scheduler.TestSpec(name, func, **kwargs)
+
+
+def test_queued_writer_is_not_starved_by_later_readers():
+    locks = LockManager()
+    order = []
+    first_in, release_first = threading.Event(), threading.Event()
+
+    def take(owner, event=None, **kwargs):
+        with locks.hold(owner, **kwargs):
+            order.append(owner)
+            if event is not None:
+                event.set()
+                release_first.wait()
+
+    def queued(n):
+        deadline_at = time.monotonic() + 2
+        while len(locks._queue) < n and time.monotonic() < deadline_at:
+            time.sleep(0.005)
+
+    threads = [threading.Thread(target=take, args=("reader-1", first_in), kwargs={"reads": ("ns:5g",)})]
+    threads[0].start()
+    first_in.wait()
+    threads.append(threading.Thread(target=take, args=("writer",), kwargs={"reads": (), "writes": ("ns:5g",)}))
+    threads[1].start()
+    queued(1)
+    threads.append(threading.Thread(target=take, args=("reader-2",), kwargs={"reads": ("ns:5g",)}))
+    threads[2].start()
+    queued(2)
+    release_first.set()
+    for t in threads:
+        t.join(2)
+    assert order == ["reader-1", "writer", "reader-2"]
+
+
+def test_nested_hold_inside_the_grant_reuses_it():
+    locks = LockManager()
+    with locks.hold("outer", reads=("ns:5g",), writes=("node:worker",)) as outer:
+        with locks.hold("inner", reads=("ns:5g", "node:worker"), writes=("node:worker",)) as inner:
+            assert inner is outer
+    assert locks.held() == []
+
+
+def test_nested_hold_outside_the_grant_raises():
+    locks = LockManager()
+    with locks.hold("outer", reads=("ns:5g",)):
+        with pytest.raises(RuntimeError, match="hold-and-wait"):
+            with locks.hold("inner", reads=("ns:5g",), writes=("ns:5g",)):
+                pass
+        with pytest.raises(RuntimeError):
+            with locks.hold("inner", reads=("dataplane",)):
+                pass
+
+
+def test_covers():
+    assert covers(("*",), ("ns:5g", "dataplane"))
+    assert covers(("ns:5g", "dataplane"), ("ns:5g",))
+    assert covers(("ns:5g",), ())
+    assert not covers(("ns:5g",), ("*",))
+    assert not covers(("ns:5g",), ("node:worker",))
+
+
+def test_test_budget_is_capped_by_the_suite_deadline():
+    budgets = {}
+
+    def record(name):
+        def run():
+            budgets[name] = deadline.current().budget
+            return True
+        return run
+
+    sched = make_scheduler(workers=1, suite_timeout=5, test_timeout=60)
+    results = sched.run([
+        spec("default", record("default")),
+        spec("own", record("own"), timeout=2),
+        spec("long", record("long"), timeout=600),
+    ])
+    assert [r.status for r in results] == [scheduler.PASSED] * 3
+    assert budgets["own"] == pytest.approx(2, abs=0.01)
+    assert 4 < budgets["default"] <= 5
+    assert 4 < budgets["long"] <= 5
+    assert all(r.budget == pytest.approx(budgets[r.name], abs=0.01) for r in results)
+
+
+def test_no_suite_timeout_uses_the_test_timeout():
+    seen = []
+    sched = make_scheduler(test_timeout=7)
+    sched.run([spec("a", lambda: seen.append(deadline.current().budget) or True)])
+    assert seen == [pytest.approx(7, abs=0.01)]
+
+
+def test_abandoned_test_gives_back_its_locks():
+    stuck = threading.Event()
+    sched = make_scheduler(workers=2)
+    sched.ABANDON_GRACE = 0.1
+
+    def ignores_deadline():
+        stuck.wait(5)
+        return True
+
+    started = time.monotonic()
+    results = sched.run([
+        spec("stuck", ignores_deadline, reads=(), writes=("ns:5g",), timeout=0.1),
+        spec("next", reads=(), writes=("ns:5g",), after=("stuck",)),
+    ])
+    stuck.set()
+    assert time.monotonic() - started < 4
+    assert results[0].status == scheduler.TIMEOUT
+    assert "abandoned" in results[0].reason
+    assert results[1].status == scheduler.SKIPPED
+    assert sched.locks.held() == []
+    assert "stuck" in scheduler.abandoned()
+
+
+def test_abandon_after_the_test_finished_is_a_no_op():
+    sched = make_scheduler()
+    with deadline.deadline(1, "t") as dl, sched.locks.hold("t") as grant:
+        sched._live["t"] = (dl, grant, None)
+        assert sched._take_live("t") is not None
+        assert sched._abandon(spec("t"), time.monotonic()) is None
+
+
+def test_finish_and_abandon_racing_report_the_test_once():
+    for _ in range(20):
+        sched = make_scheduler(workers=4)
+        sched.ABANDON_GRACE = 0.0
+        results = sched.run([spec(f"t{i}", lambda: time.sleep(0.02) or True, timeout=0.01) for i in range(4)])
+        assert len(results) == 4
+        assert all(r.status in (scheduler.PASSED, scheduler.TIMEOUT) for r in results)
+        assert sched.locks.held() == []
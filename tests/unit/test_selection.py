@@ -0,0 +1,102 @@
+"""
+Fingerprints and their invalidation in utils/selection.py (--changed-only)
+
+Usage:
+    python -m pytest -q unit
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import scheduler, test_helpers
+from utils.fake_cluster import FakeK8sClient
+from utils.locks import LockManager
+from utils.selection import ChangeSelector
+
+
+def check_amf():
+    return True
+
+
+class CountingClient:
+    """The selector's client factory, counting how often the state is read."""
+
+    def __init__(self):
+        self.k8s = FakeK8sClient()
+        self.reads = 0
+
+    def __call__(self):
+        self.reads += 1
+        return self.k8s
+
+
+def amf_pod(k8s):
+    return next(p for p in k8s.list_pods(namespace="5g") if p.name.startswith("amf"))
+
+
+def test_fingerprint_is_stable_and_digests_are_shared():
+    client = CountingClient()
+    selector = ChangeSelector(client, {})
+    spec = scheduler.TestSpec("amf", check_amf, inputs=("component:amf", "nodes"))
+    first = selector.fingerprint("e2e", spec)
+    reads = client.reads
+    assert selector.fingerprint("e2e", spec) == first
+    assert client.reads == reads
+    assert selector.fingerprint("e2e", scheduler.TestSpec("amf2", check_amf, inputs=spec.inputs)) != first
+
+
+def test_writers_and_tests_without_inputs_always_run():
+    selector = ChangeSelector(CountingClient(), {})
+    assert selector.fingerprint("e2e", scheduler.TestSpec("any", check_amf)) is None
+    writer = scheduler.TestSpec("chaos", check_amf, inputs=("ns:5g",), writes=("ns:5g",))
+    assert selector.fingerprint("resilience", writer) is None
+
+
+def test_changed_state_is_seen_only_after_invalidate():
+    client = CountingClient()
+    selector = ChangeSelector(client, {})
+    spec = scheduler.TestSpec("amf", check_amf, inputs=("component:amf",))
+    before = selector.fingerprint("e2e", spec)
+    client.k8s.delete_pod(amf_pod(client.k8s).name, "5g")
+    assert selector.fingerprint("e2e", spec) == before
+    selector.invalidate()
+    assert selector.fingerprint("e2e", spec) != before
+
+
+def test_passed_with_needs_a_pass_on_the_same_fingerprint():
+    verdicts = {("e2e", "amf"): {"status": "passed", "inputs": "abc", "run_id": 7},
+                ("e2e", "smf"): {"status": "failed", "inputs": "abc", "run_id": 7}}
+    selector = ChangeSelector(CountingClient(), verdicts)
+    assert selector.passed_with("e2e", "amf", "abc") == 7
+    assert selector.passed_with("e2e", "amf", "def") is None
+    assert selector.passed_with("e2e", "smf", "abc") is None
+    assert selector.passed_with("e2e", "upf", "abc") is None
+
+
+def test_a_writing_test_invalidates_the_fingerprints_of_later_tests():
+    client = CountingClient()
+    selector = ChangeSelector(client, {})
+    spec = scheduler.TestSpec("amf", check_amf, inputs=("component:amf",))
+    before = selector.fingerprint("e2e", spec)
+    selector.verdicts = {("e2e", "amf"): {"status": "passed", "inputs": before, "run_id": 1}}
+
+    def restart_amf():
+        client.k8s.delete_pod(amf_pod(client.k8s).name, "5g")
+        return True
+
+    sched = scheduler.TestScheduler(test_helpers.TestLogger(False), suite="e2e", locks=LockManager())
+    with scheduler.use_selector(selector):
+        results = sched.run([
+            scheduler.TestSpec("restart", restart_amf, reads=(), writes=("ns:5g",)),
+            scheduler.TestSpec("amf", check_amf, after=("restart",), inputs=("component:amf",)),
+        ])
+    assert [r.status for r in results] == [scheduler.PASSED, scheduler.PASSED]
+    assert results[1].inputs != before
+
+    with scheduler.use_selector(selector):
+        again = sched.run([scheduler.TestSpec("amf", check_amf, inputs=("component:amf",))])
+    assert again[0].status == scheduler.PASSED
+    selector.verdicts = {("e2e", "amf"): {"status": "passed", "inputs": again[0].inputs, "run_id": 2}}
+    with scheduler.use_selector(selector):
+        skipped = sched.run([scheduler.TestSpec("amf", check_amf, inputs=("component:amf",))])
+    assert skipped[0].status == scheduler.UNCHANGED
@@ -0,0 +1,223 @@
+# utils/addresses.py
+"""
+Pod address index built from pod status and the Multus
+k8s.v1.cni.cncf.io/network-status annotation (the data the endpoints_sync
+role's sync_endpoints.py reads), so address checks need no exec.
+
+PodAddresses is one pod's view: status.podIPs plus one Attachment per
+network-status entry (interface, network, IPs, MAC). K8sClient.address_index()
+converts pods with pod_addresses() through the pod informer, which memoizes
+the conversion per resourceVersion. The AddressIndex it returns is updated
+in place, and only pods whose resourceVersion changed are re-indexed:
+
+    index = k8s.address_index("5g")
+    index.ips("5g", "amf-7d9c", "n2")     # ("10.202.0.100",)
+    index.owner("10.203.0.101")           # (PodAddresses(5g/upf-cloud-...), "n3")
+    index.duplicates()                    # {ip: [(pod, interface), ...]} audit
+
+The "eth0" interface always resolves to the pod IPs, even without the
+annotation. That is the address `hostname -i` prints. hostNetwork pods
+keep their (node) IPs out of the IP -> pod map.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+import json
+import threading
+
+NETWORK_STATUS = "k8s.v1.cni.cncf.io/network-status"
+NETWORKS = "k8s.v1.cni.cncf.io/networks"
+DEFAULT_INTERFACE = "eth0"
+
+
+@dataclass(frozen=True)
+class Attachment:
+    """One network-status entry: a pod interface and the network it is attached to."""
+    interface: str
+    network: str                 # "<ns>/<nad>" for Multus attachments, the CNI name for the default
+    ips: Tuple[str, ...]
+    mac: str = ""
+    default: bool = False
+
+
+class PodAddresses:
+    """Addresses of one pod, from raw API JSON (see pod_addresses)."""
+
+    __slots__ = ("namespace", "name", "uid", "resource_version", "node", "host_network", "pod_ips",
+                 "attachments", "annotated", "pinned")
+
+    def __init__(self, raw: Dict[str, Any]):
+        meta = raw.get("metadata") or {}
+        status = raw.get("status") or {}
+        set_ = object.__setattr__
+        set_(self, "namespace", meta.get("namespace", ""))
+        set_(self, "name", meta.get("name", ""))
+        set_(self, "uid", meta.get("uid", ""))
+        set_(self, "resource_version", meta.get("resourceVersion", ""))
+        spec = raw.get("spec") or {}
+        set_(self, "node", spec.get("nodeName", ""))
+        set_(self, "host_network", bool(spec.get("hostNetwork")))
+        pod_ips = tuple(p.get("ip", "") for p in status.get("podIPs") or () if p.get("ip"))
+        set_(self, "pod_ips", pod_ips or ((status["podIP"],) if status.get("podIP") else ()))
+        annotations = meta.get("annotations") or {}
+        text = annotations.get(NETWORK_STATUS)
+        set_(self, "annotated", text is not None)
+        set_(self, "attachments", _parse_network_status(text))
+        # Addresses the pod asks for itself ("ips" in its networks annotation), not from the IPAM pool
+        set_(self, "pinned", _parse_pinned(annotations.get(NETWORKS)))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("PodAddresses is read-only")
+
+    def __repr__(self) -> str:
+        return f"PodAddresses({self.namespace}/{self.name})"
+
+    @property
+    def pod_ip(self) -> str:
+        return self.pod_ips[0] if self.pod_ips else ""
+
+    def interfaces(self) -> Dict[str, Tuple[str, ...]]:
+        """Interface -> IPs; eth0 is always present (the pod IPs)."""
+        out = {a.interface: a.ips for a in self.attachments if a.interface}
+        out[DEFAULT_INTERFACE] = self.pod_ips
+        return out
+
+    def ips(self, interface: Optional[str] = None) -> Tuple[str, ...]:
+        """IPs of `interface` (None or "eth0": the pod IPs); () if the pod has no such interface."""
+        if interface is None or interface == DEFAULT_INTERFACE:
+            return self.pod_ips
+        for a in self.attachments:
+            if a.interface == interface:
+                return a.ips
+        return ()
+
+    def describe(self, interface: Optional[str] = None) -> str:
+        """One line per interface (or just `interface`), for debug output."""
+        rows = [
+            f"{name}: {', '.join(ips) or 'no addresses'}"
+            + next((f" ({a.network})" for a in self.attachments if a.interface == name and a.network), "")
+            for name, ips in sorted(self.interfaces().items())
+            if interface is None or name == interface
+        ]
+        if not rows:
+            rows = [f"{interface}: not in {NETWORK_STATUS} (interfaces: {', '.join(sorted(self.interfaces()))})"]
+        return "\n".join(rows)
+
+
+def _parse_network_status(text: Optional[str]) -> Tuple[Attachment, ...]:
+    try:
+        entries = json.loads(text) if text else []
+    except ValueError:
+        return ()
+    if not isinstance(entries, list):
+        return ()
+    return tuple(
+        Attachment(
+            interface=e.get("interface") or "",
+            network=e.get("name") or "",
+            ips=tuple(str(ip).split("/")[0] for ip in e.get("ips") or ()),
+            mac=e.get("mac") or "",
+            default=bool(e.get("default")),
+        )
+        for e in entries if isinstance(e, dict)
+    )
+
+
+def _parse_pinned(text: Optional[str]) -> FrozenSet[str]:
+    # The short "nad1,nad2@eth1" form cannot carry ips; only the JSON list can
+    try:
+        entries = json.loads(text) if text and text.lstrip().startswith("[") else []
+    except ValueError:
+        return frozenset()
+    if not isinstance(entries, list):
+        return frozenset()
+    return frozenset(
+        str(ip).split("/")[0] for e in entries if isinstance(e, dict) for ip in e.get("ips") or ()
+    )
+
+
+def pod_addresses(raw: Dict[str, Any]) -> PodAddresses:
+    """Informer conversion (one stable callable, so results are memoized per resourceVersion)."""
+    return PodAddresses(raw)
+
+
+class AddressIndex:
+    """
+    pod -> interface -> IPs and IP -> (pod, interface) over a set of pods.
+    update() takes the current pods and re-indexes only the ones that changed.
+    Thread-safe.
+    """
+
+    def __init__(self, pods: Iterable[PodAddresses] = ()):
+        self._pods: Dict[Tuple[str, str], PodAddresses] = {}
+        self._by_ip: Dict[str, List[Tuple[PodAddresses, str]]] = {}
+        self._lock = threading.Lock()
+        self.update(pods)
+
+    def update(self, pods: Iterable[PodAddresses]) -> "AddressIndex":
+        current = {(p.namespace, p.name): p for p in pods}
+        with self._lock:
+            for key in [k for k in self._pods if k not in current]:
+                self._unindex(self._pods.pop(key))
+            for key, pod in current.items():
+                old = self._pods.get(key)
+                if old is pod or (old is not None and old.resource_version == pod.resource_version
+                                  and old.uid == pod.uid):
+                    continue
+                if old is not None:
+                    self._unindex(old)
+                self._pods[key] = pod
+                for interface, ips in self._owned(pod):
+                    for ip in ips:
+                        self._by_ip.setdefault(ip, []).append((pod, interface))
+        return self
+
+    @staticmethod
+    def _owned(pod: PodAddresses) -> List[Tuple[str, Tuple[str, ...]]]:
+        # hostNetwork pods share their node's IP; it belongs to no pod
+        return [(i, ips) for i, ips in pod.interfaces().items()
+                if not (pod.host_network and i == DEFAULT_INTERFACE)]
+
+    def _unindex(self, pod: PodAddresses) -> None:
+        for _, ips in self._owned(pod):
+            for ip in ips:
+                owners = [o for o in self._by_ip.get(ip, ()) if o[0] is not pod]
+                if owners:
+                    self._by_ip[ip] = owners
+                else:
+                    self._by_ip.pop(ip, None)
+
+    def __len__(self) -> int:
+        return len(self._pods)
+
+    def pod(self, namespace: str, name: str) -> Optional[PodAddresses]:
+        return self._pods.get((namespace, name))
+
+    def pods(self) -> List[PodAddresses]:
+        with self._lock:
+            return list(self._pods.values())
+
+    def ips(self, namespace: str, name: str, interface: Optional[str] = None) -> Tuple[str, ...]:
+        pod = self._pods.get((namespace, name))
+        return pod.ips(interface) if pod is not None else ()
+
+    def owner(self, ip: str) -> Optional[Tuple[PodAddresses, str]]:
+        """(pod, interface) holding `ip` (the first one if it is duplicated), or None."""
+        owners = self._by_ip.get(ip.split("/")[0])
+        return owners[0] if owners else None
+
+    def owners(self, ip: str) -> List[Tuple[PodAddresses, str]]:
+        return list(self._by_ip.get(ip.split("/")[0], ()))
+
+    def addresses(self) -> Dict[str, List[Tuple[PodAddresses, str]]]:
+        """Every indexed IP -> its (pod, interface) holders."""
+        with self._lock:
+            return {ip: list(owners) for ip, owners in self._by_ip.items()}
+
+    def duplicates(self) -> Dict[str, List[Tuple[PodAddresses, str]]]:
+        """IPs held by more than one pod."""
+        with self._lock:
+            return {
+                ip: list(owners) for ip, owners in self._by_ip.items()
+                if len({(p.namespace, p.name) for p, _ in owners}) > 1
+            }
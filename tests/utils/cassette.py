@@ -0,0 +1,168 @@
+# utils/cassette.py
+"""
+Record/replay cassettes for K8sClient.
+
+In record mode the client saves every list, get, log, event, exec, mutation,
+wait and kubectl result. In replay mode it serves them back with no cluster,
+no network and no real sleeps, so a suite can be re-run offline in seconds.
+
+On disk a cassette is one gzip-compressed JSON document:
+    {"version": 1,
+     "blobs": {sha256: response, ...},        # content-addressed, deduplicated
+     "calls": {key: [sha256, ...], ...}}      # responses per call key, in call order
+A key is the JSON-encoded call signature, e.g. ["exec", "5g", "amf-0", null, ["hostname"]].
+Replay pops a key's responses in recorded order. After the last one it keeps
+returning that one, so extra polling iterations still see the final state.
+
+Per-key order and the one process-wide VirtualClock only hold for one test at
+a time. While a cassette is open in a process (in_use()), TestScheduler runs
+tests serially, and run_tests.py refuses --parallel with --record/--replay.
+"""
+from __future__ import annotations
+from typing import Any, Callable, Dict, List, Optional
+import atexit
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+
+RECORD = "record"
+REPLAY = "replay"
+
+_open: List["Cassette"] = []  # opened and not yet closed
+
+
+def in_use() -> bool:
+    """True while a cassette is open in this process."""
+    return bool(_open)
+
+
+class CassetteMiss(LookupError):
+    """Replay asked for a call that the cassette never recorded."""
+
+
+class VirtualClock:
+    """
+    Replaces time.sleep/time.time/time.monotonic while replaying: sleep()
+    returns immediately and moves the clock forward instead, so deadline
+    loops in the suites still terminate and durations stay plausible.
+    Only affects code that looks the functions up on the time module.
+    """
+
+    def __init__(self):
+        self.offset = 0.0
+        self._lock = threading.Lock()
+        self._saved: Optional[Dict[str, Callable]] = None
+
+    def sleep(self, seconds: float) -> None:
+        if seconds > 0:
+            with self._lock:
+                self.offset += seconds
+
+    def install(self) -> None:
+        if self._saved is not None:
+            return
+        self._saved = {name: getattr(time, name) for name in ("sleep", "time", "monotonic")}
+        real_time, real_monotonic = self._saved["time"], self._saved["monotonic"]
+        time.sleep = self.sleep
+        time.time = lambda: real_time() + self.offset
+        time.monotonic = lambda: real_monotonic() + self.offset
+
+    def uninstall(self) -> None:
+        if self._saved is not None:
+            for name, func in self._saved.items():
+                setattr(time, name, func)
+            self._saved = None
+
+
+class Cassette:
+    """One recorded session; mode is RECORD or REPLAY."""
+
+    VERSION = 1
+
+    def __init__(self, path: str, mode: str):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"cassette mode must be '{RECORD}' or '{REPLAY}', not '{mode}'")
+        self.path = path
+        self.mode = mode
+        self.clock = VirtualClock()
+        self._blobs: Dict[str, Any] = {}
+        self._calls: Dict[str, List[str]] = {}
+        self._cursor: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        _open.append(self)
+        if mode == REPLAY:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                doc = json.load(f)
+            if doc.get("version") != self.VERSION:
+                raise ValueError(f"{path}: unsupported cassette version {doc.get('version')}")
+            self._blobs, self._calls = doc["blobs"], doc["calls"]
+        else:
+            atexit.register(self.save)
+
+    @classmethod
+    def from_env(cls) -> Optional["Cassette"]:
+        """Cassette from $K8S_CASSETTE and $K8S_CASSETTE_MODE (default replay), if set."""
+        path = os.environ.get("K8S_CASSETTE")
+        if not path:
+            return None
+        return cls(path, os.environ.get("K8S_CASSETTE_MODE", REPLAY))
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == REPLAY
+
+    @staticmethod
+    def _key(parts: tuple) -> str:
+        return json.dumps(list(parts), default=str, separators=(",", ":"))
+
+    def record(self, key: tuple, response: Any) -> Any:
+        """Store one response under key; returns it unchanged."""
+        # default=str: swagger to_dict() output carries datetimes
+        data = json.dumps(response, default=str, sort_keys=True, separators=(",", ":"))
+        digest = hashlib.sha256(data.encode("utf-8")).hexdigest()
+        with self._lock:
+            if digest not in self._blobs:
+                self._blobs[digest] = json.loads(data)
+            self._calls.setdefault(self._key(key), []).append(digest)
+        return response
+
+    def replay(self, key: tuple) -> Any:
+        """Next recorded response for key; raises CassetteMiss if there is none."""
+        k = self._key(key)
+        with self._lock:
+            digests = self._calls.get(k)
+            if not digests:
+                raise CassetteMiss(f"not in cassette {self.path}: {k}")
+            i = self._cursor.get(k, 0)
+            self._cursor[k] = i + 1
+            return self._blobs[digests[min(i, len(digests) - 1)]]
+
+    def save(self) -> None:
+        """Write a recording (atomically); a no-op in replay mode."""
+        if self.mode != RECORD:
+            return
+        with self._lock:
+            doc = {"version": self.VERSION, "blobs": self._blobs, "calls": self._calls}
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp = f"{self.path}.tmp"
+            with gzip.open(tmp, "wt", encoding="utf-8") as f:
+                json.dump(doc, f, separators=(",", ":"))
+            os.replace(tmp, self.path)
+
+    def close(self) -> None:
+        """save(), restore the real clock and stop counting as in use."""
+        self.save()
+        self.clock.uninstall()
+        if self in _open:
+            _open.remove(self)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "keys": len(self._calls),
+                "calls": sum(len(v) for v in self._calls.values()),
+                "blobs": len(self._blobs),
+            }
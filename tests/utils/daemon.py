@@ -0,0 +1,397 @@
+# utils/daemon.py
+"""
+Resident harness daemon: one long-lived process that keeps the K8sClient
+(informer caches, watches, exec session pools) warm between test runs.
+
+    python3 run_tests.py --serve          # start it (interactive_cli.py starts one in the background)
+    python3 run_tests.py -s e2e           # handed to the daemon while it is up
+    python3 run_tests.py --stop-daemon
+
+Protocol: newline-delimited JSON over a Unix socket (tests/.harness.sock,
+$HARNESS_SOCKET overrides). The client sends one request per connection:
+
+    {"op": "run", "argv": [...]}   ->  {"out": "..."}*, then {"exit": code}
+    {"op": "ping"}                 ->  {"pid": ..., "uptime": ..., "runs": ..., "busy": ...}
+    {"op": "stop"}                 ->  {"stopped": true}
+
+Everything a run prints (TestLogger, summaries, tracebacks) goes back to the
+client that submitted it. The target lives in a context variable, so output
+from scheduler, suite and exec_many threads follows it too. Runs are
+serialised: a second client waits for the first.
+
+Some runs need a fresh process and are never sent to the daemon: --isolate,
+--record/--replay, --cold-start, --no-daemon and --list. Edited suite modules
+are reloaded before a run. If utils/ or run_tests.py changed since the daemon
+started, it answers {"stale": true} and exits, and the client runs the tests
+itself. A rewritten kubeconfig makes the daemon build a new client.
+
+The top level of this module is stdlib-only: run_tests.py imports it before
+the venv exists.
+"""
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+import contextvars
+import importlib
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+import traceback
+
+TESTS_DIR = Path(__file__).resolve().parent.parent
+# Flags that need their own process (or make no sense on a shared client)
+BYPASS = ("--serve", "--stop-daemon", "--no-daemon", "--isolate", "--record", "--replay",
+          "--cold-start", "--list", "-h", "--help")
+# Top-level packages holding suites; reloaded when their source changes
+SUITE_PACKAGES = ("core", "protocols", "performance", "resilience", "ran")
+
+
+# ---------- Client ----------
+
+def eligible(argv: List[str]) -> bool:
+    """True if this command line can run on a daemon."""
+    if not hasattr(socket, "AF_UNIX"):
+        return False
+    return not any(arg.split("=", 1)[0] in BYPASS for arg in argv)
+
+
+def _connect(path: Path, timeout: float = 0.5) -> Optional[socket.socket]:
+    if not hasattr(socket, "AF_UNIX") or not Path(path).exists():
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        sock.close()  # stale socket file from a daemon that died
+        return None
+    sock.settimeout(None)
+    return sock
+
+
+def _send(sock: socket.socket, message: Dict[str, Any]) -> None:
+    sock.sendall((json.dumps(message) + "\n").encode("utf-8"))
+
+
+def _frames(sock: socket.socket) -> Iterator[Dict[str, Any]]:
+    with sock.makefile("r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def _ask(path: Path, message: Dict[str, Any], timeout: float = 2.0) -> Optional[Dict[str, Any]]:
+    sock = _connect(path)
+    if sock is None:
+        return None
+    with sock:
+        sock.settimeout(timeout)
+        try:
+            _send(sock, message)
+            return next(_frames(sock), None)
+        except OSError:
+            return None
+
+
+def ping(path: Path) -> Optional[Dict[str, Any]]:
+    """Daemon status (pid, uptime, runs, busy), or None if none is listening."""
+    return _ask(path, {"op": "ping"})
+
+
+def stop(path: Path) -> bool:
+    return bool((_ask(path, {"op": "stop"}) or {}).get("stopped"))
+
+
+def submit(path: Path, argv: List[str], out=None) -> Optional[int]:
+    """
+    Run `argv` (run_tests.py arguments) on the daemon, streaming its output
+    to `out` (default stdout). Returns the run's exit code, or None when no
+    daemon took the run and the caller should run it itself.
+    """
+    out = out or sys.stdout
+    sock = _connect(path)
+    if sock is None:
+        return None
+    started = False
+    with sock:
+        try:
+            _send(sock, {"op": "run", "argv": list(argv)})
+            for frame in _frames(sock):
+                if "out" in frame:
+                    started = True
+                    out.write(frame["out"])
+                    out.flush()
+                elif "exit" in frame:
+                    return int(frame["exit"])
+                elif frame.get("stale"):
+                    out.write("♻️  Harness code changed since the daemon started; it exited, running locally\n")
+                    return None
+        except KeyboardInterrupt:
+            return 130
+        except OSError:
+            pass
+    if not started:
+        return None
+    out.write("⚠️  Harness daemon closed the connection mid-run\n")
+    return 1
+
+
+def start_background(path: Path, log_path: Path, timeout: float = 120.0) -> bool:
+    """
+    Start `run_tests.py --serve` detached from this terminal (output to
+    log_path) and wait until it answers. It goes through the normal
+    bootstrap, so the first start can take as long as a cold run.
+    """
+    if ping(path):
+        return True
+    if not hasattr(socket, "AF_UNIX"):
+        return False
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    env = dict(os.environ, HARNESS_SOCKET=str(path))
+    with open(log_path, "a", encoding="utf-8") as log:
+        proc = subprocess.Popen(
+            [sys.executable, str(TESTS_DIR / "run_tests.py"), "--serve"],
+            cwd=str(TESTS_DIR), stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT,
+            env=env, start_new_session=True,
+        )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if ping(path):
+            return True
+        if proc.poll() is not None:
+            return False
+        time.sleep(0.2)
+    return False
+
+
+# ---------- Server ----------
+
+_SINK: contextvars.ContextVar[Optional["_Sink"]] = contextvars.ContextVar("harness_sink", default=None)
+
+
+class _Sink:
+    """Output of one run, sent to its client as {"out": ...} frames, a line at a time."""
+
+    def __init__(self, wfile):
+        self._wfile = wfile
+        self._lock = threading.Lock()
+        self._buf: List[str] = []
+        self.connected = True
+
+    def write(self, text: str) -> int:
+        with self._lock:
+            self._buf.append(text)
+            if "\n" in text:
+                self._flush()
+        return len(text)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def send(self, frame: Dict[str, Any]) -> None:
+        with self._lock:
+            self._flush()
+            self._send(frame)
+
+    def _flush(self) -> None:
+        if self._buf:
+            text = "".join(self._buf)
+            self._buf.clear()
+            self._send({"out": text})
+
+    def _send(self, frame: Dict[str, Any]) -> None:
+        if not self.connected:
+            return
+        try:
+            self._wfile.write((json.dumps(frame) + "\n").encode("utf-8"))
+            self._wfile.flush()
+        except OSError:
+            self.connected = False  # client went away; the run finishes anyway
+
+
+class _Router:
+    """Stands in for sys.stdout/sys.stderr: writes go to the current run's client, else the daemon log."""
+
+    def __init__(self, fallback):
+        self._fallback = fallback
+
+    def write(self, text: str) -> int:
+        return (_SINK.get() or self._fallback).write(text)
+
+    def flush(self) -> None:
+        (_SINK.get() or self._fallback).flush()
+
+    def isatty(self) -> bool:
+        return False
+
+    def __getattr__(self, name):
+        return getattr(self._fallback, name)
+
+
+def _mtime(paths) -> float:
+    return max((p.stat().st_mtime for p in paths if p.exists()), default=0.0)
+
+
+def _harness_files() -> List[Path]:
+    return sorted((TESTS_DIR / "utils").glob("*.py")) + [TESTS_DIR / "run_tests.py"]
+
+
+class HarnessDaemon:
+    """Serves test runs on one warm K8sClient until stopped."""
+
+    def __init__(self, socket_path: Path):
+        self.socket_path = Path(socket_path)
+        self.started = time.time()
+        self.runs = 0
+        # run_tests.run_session() keeps its client here between runs
+        self.shared: Dict[str, Any] = {}
+        self._run_lock = threading.Lock()
+        self._code_mtime = _mtime(_harness_files())
+        self._kubeconfig_mtime = 0.0
+        self._suite_mtimes: Dict[str, float] = {}
+        self._server: Optional[socketserver.BaseServer] = None
+
+    def serve_forever(self) -> None:
+        if not hasattr(socket, "AF_UNIX"):
+            raise SystemExit("The harness daemon needs Unix domain sockets")
+        if ping(self.socket_path):
+            print(f"ℹ️  A harness daemon is already listening on {self.socket_path}")
+            return
+        if self.socket_path.exists():
+            self.socket_path.unlink()  # left behind by a daemon that died
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                try:
+                    request = json.loads(self.rfile.readline() or b"{}")
+                except ValueError:
+                    return
+                daemon._dispatch(request, _Sink(self.wfile))
+
+        sys.stdout, sys.stderr = _Router(sys.stdout), _Router(sys.stderr)
+        server = socketserver.ThreadingUnixStreamServer(str(self.socket_path), Handler)
+        server.daemon_threads = True
+        self._server = server
+        os.chmod(self.socket_path, 0o600)
+        print(f"🛰️  Harness daemon listening on {self.socket_path} (pid {os.getpid()})", flush=True)
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            if self.socket_path.exists():
+                self.socket_path.unlink()
+            self._close_client()
+            print("🛑 Harness daemon stopped", flush=True)
+
+    def _dispatch(self, request: Dict[str, Any], sink: _Sink) -> None:
+        op = request.get("op")
+        if op == "ping":
+            sink.send({"pid": os.getpid(), "uptime": time.time() - self.started, "runs": self.runs,
+                       "busy": self._run_lock.locked(), "warm": "client" in self.shared})
+        elif op == "stop":
+            sink.send({"stopped": True})
+            self._shutdown()
+        elif op == "run":
+            self._run(list(request.get("argv") or []), sink)
+
+    def _shutdown(self) -> None:
+        # shutdown() blocks until serve_forever returns, so not from a handler thread
+        threading.Thread(target=self._server.shutdown, daemon=True).start()
+
+    def _run(self, argv: List[str], sink: _Sink) -> None:
+        if _mtime(_harness_files()) > self._code_mtime:
+            sink.send({"stale": True})
+            print("♻️  Harness code changed since start; exiting", flush=True)
+            self._shutdown()
+            return
+        if not eligible(argv):
+            sink.send({"out": "❌ These options need their own process: run with --no-daemon\n"})
+            sink.send({"exit": 2})
+            return
+        if not self._run_lock.acquire(blocking=False):
+            sink.write("⏳ Waiting for the run in progress on the harness daemon...\n")
+            self._run_lock.acquire()
+        token = _SINK.set(sink)
+        try:
+            code = self._run_session(argv)
+        finally:
+            _SINK.reset(token)
+            self._run_lock.release()
+        sink.send({"exit": code})
+
+    def _run_session(self, argv: List[str]) -> int:
+        import run_tests  # the daemon's own copy runs as __main__
+
+        try:
+            args = run_tests.parse_args(argv)
+        except SystemExit as e:  # argparse error or --help
+            return e.code if isinstance(e.code, int) else 2
+        self._check_auth(run_tests)
+        self._refresh_client(run_tests.KUBECONFIG_PATH)
+        self._reload_suites()
+        warm = "client" in self.shared
+        start = time.monotonic()
+        try:
+            code = run_tests.run_session(args, shared=self.shared)
+        except Exception:
+            traceback.print_exc()
+            code = 1
+        self.runs += 1
+        self._note_suite_mtimes()
+        print(f"🛰️  Daemon run #{self.runs} took {time.monotonic() - start:.1f}s "
+              f"({'warm' if warm else 'new'} client, daemon up {(time.time() - self.started) / 60:.0f}m)")
+        return code
+
+    def _check_auth(self, run_tests) -> None:
+        """
+        Re-fetch the kubeconfig when the API server rejects it. A rebuilt
+        cluster keeps the same address but issues new credentials, so the
+        kubeconfig mtime alone never tells the warm client it is stale.
+        """
+        if run_tests.check_kubeconfig_auth() != "rejected":
+            return  # "unreachable" is for the run itself to report
+        print("🔑 Kubeconfig rejected by the API server; fetching a new one")
+        self._close_client()
+        run_tests.update_kubeconfig()
+
+    def _refresh_client(self, kubeconfig: Path) -> None:
+        """Drop the warm client if the kubeconfig was re-fetched since it was built."""
+        mtime = _mtime([kubeconfig])
+        if "client" in self.shared and mtime > self._kubeconfig_mtime:
+            print("🔑 Kubeconfig changed; building a new client")
+            self._close_client()
+        self._kubeconfig_mtime = mtime
+
+    def _close_client(self) -> None:
+        if "client" in self.shared:
+            self.shared.pop("client").close()
+        if "calls" in self.shared:
+            self.shared.pop("calls").close()
+
+    def _suite_modules(self):
+        for name, module in list(sys.modules.items()):
+            path = getattr(module, "__file__", None)
+            if path and name.split(".")[0] in SUITE_PACKAGES:
+                yield name, module, Path(path)
+
+    def _note_suite_mtimes(self) -> None:
+        for name, _, path in self._suite_modules():
+            self._suite_mtimes.setdefault(name, _mtime([path]))
+
+    def _reload_suites(self) -> None:
+        for name, module, path in self._suite_modules():
+            mtime = _mtime([path])
+            if mtime > self._suite_mtimes.get(name, mtime):
+                importlib.reload(module)
+                print(f"♻️  Reloaded {name}")
+            self._suite_mtimes[name] = mtime
@@ -0,0 +1,101 @@
+# utils/deadline.py
+"""
+Deadlines that follow a test into every K8sClient call it makes.
+
+TestScheduler opens one Deadline per test, capped by what is left of the
+suite budget (test_config.yaml: suites.<name>.timeout, global.timeout per
+test). The deadline lives in a context variable, so it reaches the test's own
+thread and the threads exec_many starts. Inside it K8sClient:
+  - passes the remaining seconds as _request_timeout on API calls,
+  - clips exec, wait and kubectl timeouts to the remaining seconds,
+  - raises DeadlineExceeded (a K8sClientError) instead of starting a new API
+    call once the deadline has passed. An exec returns returncode 124 instead.
+A hung test therefore unwinds through its own error handling once its budget
+runs out.
+
+Every call recorded by CallRecorder while a deadline is active is also
+counted on it, so a timed-out test can say where its time went.
+"""
+from __future__ import annotations
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+import contextvars
+import threading
+import time
+
+
+class Deadline:
+    """Absolute time.monotonic() deadline plus per-operation timing of the calls made under it."""
+
+    def __init__(self, seconds: float, label: str = "", at: Optional[float] = None):
+        self.started = time.monotonic()
+        self.at = self.started + seconds if at is None else at
+        self.label = label
+        # op -> [calls, seconds]
+        self.spent: Dict[str, List[float]] = {}
+        self.last: Optional[Tuple[str, str, str]] = None  # (op, target, outcome) of the latest call
+        self._lock = threading.Lock()
+
+    @property
+    def budget(self) -> float:
+        return self.at - self.started
+
+    def remaining(self) -> float:
+        return self.at - time.monotonic()
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def clip(self, timeout: float) -> float:
+        """timeout, shortened to what is left (never negative)."""
+        return max(0.0, min(timeout, self.remaining()))
+
+    def note(self, op: str, target: str, seconds: float, outcome: str) -> None:
+        with self._lock:
+            entry = self.spent.get(op)
+            if entry is None:
+                self.spent[op] = [1, seconds]
+            else:
+                entry[0] += 1
+                entry[1] += seconds
+            self.last = (op, target, outcome)
+
+    def report(self) -> str:
+        """Partial timing, e.g. 'exec 3 calls/58.2s, list 2 calls/0.1s; last: exec 5g/amf-0 (timeout)'."""
+        with self._lock:
+            parts = [
+                f"{op} {int(n)} calls/{secs:.1f}s"
+                for op, (n, secs) in sorted(self.spent.items(), key=lambda kv: -kv[1][1])
+            ]
+            last = self.last
+        text = ", ".join(parts) or "no API calls"
+        if last:
+            text += f"; last: {last[0]} {last[1]} ({last[2]})"
+        return text
+
+    def describe(self) -> str:
+        over = -self.remaining()
+        return f"{self.label or 'deadline'} exceeded ({self.budget:.1f}s budget, {over:.1f}s over)"
+
+
+_CURRENT: contextvars.ContextVar[Optional[Deadline]] = contextvars.ContextVar("test_deadline", default=None)
+
+
+def current() -> Optional[Deadline]:
+    return _CURRENT.get()
+
+
+@contextmanager
+def deadline(seconds: float, label: str = "") -> Iterator[Deadline]:
+    """Run the block under a deadline `seconds` from now, never later than an enclosing one."""
+    outer = _CURRENT.get()
+    at = time.monotonic() + seconds
+    if outer is not None:
+        at = min(at, outer.at)
+    dl = Deadline(seconds, label, at=at)
+    token = _CURRENT.set(dl)
+    try:
+        yield dl
+    finally:
+        _CURRENT.reset(token)
@@ -0,0 +1,248 @@
+# utils/exec_pool.py
+"""
+Pooled long-lived shell sessions backing K8sClient.exec_in_pod.
+
+A session is one websocket exec of /bin/sh in a (pod, container). Commands are
+written to its stdin and framed with sentinel markers that carry the exit
+code, so a probe costs one round-trip on an open stream instead of a new exec
+(TLS handshake, API server -> kubelet -> runtime, plus the cloudcore tunnel
+for KubeEdge edge pods).
+"""
+from __future__ import annotations
+from typing import Callable, Dict, List, Optional, Set, Tuple
+import shlex
+import threading
+import time
+import uuid
+
+from kubernetes.stream.ws_client import ERROR_CHANNEL, STDOUT_CHANNEL, STDERR_CHANNEL
+
+
+SessionKey = Tuple[str, str, str]  # (namespace, pod, container)
+
+
+class ExecSessionError(Exception):
+    """Session unusable. `sent` tells whether the command may have started."""
+
+    def __init__(self, message: str, sent: bool = False):
+        super().__init__(message)
+        self.sent = sent
+
+
+class ExecSessionUnavailable(Exception):
+    """The target cannot host a shell session; use a one-shot exec instead."""
+
+
+def _shell_missing(ws) -> bool:
+    """True if the exec's status says /bin/sh could not be started at all."""
+    try:
+        status = ws.read_channel(ERROR_CHANNEL, timeout=0) or ""
+    except Exception:
+        return False
+    status = status.lower()
+    return "/bin/sh" in status and ("not found" in status or "no such file" in status)
+
+
+class ExecSession:
+    """One /bin/sh exec stream running framed commands sequentially."""
+
+    def __init__(self, ws, key: SessionKey):
+        self.ws = ws
+        self.key = key
+        self.last_used = time.monotonic()
+        self._token = uuid.uuid4().hex[:12]
+        self._seq = 0
+
+    @property
+    def alive(self) -> bool:
+        return self.ws.is_open()
+
+    def close(self) -> None:
+        try:
+            self.ws.close()
+        except Exception:
+            pass
+
+    def run(self, command: List[str], timeout: float) -> Tuple[str, str, Optional[int]]:
+        """
+        Run one command; returns (stdout, stderr, returncode).
+        returncode is None when the deadline passed; the session is then
+        closed (the command may still be running) and partial output returned.
+        """
+        self._seq += 1
+        marker = f"__k8s_exec_{self._token}_{self._seq}__"
+        # Subshell isolates exit/cd; stdin from /dev/null so the command
+        # cannot swallow the session's own input.
+        script = (
+            f"({' '.join(shlex.quote(arg) for arg in command)}) </dev/null; "
+            f"printf '\\n%s %d\\n' {marker} $?; printf '\\n%s\\n' {marker} >&2\n"
+        )
+        if not self.alive:
+            raise ExecSessionError("session closed")
+        try:
+            self.ws.write_stdin(script)
+        except Exception as e:
+            raise ExecSessionError(f"write failed: {e}")
+
+        out_tail, err_tail = f"\n{marker} ", f"\n{marker}\n"
+        out, err = "", ""
+        stdout: Optional[str] = None
+        stderr: Optional[str] = None
+        rc: Optional[int] = None
+        deadline = time.monotonic() + timeout
+        try:
+            while stdout is None or stderr is None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.close()
+                    return (out if stdout is None else stdout), (err if stderr is None else stderr), None
+                if not self.alive:
+                    raise ExecSessionError("session closed mid-command", sent=True)
+                self.ws.update(timeout=min(remaining, 1.0))
+                if stdout is None:
+                    out += self.ws.read_channel(STDOUT_CHANNEL, timeout=0)
+                    idx = out.find(out_tail)
+                    end = out.find("\n", idx + len(out_tail)) if idx >= 0 else -1
+                    if end >= 0:
+                        stdout, rc = out[:idx], int(out[idx + len(out_tail):end])
+                if stderr is None:
+                    err += self.ws.read_channel(STDERR_CHANNEL, timeout=0)
+                    idx = err.find(err_tail)
+                    if idx >= 0:
+                        stderr = err[:idx]
+            # Drop the websocket's capture-everything buffer between commands
+            self.ws.read_all()
+        except ExecSessionError:
+            raise
+        except Exception as e:
+            # The command is running (or ran): never worth a retry
+            raise ExecSessionError(f"read failed: {e}", sent=True)
+        self.last_used = time.monotonic()
+        return stdout, stderr, rc
+
+
+class ExecSessionPool:
+    """
+    Idle shell sessions keyed by (namespace, pod, container).
+    - acquire pops an idle live session or opens a new one, so concurrent
+      callers on the same pod each get their own stream
+    - sessions idle longer than idle_timeout are closed on the next pool call
+    - a session found dead before the command was sent is reopened once
+    - ExecSessionUnavailable means the command was never sent, so the caller
+      may run it another way; ExecSessionError with `sent` means it may have run
+    - targets where /bin/sh cannot be started (missing, or `true` fails) are
+      remembered as unsupported; a slow or dropped handshake is only retried
+      one-shot this time
+    """
+
+    HANDSHAKE_TIMEOUT = 10
+
+    def __init__(
+        self,
+        opener: Callable[[str, str, Optional[str]], object],
+        idle_timeout: float = 60.0,
+        max_idle_per_target: int = 2,
+    ):
+        self._opener = opener  # (pod, namespace, container) -> WSClient running /bin/sh
+        self.idle_timeout = idle_timeout
+        self.max_idle_per_target = max_idle_per_target
+        self._idle: Dict[SessionKey, List[ExecSession]] = {}
+        self._unsupported: Set[SessionKey] = set()
+        self._lock = threading.Lock()
+
+    def run(
+        self,
+        pod_name: str,
+        namespace: str,
+        command: List[str],
+        container: Optional[str],
+        timeout: float,
+    ) -> Tuple[str, str, Optional[int]]:
+        key = (namespace, pod_name, container or "")
+        if key in self._unsupported:
+            raise ExecSessionUnavailable(f"no shell session for {namespace}/{pod_name}")
+        for attempt in range(2):
+            session = self._acquire(key)
+            try:
+                stdout, stderr, rc = session.run(command, timeout)
+            except ExecSessionError as e:
+                session.close()
+                if e.sent:
+                    raise
+                if attempt:
+                    raise ExecSessionUnavailable(f"no live shell session for {namespace}/{pod_name}: {e}")
+                continue  # stale session, reconnect once
+            if rc is not None:
+                self._release(session)
+            return stdout, stderr, rc
+        raise ExecSessionError("unreachable")
+
+    def close_all(self) -> None:
+        with self._lock:
+            sessions = [s for group in self._idle.values() for s in group]
+            self._idle = {}
+        for s in sessions:
+            s.close()
+
+    def _acquire(self, key: SessionKey) -> ExecSession:
+        with self._lock:
+            self._sweep()
+            group = self._idle.get(key) or []
+            while group:
+                session = group.pop()
+                if session.alive:
+                    return session
+                session.close()
+        return self._open(key)
+
+    def _release(self, session: ExecSession) -> None:
+        with self._lock:
+            group = self._idle.setdefault(session.key, [])
+            if session.alive and len(group) < self.max_idle_per_target:
+                group.append(session)
+                session = None
+            self._sweep()
+        if session is not None:
+            session.close()
+
+    def _open(self, key: SessionKey) -> ExecSession:
+        namespace, pod_name, container = key
+        try:
+            ws = self._opener(pod_name, namespace, container or None)
+        except Exception as e:
+            # Not remembered as unsupported: the pod may just be restarting
+            raise ExecSessionUnavailable(f"cannot open a shell session on {namespace}/{pod_name}: {e}")
+        session = ExecSession(ws, key)
+        try:
+            _, _, rc = session.run(["true"], self.HANDSHAKE_TIMEOUT)
+        except ExecSessionError as e:
+            # The shell exited: a missing /bin/sh is permanent, anything else
+            # (a dropped cloudcore tunnel, a restarting pod) is worth retrying
+            missing = _shell_missing(ws)
+            session.close()
+            if missing:
+                self._unsupported.add(key)
+            raise ExecSessionUnavailable(f"no shell session for {namespace}/{pod_name}: {e}")
+        if rc is None:
+            # Slow handshake (e.g. an edge pod over the tunnel); run() closed it
+            raise ExecSessionUnavailable(f"shell session handshake on {namespace}/{pod_name} timed out")
+        if rc != 0:
+            session.close()
+            self._unsupported.add(key)
+            raise ExecSessionUnavailable(f"no shell session for {namespace}/{pod_name}: `true` exited {rc}")
+        return session
+
+    def _sweep(self) -> None:
+        """Close idle sessions past idle_timeout. Caller holds the lock."""
+        cutoff = time.monotonic() - self.idle_timeout
+        for key in list(self._idle):
+            keep = []
+            for s in self._idle[key]:
+                if s.alive and s.last_used >= cutoff:
+                    keep.append(s)
+                else:
+                    s.close()
+            if keep:
+                self._idle[key] = keep
+            else:
+                del self._idle[key]
@@ -0,0 +1,338 @@
+# utils/exec_stream.py
+"""
+Streaming exec with early-exit matchers.
+
+exec_in_pod returns only after the command exits. A `ping -c 3` reachability
+check therefore waits out all three replies, and `iperf3 -t 120` shows nothing
+for two minutes. K8sClient.exec_stream() returns an ExecStream instead. It
+yields ExecChunks as the exec websocket delivers them:
+
+    stream = k8s.exec_stream(pod, "5g", ["ping", "-c", "3", ip], stop=[until_output("bytes from")])
+    for chunk in stream:
+        ...                      # ExecChunk(channel, data, at)
+    result = stream.result()     # ExecResult
+
+- `stop` matchers see every complete stdout line. The first one to return a
+  Stop ends the exec: the websocket is closed, which ends the command in the
+  pod, and the stream's returncode is the Stop's.
+- Otherwise returncode is the real exit code from the exec status channel,
+  or 124 when `timeout` cut the command off.
+- Each channel is buffered in memory up to `spill_bytes` and in a temporary
+  file beyond that; lines() reads it back without loading it all.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Generator, Iterable, Iterator, List, Optional, Tuple
+import re
+import tempfile
+import time
+
+if TYPE_CHECKING:
+    from .k8s_client import ExecResult
+
+DEFAULT_SPILL_BYTES = 1 << 20  # per channel
+
+CHANNELS = ("stdout", "stderr")
+
+# Yields (channel, data) as the command produces it, returns the exit code
+ChunkSource = Generator[Tuple[str, str], None, Optional[int]]
+
+
+@dataclass(frozen=True)
+class ExecChunk:
+    channel: str    # "stdout" | "stderr"
+    data: str
+    at: float       # seconds since the stream started
+
+
+@dataclass(frozen=True)
+class Stop:
+    """Returned by a matcher to end the exec; returncode becomes the stream's."""
+    reason: str
+    returncode: int = 0
+
+
+# Complete stdout line (without the newline) -> Stop to end the exec, or None
+Matcher = Callable[[str], Optional[Stop]]
+
+
+class StreamStopped(Exception):
+    """Thrown into a chunk source when a matcher ends the exec with `returncode`."""
+
+    def __init__(self, returncode: int):
+        super().__init__(f"stopped (rc={returncode})")
+        self.returncode = returncode
+
+
+class ExecStream:
+    """Iterator of ExecChunks from one running exec; see the module docstring."""
+
+    def __init__(
+        self,
+        source: ChunkSource,
+        stop: Iterable[Matcher] = (),
+        spill_bytes: int = DEFAULT_SPILL_BYTES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._source = source
+        self._matchers: List[Matcher] = list(stop)
+        self.spill_bytes = spill_bytes
+        self._clock = clock
+        self._started = clock()
+        self._buffers = {
+            ch: tempfile.SpooledTemporaryFile(max_size=spill_bytes, mode="w+", encoding="utf-8", newline="")
+            for ch in CHANNELS
+        }
+        self._sizes: Dict[str, int] = dict.fromkeys(CHANNELS, 0)
+        self._partial = ""
+        self.returncode: Optional[int] = None
+        self.stopped: Optional[Stop] = None
+        self.elapsed = 0.0
+
+    # ---------- iteration ----------
+
+    def __iter__(self) -> "ExecStream":
+        return self
+
+    def __next__(self) -> ExecChunk:
+        if self.done:
+            raise StopIteration
+        try:
+            channel, data = next(self._source)
+        except StopIteration as end:
+            self._finish(1 if end.value is None else end.value)
+            raise StopIteration
+        except Exception as e:
+            # A source never raises on purpose; keep the ExecResult contract anyway
+            self._append("stderr", str(e))
+            self._finish(1)
+            raise StopIteration
+        self._append(channel, data)
+        chunk = ExecChunk(channel, data, self._clock() - self._started)
+        if channel == "stdout" and self._matchers:
+            self._match(data)
+        return chunk
+
+    def __enter__(self) -> "ExecStream":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    @property
+    def done(self) -> bool:
+        return self.returncode is not None
+
+    def _append(self, channel: str, data: str) -> None:
+        self._buffers[channel].write(data)
+        self._sizes[channel] += len(data)
+
+    def _match(self, data: str) -> None:
+        lines = (self._partial + data).split("\n")
+        self._partial = lines.pop()
+        for line in lines:
+            for matcher in self._matchers:
+                hit = matcher(line.rstrip("\r"))
+                if hit is not None:
+                    self.stopped = hit
+                    try:
+                        self._source.throw(StreamStopped(hit.returncode))
+                    except (StopIteration, StreamStopped):
+                        pass
+                    self._source.close()
+                    self._finish(hit.returncode)
+                    return
+
+    def _finish(self, returncode: int) -> None:
+        self.returncode = returncode
+        self.elapsed = self._clock() - self._started
+
+    def close(self) -> None:
+        """End the exec if it is still running (returncode 124); the output stays readable."""
+        if not self.done:
+            self._source.close()
+            self.stopped = Stop("closed before the command exited", 124)
+            self._finish(124)
+
+    def follow(self, channel: str = "stdout") -> Iterator[str]:
+        """Consume the stream, yielding each complete line of `channel` as it arrives."""
+        partial = ""
+        for chunk in self:
+            if chunk.channel != channel:
+                continue
+            lines = (partial + chunk.data).split("\n")
+            partial = lines.pop()
+            for line in lines:
+                yield line.rstrip("\r")
+        if partial:
+            yield partial
+
+    # ---------- output ----------
+
+    def wait(self) -> int:
+        """Consume the rest of the stream; returns the exit code."""
+        for _ in self:
+            pass
+        return self.returncode
+
+    def result(self) -> ExecResult:
+        """wait(), then everything captured as an ExecResult."""
+        from .k8s_client import ExecResult  # k8s_client imports this module
+        self.wait()
+        stderr = self.text("stderr")
+        if self.stopped is not None and self.stopped.returncode:
+            stderr += self.stopped.reason
+        return ExecResult(stdout=self.text("stdout"), stderr=stderr, returncode=self.returncode)
+
+    def text(self, channel: str = "stdout") -> str:
+        """Output captured so far on one channel."""
+        buf = self._buffers[channel]
+        end = buf.tell()
+        buf.seek(0)
+        try:
+            return buf.read()
+        finally:
+            buf.seek(end)
+
+    def lines(self, channel: str = "stdout") -> Iterator[str]:
+        """Captured lines one at a time, for output too large to hold as one string."""
+        buf = self._buffers[channel]
+        end = buf.tell()
+        buf.seek(0)
+        try:
+            for line in buf:
+                yield line.rstrip("\r\n")
+        finally:
+            buf.seek(end)
+
+    @property
+    def spilled(self) -> bool:
+        """True when some output went to a temporary file."""
+        return any(size > self.spill_bytes for size in self._sizes.values())
+
+    def size(self, channel: str = "stdout") -> int:
+        return self._sizes[channel]
+
+
+class AsyncExecStream:
+    """
+    ExecStream for AsyncK8sClient: `async for` over its chunks, each read on
+    the client's executor through `run(func, *args)`.
+    """
+
+    def __init__(self, stream: ExecStream, run: Callable[..., Awaitable[Any]]):
+        self.stream = stream
+        self._run = run
+
+    def __aiter__(self) -> "AsyncExecStream":
+        return self
+
+    async def __anext__(self) -> ExecChunk:
+        chunk = await self._run(next, self.stream, None)
+        if chunk is None:
+            raise StopAsyncIteration
+        return chunk
+
+    async def __aenter__(self) -> "AsyncExecStream":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+    @property
+    def returncode(self) -> Optional[int]:
+        return self.stream.returncode
+
+    @property
+    def stopped(self) -> Optional[Stop]:
+        return self.stream.stopped
+
+    async def result(self) -> ExecResult:
+        return await self._run(self.stream.result)
+
+    async def close(self) -> None:
+        await self._run(self.stream.close)
+
+
+def replay(result: ExecResult) -> ChunkSource:
+    """Chunk source for an exec that already finished: its stdout line by line, then stderr."""
+    for line in result.stdout.splitlines(keepends=True):
+        yield "stdout", line
+    if result.stderr:
+        yield "stderr", result.stderr
+    return result.returncode
+
+
+# ---------- Matchers ----------
+
+def until_output(pattern: str, returncode: int = 0) -> Matcher:
+    """Stop at the first stdout line matching the regex `pattern` (e.g. "bytes from")."""
+    rx = re.compile(pattern)
+
+    def match(line: str) -> Optional[Stop]:
+        return Stop(f"matched {pattern!r}", returncode) if rx.search(line) else None
+    return match
+
+
+# iputils prints icmp_seq= from 1, busybox seq= from 0
+_ICMP_SEQ = re.compile(r"bytes from .*?\b(icmp_)?seq=(\d+)")
+
+
+def ping_loss_above(percent: float, count: int) -> Matcher:
+    """
+    Stop a `ping -c count` once more than `percent` of all `count` probes are
+    already lost, i.e. once the final loss can no longer come in at or under
+    `percent`. ping prints replies only, so a probe counts as lost once a
+    later sequence number has come back (iputils or busybox ping). returncode 1.
+    """
+    allowed = percent / 100.0 * count
+    seen = set()
+    highest = 0
+
+    def match(line: str) -> Optional[Stop]:
+        nonlocal highest
+        m = _ICMP_SEQ.search(line)
+        if m is None:
+            return None
+        seq = int(m.group(2))
+        seen.add(seq)
+        highest = max(highest, seq)
+        first = 1 if m.group(1) else 0
+        lost = highest - first + 1 - len(seen)
+        if lost > allowed:
+            return Stop(f"{lost} of {count} probes lost by {m.group(1) or ''}seq={highest}: packet loss > {percent}%", 1)
+        return None
+    return match
+
+
+_IPERF3_RATE = re.compile(r"\]\s+([\d.]+)-([\d.]+)\s+sec\s.*?\s([\d.]+)\s+([KMG]?)bits/sec(.*)$")
+_UNITS = {"": 1e-6, "K": 1e-3, "M": 1.0, "G": 1e3}
+
+
+def iperf3_rate(line: str) -> Optional[Tuple[float, float, str]]:
+    """
+    (end second, Mbit/s, role) from an iperf3 text report line; role is
+    "sender"/"receiver" on the summary lines and "" on the interval lines.
+    """
+    m = _IPERF3_RATE.search(line)
+    if m is None:
+        return None
+    tail = m.group(5)
+    role = "receiver" if "receiver" in tail else "sender" if "sender" in tail else ""
+    return float(m.group(2)), float(m.group(3)) * _UNITS[m.group(4)], role
+
+
+def iperf3_below(min_mbps: float, intervals: int = 3) -> Matcher:
+    """Stop an iperf3 client after `intervals` consecutive interval reports under min_mbps; returncode 1."""
+    low = 0
+
+    def match(line: str) -> Optional[Stop]:
+        nonlocal low
+        rate = iperf3_rate(line)
+        if rate is None or rate[2]:
+            return None
+        low = low + 1 if rate[1] < min_mbps else 0
+        if low >= intervals:
+            return Stop(f"throughput under {min_mbps} Mbps for {intervals} intervals (at {rate[0]:.0f}s)", 1)
+        return None
+    return match
@@ -0,0 +1,1163 @@
+# utils/fake_cluster.py
+"""
+In-memory fake cluster behind the K8sClient interface.
+
+FakeCluster holds pods, services, nodes, NetworkAttachmentDefinitions,
+Whereabouts IPPools, ConfigMaps, workloads and events as raw API JSON. Every write bumps a resourceVersion and
+appends a watch event. Scripted exec handlers answer the commands the suites
+run, using each pod's simulated interfaces and sockets: `hostname -i`,
+`ip addr/link show`, `ss`, `ovs-vsctl show/list-br`, `ping` and `iperf3 -J`.
+Simple controllers replace deleted pods and drive rollouts.
+
+FakeK8sClient is a K8sClient over a FakeCluster. Validators, parsers, waits,
+exec_many and metrics run unchanged, so harness overhead can be benchmarked
+and profiled deterministically with no cluster:
+
+    cluster = FakeCluster.testbed(cells=500, ues_per_cell=40)   # ~20k pods
+    k8s = FakeK8sClient(cluster)
+    ComponentValidator(k8s, TestConfig()).get_component_pods("ue")
+"""
+from __future__ import annotations
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+import copy
+import ipaddress
+import json
+import re
+import threading
+import time
+import zlib
+
+from kubernetes import client
+
+from .k8s_client import (
+    _APPS_LIST_KINDS,
+    _WORKLOAD_KINDS,
+    ExecResult,
+    K8sClient,
+    K8sClientError,
+    WaitResult,
+    _Informer,
+    _limited,
+    _resource_version,
+    _to_model_dict,
+)
+from .cassette import Cassette
+from .exec_stream import ChunkSource, replay
+from .metrics import CallRecorder
+
+KINDS = (
+    "pods", "services", "nodes", "network-attachment-definitions", "configmaps", "ippools",
+    "deployments", "daemonsets", "statefulsets", "events",
+)
+_NAMESPACED_WORKLOADS = {"Deployment": "deployments", "DaemonSet": "daemonsets", "StatefulSet": "statefulsets"}
+
+# Defaults mirroring test_config.yaml network.interfaces / network.vxlan
+DEFAULT_SUBNETS = {
+    "n1": "10.201.0.0/24", "n2": "10.202.0.0/24", "n3": "10.203.0.0/24",
+    "n4": "10.204.0.0/24", "n6e": "10.206.0.0/24", "n6c": "10.207.0.0/24",
+}
+DEFAULT_VXLAN_KEYS = {"n1": 1, "n2": 2, "n3": 3, "n4": 4, "n6e": 6, "n6c": 7}
+_NAD_NAMES = {
+    "n1": ("5g", "n1-net"), "n2": ("5g", "n2-net"), "n3": ("5g", "n3-net"),
+    "n4": ("5g", "n4-net"), "n6e": ("mec", "n6-mec-net"), "n6c": ("5g", "n6-cld-net"),
+}
+NODE_IPS = {"master": "192.168.56.10", "worker": "192.168.56.11", "edge": "192.168.56.12"}
+
+ExecHandler = Callable[["FakeCluster", Dict[str, Any], List[str]], Union[ExecResult, str]]
+
+
+# ---------- Selectors ----------
+
+_SET_TERM = re.compile(r"^\s*([\w./-]+)\s+(in|notin)\s+\(([^)]*)\)\s*$")
+_CMP_TERM = re.compile(r"^\s*(!?)\s*([\w./-]+)\s*(?:(==|=|!=)\s*([\w./-]*))?\s*$")
+
+
+def _split_terms(selector: str) -> List[str]:
+    """Split on commas outside parentheses: 'app in (a,b),tier=x' -> 2 terms."""
+    terms, depth, start = [], 0, 0
+    for i, ch in enumerate(selector):
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            terms.append(selector[start:i])
+            start = i + 1
+    terms.append(selector[start:])
+    return [t for t in terms if t.strip()]
+
+
+def parse_label_selector(
+    selector: Optional[str],
+) -> Tuple[List[Callable[[Dict[str, str]], bool]], List[Tuple[str, Set[str]]]]:
+    """
+    API-server label selector -> (predicates over a labels dict, indexable
+    (key, allowed values) terms for `=`, `==` and `in`).
+    """
+    preds: List[Callable[[Dict[str, str]], bool]] = []
+    indexable: List[Tuple[str, Set[str]]] = []
+    for term in _split_terms(selector or ""):
+        m = _SET_TERM.match(term)
+        if m:
+            key, op, values = m.group(1), m.group(2), {v.strip() for v in m.group(3).split(",") if v.strip()}
+            if op == "in":
+                indexable.append((key, values))
+                preds.append(lambda labels, k=key, vs=values: labels.get(k) in vs)
+            else:
+                preds.append(lambda labels, k=key, vs=values: labels.get(k) not in vs)
+            continue
+        m = _CMP_TERM.match(term)
+        if not m:
+            raise K8sClientError(f"unable to parse label selector term: {term!r}")
+        negated, key, op, value = m.groups()
+        if op is None:
+            preds.append((lambda labels, k=key: k not in labels) if negated else (lambda labels, k=key: k in labels))
+        elif op == "!=":
+            preds.append(lambda labels, k=key, v=value: labels.get(k) != v)
+        else:
+            indexable.append((key, {value}))
+            preds.append(lambda labels, k=key, v=value: labels.get(k) == v)
+    return preds, indexable
+
+
+def _field(obj: Dict[str, Any], path: str) -> str:
+    value: Any = obj
+    for part in path.split("."):
+        value = value.get(part) if isinstance(value, dict) else None
+    return "" if value is None else str(value)
+
+
+def parse_field_selector(selector: Optional[str]) -> List[Callable[[Dict[str, Any]], bool]]:
+    """'status.phase=Running,spec.nodeName!=edge' -> predicates over raw objects."""
+    preds = []
+    for term in _split_terms(selector or ""):
+        m = re.match(r"^\s*([\w.]+)\s*(==|=|!=)\s*(.*?)\s*$", term)
+        if not m:
+            raise K8sClientError(f"unable to parse field selector term: {term!r}")
+        path, op, value = m.groups()
+        if op == "!=":
+            preds.append(lambda o, p=path, v=value: _field(o, p) != v)
+        else:
+            preds.append(lambda o, p=path, v=value: _field(o, p) == v)
+    return preds
+
+
+# ---------- Simulated pod network ----------
+
+@dataclass
+class PodNet:
+    """Interfaces ((name, "ip/prefix", mac)) and listening sockets ((proto, ip, port, process)) of a pod."""
+    interfaces: List[Tuple[str, str, str]] = field(default_factory=list)
+    sockets: List[Tuple[str, str, int, str]] = field(default_factory=list)
+
+
+def _mac(seed: str) -> str:
+    h = zlib.crc32(seed.encode())
+    return "0a:58:" + ":".join(f"{(h >> s) & 0xff:02x}" for s in (24, 16, 8, 0))
+
+
+class _Allocator:
+    """
+    Sequential addresses from a subnet's first host. It keeps counting past the
+    subnet edge, so oversized synthetic topologies show up as out-of-range IPs.
+    """
+
+    def __init__(self, cidr: str, first: int = 1):
+        self.net = ipaddress.ip_network(cidr, strict=False)
+        self.next = first
+
+    def take(self) -> str:
+        ip = self.net.network_address + self.next
+        self.next += 1
+        return f"{ip}/{self.net.prefixlen}"
+
+
+# ---------- Cluster ----------
+
+class FakeCluster:
+    """
+    Thread-safe in-memory object store with watch events, exec handlers and
+    minimal controllers. Objects are raw API JSON and are never mutated in
+    place, so lists can hand them out without copying.
+    """
+
+    EVENT_BACKLOG = 100_000  # watch events kept per kind; older resumes relist (410)
+
+    def __init__(self, respawn: bool = True, respawn_delay: float = 0.0):
+        self.respawn = respawn              # controllers replace deleted owned pods
+        self.respawn_delay = respawn_delay  # seconds before the replacement appears
+        self._store: Dict[str, Dict[Tuple[str, str], Dict[str, Any]]] = {k: {} for k in KINDS}
+        self._labels: Dict[str, Dict[Tuple[str, str], Set[Tuple[str, str]]]] = {k: {} for k in KINDS}
+        self._events: Dict[str, Deque[Tuple[int, str, Dict[str, Any]]]] = {
+            k: deque(maxlen=self.EVENT_BACKLOG) for k in KINDS
+        }
+        self._rv = 0
+        self._lock = threading.RLock()
+        self._changed = threading.Condition(self._lock)
+        self._seq = 0
+        self.net: Dict[Tuple[str, str], PodNet] = {}
+        self.logs: Dict[Tuple[str, str], str] = {}
+        self.ip_owner: Dict[str, Tuple[str, str]] = {}  # pod/interface IP -> pod key
+        self.gateways: Set[str] = set()                 # extra IPs that answer ping
+        self.ovs_bridges: List[Tuple[str, int]] = []    # (bridge, vxlan key) on every OVS pod
+        self._pod_ips = _Allocator("10.42.0.0/16", first=2)
+        self._exec_handlers: List[Tuple[Tuple[str, ...], ExecHandler]] = []
+
+    # ----- store -----
+
+    @property
+    def resource_version(self) -> int:
+        return self._rv
+
+    def _index(self, kind: str, key: Tuple[str, str], labels: Dict[str, str], add: bool) -> None:
+        index = self._labels[kind]
+        for pair in labels.items():
+            keys = index.setdefault(pair, set())
+            if add:
+                keys.add(key)
+            else:
+                keys.discard(key)
+
+    def put(self, kind: str, obj: Dict[str, Any]) -> Dict[str, Any]:
+        """Create or replace an object; assigns uid/resourceVersion and emits ADDED/MODIFIED."""
+        with self._lock:
+            meta = obj.setdefault("metadata", {})
+            key = (meta.get("namespace") or "", meta["name"])
+            old = self._store[kind].get(key)
+            self._rv += 1
+            meta["resourceVersion"] = str(self._rv)
+            if not meta.get("uid"):
+                self._seq += 1
+                meta["uid"] = f"fake-{self._seq:08d}-{zlib.crc32(meta['name'].encode()):08x}"
+            meta.setdefault("creationTimestamp", time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()))
+            if old is not None:
+                self._index(kind, key, (old.get("metadata") or {}).get("labels") or {}, add=False)
+            self._index(kind, key, meta.get("labels") or {}, add=True)
+            self._store[kind][key] = obj
+            self._events[kind].append((self._rv, "MODIFIED" if old is not None else "ADDED", obj))
+            self._changed.notify_all()
+            return obj
+
+    def update(self, kind: str, namespace: str, name: str, change: Callable[[Dict[str, Any]], None]) -> Dict[str, Any]:
+        """Apply change() to a deep copy of the object and store it."""
+        with self._lock:
+            obj = self.get(kind, namespace, name)
+            if obj is None:
+                raise K8sClientError(f'{kind} "{name}" not found')
+            obj = copy.deepcopy(obj)
+            change(obj)
+            return self.put(kind, obj)
+
+    def remove(self, kind: str, namespace: str, name: str) -> Dict[str, Any]:
+        """Delete an object and emit DELETED; raises K8sClientError if it does not exist."""
+        with self._lock:
+            key = (namespace or "", name)
+            obj = self._store[kind].pop(key, None)
+            if obj is None:
+                raise K8sClientError(f'{kind} "{name}" not found')
+            self._index(kind, key, (obj.get("metadata") or {}).get("labels") or {}, add=False)
+            self._rv += 1
+            obj = dict(obj, metadata=dict(obj["metadata"], resourceVersion=str(self._rv)))
+            self._events[kind].append((self._rv, "DELETED", obj))
+            if kind == "pods":
+                net = self.net.pop(key, PodNet())
+                for _, cidr, _ in net.interfaces:
+                    if self.ip_owner.get(cidr.split("/")[0]) == key:
+                        del self.ip_owner[cidr.split("/")[0]]
+            self._changed.notify_all()
+            return obj
+
+    def get(self, kind: str, namespace: Optional[str], name: str) -> Optional[Dict[str, Any]]:
+        return self._store[kind].get((namespace or "", name))
+
+    def matcher(
+        self, namespace: Optional[str], label_selector: Optional[str], field_selector: Optional[str]
+    ) -> Callable[[Dict[str, Any]], bool]:
+        label_preds, _ = parse_label_selector(label_selector)
+        field_preds = parse_field_selector(field_selector)
+
+        def match(obj: Dict[str, Any]) -> bool:
+            meta = obj.get("metadata") or {}
+            if namespace and meta.get("namespace") != namespace:
+                return False
+            labels = meta.get("labels") or {}
+            return all(p(labels) for p in label_preds) and all(p(obj) for p in field_preds)
+
+        return match
+
+    def list(
+        self,
+        kind: str,
+        namespace: Optional[str] = None,
+        label_selector: Optional[str] = None,
+        field_selector: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """(matching objects in (namespace, name) order, current resourceVersion)."""
+        match = self.matcher(namespace, label_selector, field_selector)
+        _, indexable = parse_label_selector(label_selector)
+        with self._lock:
+            store = self._store[kind]
+            keys: Iterable[Tuple[str, str]] = store.keys()
+            # Narrow by the most selective equality/in term before full matching
+            for key_name, values in indexable:
+                index = self._labels[kind]
+                candidates: Set[Tuple[str, str]] = set()
+                for value in values:
+                    candidates |= index.get((key_name, value), set())
+                if len(candidates) < len(keys):  # type: ignore[arg-type]
+                    keys = candidates
+            items = [(k, store[k]) for k in keys if k in store]
+            rv = self._rv
+        items.sort(key=lambda kv: kv[0])
+        return [obj for _, obj in items if match(obj)], rv
+
+    def events_since(
+        self, kind: str, resource_version: int, timeout: float
+    ) -> Optional[List[Tuple[int, str, Dict[str, Any]]]]:
+        """
+        Watch: events of `kind` newer than resource_version, blocking up to
+        timeout for the first one. None means the backlog no longer reaches
+        back that far (the caller must relist, like a 410 Gone).
+        """
+        deadline = time.monotonic() + timeout
+        with self._changed:
+            while True:
+                log = self._events[kind]
+                if log and log[0][0] > resource_version + 1 and len(log) == log.maxlen:
+                    return None
+                if log and log[-1][0] > resource_version:
+                    return [e for e in log if e[0] > resource_version]
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return []
+                self._changed.wait(remaining)
+
+    # ----- builders -----
+
+    def add_node(self, name: str, ip: Optional[str] = None, labels: Optional[Dict[str, str]] = None,
+                 ready: bool = True) -> Dict[str, Any]:
+        return self.put("nodes", {
+            "apiVersion": "v1", "kind": "Node",
+            "metadata": {"name": name, "labels": {"kubernetes.io/hostname": name, **(labels or {})}},
+            "spec": {},
+            "status": {
+                "addresses": [{"type": "InternalIP", "address": ip or NODE_IPS.get(name, "192.168.56.20")}],
+                "conditions": [{"type": "Ready", "status": "True" if ready else "False",
+                                "lastTransitionTime": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())}],
+            },
+        })
+
+    def add_nad(self, name: str, namespace: str, subnet: str, vxlan_key: Optional[int] = None) -> Dict[str, Any]:
+        cni = {"cniVersion": "0.3.1", "type": "ovs", "bridge": f"br-{name.split('-')[0]}",
+               "ipam": {"type": "static", "subnet": subnet}}
+        if vxlan_key is not None:
+            cni["vxlan_key"] = vxlan_key
+        return self.put("network-attachment-definitions", {
+            "apiVersion": "k8s.cni.cncf.io/v1", "kind": "NetworkAttachmentDefinition",
+            "metadata": {"name": name, "namespace": namespace},
+            "spec": {"config": json.dumps(cni)},
+        })
+
+    def add_ip_pool(self, cidr: str, allocations: Dict[int, str], namespace: str = "kube-system") -> Dict[str, Any]:
+        """Whereabouts IPPool for `cidr`; allocations maps address offset -> podref "ns/name"."""
+        return self.put("ippools", {
+            "apiVersion": "whereabouts.cni.cncf.io/v1alpha1", "kind": "IPPool",
+            "metadata": {"name": cidr.replace("/", "-"), "namespace": namespace},
+            "spec": {"range": cidr, "allocations": {
+                str(offset): {"id": f"fake-{offset}", "podref": podref} for offset, podref in allocations.items()
+            }},
+        })
+
+    def add_configmap(self, name: str, namespace: str, data: Dict[str, str]) -> Dict[str, Any]:
+        return self.put("configmaps", {
+            "apiVersion": "v1", "kind": "ConfigMap",
+            "metadata": {"name": name, "namespace": namespace},
+            "data": dict(data),
+        })
+
+    def add_service(self, name: str, namespace: str, selector: Dict[str, str],
+                    ports: Sequence[Tuple[str, int]] = ()) -> Dict[str, Any]:
+        self._seq += 1
+        return self.put("services", {
+            "apiVersion": "v1", "kind": "Service",
+            "metadata": {"name": name, "namespace": namespace},
+            "spec": {
+                "selector": dict(selector),
+                "clusterIP": f"10.43.{(self._seq >> 8) & 0xff}.{self._seq & 0xff}",
+                "ports": [{"protocol": proto.upper(), "port": port, "targetPort": port} for proto, port in ports],
+            },
+        })
+
+    def add_workload(self, kind: str, name: str, namespace: str, labels: Dict[str, str],
+                     replicas: int = 1) -> Dict[str, Any]:
+        """Deployment/DaemonSet/StatefulSet shell (status complete); pods are added separately."""
+        resource = _WORKLOAD_KINDS[kind.lower()]
+        status: Dict[str, Any] = {"observedGeneration": 1}
+        if resource == "daemon_set":
+            status.update(desiredNumberScheduled=replicas, updatedNumberScheduled=replicas, numberAvailable=replicas)
+        else:
+            status.update(replicas=replicas, updatedReplicas=replicas, readyReplicas=replicas,
+                          availableReplicas=replicas, currentRevision="r1", updateRevision="r1")
+        return self.put(_APPS_LIST_KINDS[resource], {
+            "apiVersion": "apps/v1",
+            "kind": {"deployment": "Deployment", "daemon_set": "DaemonSet", "stateful_set": "StatefulSet"}[resource],
+            "metadata": {"name": name, "namespace": namespace, "generation": 1, "labels": dict(labels)},
+            "spec": {"replicas": replicas, "selector": {"matchLabels": dict(labels)},
+                     "template": {"metadata": {"labels": dict(labels)}}},
+            "status": status,
+        })
+
+    def add_pod(
+        self,
+        name: str,
+        namespace: str = "5g",
+        labels: Optional[Dict[str, str]] = None,
+        node: str = "worker",
+        containers: Sequence[str] = ("main",),
+        networks: Sequence[Tuple[str, str, str]] = (),
+        sockets: Sequence[Tuple[str, int, str]] = (),
+        owner: Optional[Tuple[str, str]] = None,
+        phase: str = "Running",
+        logs: Optional[str] = None,
+        pinned: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Add a pod with a simulated network:
+        - networks: (nad_name, interface, "ip/prefix") Multus attachments;
+          pinned=True requests those addresses in the networks annotation ("ips")
+        - sockets: (proto, port, process) listeners, proto udp/tcp/sctp
+        - owner: (kind, name), e.g. ("Deployment", "amf"); controllers recreate owned pods
+        """
+        with self._lock:
+            pod_cidr = self._pod_ips.take()
+            pod_ip = pod_cidr.split("/")[0]
+            ready = "True" if phase == "Running" else "False"
+            status = [{
+                "name": "cbr0", "interface": "eth0", "ips": [pod_ip], "default": True,
+                "mac": _mac(f"{namespace}/{name}/eth0"),
+            }]
+            status += [
+                {"name": f"{namespace}/{nad}", "interface": iface, "ips": [cidr.split("/")[0]],
+                 "mac": _mac(f"{namespace}/{name}/{iface}")}
+                for nad, iface, cidr in networks
+            ]
+            meta: Dict[str, Any] = {"name": name, "namespace": namespace, "labels": dict(labels or {})}
+            if networks:
+                meta["annotations"] = {
+                    "k8s.v1.cni.cncf.io/networks": json.dumps([
+                        dict({"name": nad, "interface": iface}, **({"ips": [cidr]} if pinned else {}))
+                        for nad, iface, cidr in networks
+                    ]),
+                    "k8s.v1.cni.cncf.io/network-status": json.dumps(status),
+                }
+            if owner:
+                workload = self.get(_NAMESPACED_WORKLOADS.get(owner[0], ""), namespace, owner[1]) \
+                    if owner[0] in _NAMESPACED_WORKLOADS else None
+                meta["ownerReferences"] = [{
+                    "apiVersion": "apps/v1", "kind": owner[0], "name": owner[1], "controller": True,
+                    "uid": workload["metadata"]["uid"] if workload else f"fake-owner-{owner[1]}",
+                }]
+            key = (namespace, name)
+            self.net[key] = PodNet(
+                interfaces=[("eth0", f"{pod_ip}/16", status[0]["mac"])] + [
+                    (iface, cidr, _mac(f"{namespace}/{name}/{iface}")) for _, iface, cidr in networks
+                ],
+                sockets=[(proto.lower(), "0.0.0.0", port, process) for proto, port, process in sockets],
+            )
+            self.ip_owner[pod_ip] = key
+            for _, _, cidr in networks:
+                self.ip_owner[cidr.split("/")[0]] = key
+            if logs is not None:
+                self.logs[key] = logs
+            return self.put("pods", {
+                "apiVersion": "v1", "kind": "Pod",
+                "metadata": meta,
+                "spec": {"nodeName": node, "containers": [{"name": c, "image": f"fake/{c}:latest"} for c in containers]},
+                "status": {
+                    "phase": phase,
+                    "hostIP": NODE_IPS.get(node, ""),
+                    "podIP": pod_ip,
+                    "conditions": [{"type": t, "status": ready,
+                                    "lastTransitionTime": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())}
+                                   for t in ("Ready", "ContainersReady")],
+                    "containerStatuses": [{
+                        "name": c, "ready": ready == "True", "restartCount": 0, "image": f"fake/{c}:latest",
+                        "imageID": f"fake/{c}@sha256:{zlib.crc32(c.encode()):064x}",
+                        "state": {"running": {}} if phase == "Running" else {"waiting": {"reason": "Pending"}},
+                    } for c in containers],
+                },
+            })
+
+    def add_event(self, namespace: str, pod_name: str, reason: str, message: str,
+                  event_type: str = "Normal") -> Dict[str, Any]:
+        self._seq += 1
+        return self.put("events", {
+            "apiVersion": "v1", "kind": "Event",
+            "metadata": {"name": f"{pod_name}.{self._seq:x}", "namespace": namespace},
+            "involvedObject": {"kind": "Pod", "name": pod_name, "namespace": namespace},
+            "reason": reason, "message": message, "type": event_type, "count": 1,
+        })
+
+    @classmethod
+    def testbed(
+        cls,
+        cells: int = 1,
+        ues_per_cell: int = 1,
+        subnets: Optional[Dict[str, str]] = None,
+        vxlan_keys: Optional[Dict[str, int]] = None,
+        edge_nodes: int = 1,
+        **kwargs: Any,
+    ) -> "FakeCluster":
+        """
+        The Vagrant testbed in memory: master/worker/edge nodes, Multus and OVS
+        DaemonSets, cloudcore, the N1-N6 NADs, Open5GS NFs with their
+        configmaps_setup ConfigMaps, and per cell one gNB plus a UE StatefulSet
+        of ues_per_cell pods. The addresses follow
+        test_config.yaml: amf/smf/upf use its static N-interface IPs, and gNBs
+        and UEs take the next free ones.
+        """
+        cluster = cls(**kwargs)
+        subnets = {**DEFAULT_SUBNETS, **(subnets or {})}
+        keys = {**DEFAULT_VXLAN_KEYS, **(vxlan_keys or {})}
+        edges = ["edge"] + [f"edge-{i}" for i in range(1, edge_nodes)]
+
+        cluster.add_node("master", labels={"node-role.kubernetes.io/master": "true"})
+        cluster.add_node("worker")
+        for i, edge in enumerate(edges):
+            cluster.add_node(edge, ip=None if i == 0 else f"192.168.56.{12 + i}",
+                             labels={"node-role.kubernetes.io/edge": ""})
+        for net, (ns, nad) in _NAD_NAMES.items():
+            cluster.add_nad(nad, ns, subnets[net], keys.get(net))
+            cluster.gateways.add(str(ipaddress.ip_network(subnets[net], strict=False).network_address + 1))
+        cluster.ovs_bridges = [(f"br-{net}", key) for net, key in sorted(keys.items(), key=lambda kv: kv[1])]
+        cluster.add_configmap("ovs-scripts", "kube-system", {"ovs-setup.sh": "#!/bin/sh\n"})
+
+        # kube-system / kubeedge
+        cluster.add_pod("coredns-fake", "kube-system", {"k8s-app": "kube-dns"}, node="master",
+                        containers=("coredns",), sockets=[("udp", 53, "coredns"), ("tcp", 53, "coredns")])
+        for ds, nodes in (("worker", ["worker"]), ("edge", edges)):
+            cluster.add_workload("daemonset", f"multus-{ds}", "kube-system", {"app": "multus"}, len(nodes))
+            cluster.add_workload("daemonset", f"ds-net-setup-{ds}", "kube-system", {"app": f"ds-net-setup-{ds}"},
+                                 len(nodes))
+            for n in nodes:
+                cluster.add_pod(f"multus-{ds}-{n}", "kube-system", {"app": "multus"}, node=n,
+                                containers=("kube-multus",), owner=("DaemonSet", f"multus-{ds}"))
+                cluster.add_pod(f"ds-net-setup-{ds}-{n}", "kube-system", {"app": f"ds-net-setup-{ds}"}, node=n,
+                                containers=("ovs",), owner=("DaemonSet", f"ds-net-setup-{ds}"))
+        cluster.add_workload("deployment", "cloudcore", "kubeedge", {"kubeedge": "cloudcore"})
+        cluster.add_pod("cloudcore-fake", "kubeedge", {"kubeedge": "cloudcore"}, node="master",
+                        containers=("cloudcore",), owner=("Deployment", "cloudcore"),
+                        sockets=[("tcp", 10000, "cloudcore"), ("tcp", 10002, "cloudcore")])
+
+        # 5G core (static IPs from test_config.yaml)
+        alloc = {net: _Allocator(cidr, first=110) for net, cidr in subnets.items()}
+
+        def static(net: str, host: int) -> str:
+            ip = ipaddress.ip_network(subnets[net], strict=False)
+            return f"{ip.network_address + host}/{ip.prefixlen}"
+
+        cluster.add_configmap("nf-scripts", "5g", {"entrypoint.sh": "#!/bin/sh\n"})
+
+        def nf(name: str, node: str, networks=(), sockets=()):
+            cluster.add_configmap(f"{name}-config", "5g", {f"{name}.yaml": f"logger:\n  level: info\n{name}: {{}}\n"})
+            cluster.add_workload("deployment", name, "5g", {"app": name})
+            cluster.add_pod(f"{name}-fake", "5g", {"app": name}, node=node, containers=(name,),
+                            networks=[(_NAD_NAMES[n][1], n[:2], cidr) for n, cidr in networks],
+                            sockets=[("tcp", 7777, f"open5gs-{name}d")] + list(sockets),
+                            owner=("Deployment", name), logs=f"[{name}] INFO: started\n", pinned=bool(networks))
+
+        nf("amf", "worker", [("n1", static("n1", 100)), ("n2", static("n2", 100))],
+           [("sctp", 38412, "open5gs-amfd")])
+        nf("smf", "worker", [("n4", static("n4", 100))], [("udp", 8805, "open5gs-smfd")])
+        nf("upf-edge", edges[0], [("n3", static("n3", 100)), ("n4", static("n4", 101)), ("n6e", alloc["n6e"].take())],
+           [("udp", 8805, "open5gs-upfd"), ("udp", 2152, "open5gs-upfd")])
+        nf("upf-cloud", "worker", [("n3", static("n3", 101)), ("n4", static("n4", 102)), ("n6c", alloc["n6c"].take())],
+           [("udp", 8805, "open5gs-upfd"), ("udp", 2152, "open5gs-upfd")])
+        for name in ("nrf", "ausf", "udm", "udr", "pcf", "bsf", "nssf"):
+            nf(name, "worker")
+        cluster.add_configmap("mongodb-config", "5g", {"mongod.conf": "net:\n  port: 27017\n"})
+        cluster.add_workload("deployment", "mongodb", "5g", {"app": "mongodb"})
+        cluster.add_pod("mongodb-fake", "5g", {"app": "mongodb"}, node="worker", containers=("mongodb",),
+                        owner=("Deployment", "mongodb"), sockets=[("tcp", 27017, "mongod")])
+        for name in ("amf", "smf", "nrf"):
+            cluster.add_service(f"{name}-sbi", "5g", {"app": name}, [("tcp", 7777)])
+
+        # RAN: one gNB and a UE StatefulSet per cell, round-robin over edge nodes
+        for c in range(cells):
+            node = edges[c % len(edges)]
+            gnb = f"gnb-{c}"
+            cluster.add_workload("deployment", gnb, "5g", {"component": "gnb", "cell": str(c)})
+            cluster.add_pod(f"{gnb}-fake", "5g", {"component": "gnb", "app": "gnb", "cell": str(c)}, node=node,
+                            containers=("gnb",), owner=("Deployment", gnb),
+                            networks=[("n2-net", "n2", alloc["n2"].take()), ("n3-net", "n3", alloc["n3"].take())],
+                            sockets=[("udp", 2152, "nr-gnb")])
+            ue = f"ue-{c}"
+            cluster.add_workload("statefulset", ue, "5g", {"component": "ue", "cell": str(c)}, ues_per_cell)
+            for i in range(ues_per_cell):
+                cluster.add_pod(f"{ue}-{i}", "5g", {"component": "ue", "app": "ue", "cell": str(c)}, node=node,
+                                containers=("ue",), owner=("StatefulSet", ue),
+                                networks=[("n1-net", "n1", alloc["n1"].take()), ("n3-net", "n3", alloc["n3"].take())])
+        return cluster
+
+    # ----- controllers -----
+
+    def _replacement(self, pod: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """Name and add_pod() kwargs for a controller-made replacement of `pod`."""
+        meta = pod["metadata"]
+        owner = (meta.get("ownerReferences") or [{}])[0]
+        key = (meta["namespace"], meta["name"])
+        net = self.net.get(key, PodNet())
+        self._seq += 1
+        name = meta["name"] if owner.get("kind") == "StatefulSet" else f"{owner.get('name', meta['name'])}-{self._seq:05x}"
+        networks = [
+            (entry["name"].split("/")[-1], entry["interface"], next(
+                (cidr for iface, cidr, _ in net.interfaces if iface == entry["interface"]), entry["ips"][0] + "/24"
+            ))
+            for entry in json.loads((meta.get("annotations") or {}).get("k8s.v1.cni.cncf.io/network-status", "[]"))
+            if not entry.get("default")
+        ]
+        return name, dict(
+            namespace=meta["namespace"], labels=meta.get("labels") or {}, node=pod["spec"].get("nodeName", ""),
+            containers=[c["name"] for c in pod["spec"].get("containers") or []], networks=networks,
+            sockets=[(proto, port, proc) for proto, _, port, proc in net.sockets],
+            owner=(owner["kind"], owner["name"]) if owner else None, logs=self.logs.get(key),
+        )
+
+    def delete_pod(self, namespace: str, name: str) -> Dict[str, Any]:
+        """Delete a pod; an owned pod is recreated after respawn_delay."""
+        with self._lock:
+            pod = self.get("pods", namespace, name)
+            if pod is None:
+                raise K8sClientError(f'pods "{name}" not found')
+            replacement = self._replacement(pod) if self.respawn and pod["metadata"].get("ownerReferences") else None
+            deleted = self.remove("pods", namespace, name)
+        if replacement:
+            new_name, kwargs = replacement
+            if self.respawn_delay > 0:
+                timer = threading.Timer(self.respawn_delay, self.add_pod, (new_name,), kwargs)
+                timer.daemon = True
+                timer.start()
+            else:
+                self.add_pod(new_name, **kwargs)
+        return deleted
+
+    def owned_pods(self, kind: str, name: str, namespace: str) -> List[Dict[str, Any]]:
+        return [
+            p for (ns, _), p in list(self._store["pods"].items())
+            if ns == namespace and any(
+                o.get("kind") == kind and o.get("name") == name for o in p["metadata"].get("ownerReferences") or []
+            )
+        ]
+
+    def rollout_restart(self, resource: str, name: str, namespace: str) -> Dict[str, Any]:
+        """Bump the template and generation, then replace every owned pod."""
+        plural = _APPS_LIST_KINDS[resource]
+        workload = self.get(plural, namespace, name)
+        if workload is None:
+            raise K8sClientError(f'{plural} "{name}" not found')
+        stamp = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+        def restart(obj: Dict[str, Any]) -> None:
+            meta = obj["metadata"]
+            meta["generation"] = meta.get("generation", 1) + 1
+            tmpl = obj["spec"].setdefault("template", {}).setdefault("metadata", {})
+            tmpl.setdefault("annotations", {})["kubectl.kubernetes.io/restartedAt"] = stamp
+            obj["status"]["observedGeneration"] = meta["generation"]
+            if resource == "stateful_set":
+                obj["status"]["currentRevision"] = obj["status"]["updateRevision"] = f"r{meta['generation']}"
+
+        updated = self.update(plural, namespace, name, restart)
+        respawn, self.respawn = self.respawn, True
+        try:
+            for pod in self.owned_pods(workload["kind"], name, namespace):
+                self.delete_pod(namespace, pod["metadata"]["name"])
+        finally:
+            self.respawn = respawn
+        return updated
+
+    def scale(self, resource: str, name: str, namespace: str, replicas: int) -> Dict[str, Any]:
+        plural = _APPS_LIST_KINDS[resource]
+        workload = self.get(plural, namespace, name)
+        if workload is None:
+            raise K8sClientError(f'{plural} "{name}" not found')
+        pods = sorted(self.owned_pods(workload["kind"], name, namespace), key=lambda p: p["metadata"]["name"])
+        template = pods[0] if pods else None
+        for pod in pods[replicas:]:
+            self.remove("pods", namespace, pod["metadata"]["name"])
+        for i in range(len(pods), replicas if template else 0):
+            new_name, kwargs = self._replacement(template)
+            if resource == "stateful_set":
+                new_name = f"{name}-{i}"
+            self.add_pod(new_name, **kwargs)
+
+        def resize(obj: Dict[str, Any]) -> None:
+            obj["spec"]["replicas"] = replicas
+            obj["status"].update(replicas=replicas, updatedReplicas=replicas, readyReplicas=replicas,
+                                 availableReplicas=replicas)
+
+        return self.update(plural, namespace, name, resize)
+
+    # ----- exec -----
+
+    def on_exec(self, prefix: Sequence[str], handler: ExecHandler) -> None:
+        """
+        Script a command: handler(cluster, pod, argv) -> ExecResult or stdout,
+        for any argv starting with `prefix`. Later registrations win and all
+        take precedence over the built-in handlers.
+        """
+        self._exec_handlers.insert(0, (tuple(prefix), handler))
+
+    def exec(self, namespace: str, pod_name: str, command: List[str], container: Optional[str] = None) -> ExecResult:
+        pod = self.get("pods", namespace, pod_name)
+        if pod is None:
+            return ExecResult(stdout="", stderr=f'pods "{pod_name}" not found', returncode=1)
+        containers = [c["name"] for c in pod["spec"].get("containers") or []]
+        if container and container not in containers:
+            return ExecResult(stdout="", stderr=f"container not found ({container})", returncode=1)
+        if pod["status"].get("phase") != "Running":
+            return ExecResult(stdout="", stderr="container not running", returncode=1)
+        argv = list(command)
+        if argv[:2] in (["sh", "-c"], ["/bin/sh", "-c"]) and len(argv) > 2:
+            argv = argv[2].split()
+        for prefix, handler in self._exec_handlers + _BUILTIN_HANDLERS:
+            if tuple(argv[:len(prefix)]) == prefix:
+                out = handler(self, pod, argv)
+                return out if isinstance(out, ExecResult) else ExecResult(stdout=out)
+        name = argv[0] if argv else ""
+        return ExecResult(stdout="", stderr=f"sh: {name}: not found", returncode=127)
+
+    def pod_net(self, pod: Dict[str, Any]) -> PodNet:
+        meta = pod["metadata"]
+        return self.net.get((meta["namespace"], meta["name"]), PodNet())
+
+    def rtt_ms(self, pod: Dict[str, Any], ip: str) -> Optional[float]:
+        """Simulated round trip: same node < cross node < via the edge; None if unreachable."""
+        if ip in self.gateways:
+            return 0.3
+        owner = self.ip_owner.get(ip)
+        target = self.get("pods", *owner) if owner else None
+        if target is None:
+            return None
+        src, dst = pod["spec"].get("nodeName", ""), target["spec"].get("nodeName", "")
+        if src == dst:
+            return 0.08
+        return 1.6 if "edge" in src or "edge" in dst else 0.6
+
+
+# ---------- Built-in exec handlers ----------
+
+def _hostname(cluster: FakeCluster, pod: Dict[str, Any], argv: List[str]) -> str:
+    return (pod["status"].get("podIP", "") if "-i" in argv else pod["metadata"]["name"]) + "\n"
+
+
+def _ip_show(cluster: FakeCluster, pod: Dict[str, Any], argv: List[str]) -> ExecResult:
+    """`ip [-j] addr|link|route [show] [dev IFACE]`, as text or iproute2 JSON."""
+    as_json = any(a in ("-j", "-json") for a in argv[1:])
+    words = [a for a in argv[1:] if not a.startswith("-")]
+    if words[:1] and words[0] in ("r", "ro", "route"):
+        return _ip_route(cluster, pod, as_json)
+    with_addr = bool(words) and words[0] in ("addr", "a", "address")
+    rest = [a for a in words[1:] if a not in ("show", "list", "dev")]
+    ifaces = [("lo", "127.0.0.1/8", "00:00:00:00:00:00")] + cluster.pod_net(pod).interfaces
+    if rest:
+        ifaces = [i for i in ifaces if i[0] == rest[0]]
+        if not ifaces:
+            return ExecResult(stdout="", stderr=f'Device "{rest[0]}" does not exist.\n', returncode=1)
+    if as_json:
+        return ExecResult(stdout=json.dumps(
+            [_ip_json(idx, iface, with_addr) for idx, iface in enumerate(ifaces, start=1)]) + "\n")
+    lines = []
+    for idx, (name, cidr, mac) in enumerate(ifaces, start=1):
+        if name == "lo":
+            lines.append(f"{idx}: lo: <LOOPBACK,UP,LOWER_UP> mtu 65536 qdisc noqueue state UNKNOWN mode DEFAULT group default qlen 1000")
+            lines.append("    link/loopback 00:00:00:00:00:00 brd 00:00:00:00:00:00")
+        else:
+            lines.append(f"{idx}: {name}@if{100 + idx}: <BROADCAST,MULTICAST,UP,LOWER_UP> mtu 1450 qdisc noqueue state UP mode DEFAULT group default")
+            lines.append(f"    link/ether {mac} brd ff:ff:ff:ff:ff:ff link-netnsid 0")
+        if with_addr:
+            net = ipaddress.ip_interface(cidr).network
+            brd = f" brd {net.broadcast_address}" if name != "lo" else ""
+            lines.append(f"    inet {cidr}{brd} scope {'host' if name == 'lo' else 'global'} {name}")
+            lines.append("       valid_lft forever preferred_lft forever")
+    return ExecResult(stdout="\n".join(lines) + "\n")
+
+
+def _ip_json(idx: int, iface: Tuple[str, str, str], with_addr: bool) -> Dict[str, Any]:
+    name, cidr, mac = iface
+    lo = name == "lo"
+    entry: Dict[str, Any] = {
+        "ifindex": idx, "ifname": name,
+        "flags": ["LOOPBACK", "UP", "LOWER_UP"] if lo else ["BROADCAST", "MULTICAST", "UP", "LOWER_UP"],
+        "mtu": 65536 if lo else 1450, "qdisc": "noqueue", "operstate": "UNKNOWN" if lo else "UP",
+        "group": "default", "link_type": "loopback" if lo else "ether", "address": mac,
+        "broadcast": mac if lo else "ff:ff:ff:ff:ff:ff",
+    }
+    if not lo:
+        entry.update(link_index=100 + idx, link_netnsid=0)
+    if with_addr:
+        ip = ipaddress.ip_interface(cidr)
+        addr = {"family": "inet", "local": str(ip.ip), "prefixlen": ip.network.prefixlen,
+                "scope": "host" if lo else "global", "label": name,
+                "valid_life_time": 4294967295, "preferred_life_time": 4294967295}
+        if not lo:
+            addr["broadcast"] = str(ip.network.broadcast_address)
+        entry["addr_info"] = [addr]
+    return entry
+
+
+def _ip_route(cluster: FakeCluster, pod: Dict[str, Any], as_json: bool) -> ExecResult:
+    """Connected routes of the pod's interfaces plus a default route via eth0's gateway."""
+    routes = []
+    for name, cidr, _ in cluster.pod_net(pod).interfaces:
+        ip = ipaddress.ip_interface(cidr)
+        if name == "eth0":
+            routes.insert(0, {"dst": "default", "gateway": str(ip.network.network_address + 1), "dev": name})
+        routes.append({"dst": str(ip.network), "dev": name, "protocol": "kernel", "scope": "link",
+                       "prefsrc": str(ip.ip)})
+    if as_json:
+        return ExecResult(stdout=json.dumps(routes) + "\n")
+    lines = []
+    for r in routes:
+        via = f" via {r['gateway']}" if "gateway" in r else ""
+        tail = f" proto {r['protocol']} scope {r['scope']} src {r['prefsrc']}" if "prefsrc" in r else ""
+        lines.append(f"{r['dst']}{via} dev {r['dev']}{tail}")
+    return ExecResult(stdout="\n".join(lines) + "\n")
+
+
+def _ss(cluster: FakeCluster, pod: Dict[str, Any], argv: List[str]) -> str:
+    """`ss [-H] [-l|-a] [-u|-t|-S] [-p] [sport = :PORT]`; Netid only when several protocols are listed."""
+    flags = "".join(a[1:] for a in argv[1:] if a.startswith("-") and not a.startswith("--"))
+    protos = {p for f, p in (("u", "udp"), ("t", "tcp"), ("S", "sctp")) if f in flags} or {"udp", "tcp", "sctp"}
+    words = [a for a in argv[1:] if not a.startswith("-")]
+    ports = {int(w[1:]) for w in words if w.startswith(":") and w[1:].isdigit()}
+    netid = len(protos) > 1
+    lines = [] if "H" in flags else [("Netid " if netid else "") + "State  Recv-Q Send-Q Local Address:Port Peer Address:Port Process"]
+    for proto, ip, port, process in cluster.pod_net(pod).sockets:
+        if proto in protos and (not ports or port in ports):
+            state = "UNCONN" if proto == "udp" else "LISTEN"
+            users = f'users:(("{process}",pid=1,fd={port % 100 + 3}))' if "p" in flags else ""
+            lines.append((f"{proto:<5} " if netid else "")
+                         + f"{state:<6} 0      {128 if state == 'LISTEN' else 0:<6} {ip}:{port} 0.0.0.0:* {users}".rstrip())
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def _ovs_vsctl(cluster: FakeCluster, pod: Dict[str, Any], argv: List[str]) -> ExecResult:
+    if "ds-net-setup" not in (pod["metadata"].get("labels") or {}).get("app", ""):
+        return ExecResult(stdout="", stderr="ovs-vsctl: unix:/var/run/openvswitch/db.sock: database connection failed\n",
+                          returncode=1)
+    if argv[1:2] == ["list-br"]:
+        return ExecResult(stdout="".join(f"{br}\n" for br, _ in cluster.ovs_bridges))
+    node = pod["spec"].get("nodeName", "")
+    remote = NODE_IPS["edge"] if "edge" not in node else NODE_IPS["worker"]
+    lines = [f"{zlib.crc32(node.encode()):08x}-0000-0000-0000-000000000000"]
+    for br, key in cluster.ovs_bridges:
+        port = f"vxlan-{br[3:]}"
+        lines += [
+            f"    Bridge {br}",
+            f"        Port {port}",
+            f"            Interface {port}",
+            "                type: vxlan",
+            f'                options: {{key="{key}", remote_ip="{remote}"}}',
+            f"        Port {br}",
+            f"            Interface {br}",
+            "                type: internal",
+        ]
+    lines.append('    ovs_version: "2.17.9"')
+    return ExecResult(stdout="\n".join(lines) + "\n")
+
+
+def _opt(argv: List[str], flag: str, default: str) -> str:
+    return argv[argv.index(flag) + 1] if flag in argv and argv.index(flag) + 1 < len(argv) else default
+
+
+def _ping(cluster: FakeCluster, pod: Dict[str, Any], argv: List[str]) -> ExecResult:
+    target = argv[-1]
+    count = int(_opt(argv, "-c", "3"))
+    size = int(_opt(argv, "-s", "56"))
+    rtt = cluster.rtt_ms(pod, target)
+    head = f"PING {target} ({target}) {size}({size + 28}) bytes of data."
+    if rtt is None:
+        return ExecResult(
+            stdout=f"{head}\n\n--- {target} ping statistics ---\n"
+                   f"{count} packets transmitted, 0 received, 100% packet loss, time {count * 1000}ms\n",
+            returncode=1,
+        )
+    rtt += size / 1e5  # serialization delay grows with payload
+    lines = [head] + [
+        f"{size + 8} bytes from {target}: icmp_seq={i} ttl=64 time={rtt:.3f} ms" for i in range(1, count + 1)
+    ]
+    lines += [
+        "", f"--- {target} ping statistics ---",
+        f"{count} packets transmitted, {count} received, 0% packet loss, time {max(0, count - 1) * 1000}ms",
+        f"rtt min/avg/max/mdev = {rtt * 0.9:.3f}/{rtt:.3f}/{rtt * 1.1:.3f}/{rtt * 0.05:.3f} ms",
+    ]
+    return ExecResult(stdout="\n".join(lines) + "\n")
+
+
+def _iperf3(cluster: FakeCluster, pod: Dict[str, Any], argv: List[str]) -> ExecResult:
+    if "--help" in argv:
+        return ExecResult(stdout=_IPERF3_USAGE)
+    if "-s" in argv:
+        return ExecResult(stdout="")
+    server = _opt(argv, "-c", "")
+    seconds = float(_opt(argv, "-t", "10"))
+    streams = int(_opt(argv, "-P", "1"))
+    rtt = cluster.rtt_ms(pod, server)
+    if rtt is None:
+        if "-J" not in argv:
+            return ExecResult(stdout="", stderr="iperf3: error - unable to connect to server: No route to host\n",
+                              returncode=1)
+        return ExecResult(stdout=json.dumps({"start": {}, "intervals": [], "end": {},
+                                             "error": "unable to connect to server: No route to host"}), returncode=1)
+    bps = (9.4e9 if rtt < 0.1 else 9.4e8 if rtt < 1 else 9.5e7)
+    if "-J" not in argv:
+        return ExecResult(stdout=_iperf3_text(server, seconds, float(_opt(argv, "-i", "1")), bps))
+    total = {"start": 0, "end": seconds, "seconds": seconds, "bytes": int(bps * seconds / 8),
+             "bits_per_second": bps}
+    return ExecResult(stdout=json.dumps({
+        "start": {"connecting_to": {"host": server, "port": 5201}, "test_start": {"num_streams": streams,
+                                                                                  "duration": seconds}},
+        "intervals": [],
+        "end": {"sum_sent": dict(total, retransmits=0), "sum_received": total},
+    }))
+
+
+_IPERF3_USAGE = """Usage: iperf3 [-s|-c host] [options]
+  -i, --interval  #         seconds between periodic throughput reports
+  -f, --format   [kmgtKMGT] format to report: Kbits, Mbits, Gbits, Tbits
+  --forceflush              force flushing output at every interval
+  -J, --json                output in JSON format
+"""
+
+
+def _iperf3_text(server: str, seconds: float, interval: float, bps: float) -> str:
+    """iperf3 client report in its default text format (-f m)."""
+    mbps = bps / 1e6
+    lines = [f"Connecting to host {server}, port 5201",
+             f"[  5] local 10.42.0.10 port 43210 connected to {server} port 5201",
+             "[ ID] Interval           Transfer     Bitrate         Retr"]
+    start = 0.0
+    while interval > 0 and start < seconds:
+        end = min(seconds, start + interval)
+        mbytes = mbps * (end - start) / 8
+        lines.append(f"[  5] {start:6.2f}-{end:<6.2f} sec  {mbytes:6.1f} MBytes  {mbps:6.0f} Mbits/sec    0")
+        start = end
+    total = mbps * seconds / 8
+    lines += ["- - - - - - - - - - - - - - - - - - - - - - - - -",
+              "[ ID] Interval           Transfer     Bitrate         Retr",
+              f"[  5]   0.00-{seconds:<6.2f} sec  {total:6.1f} MBytes  {mbps:6.0f} Mbits/sec    0             sender",
+              f"[  5]   0.00-{seconds:<6.2f} sec  {total:6.1f} MBytes  {mbps:6.0f} Mbits/sec                  receiver",
+              "", "iperf Done."]
+    return "\n".join(lines) + "\n"
+
+
+_BUILTIN_HANDLERS: List[Tuple[Tuple[str, ...], ExecHandler]] = [
+    (("hostname",), _hostname),
+    (("ip",), _ip_show),
+    (("ss",), _ss),
+    (("ovs-vsctl",), _ovs_vsctl),
+    (("ping",), _ping),
+    (("iperf3",), _iperf3),
+    (("true",), lambda cluster, pod, argv: ""),
+]
+
+
+# ---------- Client ----------
+
+class FakeK8sClient(K8sClient):
+    """
+    K8sClient backed by a FakeCluster: no kubeconfig, no network. The client
+    layers above the wire (conversion memo, selectors, waits, exec_many, the
+    exec in-flight cap, metrics, cassettes) are the real ones.
+    exec_latency/api_latency add a fixed delay per exec/API call to model a
+    slow control plane. A recording made with `cassette` replays on a plain
+    K8sClient.
+    """
+
+    def __init__(
+        self,
+        cluster: Optional[FakeCluster] = None,
+        max_exec_inflight: int = 16,
+        rate_limits: Optional[Dict[str, Any]] = None,
+        calls: Optional[CallRecorder] = None,
+        exec_latency: float = 0.0,
+        api_latency: float = 0.0,
+        probe_cache: Optional[Dict[str, Any]] = None,
+        cassette: Optional[Cassette] = None,
+    ):
+        # API objects over an ApiClient that never connects: they deserialize
+        # the legacy dicts and name the writes (_write dispatches on the name)
+        api_client = client.ApiClient()
+        super().__init__(
+            exec_sessions=False,
+            max_exec_inflight=max_exec_inflight,
+            rate_limits=rate_limits,
+            calls=calls or CallRecorder(),
+            cassette=cassette,
+            probe_cache=probe_cache,
+            core_api=client.CoreV1Api(api_client),
+            apps_api=client.AppsV1Api(api_client),
+        )
+        self.cluster = cluster or FakeCluster.testbed()
+        self.exec_latency = exec_latency
+        self.api_latency = api_latency
+        # convert -> (namespace, name) -> (resourceVersion, converted), as the informers keep it
+        self._memo: Dict[Callable, Dict[Tuple[str, str], Tuple[Optional[str], Any]]] = {}
+
+    def _api(self, kind: str) -> None:
+        # DeadlineExceeded once the test deadline has passed, before or during the limiter wait
+        with _limited(self.limiter, kind, f"{kind} (fake)"):
+            if self.api_latency:
+                time.sleep(self.api_latency)
+
+    def _list_items(
+        self,
+        kind: str,
+        namespace: Optional[str],
+        fresh: bool,
+        label_selector: Optional[str] = None,
+        field_selector: Optional[str] = None,
+        convert: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    ) -> List[Any]:
+        if kind not in KINDS:
+            raise K8sClientError(f"unsupported kind: {kind}")
+        if fresh or not self.cache_enabled:
+            self._api("list")
+        with self.calls.call("list", " ".join(filter(None, (kind, namespace, label_selector, field_selector)))):
+            items, _ = self.cluster.list(kind, namespace, label_selector, field_selector)
+        if convert is None:
+            return items
+        memo = self._memo.setdefault(convert, {})
+        out = []
+        for raw in items:
+            meta = raw["metadata"]
+            key, rv = (meta.get("namespace") or "", meta["name"]), meta.get("resourceVersion")
+            hit = memo.get(key)
+            if hit is None or hit[0] != rv:
+                hit = memo[key] = (rv, convert(raw))
+            out.append(hit[1])
+        return out
+
+    def _read_pod_logs(self, pod_name: str, namespace: str, container: Optional[str], tail_lines: int) -> str:
+        self._api("log")
+        if self.cluster.get("pods", namespace, pod_name) is None:
+            raise K8sClientError(f'read log failed: pods "{pod_name}" not found')
+        lines = self.cluster.logs.get((namespace, pod_name), "").splitlines(keepends=True)
+        return "".join(lines[-tail_lines:] if tail_lines else lines)
+
+    def _list_pod_events(self, pod_name: str, namespace: str) -> List[Dict[str, Any]]:
+        self._api("list")
+        items, _ = self.cluster.list(
+            "events", namespace,
+            field_selector=f"involvedObject.kind=Pod,involvedObject.name={pod_name},involvedObject.namespace={namespace}",
+        )
+        return [_to_model_dict(self.core.api_client, e, "CoreV1Event") for e in items]
+
+    def _read_pod(self, pod_name: str, namespace: str) -> Dict[str, Any]:
+        self._api("list")
+        pod = self.cluster.get("pods", namespace, pod_name)
+        if pod is None:
+            raise K8sClientError(f'get pod failed: pods "{pod_name}" not found')
+        return self._dict_adapters["pods"](pod)
+
+    def _run_exec(
+        self,
+        pod_name: str,
+        namespace: str,
+        command: List[str],
+        container: Optional[str] = None,
+        tty: bool = False,
+        timeout: int = 60,
+        retry_if_not_found: bool = True,
+    ) -> ExecResult:
+        self.limiter.wait("exec")
+        if self.exec_latency > timeout:
+            time.sleep(timeout)
+            return ExecResult(stdout="", stderr="Command timed out", returncode=124)
+        if self.exec_latency:
+            time.sleep(self.exec_latency)
+        result = self.cluster.exec(namespace, pod_name, command, container)
+        if retry_if_not_found and "container not found" in result.stderr:
+            return self.cluster.exec(namespace, pod_name, command)
+        return result
+
+    def _stream_exec(
+        self,
+        pod_name: str,
+        namespace: str,
+        command: List[str],
+        container: Optional[str],
+        timeout: int,
+        retry_if_not_found: bool = True,
+    ) -> ChunkSource:
+        # The handlers answer all at once; stream their output line by line
+        return (yield from replay(self._run_exec(pod_name, namespace, command, container, timeout=timeout)))
+
+    def _write(self, func, *args: Any, **kwargs: Any) -> str:
+        """The write K8sClient._mutate asked for, applied to the cluster by API method name."""
+        what = func.__name__
+        self._api("write")
+        try:
+            if what == "delete_namespaced_pod":
+                obj = self.cluster.delete_pod(args[1], args[0])
+            elif what == "patch_node":
+                def cordon(node: Dict[str, Any]) -> None:
+                    node["spec"]["unschedulable"] = args[1]["spec"]["unschedulable"]
+                obj = self.cluster.update("nodes", "", args[0], cordon)
+            elif what.endswith("_scale"):
+                resource = what[len("patch_namespaced_"):-len("_scale")]
+                obj = self.cluster.scale(resource, args[0], args[1], args[2]["spec"]["replicas"])
+            elif what.startswith("patch_namespaced_"):
+                obj = self.cluster.rollout_restart(what[len("patch_namespaced_"):], args[0], args[1])
+            else:
+                raise NotImplementedError(f"{what} is not supported by the fake cluster")
+        except K8sClientError as e:
+            raise K8sClientError(f"{what} failed: 404 {e}")
+        return _resource_version(obj["metadata"]) or ""
+
+    def _watch_until(
+        self,
+        kind: str,
+        namespace: Optional[str],
+        check: Callable[[List[Dict[str, Any]]], Optional[List[Any]]],
+        timeout: float,
+        label_selector: Optional[str] = None,
+        field_selector: Optional[str] = None,
+    ) -> WaitResult:
+        """K8sClient._watch_until semantics over the cluster's event log."""
+        started = time.monotonic()
+        deadline = started + timeout
+        match = self.cluster.matcher(namespace, label_selector, field_selector)
+        rv: Optional[int] = None
+        state: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        while True:
+            if rv is None:
+                self._api("list")
+                items, rv = self.cluster.list(kind, namespace, label_selector, field_selector)
+                state = {_Informer._key(o): o for o in items}
+                hit = check(list(state.values()))
+                if hit is not None:
+                    return WaitResult(True, time.monotonic() - started, time.time(), hit, str(rv))
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return WaitResult(False, time.monotonic() - started, resource_version=str(rv))
+            events = self.cluster.events_since(kind, rv, remaining)
+            if events is None:
+                rv = None  # backlog expired: relist, like a 410 Gone
+                continue
+            for ev_rv, ev_type, obj in events:
+                rv = ev_rv
+                key = _Informer._key(obj)
+                if ev_type == "DELETED" or not match(obj):
+                    if state.pop(key, None) is None:
+                        continue
+                else:
+                    state[key] = obj
+                hit = check(list(state.values()))
+                if hit is not None:
+                    return WaitResult(True, time.monotonic() - started, time.time(), hit, str(rv))
+
+    def run_command(self, args: List[str], namespace: Optional[str] = None) -> ExecResult:
+        return ExecResult(stdout="", stderr="kubectl is not available on a fake cluster", returncode=127)
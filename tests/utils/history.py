@@ -0,0 +1,369 @@
+# utils/history.py
+"""
+Run history: every run_tests.py run is saved to a local SQLite database
+(tests/history.db, $TEST_HISTORY_DB overrides), so control-plane and
+data-plane slowdowns show up between deploys instead of weeks later.
+
+Per run it stores:
+  runs       argv, exit code, wall time, pass/fail counts and a cluster
+             fingerprint (container image digests per workload, node
+             kubelet/kernel/runtime versions) with a short id
+  tests      status, duration and lock wait of every scheduled test, and
+             the fingerprint of its inputs under --changed-only
+  metrics    values tests report with TestLogger.metric() (throughput,
+             RTT, packet loss, recovery times), with their direction
+  api_calls  per-op K8s API latency aggregates from the run's call logs
+
+All of it is read back as named series (the `series` view):
+  test/<suite>/<test>                duration of passing runs, s
+  metric/<suite>/<test>/<name>       as reported
+  api/<op>/p95                       p95 latency, ms
+
+regressions() compares each series' last `recent` runs with the `baseline`
+runs before them. It uses a one-sided Mann-Whitney U test: exact without
+ties, normal approximation otherwise. A series is flagged when p < alpha and
+its median moved at least min_change the wrong way. A rank test makes no
+normality assumption, and one slow outlier in the baseline cannot mask a
+shift. run_history.py is the query CLI.
+
+Stdlib only, so run_history.py runs without the venv.
+"""
+from __future__ import annotations
+from dataclasses import asdict, dataclass, is_dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import statistics
+
+TESTS_DIR = Path(__file__).resolve().parent.parent
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started REAL NOT NULL,
+    wall_s REAL,
+    argv TEXT,
+    exit_code INTEGER,
+    passed INTEGER,
+    failed INTEGER,
+    skipped INTEGER,
+    fingerprint TEXT,
+    fingerprint_id TEXT
+);
+CREATE TABLE IF NOT EXISTS tests (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    suite TEXT, test TEXT, status TEXT,
+    elapsed_s REAL, waited_s REAL, reason TEXT,
+    inputs TEXT
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    suite TEXT, test TEXT, name TEXT,
+    value REAL, unit TEXT, better TEXT
+);
+CREATE TABLE IF NOT EXISTS api_calls (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    op TEXT, calls INTEGER, failed INTEGER,
+    p50_ms REAL, p95_ms REAL, p99_ms REAL, max_ms REAL, total_s REAL
+);
+CREATE INDEX IF NOT EXISTS tests_run ON tests(run_id);
+CREATE INDEX IF NOT EXISTS metrics_run ON metrics(run_id);
+CREATE INDEX IF NOT EXISTS api_calls_run ON api_calls(run_id);
+CREATE VIEW IF NOT EXISTS series AS
+    SELECT t.run_id, r.started, 'test/' || t.suite || '/' || t.test AS name,
+           t.elapsed_s AS value, 's' AS unit, 'lower' AS better, r.fingerprint_id
+      FROM tests t JOIN runs r ON r.id = t.run_id WHERE t.status = 'passed'
+    UNION ALL
+    SELECT m.run_id, r.started, 'metric/' || m.suite || '/' || m.test || '/' || m.name,
+           m.value, m.unit, m.better, r.fingerprint_id
+      FROM metrics m JOIN runs r ON r.id = m.run_id
+    UNION ALL
+    SELECT a.run_id, r.started, 'api/' || a.op || '/p95', a.p95_ms, 'ms', 'lower', r.fingerprint_id
+      FROM api_calls a JOIN runs r ON r.id = a.run_id;
+"""
+
+
+def default_path() -> Path:
+    return Path(os.environ.get("TEST_HISTORY_DB", TESTS_DIR / "history.db"))
+
+
+@dataclass
+class Regression:
+    series: str
+    unit: str
+    better: str
+    baseline_median: float
+    recent_median: float
+    change: float          # relative move in the bad direction, 0.25 = 25% worse
+    p_value: float
+    baseline_runs: int
+    recent_runs: int
+    last_run_id: int
+    deploy_changed: bool   # cluster fingerprint differs between baseline and recent runs
+
+
+class RunHistory:
+    """SQLite store of past runs."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or default_path())
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(self.path))
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(_SCHEMA)
+        if "inputs" not in {r["name"] for r in self.db.execute("PRAGMA table_info(tests)")}:
+            self.db.execute("ALTER TABLE tests ADD COLUMN inputs TEXT")  # databases from before --changed-only
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __enter__(self) -> "RunHistory":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ---------- writing ----------
+
+    def record_run(
+        self,
+        started: float,
+        wall: float,
+        argv: str,
+        exit_code: int,
+        outcomes: Mapping[str, Iterable[Any]],
+        calls: Any = None,
+        fingerprint: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        """
+        Save one run. outcomes maps suite -> TestOutcomes (or their dicts,
+        from load_results_ndjson); calls is a CallRecorder. Returns the run id.
+        """
+        rows = [(suite, _as_dict(o)) for suite, items in outcomes.items() for o in items]
+        count = lambda *statuses: sum(o["status"] in statuses for _, o in rows)
+        fp_json = json.dumps(fingerprint, sort_keys=True) if fingerprint else None
+        with self.db:
+            cur = self.db.execute(
+                "INSERT INTO runs (started, wall_s, argv, exit_code, passed, failed, skipped, fingerprint, fingerprint_id)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (started, wall, argv, exit_code, count("passed", "unchanged"), count("failed", "timeout"),
+                 count("skipped"), fp_json, fingerprint_id(fingerprint) if fingerprint else None),
+            )
+            run_id = cur.lastrowid
+            self.db.executemany(
+                "INSERT INTO tests (run_id, suite, test, status, elapsed_s, waited_s, reason, inputs)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(run_id, suite, o["name"], o["status"], o.get("elapsed"), o.get("waited"), o.get("reason"),
+                  o.get("inputs")) for suite, o in rows],
+            )
+            self.db.executemany(
+                "INSERT INTO metrics VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(run_id, suite, o["name"], m["name"], m["value"], m.get("unit", ""), m.get("better", "higher"))
+                 for suite, o in rows for m in o.get("metrics") or ()],
+            )
+            if calls is not None:
+                self.db.executemany("INSERT INTO api_calls VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", [
+                    (run_id, op, h.count,
+                     sum(n for (o, outcome), n in calls.outcomes.items() if o == op and outcome != "ok"),
+                     h.percentile(50) * 1000, h.percentile(95) * 1000, h.percentile(99) * 1000,
+                     h.max_us / 1000, h.total_us / 1e6)
+                    for op, h in calls.by_op.items()
+                ])
+        return run_id
+
+    # ---------- reading ----------
+
+    def runs(self, limit: int = 20) -> List[sqlite3.Row]:
+        return self.db.execute("SELECT * FROM runs ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+
+    def series_names(self, pattern: str = "") -> List[str]:
+        rows = self.db.execute(
+            "SELECT DISTINCT name FROM series WHERE name LIKE ? ORDER BY name", (f"%{pattern}%",)
+        ).fetchall()
+        return [r["name"] for r in rows]
+
+    def trend(self, series: str, limit: int = 30) -> List[sqlite3.Row]:
+        """Last `limit` points of one series, oldest first."""
+        rows = self.db.execute(
+            "SELECT * FROM series WHERE name = ? ORDER BY run_id DESC LIMIT ?", (series, limit)
+        ).fetchall()
+        return rows[::-1]
+
+    def last_verdicts(self) -> Dict[Tuple[str, str], sqlite3.Row]:
+        """
+        (suite, test) -> its latest row that actually ran it (passed, failed or
+        timeout; skipped and unchanged rows don't count), with run_id and inputs.
+        """
+        # SQLite takes the bare columns from the row that holds MAX(run_id)
+        rows = self.db.execute(
+            "SELECT suite, test, status, inputs, MAX(run_id) AS run_id FROM tests"
+            " WHERE status IN ('passed', 'failed', 'timeout') GROUP BY suite, test"
+        ).fetchall()
+        return {(r["suite"], r["test"]): r for r in rows}
+
+    def fingerprint(self, run_id: int) -> Dict[str, Any]:
+        row = self.db.execute("SELECT fingerprint FROM runs WHERE id = ?", (run_id,)).fetchone()
+        return json.loads(row["fingerprint"]) if row and row["fingerprint"] else {}
+
+    def regressions(
+        self,
+        recent: int = 3,
+        baseline: int = 10,
+        alpha: float = 0.05,
+        min_change: float = 0.10,
+        min_baseline: int = 5,
+        pattern: str = "",
+    ) -> List[Regression]:
+        """Series whose last `recent` points are significantly worse than the `baseline` before them."""
+        found = []
+        for name in self.series_names(pattern):
+            points = self.trend(name, recent + baseline)
+            if len(points) < recent + min_baseline:
+                continue
+            base, last = points[:-recent], points[-recent:]
+            better = last[-1]["better"]
+            sign = -1.0 if better == "higher" else 1.0  # orient so that bigger is worse
+            b = [sign * p["value"] for p in base]
+            r = [sign * p["value"] for p in last]
+            p_value = mann_whitney_greater(r, b)
+            base_med, recent_med = statistics.median(b), statistics.median(r)
+            change = (recent_med - base_med) / abs(base_med) if base_med else (math.inf if recent_med > 0 else 0.0)
+            if p_value < alpha and change >= min_change:
+                found.append(Regression(
+                    name, last[-1]["unit"], better, sign * base_med, sign * recent_med, change, p_value,
+                    len(base), len(last), last[-1]["run_id"],
+                    {p["fingerprint_id"] for p in base} != {p["fingerprint_id"] for p in last},
+                ))
+        return sorted(found, key=lambda g: g.p_value)
+
+
+# ---------- statistics ----------
+
+def mann_whitney_greater(a: Sequence[float], b: Sequence[float]) -> float:
+    """
+    One-sided p-value for "a tends to be larger than b". Exact null
+    distribution for small samples without ties, normal approximation with
+    tie correction otherwise.
+    """
+    m, n = len(a), len(b)
+    if not m or not n:
+        return 1.0
+    u = sum((x > y) + 0.5 * (x == y) for x in a for y in b)
+    ties = len(set(a) | set(b)) < m + n
+    if not ties and m * n <= 2500:
+        counts = _u_distribution(min(m, n), max(m, n))
+        total = sum(counts)
+        return sum(counts[math.ceil(u):]) / total
+    # normal approximation with tie correction and continuity correction
+    values = sorted(list(a) + list(b))
+    tie_term = sum(t ** 3 - t for t in (values.count(v) for v in set(values)))
+    N = m + n
+    sigma = math.sqrt(m * n / 12.0 * ((N + 1) - tie_term / (N * (N - 1))))
+    if sigma == 0:
+        return 1.0
+    z = (u - m * n / 2.0 - 0.5) / sigma
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+@lru_cache(maxsize=256)
+def _u_distribution(m: int, n: int) -> tuple:
+    """
+    Number of orderings giving each U = 0..m*n for sample sizes m, n (no ties).
+    These are the coefficients of the Gaussian binomial [m+n choose m](q),
+    built as prod_{k=1..m} (1 - q^(n+k)) / (1 - q^k) one factor at a time, so
+    nothing recurses however uneven the samples are. Coefficients above m*n
+    are dropped along the way: the lower ones never depend on them.
+    """
+    size = m * n + 1
+    counts = [0] * size
+    counts[0] = 1
+    for k in range(1, m + 1):
+        for u in range(size - 1, n + k - 1, -1):   # * (1 - q^(n+k))
+            counts[u] -= counts[u - n - k]
+        for u in range(k, size):                   # / (1 - q^k)
+            counts[u] += counts[u - k]
+    return tuple(counts)
+
+
+# ---------- cluster fingerprint ----------
+
+def collect_fingerprint(k8s, namespaces: Iterable[str]) -> Dict[str, Any]:
+    """
+    Image digests per namespace/app/container and node versions, taken
+    through a K8sClient (list_pods / get_nodes).
+    """
+    images: Dict[str, set] = {}
+    for ns in namespaces:
+        for pod in k8s.list_pods(ns):
+            app = pod.labels.get("app") or pod.labels.get("app.kubernetes.io/name") or pod.name
+            for cs in pod.container_statuses:
+                images.setdefault(f"{ns}/{app}/{cs.name}", set()).add(cs.image_id or cs.image)
+    nodes = {}
+    for node in k8s.get_nodes():
+        info = (node.get("status") or {}).get("node_info") or {}
+        nodes[node["metadata"]["name"]] = {
+            "kubelet": info.get("kubelet_version"),
+            "kernel": info.get("kernel_version"),
+            "os": info.get("os_image"),
+            "runtime": info.get("container_runtime_version"),
+        }
+    return {"images": {k: sorted(v) for k, v in sorted(images.items())}, "nodes": nodes}
+
+
+def fingerprint_id(fingerprint: Dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(fingerprint, sort_keys=True).encode()).hexdigest()[:12]
+
+
+def diff_fingerprints(old: Dict[str, Any], new: Dict[str, Any]) -> List[str]:
+    """Human-readable changes between two fingerprints."""
+    changes = []
+    for section in ("images", "nodes"):
+        a, b = old.get(section) or {}, new.get(section) or {}
+        for key in sorted(set(a) | set(b)):
+            if key not in a:
+                changes.append(f"+ {section[:-1]} {key}: {_short(b[key])}")
+            elif key not in b:
+                changes.append(f"- {section[:-1]} {key}: {_short(a[key])}")
+            elif a[key] != b[key]:
+                changes.append(f"~ {section[:-1]} {key}: {_short(a[key])} -> {_short(b[key])}")
+    return changes
+
+
+def _short(value: Any) -> str:
+    if isinstance(value, list):
+        return ", ".join(_short(v) for v in value)
+    if isinstance(value, dict):
+        return " ".join(f"{k}={v}" for k, v in value.items() if v)
+    text = str(value)
+    if "@sha256:" in text:
+        repo, digest = text.split("@sha256:", 1)
+        return f"{repo.rsplit('/', 1)[-1]}@{digest[:12]}"
+    return text
+
+
+# ---------- helpers ----------
+
+def load_results_ndjson(paths: Iterable[Path]) -> Dict[str, List[Dict[str, Any]]]:
+    """TestOutcome dicts per suite from $TEST_RESULTS_LOG files (--isolate runs)."""
+    outcomes: Dict[str, List[Dict[str, Any]]] = {}
+    for path in paths:
+        try:
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        continue
+                    outcomes.setdefault(rec.pop("suite", "") or Path(path).stem, []).append(rec)
+        except OSError:
+            continue
+    return outcomes
+
+
+def _as_dict(outcome: Any) -> Dict[str, Any]:
+    return asdict(outcome) if is_dataclass(outcome) else dict(outcome)
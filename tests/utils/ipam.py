@@ -0,0 +1,345 @@
+# utils/ipam.py
+"""
+IPAM consistency analyzer for the Multus networks (n1-net ... n6-cld-net).
+
+One pass over three lists, with no exec:
+  - every NetworkAttachmentDefinition's CNI config: its ipam range, start/end
+    (Whereabouts range_start/range_end, as the per-cell n2/n3 NADs use, or
+    host-local rangeStart/rangeEnd), gateway and exclude list. Static NADs
+    carry no range, so their subnet comes from test_config.yaml
+    network.interfaces.<n>.subnet
+  - every pod's network-status attachments, and the addresses it pins itself
+    through "ips" in its networks annotation (utils/addresses.py)
+  - Whereabouts IPPool leases, when the CRD is installed
+
+and reports:
+  duplicate     one address on interfaces of two or more pods
+  out-of-range  an address outside its NAD's subnet, or outside its pool's
+                start..end unless the pod pinned it (the AMF's per-cell N2
+                address sits below the Whereabouts range on purpose), or a pod
+                holding the gateway address
+  overlap       two NADs whose allocation pools intersect
+  exhausted     a pool at or above `exhaustion` (default 90%) of its size
+  stale         an IPPool lease whose pod is gone or no longer holds the address
+
+Addresses are handled as integers. Duplicates come from one sort of all
+attachment addresses. Overlaps come from a sweep over pools sorted by start.
+Attachments with no known network are matched to a pool by bisecting the
+sorted pool starts. Everything is O(n log n) in pods + leases.
+
+    report = analyze_cluster(k8s, config)
+    print(report.summary())
+    report.ok      # no duplicate, out-of-range or overlap findings
+"""
+from __future__ import annotations
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import ipaddress
+import json
+import socket
+
+from .addresses import PodAddresses
+from .k8s_client import K8sClient, K8sClientError
+
+DUPLICATE = "duplicate"
+OUT_OF_RANGE = "out-of-range"
+OVERLAP = "overlap"
+EXHAUSTED = "exhausted"
+STALE = "stale"
+# Findings that mean traffic goes to the wrong place now; the rest are warnings
+ERRORS = (DUPLICATE, OUT_OF_RANGE, OVERLAP)
+
+
+@dataclass(frozen=True)
+class Pool:
+    """Allocatable addresses of one NAD, as integers (start..end inclusive)."""
+    network: str                       # "<ns>/<nad>"
+    ipam: str                          # whereabouts, static, host-local, ...
+    subnet: Optional[ipaddress.IPv4Network]
+    start: int
+    end: int
+    gateway: Optional[int] = None
+    excluded: Tuple[Tuple[int, int], ...] = ()
+
+    @property
+    def size(self) -> int:
+        excluded = sum(max(0, min(e, self.end) - max(s, self.start) + 1) for s, e in self.excluded)
+        gateway = 1 if self.gateway is not None and self.start <= self.gateway <= self.end else 0
+        return max(0, self.end - self.start + 1 - excluded - gateway)
+
+    def contains(self, ip: int) -> bool:
+        return self.start <= ip <= self.end and not any(s <= ip <= e for s, e in self.excluded)
+
+    def describe(self) -> str:
+        return f"{_ip(self.start)}-{_ip(self.end)}"
+
+
+@dataclass(frozen=True)
+class Finding:
+    kind: str
+    network: str
+    detail: str
+    ip: str = ""
+    pods: Tuple[str, ...] = ()
+
+
+@dataclass
+class IpamReport:
+    pools: List[Pool]
+    usage: Dict[str, int]                  # network -> addresses in use (attachments and leases)
+    findings: List[Finding]
+    pods: int = 0
+    attachments: int = 0
+    leases: Optional[int] = None           # None: no Whereabouts IPPools readable
+    notes: List[str] = field(default_factory=list)
+
+    def by_kind(self, kind: str) -> List[Finding]:
+        return [f for f in self.findings if f.kind == kind]
+
+    @property
+    def ok(self) -> bool:
+        return not any(f.kind in ERRORS for f in self.findings)
+
+    def summary(self) -> str:
+        lines = [f"{self.attachments} attachments on {self.pods} pods, {len(self.pools)} NADs, "
+                 + (f"{self.leases} IPPool leases" if self.leases is not None else "no IPPool leases")]
+        for pool in self.pools:
+            used = self.usage.get(pool.network, 0)
+            pct = f"{used / pool.size:.0%}" if pool.size else "-"
+            lines.append(f"  {pool.network:<20} {pool.ipam:<11} {pool.describe():<29} {used:>5}/{pool.size:<5} {pct:>4}")
+        for f in self.findings:
+            who = f" ({', '.join(f.pods)})" if f.pods else ""
+            lines.append(f"  {f.kind}: {f.network} {f.ip + ' ' if f.ip else ''}{f.detail}{who}")
+        lines.extend(f"  note: {n}" for n in self.notes)
+        return "\n".join(lines)
+
+
+def _ip(value: int) -> str:
+    return str(ipaddress.IPv4Address(value))
+
+
+def _int(ip: str) -> Optional[int]:
+    # inet_pton is strict dotted-quad like IPv4Address, and ~10x faster on large pod lists
+    try:
+        return int.from_bytes(socket.inet_pton(socket.AF_INET, ip.split("/")[0]), "big")
+    except (OSError, ValueError):
+        return None  # IPv6 and garbage are out of scope
+
+
+def _ipam_config(nad: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        config = json.loads((nad.get("spec") or {}).get("config") or "{}")
+    except ValueError:
+        return {}
+    if config.get("ipam"):
+        return config["ipam"]
+    # conflist form: the first plugin with an ipam section
+    return next((p["ipam"] for p in config.get("plugins") or () if isinstance(p, dict) and p.get("ipam")), {})
+
+
+def parse_pool(nad: Dict[str, Any], subnet_hint: Optional[str] = None) -> Optional[Pool]:
+    """Pool of one NAD; None if neither its config nor subnet_hint names a subnet."""
+    meta = nad.get("metadata") or {}
+    network = f"{meta.get('namespace', '')}/{meta.get('name', '')}"
+    ipam = _ipam_config(nad)
+    cidr = ipam.get("range") or ipam.get("subnet") or subnet_hint
+    if not cidr:
+        return None
+    # Whereabouts also takes "first-last/len" as the range
+    first, _, rest = cidr.partition("-") if "-" in cidr else ("", "", cidr)
+    try:
+        subnet = ipaddress.IPv4Network(rest, strict=False)
+    except ValueError:
+        return None
+    # Usable hosts: network and broadcast addresses are never handed out
+    start, end = int(subnet.network_address) + 1, int(subnet.broadcast_address) - 1
+    if first:
+        start, end = max(start, _int(first) or start), min(end, _int(rest) or end)
+    # Whereabouts spells the bounds range_start/range_end, host-local rangeStart/rangeEnd
+    first_ip = ipam.get("range_start") or ipam.get("rangeStart")
+    last_ip = ipam.get("range_end") or ipam.get("rangeEnd")
+    if first_ip:
+        start = max(start, _int(first_ip) or start)
+    if last_ip:
+        end = min(end, _int(last_ip) or end)
+    excluded = []
+    for item in ipam.get("exclude") or ():
+        try:
+            net = ipaddress.IPv4Network(item, strict=False)
+        except ValueError:
+            continue
+        excluded.append((int(net.network_address), int(net.broadcast_address)))
+    gateway = _int(ipam["gateway"]) if ipam.get("gateway") else None
+    return Pool(network, ipam.get("type", ""), subnet, start, end, gateway, tuple(sorted(excluded)))
+
+
+def subnets_from_config(config: Any) -> Dict[str, str]:
+    """"<ns>/<nad>" -> subnet from test_config.yaml network.interfaces (for static NADs)."""
+    out = {}
+    for iface in (config.get("network.interfaces", {}) or {}).values():
+        if isinstance(iface, dict) and iface.get("nad_name") and iface.get("subnet"):
+            out[f"{iface.get('nad_namespace', '5g')}/{iface['nad_name']}"] = iface["subnet"]
+    return out
+
+
+def _lease_addresses(ip_pool: Dict[str, Any]) -> List[Tuple[int, str]]:
+    """(address, podref) of every allocation in a Whereabouts IPPool."""
+    spec = ip_pool.get("spec") or {}
+    try:
+        base = int(ipaddress.IPv4Network(spec.get("range", ""), strict=False).network_address)
+    except ValueError:
+        return []
+    out = []
+    for offset, alloc in (spec.get("allocations") or {}).items():
+        try:
+            out.append((base + int(offset), (alloc or {}).get("podref", "")))
+        except ValueError:
+            continue
+    return out
+
+
+def analyze(
+    nads: Iterable[Dict[str, Any]],
+    pods: Iterable[PodAddresses],
+    ip_pools: Optional[Iterable[Dict[str, Any]]] = None,
+    subnets: Optional[Dict[str, str]] = None,
+    exhaustion: float = 0.9,
+) -> IpamReport:
+    """Check pods' Multus addresses against the NAD pools; see the module docstring."""
+    subnets = subnets or {}
+    pools: List[Pool] = []
+    notes: List[str] = []
+    for nad in nads:
+        meta = nad.get("metadata") or {}
+        network = f"{meta.get('namespace', '')}/{meta.get('name', '')}"
+        pool = parse_pool(nad, subnets.get(network))
+        if pool is None:
+            notes.append(f"{network}: no subnet in its ipam config or test_config.yaml, not checked")
+        else:
+            pools.append(pool)
+    pools.sort(key=lambda p: (p.start, p.end))
+    by_network = {p.network: p for p in pools}
+    starts = [p.start for p in pools]
+    reach = []                             # reach[i]: max end of pools[0..i]
+    for pool in pools:
+        reach.append(max(pool.end, reach[-1] if reach else pool.end))
+    findings: List[Finding] = []
+
+    # Pool overlaps: sweep by start, keeping the pools still open
+    open_pools: List[Pool] = []
+    for pool in pools:
+        open_pools = [o for o in open_pools if o.end >= pool.start]
+        for other in open_pools:
+            findings.append(Finding(
+                OVERLAP, pool.network,
+                f"pool {pool.describe()} overlaps {other.network} pool {other.describe()}",
+            ))
+        open_pools.append(pool)
+
+    # Attachments: (address, network, pod, interface)
+    pods = list(pods)
+    attachments: List[Tuple[int, str, str, str]] = []
+    pinned = set()                         # (pod, address) requested through the networks annotation
+    for pod in pods:
+        ref = f"{pod.namespace}/{pod.name}"
+        pinned.update((ref, v) for v in map(_int, pod.pinned) if v is not None)
+        for a in pod.attachments:
+            if a.default or not a.interface:
+                continue
+            for ip in a.ips:
+                value = _int(ip)
+                if value is not None:
+                    attachments.append((value, a.network, ref, a.interface))
+
+    def pool_for(network: str, value: int) -> Optional[Pool]:
+        pool = by_network.get(network)
+        if pool is None and "/" not in network:  # network-status without a namespace
+            pool = next((p for n, p in by_network.items() if n.endswith("/" + network)), None)
+        # Unknown network: the pool covering the address, scanning left from the
+        # last start <= value while some pool that far left still reaches it
+        i = bisect_right(starts, value) - 1
+        while pool is None and i >= 0 and reach[i] >= value:
+            if pools[i].end >= value:
+                pool = pools[i]
+            i -= 1
+        return pool
+
+    used: Dict[str, set] = {}
+    for value, network, ref, iface in attachments:
+        pool = pool_for(network, value)
+        if pool is None:
+            continue
+        static = (ref, value) in pinned
+        if not static or pool.contains(value):
+            used.setdefault(pool.network, set()).add(value)
+        if pool.gateway == value:
+            findings.append(Finding(OUT_OF_RANGE, pool.network, f"is the gateway ({iface})", _ip(value), (ref,)))
+        elif pool.subnet is not None and value not in range(int(pool.subnet.network_address) + 1,
+                                                               int(pool.subnet.broadcast_address)):
+            findings.append(Finding(OUT_OF_RANGE, pool.network, f"outside subnet {pool.subnet} ({iface})",
+                                    _ip(value), (ref,)))
+        elif pool.ipam != "static" and not static and not pool.contains(value):
+            findings.append(Finding(OUT_OF_RANGE, pool.network, f"outside pool {pool.describe()} ({iface})",
+                                    _ip(value), (ref,)))
+
+    # Duplicates: one sort, then runs of equal addresses
+    attachments.sort()
+    i = 0
+    while i < len(attachments):
+        j = i
+        while j + 1 < len(attachments) and attachments[j + 1][0] == attachments[i][0]:
+            j += 1
+        holders = sorted({f"{ref}:{iface}" for _, _, ref, iface in attachments[i:j + 1]})
+        if len({h.split(":")[0] for h in holders}) > 1:
+            findings.append(Finding(DUPLICATE, attachments[i][1], f"held by {len(holders)} interfaces",
+                                    _ip(attachments[i][0]), tuple(holders)))
+        i = j + 1
+
+    # Leases: stale ones, and their addresses count towards pool usage
+    leases = None
+    if ip_pools is not None:
+        holds = {(ref, value) for value, _, ref, _ in attachments}
+        present = {f"{p.namespace}/{p.name}" for p in pods}
+        leases = 0
+        for ip_pool in ip_pools:
+            for value, podref in _lease_addresses(ip_pool):
+                leases += 1
+                pool = pool_for("", value)
+                network = pool.network if pool else (ip_pool.get("metadata") or {}).get("name", "")
+                if pool is not None:
+                    used.setdefault(pool.network, set()).add(value)
+                if podref not in present:
+                    findings.append(Finding(STALE, network, "leased to a pod that no longer exists",
+                                            _ip(value), (podref,)))
+                elif (podref, value) not in holds:
+                    findings.append(Finding(STALE, network, "leased to a pod that does not hold it",
+                                            _ip(value), (podref,)))
+
+    usage = {network: len(values) for network, values in used.items()}
+    for pool in pools:
+        if pool.ipam == "static" or not pool.size:
+            continue
+        count = usage.get(pool.network, 0)
+        if count >= pool.size * exhaustion:
+            findings.append(Finding(EXHAUSTED, pool.network,
+                                    f"{count}/{pool.size} addresses of {pool.describe()} in use"))
+
+    order = {k: i for i, k in enumerate((DUPLICATE, OUT_OF_RANGE, OVERLAP, EXHAUSTED, STALE))}
+    findings.sort(key=lambda f: (order[f.kind], f.network, _int(f.ip) or 0))
+    return IpamReport(pools, usage, findings, len(pods), len(attachments), leases, notes)
+
+
+def analyze_cluster(k8s: K8sClient, config: Any = None, exhaustion: float = 0.9) -> IpamReport:
+    """analyze() over the live cluster: all NADs, all pods, Whereabouts leases if installed."""
+    nads = k8s.get_network_attachments()
+    pods = k8s.address_index().pods()
+    try:
+        ip_pools: Optional[Sequence[Dict[str, Any]]] = k8s.get_ip_pools()
+    except K8sClientError:
+        ip_pools = None
+    report = analyze(nads, pods, ip_pools, subnets_from_config(config) if config is not None else None,
+                     exhaustion)
+    if ip_pools is None:
+        report.notes.append("Whereabouts IPPools not readable: stale leases not checked")
+    return report
@@ -1,20 +1,51 @@
 # utils/k8s_client.py
 from __future__ import annotations
-from typing import Any, Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from contextlib import contextmanager, nullcontext
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from types import MappingProxyType
+import asyncio
 import base64
+import calendar
+import contextvars
+import functools
+import json
+import math
 import os
 import subprocess
+import threading
+import time
 
-from kubernetes import client, config
+from kubernetes import client, config, watch
 from kubernetes.stream import stream
+from kubernetes.stream.ws_client import ERROR_CHANNEL, STDERR_CHANNEL, STDOUT_CHANNEL
 from kubernetes.client import ApiException
 
+from .addresses import AddressIndex, pod_addresses
+from .cassette import Cassette, CassetteMiss
+from .deadline import current as _current_deadline
+from .exec_pool import ExecSessionPool, ExecSessionUnavailable
+from .exec_stream import DEFAULT_SPILL_BYTES, AsyncExecStream, ChunkSource, ExecStream, Matcher, StreamStopped, replay
+from .metrics import CallRecorder
+from .probes import ProbeCache, pod_generations, probe_key
+from .rate_limit import UNLIMITED, RateLimiter
+
+try:
+    import orjson  # optional, noticeably faster on large list responses
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover - stdlib fallback
+    _loads = json.loads
+
 
 class K8sClientError(Exception):
     pass
 
 
+class DeadlineExceeded(K8sClientError):
+    """The test's deadline (utils/deadline.py) passed before this call could start."""
+
+
 @dataclass
 class ExecResult:
     """Result of exec_in_pod, compatible with subprocess.CompletedProcess"""
@@ -26,15 +57,459 @@ class ExecResult:
         return self.returncode == 0
 
 
+@dataclass
+class WaitResult:
+    """Outcome of a K8sClient.wait_for_* call; truthy when the condition was met."""
+    ok: bool
+    elapsed: float                      # seconds from the start of the wait
+    observed_at: Optional[float] = None  # time.time() when the client received the deciding event
+    items: List[Any] = field(default_factory=list)  # objects that satisfied it
+    resource_version: Optional[str] = None  # last resourceVersion observed
+    # time.time() of the latest lastTransitionTime of the waited-for condition
+    # across items (whole seconds, API server clock); wait_for_pod (Ready) and
+    # wait_for_condition only, None if any item lacks it
+    transitioned_at: Optional[float] = None
+
+    def __bool__(self):
+        return self.ok
+
+
+class ContainerStatusView:
+    """Read-only container status slice of a PodView."""
+
+    __slots__ = ("name", "ready", "restart_count", "state", "image", "image_id")
+
+    def __init__(self, raw: Dict[str, Any]):
+        set_ = object.__setattr__
+        set_(self, "name", raw.get("name", ""))
+        set_(self, "ready", bool(raw.get("ready")))
+        set_(self, "restart_count", raw.get("restartCount") or 0)
+        # state is {"running": {...}} / {"waiting": {...}} / {"terminated": {...}}
+        set_(self, "state", next(iter(raw.get("state") or {}), "unknown"))
+        set_(self, "image", raw.get("image", ""))
+        set_(self, "image_id", raw.get("imageID", ""))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("ContainerStatusView is read-only")
+
+    def __repr__(self) -> str:
+        return f"ContainerStatusView({self.name!r}, state={self.state!r}, restarts={self.restart_count})"
+
+
+class PodView:
+    """
+    Compact read-only view of a pod, built straight from the raw API JSON.
+    Cheaper to build and hold than swagger models or their .to_dict() output;
+    use K8sClient.get_pods() when the full nested dict is needed.
+    """
+
+    __slots__ = (
+        "name", "namespace", "uid", "resource_version", "phase", "node", "ip",
+        "ready", "ready_since", "terminating", "labels", "annotations", "containers", "container_statuses",
+    )
+
+    def __init__(self, raw: Dict[str, Any]):
+        meta = raw.get("metadata") or {}
+        spec = raw.get("spec") or {}
+        status = raw.get("status") or {}
+        set_ = object.__setattr__
+        set_(self, "name", meta.get("name", ""))
+        set_(self, "namespace", meta.get("namespace", ""))
+        set_(self, "uid", meta.get("uid", ""))
+        set_(self, "resource_version", meta.get("resourceVersion", ""))
+        set_(self, "phase", status.get("phase", ""))
+        set_(self, "node", spec.get("nodeName", ""))
+        set_(self, "ip", status.get("podIP", ""))
+        ready = next((c for c in status.get("conditions") or [] if c.get("type") == "Ready"), {})
+        set_(self, "ready", ready.get("status") == "True")
+        # RFC 3339 lastTransitionTime of the Ready condition, "" if unknown
+        set_(self, "ready_since", ready.get("lastTransitionTime") or "")
+        set_(self, "terminating", bool(meta.get("deletionTimestamp")))
+        set_(self, "labels", MappingProxyType(meta.get("labels") or {}))
+        set_(self, "annotations", MappingProxyType(meta.get("annotations") or {}))
+        set_(self, "containers", tuple(c.get("name", "") for c in spec.get("containers") or []))
+        set_(self, "container_statuses", tuple(
+            ContainerStatusView(cs) for cs in status.get("containerStatuses") or []
+        ))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("PodView is read-only")
+
+    def __repr__(self) -> str:
+        return f"PodView({self.namespace}/{self.name}, phase={self.phase!r}, node={self.node!r})"
+
+    @property
+    def restarts(self) -> int:
+        return sum(cs.restart_count for cs in self.container_statuses)
+
+
+# Swagger model used by the dict adapter for each cached kind (custom objects stay raw)
+_MODEL_TYPES = {"pods": "V1Pod", "services": "V1Service", "nodes": "V1Node"}
+
+
+class _RawResponse:
+    """Minimal response shim for ApiClient.deserialize on older client releases."""
+
+    def __init__(self, data: str):
+        self.data = data
+
+
+def _to_model_dict(api_client: client.ApiClient, raw: Dict[str, Any], type_name: str) -> Dict[str, Any]:
+    """Raw API JSON -> swagger .to_dict() shape (the legacy dict API)."""
+    text = json.dumps(raw)
+    try:
+        model = api_client.deserialize(text, type_name, "application/json")
+    except TypeError:
+        model = api_client.deserialize(_RawResponse(text), type_name)
+    return model.to_dict()
+
+
+def _resource_version(meta: Dict[str, Any]) -> Optional[str]:
+    return meta.get("resource_version") or meta.get("resourceVersion")
+
+
+def _call_target(func, args: tuple, kwargs: Dict[str, Any]) -> str:
+    """Per-target label for call metrics, e.g. 'list_namespaced_pod 5g app=amf'."""
+    parts = [getattr(func, "__name__", "call")] + [a for a in args if isinstance(a, str)]
+    parts += [kwargs[k] for k in ("label_selector", "field_selector") if kwargs.get(k)]
+    return " ".join(parts)
+
+
+def _request_kwargs(what: str) -> Dict[str, Any]:
+    """
+    {"_request_timeout": seconds left} under a test deadline, {} without one;
+    raises DeadlineExceeded once the deadline has passed.
+    """
+    dl = _current_deadline()
+    if dl is None:
+        return {}
+    left = dl.remaining()
+    if left <= 0:
+        raise DeadlineExceeded(f"{what}: {dl.describe()}")
+    return {"_request_timeout": left}
+
+
+@contextmanager
+def _limited(limiter: RateLimiter, kind: str, what: str) -> Iterator[Dict[str, Any]]:
+    """
+    Hold a limiter grant for one short request and yield its request kwargs,
+    timed from what is left of the deadline once the grant came through.
+    """
+    with limiter.request(kind) as granted:
+        if not granted:
+            raise DeadlineExceeded(f"{what}: {_current_deadline().describe()}")
+        yield _request_kwargs(what)
+
+
+def _raw_list(
+    list_func,
+    args: tuple,
+    kwargs: Dict[str, Any],
+    limiter: RateLimiter = UNLIMITED,
+    recorder: Optional[CallRecorder] = None,
+    op: str = "list",
+    kind: str = "list",
+) -> Dict[str, Any]:
+    """Fast list path: skip swagger deserialization and decode the raw bytes."""
+    target = _call_target(list_func, args, kwargs)
+    with _limited(limiter, kind, f"{op} {target}") as request:
+        timed = recorder.call(op, target) if recorder else nullcontext({})
+        with timed as call:
+            resp = list_func(*args, _preload_content=False, **kwargs, **request)
+            try:
+                call["bytes"] = len(resp.data)
+                return _loads(resp.data)
+            finally:
+                resp.release_conn()
+
+
+# exec_many target: (pod_name, namespace), a get_pods() dict or a PodView
+ExecTarget = Union[Tuple[str, str], Dict[str, Any], PodView]
+
+# Extra seconds past an exec's own timeout before exec_many gives up on it
+EXEC_DEADLINE_GRACE = 5
+
+
+def _kubectl_argv(args: List[str], namespace: Optional[str]) -> List[str]:
+    kubeconfig = os.environ.get("KUBECONFIG", "")
+    cmd = ["kubectl"]
+    if kubeconfig:
+        cmd.extend(["--kubeconfig", kubeconfig])
+    if namespace:
+        cmd.extend(["-n", namespace])
+    cmd.extend(args)
+    return cmd
+
+
+# rollout_restart / scale kind aliases -> AppsV1Api resource suffix
+_WORKLOAD_KINDS = {
+    "deployment": "deployment", "deploy": "deployment",
+    "daemonset": "daemon_set", "ds": "daemon_set",
+    "statefulset": "stateful_set", "sts": "stateful_set",
+}
+
+# AppsV1Api resource suffix -> _list_call kind
+_APPS_LIST_KINDS = {"deployment": "deployments", "daemon_set": "daemonsets", "stateful_set": "statefulsets"}
+
+
+def _rollout_complete(obj: Dict[str, Any], resource: str) -> bool:
+    """kubectl rollout status semantics on raw workload JSON."""
+    meta, spec, st = obj.get("metadata") or {}, obj.get("spec") or {}, obj.get("status") or {}
+    if (st.get("observedGeneration") or 0) < (meta.get("generation") or 0):
+        return False
+    if resource == "daemon_set":
+        desired = st.get("desiredNumberScheduled") or 0
+        return (st.get("updatedNumberScheduled") or 0) >= desired and (st.get("numberAvailable") or 0) >= desired
+    replicas = spec.get("replicas", 1)
+    updated = st.get("updatedReplicas") or 0
+    if resource == "deployment":
+        # no old-ReplicaSet pods left and all new ones available
+        return updated >= replicas and (st.get("replicas") or 0) <= updated \
+            and (st.get("availableReplicas") or 0) >= replicas
+    return updated >= replicas and (st.get("readyReplicas") or 0) >= replicas \
+        and st.get("currentRevision") == st.get("updateRevision")
+
+
+def _has_condition(obj: Dict[str, Any], condition_type: str, status: str) -> bool:
+    return any(
+        c.get("type") == condition_type and c.get("status") == status
+        for c in (obj.get("status") or {}).get("conditions") or []
+    )
+
+
+def _condition_since(obj: Dict[str, Any], condition_type: str) -> str:
+    for c in (obj.get("status") or {}).get("conditions") or []:
+        if c.get("type") == condition_type:
+            return c.get("lastTransitionTime") or ""
+    return ""
+
+
+def _latest_transition(stamps: Iterable[str]) -> Optional[float]:
+    """Latest of RFC 3339 API timestamps as time.time() seconds; None if any is missing."""
+    times = []
+    for stamp in stamps:
+        try:
+            times.append(calendar.timegm(time.strptime(stamp, "%Y-%m-%dT%H:%M:%SZ")))
+        except ValueError:
+            return None
+    return float(max(times)) if times else None
+
+
+# Newer clients default dict patch bodies to json-patch; pin what kubectl sends
+_STRATEGIC_MERGE_PATCH = "application/strategic-merge-patch+json"
+
+
+def _mutation_rv(limiter: RateLimiter, recorder: Optional[CallRecorder], func, *args: Any, **kwargs: Any) -> str:
+    """Call a write API with the raw response and return the object's new resourceVersion."""
+    try:
+        body = _raw_list(func, args, kwargs, limiter, recorder, op="mutate", kind="write")
+    except ApiException as e:
+        raise K8sClientError(f"{func.__name__} failed: {e.status} {e.reason}")
+    return _resource_version(body.get("metadata") or {}) or ""
+
+
+def _exec_outcome(returncode: int) -> str:
+    if returncode == 0:
+        return "ok"
+    return "timeout" if returncode == 124 else f"rc={returncode}"
+
+
+def _exec_status(ws) -> Tuple[int, str]:
+    """
+    (exit code, message) from the v1 Status an exec websocket sends on its
+    error channel once the command is done: 0 for Success, the ExitCode cause
+    for NonZeroExitCode, 1 plus the message for anything else (or no status).
+    """
+    try:
+        status = json.loads(ws.read_channel(ERROR_CHANNEL, timeout=0) or "null")
+    except ValueError:
+        status = None
+    if not isinstance(status, dict):
+        return 1, "no exit status from the exec stream"
+    if status.get("status") == "Success":
+        return 0, ""
+    for cause in (status.get("details") or {}).get("causes") or []:
+        if cause.get("reason") == "ExitCode":
+            try:
+                return int(cause.get("message")), ""
+            except (TypeError, ValueError):
+                break
+    return 1, status.get("message") or status.get("reason") or "exec failed"
+
+
+def _exec_target(target: ExecTarget) -> Tuple[str, str]:
+    if isinstance(target, PodView):
+        return target.name, target.namespace
+    if isinstance(target, dict):
+        meta = target["metadata"]
+        return meta["name"], meta["namespace"]
+    pod_name, namespace = target
+    return pod_name, namespace
+
+
+class _Informer:
+    """
+    List-then-watch cache for one resource kind in one namespace
+    ("" = all namespaces), optionally narrowed by label/field selectors
+    that are evaluated server-side, in the spirit of client-go informers.
+    - start() does the initial list synchronously, then a daemon thread
+      keeps the store current from a watch that resumes at the last
+      resourceVersion. A 410 Gone or a broken stream triggers a relist.
+    - While the watch is down the informer reports unhealthy and callers
+      fall back to a live list instead of serving stale data.
+    - The store holds raw API JSON; items(convert) memoizes each conversion
+      (PodView, legacy dict) per object resourceVersion.
+    """
+
+    WATCH_TIMEOUT = 300  # seconds per watch request before it is renewed
+    RETRY_DELAY = 2
+
+    def __init__(
+        self,
+        list_func,
+        *args: Any,
+        limiter: RateLimiter = UNLIMITED,
+        recorder: Optional[CallRecorder] = None,
+        **kwargs: Any,
+    ):
+        self._list_func = list_func
+        self._limiter = limiter
+        self._recorder = recorder
+        self._args = args
+        self._kwargs = kwargs
+        self._items: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._memo: Dict[Callable, Dict[Tuple[str, str], Tuple[Optional[str], Any]]] = {}
+        self._lock = threading.Lock()
+        self._healthy = threading.Event()
+        self._stopped = threading.Event()
+        self._watch: Optional[watch.Watch] = None
+        self._thread: Optional[threading.Thread] = None
+        self.resource_version: Optional[str] = None
+
+    @staticmethod
+    def _key(item: Dict[str, Any]) -> Tuple[str, str]:
+        meta = item.get("metadata") or {}
+        return (meta.get("namespace") or "", meta.get("name") or "")
+
+    def start(self) -> None:
+        self._relist()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._watch:
+            self._watch.stop()
+
+    @property
+    def healthy(self) -> bool:
+        return self._healthy.is_set() and not self._stopped.is_set()
+
+    def items(
+        self,
+        convert: Optional[Callable[[Dict[str, Any]], Any]] = None,
+        namespace: Optional[str] = None,
+    ) -> List[Any]:
+        # Same (namespace, name) order a plain list call returns
+        with self._lock:
+            keys = sorted(k for k in self._items if namespace is None or k[0] == namespace)
+            if convert is None:
+                return [self._items[k] for k in keys]
+            memo = self._memo.setdefault(convert, {})
+            out = []
+            for k in keys:
+                raw = self._items[k]
+                rv = _resource_version(raw.get("metadata") or {})
+                hit = memo.get(k)
+                if hit is None or hit[0] != rv:
+                    hit = memo[k] = (rv, convert(raw))
+                out.append(hit[1])
+            return out
+
+    def _relist(self) -> None:
+        resp = _raw_list(self._list_func, self._args, self._kwargs, self._limiter, self._recorder)
+        items = {self._key(i): i for i in resp.get("items") or []}
+        with self._lock:
+            self._items = items
+            self._memo = {}
+            self.resource_version = _resource_version(resp.get("metadata") or {})
+        self._healthy.set()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                self._limiter.wait("watch")
+                self._watch = watch.Watch()
+                for event in self._watch.stream(
+                    self._list_func,
+                    *self._args,
+                    **self._kwargs,
+                    resource_version=self.resource_version,
+                    timeout_seconds=self.WATCH_TIMEOUT,
+                ):
+                    self._apply(event["type"], event["raw_object"])
+            except Exception:
+                # Expired resourceVersion (410) or dropped stream: resync
+                self._healthy.clear()
+                while not self._stopped.is_set():
+                    try:
+                        self._relist()
+                        break
+                    except Exception:
+                        time.sleep(self.RETRY_DELAY)
+
+    def _apply(self, event_type: str, obj: Dict[str, Any]) -> None:
+        key = self._key(obj)
+        with self._lock:
+            if event_type == "DELETED":
+                self._items.pop(key, None)
+                for memo in self._memo.values():
+                    memo.pop(key, None)
+            elif event_type in ("ADDED", "MODIFIED"):
+                self._items[key] = obj
+            rv = _resource_version(obj.get("metadata") or {})
+            if rv:
+                self.resource_version = rv
+
+
 class K8sClient:
     """
     Thin wrapper over kubernetes Python client.
     Uses only API calls; no subprocess/kubectl.
+
+    Reads come from watch-backed informers (fresh=True forces a live list)
+    and non-TTY execs from pooled shell sessions. Options: rate_limits and
+    probe_cache take test_config.yaml global.api_rate_limits and
+    global.probe_cache; cassette records or replays every call
+    (utils/cassette.py); core_api/apps_api/custom_api inject pre-built API
+    objects (FakeK8sClient) instead of loading a kubeconfig.
     """
 
-    def __init__(self, kubeconfig_path: Optional[str] = None, context: Optional[str] = None):
+    def __init__(
+        self,
+        kubeconfig_path: Optional[str] = None,
+        context: Optional[str] = None,
+        cache: bool = True,
+        exec_sessions: bool = True,
+        max_exec_inflight: int = 16,
+        rate_limits: Optional[Dict[str, Any]] = None,
+        calls: Optional[CallRecorder] = None,
+        cassette: Optional[Cassette] = None,
+        probe_cache: Optional[Dict[str, Any]] = None,
+        core_api: Optional[client.CoreV1Api] = None,
+        apps_api: Optional[client.AppsV1Api] = None,
+        custom_api: Optional[client.CustomObjectsApi] = None,
+    ):
+        self.cassette = cassette or Cassette.from_env()
+        replaying = self.cassette is not None and self.cassette.replaying
         kubeconfig_path = kubeconfig_path or os.environ.get("KUBECONFIG")
-        if kubeconfig_path and os.path.exists(kubeconfig_path):
+        if replaying:
+            # Everything comes off the cassette; sleeps advance a virtual clock
+            cache = exec_sessions = False
+            self.cassette.clock.install()
+        elif core_api is not None:
+            pass  # injected API objects (FakeK8sClient): no kubeconfig to load
+        elif kubeconfig_path and os.path.exists(kubeconfig_path):
             config.load_kube_config(config_file=kubeconfig_path, context=context)
         else:
             # Fallback for in-cluster (not typical here, but harmless)
@@ -44,41 +519,269 @@ class K8sClient:
                 raise K8sClientError(
                     f"Cannot load kubeconfig at '{kubeconfig_path}' and not in cluster: {e}"
                 )
-        self.core = client.CoreV1Api()
-        self.custom = client.CustomObjectsApi()
+        if core_api is not None:
+            self.core, self.apps, self.custom = core_api, apps_api, custom_api
+        else:
+            self.core = client.CoreV1Api()
+            self.apps = client.AppsV1Api()
+            self.custom = client.CustomObjectsApi()
+        self.cache_enabled = cache
+        # Client-side API budget (global.api_rate_limits); unlimited when not configured
+        self.limiter = RateLimiter.from_config(rate_limits)
+        # Per-call latency/bytes/outcome; the shared recorder writes $K8S_CALL_LOG
+        self.calls = calls or CallRecorder.shared()
+        # raw JSON -> legacy swagger dict, one stable callable per kind for memoization
+        self._dict_adapters: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+            kind: functools.partial(_to_model_dict, self.core.api_client, type_name=type_name)
+            for kind, type_name in _MODEL_TYPES.items()
+        }
+        self._informers: Dict[Tuple[str, str, str, str], _Informer] = {}
+        self._informers_lock = threading.Lock()
+        self._informer_starts: Dict[Tuple[str, str, str, str], threading.Lock] = {}
+        self._address_indexes: Dict[str, AddressIndex] = {}
+        # Recorded/replayed runs keep every exec on the tape
+        self.probes = ProbeCache.from_config(probe_cache)
+        if self.cassette is not None:
+            self.probes.enabled = False
+        # Exec connects get ApiClients of their own: stream() swaps call_api on
+        # the client it is given for the whole handshake, which must not leak
+        # into list/watch calls or into another exec connecting at the same time.
+        self._exec_cores: List[client.CoreV1Api] = []
+        self._exec_lock = threading.Lock()
+        self._exec_slots = threading.Semaphore(max_exec_inflight)
+        self._exec_pool = ExecSessionPool(self._open_shell) if exec_sessions else None
 
-    # ---------- Core getters ----------
+    def close(self) -> None:
+        """Stop all informer watches, close pooled exec sessions and save a recording."""
+        with self._informers_lock:
+            informers, self._informers = list(self._informers.values()), {}
+        for inf in informers:
+            inf.stop()
+        if self._exec_pool is not None:
+            self._exec_pool.close_all()
+        with self._exec_lock:
+            cores, self._exec_cores = self._exec_cores, []
+        for core in cores:
+            core.api_client.close()
+        if self.cassette is not None:
+            self.cassette.close()
 
-    def get_nodes(self) -> List[Dict[str, Any]]:
-        return self.core.list_node().to_dict().get("items", [])
+    def _taped(
+        self,
+        key: tuple,
+        call: Callable[[], Any],
+        encode: Callable[[Any], Any] = lambda v: v,
+        decode: Callable[[Any], Any] = lambda v: v,
+    ) -> Any:
+        """
+        Run call() through the cassette, if any: record its result (or its
+        K8sClientError) under key, or replay the recorded one instead.
+        """
+        tape = self.cassette
+        if tape is None:
+            return call()
+        if tape.replaying:
+            try:
+                entry = tape.replay(key)
+            except CassetteMiss as e:
+                raise K8sClientError(str(e))
+            if "error" in entry:
+                raise K8sClientError(entry["error"])
+            return decode(entry["value"])
+        try:
+            value = call()
+        except K8sClientError as e:
+            tape.record(key, {"error": str(e)})
+            raise
+        tape.record(key, {"value": encode(value)})
+        return value
 
-    def get_pods(self, namespace: Optional[str] = None) -> List[Dict[str, Any]]:
-        ns = namespace or ""
-        if ns:
-            pods = self.core.list_namespaced_pod(ns)
-        else:
-            pods = self.core.list_pod_for_all_namespaces()
-        return pods.to_dict().get("items", [])
+    # ---------- Informer cache ----------
 
-    def get_services(self, namespace: Optional[str] = None) -> List[Dict[str, Any]]:
-        ns = namespace or ""
-        if ns:
-            svcs = self.core.list_namespaced_service(ns)
-        else:
-            svcs = self.core.list_service_for_all_namespaces()
-        return svcs.to_dict().get("items", [])
+    def _list_call(self, kind: str, namespace: str) -> Tuple[Any, tuple]:
+        """(list function, positional args) for a kind, namespaced or cluster-wide."""
+        if kind == "pods":
+            return (self.core.list_namespaced_pod, (namespace,)) if namespace \
+                else (self.core.list_pod_for_all_namespaces, ())
+        if kind == "services":
+            return (self.core.list_namespaced_service, (namespace,)) if namespace \
+                else (self.core.list_service_for_all_namespaces, ())
+        if kind == "nodes":
+            return self.core.list_node, ()
+        if kind == "configmaps":
+            return (self.core.list_namespaced_config_map, (namespace,)) if namespace \
+                else (self.core.list_config_map_for_all_namespaces, ())
+        if kind in _APPS_LIST_KINDS.values():
+            resource = next(r for r, k in _APPS_LIST_KINDS.items() if k == kind)
+            return (getattr(self.apps, f"list_namespaced_{resource}"), (namespace,)) if namespace \
+                else (getattr(self.apps, f"list_{resource}_for_all_namespaces"), ())
+        if kind == "network-attachment-definitions":
+            # Multus CRD: k8s.cni.cncf.io/v1 NetworkAttachmentDefinition
+            group, version = "k8s.cni.cncf.io", "v1"
+            if namespace:
+                return self.custom.list_namespaced_custom_object, (group, version, namespace, kind)
+            return self.custom.list_cluster_custom_object, (group, version, kind)
+        if kind == "ippools":
+            # Whereabouts IPAM leases: whereabouts.cni.cncf.io/v1alpha1 IPPool
+            group, version = "whereabouts.cni.cncf.io", "v1alpha1"
+            if namespace:
+                return self.custom.list_namespaced_custom_object, (group, version, namespace, kind)
+            return self.custom.list_cluster_custom_object, (group, version, kind)
+        raise K8sClientError(f"unsupported kind: {kind}")
 
-    def get_network_attachments(self, namespace: Optional[str] = None) -> List[Dict[str, Any]]:
-        # Multus CRD: k8s.cni.cncf.io/v1 NetworkAttachmentDefinition
+    def _list(
+        self,
+        kind: str,
+        namespace: Optional[str],
+        fresh: bool,
+        label_selector: Optional[str] = None,
+        field_selector: Optional[str] = None,
+        convert: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    ) -> List[Any]:
+        """_list_items, with the raw items recorded to / replayed from the cassette."""
+        if self.cassette is None:
+            return self._list_items(kind, namespace, fresh, label_selector, field_selector, convert)
+        items = self._taped(
+            ("list", kind, namespace or "", label_selector, field_selector),
+            lambda: self._list_items(kind, namespace, fresh, label_selector, field_selector),
+        )
+        return [convert(i) for i in items] if convert else items
+
+    def _cached_informer(
+        self, key: Tuple[str, str, str, str], kind: str, ns: str, kwargs: Dict[str, Any]
+    ) -> Tuple[Optional[_Informer], Optional[_Informer]]:
+        """(informer for key, unfiltered cluster-wide informer for kind if one covers ns)."""
+        with self._informers_lock:
+            inf = self._informers.get(key)
+            # An unfiltered cluster-wide informer already covers every namespace
+            wide = self._informers.get((kind, "", "", "")) if ns and not kwargs else None
+        return inf, wide
+
+    def _list_items(
+        self,
+        kind: str,
+        namespace: Optional[str],
+        fresh: bool,
+        label_selector: Optional[str] = None,
+        field_selector: Optional[str] = None,
+        convert: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    ) -> List[Any]:
+        """
+        List `kind` through the raw-JSON fast path, from an informer unless
+        fresh/uncached. There is one informer per kind, namespace and selector
+        pair; selectors use the API server syntax, e.g. "app in
+        (upf-edge,upf-cloud)", "status.phase=Running". `convert` maps each raw
+        item (e.g. PodView or the legacy dict adapter); None returns the raw
+        API dicts.
+        """
         ns = namespace or ""
-        group = "k8s.cni.cncf.io"
-        version = "v1"
-        plural = "network-attachment-definitions"
-        if ns:
-            obj = self.custom.list_namespaced_custom_object(group, version, ns, plural)
-        else:
-            obj = self.custom.list_cluster_custom_object(group, version, plural)
-        return obj.get("items", [])
+        func, args = self._list_call(kind, ns)
+        kwargs = {}
+        if label_selector:
+            kwargs["label_selector"] = label_selector
+        if field_selector:
+            kwargs["field_selector"] = field_selector
+
+        def live() -> List[Any]:
+            items = _raw_list(func, args, kwargs, self.limiter, self.calls).get("items") or []
+            return [convert(i) for i in items] if convert else items
+
+        if fresh or not self.cache_enabled:
+            return live()
+
+        key = (kind, ns, label_selector or "", field_selector or "")
+        inf, wide = self._cached_informer(key, kind, ns, kwargs)
+        if inf is None and wide is None:
+            # The first list is slow and rate-limited: hold only this key's start
+            # lock over it, so other kinds and namespaces are not kept waiting
+            with self._informers_lock:
+                starting = self._informer_starts.setdefault(key, threading.Lock())
+            with starting:
+                inf, wide = self._cached_informer(key, kind, ns, kwargs)
+                if inf is None and wide is None:
+                    inf = _Informer(func, *args, limiter=self.limiter, recorder=self.calls, **kwargs)
+                    inf.start()
+                    with self._informers_lock:
+                        self._informers[key] = inf
+
+        if inf is None and wide is not None and wide.healthy:
+            return wide.items(convert, namespace=ns)
+        if inf is not None and inf.healthy:
+            return inf.items(convert)
+        return live()
+
+    # ---------- Core getters ----------
+    # get_* return the legacy swagger .to_dict() shape (snake_case keys);
+    # list_pods returns PodView records and skips that conversion entirely.
+
+    def list_pods(
+        self,
+        namespace: Optional[str] = None,
+        label_selector: Optional[str] = None,
+        field_selector: Optional[str] = None,
+        fresh: bool = False,
+    ) -> List[PodView]:
+        return self._list("pods", namespace, fresh, label_selector, field_selector, convert=PodView)
+
+    def get_nodes(
+        self, label_selector: Optional[str] = None, fresh: bool = False
+    ) -> List[Dict[str, Any]]:
+        return self._list("nodes", None, fresh, label_selector, convert=self._dict_adapters["nodes"])
+
+    def get_pods(
+        self,
+        namespace: Optional[str] = None,
+        label_selector: Optional[str] = None,
+        field_selector: Optional[str] = None,
+        fresh: bool = False,
+    ) -> List[Dict[str, Any]]:
+        return self._list(
+            "pods", namespace, fresh, label_selector, field_selector,
+            convert=self._dict_adapters["pods"],
+        )
+
+    def get_services(
+        self,
+        namespace: Optional[str] = None,
+        label_selector: Optional[str] = None,
+        fresh: bool = False,
+    ) -> List[Dict[str, Any]]:
+        return self._list(
+            "services", namespace, fresh, label_selector, convert=self._dict_adapters["services"]
+        )
+
+    def get_network_attachments(
+        self, namespace: Optional[str] = None, fresh: bool = False
+    ) -> List[Dict[str, Any]]:
+        return self._list("network-attachment-definitions", namespace, fresh)
+
+    def get_configmaps(
+        self, namespace: Optional[str] = None, label_selector: Optional[str] = None, fresh: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Raw ConfigMap JSON (data/binaryData as stored)."""
+        return self._list("configmaps", namespace, fresh, label_selector)
+
+    def get_ip_pools(self, namespace: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Raw Whereabouts IPPool JSON (spec.range, spec.allocations), always
+        listed live; K8sClientError if the CRD is not installed.
+        """
+        try:
+            return self._list("ippools", namespace, fresh=True)
+        except ApiException as e:
+            raise K8sClientError(f"list ippools failed: {e.status} {e.reason}")
+
+    def address_index(self, namespace: Optional[str] = None, fresh: bool = False) -> AddressIndex:
+        """
+        Pod -> interface -> IPs and IP -> pod for `namespace` (None = all),
+        from pod status and Multus network-status (utils/addresses.py). The
+        index is kept per namespace and brought up to date from the pod cache
+        on every call.
+        """
+        pods = self._list("pods", namespace, fresh, convert=pod_addresses)
+        with self._informers_lock:
+            index = self._address_indexes.setdefault(namespace or "", AddressIndex())
+        return index.update(pods)
 
     # ---------- Logs / Events ----------
 
@@ -89,24 +792,38 @@ class K8sClient:
         container: Optional[str] = None,
         tail_lines: int = 200,
     ) -> str:
+        return self._taped(("log", namespace, pod_name, container, tail_lines),
+                           lambda: self._read_pod_logs(pod_name, namespace, container, tail_lines))
+
+    def _read_pod_logs(self, pod_name: str, namespace: str, container: Optional[str], tail_lines: int) -> str:
         try:
-            return self.core.read_namespaced_pod_log(
-                name=pod_name,
-                namespace=namespace,
-                container=container,
-                tail_lines=tail_lines,
-                timestamps=False,
-            )
+            with _limited(self.limiter, "log", f"log {namespace}/{pod_name}") as request, \
+                    self.calls.call("log", f"{namespace}/{pod_name}") as call:
+                logs = self.core.read_namespaced_pod_log(
+                    name=pod_name,
+                    namespace=namespace,
+                    container=container,
+                    tail_lines=tail_lines,
+                    timestamps=False,
+                    **request,
+                )
+                call["bytes"] = len(logs or "")
+                return logs
         except ApiException as e:
             raise K8sClientError(f"read log failed: {e}")
 
     def get_pod_events(self, pod_name: str, namespace: str) -> List[Dict[str, Any]]:
+        return self._taped(("events", namespace, pod_name), lambda: self._list_pod_events(pod_name, namespace))
+
+    def _list_pod_events(self, pod_name: str, namespace: str) -> List[Dict[str, Any]]:
         # Filter events by field selector for this pod
         try:
             field_selector = f"involvedObject.kind=Pod,involvedObject.name={pod_name},involvedObject.namespace={namespace}"
-            ev = self.core.list_namespaced_event(
-                namespace=namespace, field_selector=field_selector
-            )
+            with _limited(self.limiter, "list", f"events {namespace}/{pod_name}") as request, \
+                    self.calls.call("events", f"{namespace}/{pod_name}"):
+                ev = self.core.list_namespaced_event(
+                    namespace=namespace, field_selector=field_selector, **request
+                )
             return ev.to_dict().get("items", [])
         except ApiException as e:
             raise K8sClientError(f"list events failed: {e}")
@@ -119,12 +836,95 @@ class K8sClient:
         return containers[0]["name"] if containers else None
 
     def _get_pod(self, pod_name: str, namespace: str) -> Dict[str, Any]:
+        return self._taped(("pod", namespace, pod_name), lambda: self._read_pod(pod_name, namespace))
+
+    def _read_pod(self, pod_name: str, namespace: str) -> Dict[str, Any]:
         try:
-            pod = self.core.read_namespaced_pod(pod_name, namespace)
+            with _limited(self.limiter, "list", f"get {namespace}/{pod_name}") as request, \
+                    self.calls.call("get", f"{namespace}/{pod_name}"):
+                pod = self.core.read_namespaced_pod(pod_name, namespace, **request)
             return pod.to_dict()
         except ApiException as e:
             raise K8sClientError(f"get pod failed: {e}")
 
+    def _open_exec(
+        self,
+        pod_name: str,
+        namespace: str,
+        container: Optional[str],
+        command: List[str],
+        stdin: bool = False,
+        tty: bool = False,
+    ):
+        """Connect an exec websocket and return the open WSClient."""
+        self.limiter.wait("exec")
+        # stream() patches the ApiClient while connecting: one idle client per
+        # connect in flight, so concurrent handshakes don't wait on each other
+        with self._exec_lock:
+            core = self._exec_cores.pop() if self._exec_cores else None
+        if core is None:
+            core = client.CoreV1Api(client.ApiClient())
+        try:
+            with self.calls.call("exec_connect", f"{namespace}/{pod_name}"):
+                return stream(
+                    core.connect_get_namespaced_pod_exec,
+                    name=pod_name,
+                    namespace=namespace,
+                    container=container,
+                    command=command,
+                    stderr=True,
+                    stdin=stdin,
+                    stdout=True,
+                    tty=tty,
+                    _preload_content=False,
+                )
+        finally:
+            with self._exec_lock:
+                self._exec_cores.append(core)
+
+    def _open_shell(self, pod_name: str, namespace: str, container: Optional[str]):
+        """Open an interactive /bin/sh exec stream for the session pool."""
+        return self._open_exec(pod_name, namespace, container, ["/bin/sh"], stdin=True)
+
+    def _oneshot_exec(
+        self,
+        pod_name: str,
+        namespace: str,
+        container: Optional[str],
+        command: List[str],
+        tty: bool,
+        timeout: int,
+    ) -> ExecResult:
+        ws = self._open_exec(pod_name, namespace, container, command, tty=tty)
+        try:
+            ws.run_forever(timeout=timeout)
+            if ws.is_open():
+                return ExecResult(stdout=ws.read_all(), stderr="Command timed out", returncode=124)
+            returncode, message = _exec_status(ws)
+            return ExecResult(stdout=ws.read_all(), stderr=message, returncode=returncode)
+        finally:
+            ws.close()
+
+    def _pooled_exec(
+        self,
+        pod_name: str,
+        namespace: str,
+        command: List[str],
+        container: Optional[str],
+        timeout: int,
+    ) -> Optional[ExecResult]:
+        """Run on a pooled session; None means fall back to a one-shot exec."""
+        try:
+            stdout, stderr, rc = self._exec_pool.run(pod_name, namespace, command, container, timeout)
+        except ExecSessionUnavailable:
+            return None  # never sent: safe to run one-shot
+        except Exception as e:
+            # The command may have run; re-running could duplicate side effects
+            return ExecResult(stdout="", stderr=str(e), returncode=1)
+        if rc is None:
+            return ExecResult(stdout=stdout, stderr=stderr + "Command timed out", returncode=124)
+        return ExecResult(stdout=stdout, stderr=stderr, returncode=rc)
+
     def exec_in_pod(
         self,
         pod_name: str,
@@ -139,22 +939,64 @@ class K8sClient:
         Executes a command inside a pod.
         - If `container` is None, Kubernetes may still require it when multiple containers exist.
         - On 'container not found' errors, it retries automatically with the first non-init container.
+        - Non-TTY commands reuse a pooled shell session, which reports stderr separately; the
+          one-shot fallback merges stderr into stdout. Both report the real exit code (124 on timeout).
         Returns ExecResult with stdout, stderr, returncode.
+        Commands that are not read-only probes drop the pod's cached probes.
         """
+        if not self.probes.read_only(command):
+            self.probes.invalidate(namespace, pod_name)
+        with self._exec_slots:
+            return self._exec(pod_name, namespace, command, container, tty, timeout, retry_if_not_found)
+
+    def _exec(
+        self,
+        pod_name: str,
+        namespace: str,
+        command: List[str],
+        container: Optional[str] = None,
+        tty: bool = False,
+        timeout: int = 60,
+        retry_if_not_found: bool = True,
+    ) -> ExecResult:
+        """Timed (and taped) exec_in_pod body; the caller holds an in-flight slot."""
+        dl = _current_deadline()
+        if dl is not None:
+            timeout = dl.clip(timeout)
+        with self.calls.call("exec", f"{namespace}/{pod_name}") as call:
+            if dl is not None and timeout <= 0:
+                result = ExecResult(stdout="", stderr=dl.describe(), returncode=124)
+            else:
+                try:
+                    result = self._taped(
+                        ("exec", namespace, pod_name, container, command, tty),
+                        lambda: self._run_exec(pod_name, namespace, command, container, tty, timeout, retry_if_not_found),
+                        encode=asdict,
+                        decode=lambda d: ExecResult(**d),
+                    )
+                except K8sClientError as e:
+                    result = ExecResult(stdout="", stderr=str(e), returncode=124 if isinstance(e, DeadlineExceeded) else 1)
+            call["bytes"] = len(result.stdout) + len(result.stderr)
+            call["outcome"] = _exec_outcome(result.returncode)
+            return result
+
+    def _run_exec(
+        self,
+        pod_name: str,
+        namespace: str,
+        command: List[str],
+        container: Optional[str] = None,
+        tty: bool = False,
+        timeout: int = 60,
+        retry_if_not_found: bool = True,
+    ) -> ExecResult:
+        """Pooled exec with one-shot fallback and the container-not-found retry."""
+        if self._exec_pool is not None and not tty:
+            result = self._pooled_exec(pod_name, namespace, command, container, timeout)
+            if result is not None:
+                return result
         try:
-            output = stream(
-                self.core.connect_get_namespaced_pod_exec,
-                name=pod_name,
-                namespace=namespace,
-                container=container,
-                command=command,
-                stderr=True,
-                stdin=False,
-                stdout=True,
-                tty=tty,
-                _request_timeout=timeout,
-            )
-            return ExecResult(stdout=output, stderr="", returncode=0)
+            return self._oneshot_exec(pod_name, namespace, container, command, tty, timeout)
         except ApiException as e:
             msg = getattr(e, "body", "") or str(e)
             needs_retry = retry_if_not_found and ("container not found" in msg.lower())
@@ -163,25 +1005,502 @@ class K8sClient:
                 fallback = self._pick_default_container(pod)
                 if fallback and fallback != container:
                     try:
-                        output = stream(
-                            self.core.connect_get_namespaced_pod_exec,
-                            name=pod_name,
-                            namespace=namespace,
-                            container=fallback,
-                            command=command,
-                            stderr=True,
-                            stdin=False,
-                            stdout=True,
-                            tty=tty,
-                            _request_timeout=timeout,
-                        )
-                        return ExecResult(stdout=output, stderr="", returncode=0)
+                        return self._oneshot_exec(pod_name, namespace, fallback, command, tty, timeout)
                     except ApiException as e2:
                         return ExecResult(stdout="", stderr=str(e2), returncode=1)
             return ExecResult(stdout="", stderr=msg, returncode=1)
         except Exception as e:
             return ExecResult(stdout="", stderr=str(e), returncode=1)
 
+    def exec_many(
+        self,
+        targets: Iterable[ExecTarget],
+        command: List[str],
+        container: Optional[str] = None,
+        concurrency: int = 8,
+        timeout: int = 60,
+    ) -> Iterator[Tuple[Tuple[str, str], ExecResult]]:
+        """
+        Run one command in many pods concurrently.
+        - targets: (pod_name, namespace) pairs, pod dicts from get_pods() or PodViews
+        - at most `concurrency` pods run at once, and each exec also takes a slot
+          from the client-wide in-flight cap (max_exec_inflight)
+        - each pod gets its own `timeout` deadline, counted from when its exec starts
+        Yields ((pod_name, namespace), ExecResult) in completion order; a pod that
+        overruns its deadline yields returncode 124. Leaving the loop early
+        cancels pods that have not started yet.
+        """
+        keys = [_exec_target(t) for t in targets]
+        if not keys:
+            return
+        if not self.probes.read_only(command):
+            self.probes.invalidate_pods(keys)
+        started: Dict[int, float] = {}
+
+        def run(i: int) -> ExecResult:
+            with self._exec_slots:
+                started[i] = time.monotonic()
+                return self._exec(keys[i][0], keys[i][1], command, container, timeout=timeout)
+
+        pool = ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(keys))), thread_name_prefix="exec-many")
+        ctx = contextvars.copy_context()  # keeps the caller's suite tag on each exec's call record
+        futures = {pool.submit(ctx.copy().run, run, i): i for i in range(len(keys))}
+        pending = set(futures)
+        try:
+            while pending:
+                done, pending = wait(pending, timeout=1.0, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    try:
+                        result = fut.result()
+                    except Exception as e:
+                        result = ExecResult(stdout="", stderr=str(e), returncode=1)
+                    yield keys[futures[fut]], result
+                # exec_in_pod enforces `timeout` itself; this only catches a stuck stream
+                cutoff = time.monotonic() - timeout - EXEC_DEADLINE_GRACE
+                for fut in [f for f in pending if started.get(futures[f], cutoff) < cutoff]:
+                    pending.discard(fut)
+                    yield keys[futures[fut]], ExecResult(stdout="", stderr="Deadline exceeded", returncode=124)
+        finally:
+            for fut in pending:
+                fut.cancel()
+            pool.shutdown(wait=False)
+
+    def exec_stream(
+        self,
+        pod_name: str,
+        namespace: str,
+        command: List[str],
+        container: Optional[str] = None,
+        timeout: int = 60,
+        stop: Iterable[Matcher] = (),
+        spill_bytes: int = DEFAULT_SPILL_BYTES,
+    ) -> ExecStream:
+        """
+        Run a command and stream its output (utils/exec_stream.py).
+        - iterate the ExecStream for stdout/stderr chunks as they arrive, or call
+          result() for an ExecResult; returncode comes from the exec status channel
+        - `stop` matchers end the exec at the first stdout line they match
+        - output past spill_bytes per channel is kept in a temporary file
+        The exec starts on the first read. It holds an in-flight slot and is
+        recorded as one "exec_stream" call until it ends. It is always a one-shot
+        exec, since a pooled session cannot be cut short. Under a cassette the
+        command runs through exec_in_pod and its output is replayed through the matchers.
+        """
+        if not self.probes.read_only(command):
+            self.probes.invalidate(namespace, pod_name)
+        dl = _current_deadline()
+        if dl is not None:
+            timeout = dl.clip(timeout)
+        return ExecStream(self._streamed(pod_name, namespace, command, container, timeout, dl), stop, spill_bytes)
+
+    def exec_until(
+        self,
+        pod_name: str,
+        namespace: str,
+        command: List[str],
+        stop: Iterable[Matcher],
+        container: Optional[str] = None,
+        timeout: int = 60,
+    ) -> ExecResult:
+        """exec_stream(...).result(): the output up to the first matching line, or all of it."""
+        return self.exec_stream(pod_name, namespace, command, container, timeout, stop).result()
+
+    def _streamed(
+        self,
+        pod_name: str,
+        namespace: str,
+        command: List[str],
+        container: Optional[str],
+        timeout: int,
+        dl: Any,
+    ) -> ChunkSource:
+        """exec_stream's chunk source: the slot and call record around the live (or taped) exec."""
+        with self._exec_slots, self.calls.call("exec_stream", f"{namespace}/{pod_name}") as call:
+            if dl is not None and timeout <= 0:
+                source = replay(ExecResult(stdout="", stderr=dl.describe(), returncode=124))
+            elif self.cassette is not None:
+                source = replay(self._exec(pod_name, namespace, command, container, timeout=timeout))
+            else:
+                source = self._stream_exec(pod_name, namespace, command, container, timeout)
+            try:
+                while True:
+                    channel, data = next(source)
+                    call["bytes"] += len(data)
+                    yield channel, data
+            except StopIteration as end:
+                call["outcome"] = _exec_outcome(end.value)
+                return end.value
+            except StreamStopped as e:
+                # A stop matcher ended the exec: its verdict is the outcome
+                call["outcome"] = _exec_outcome(e.returncode)
+                return e.returncode
+            except GeneratorExit:
+                # The caller closed the stream before the command exited
+                call["outcome"] = "stopped"
+                return None
+            finally:
+                source.close()
+
+    def _stream_exec(
+        self,
+        pod_name: str,
+        namespace: str,
+        command: List[str],
+        container: Optional[str],
+        timeout: int,
+        retry_if_not_found: bool = True,
+    ) -> ChunkSource:
+        """One-shot exec read frame by frame; closing the generator closes the websocket."""
+        try:
+            ws = self._open_exec(pod_name, namespace, container, command)
+        except ApiException as e:
+            msg = getattr(e, "body", "") or str(e)
+            if retry_if_not_found and "container not found" in msg.lower():
+                fallback = self._pick_default_container(self._get_pod(pod_name, namespace))
+                if fallback and fallback != container:
+                    return (yield from self._stream_exec(pod_name, namespace, command, fallback, timeout, False))
+            yield "stderr", msg
+            return 1
+        except Exception as e:
+            yield "stderr", str(e)
+            return 1
+        try:
+            deadline = time.monotonic() + timeout
+            while ws.is_open():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    yield "stderr", "Command timed out"
+                    return 124
+                ws.update(timeout=min(remaining, 1.0))
+                for channel, name in ((STDOUT_CHANNEL, "stdout"), (STDERR_CHANNEL, "stderr")):
+                    data = ws.read_channel(channel, timeout=0)
+                    if data:
+                        yield name, data
+            for channel, name in ((STDOUT_CHANNEL, "stdout"), (STDERR_CHANNEL, "stderr")):
+                data = ws.read_channel(channel, timeout=0)
+                if data:
+                    yield name, data
+            returncode, message = _exec_status(ws)
+            if message:
+                yield "stderr", message
+            return returncode
+        except Exception as e:
+            yield "stderr", str(e)
+            return 1
+        finally:
+            ws.close()
+
+    def _generations(self, namespace: str) -> Dict[str, Tuple[str, int]]:
+        """pod name -> (uid, restart count) from the pod cache."""
+        return pod_generations(self.list_pods(namespace))
+
+    def probe(
+        self,
+        pod_name: str,
+        namespace: str,
+        command: List[str],
+        container: Optional[str] = None,
+        timeout: int = 60,
+        ttl: Optional[float] = None,
+    ) -> ExecResult:
+        """
+        exec_in_pod for a read-only command, memoized per pod uid/restart count
+        for `ttl` seconds (default: the command's probe_cache TTL; 0 = run it).
+        Pods missing from the pod cache are exec'd uncached.
+        """
+        ttl = self.probes.ttl(command) if ttl is None else ttl
+        generation = self._generations(namespace).get(pod_name) if ttl > 0 else None
+        if generation is None:
+            return self.exec_in_pod(pod_name, namespace, command, container, timeout=timeout)
+        return self.probes.run(
+            probe_key(pod_name, namespace, container, command), generation, ttl,
+            lambda: self.exec_in_pod(pod_name, namespace, command, container, timeout=timeout),
+        )
+
+    def probe_many(
+        self,
+        targets: Iterable[ExecTarget],
+        command: List[str],
+        container: Optional[str] = None,
+        concurrency: int = 8,
+        timeout: int = 60,
+    ) -> Iterator[Tuple[Tuple[str, str], ExecResult]]:
+        """exec_many through the probe cache: cached pods are yielded first, the rest are exec'd."""
+        keys = [_exec_target(t) for t in targets]
+        ttl = self.probes.ttl(command)
+        if ttl <= 0:
+            yield from self.exec_many(keys, command, container, concurrency, timeout)
+            return
+        generations: Dict[str, Dict[str, Tuple[str, int]]] = {}
+        misses = []
+        for name, ns in keys:
+            if ns not in generations:
+                generations[ns] = self._generations(ns)
+            generation = generations[ns].get(name)
+            hit = self.probes.get(probe_key(name, ns, container, command), generation) if generation else None
+            if hit is not None:
+                yield (name, ns), hit
+            else:
+                misses.append((name, ns))
+        started = time.monotonic()
+        for (name, ns), result in self.exec_many(misses, command, container, concurrency, timeout):
+            generation = generations[ns].get(name)
+            if generation is not None:
+                # exec_many does not time pods one by one; charge the batch average
+                cost = (time.monotonic() - started) / len(misses)
+                self.probes.put(probe_key(name, ns, container, command), generation, result, ttl, cost)
+            yield (name, ns), result
+
+    # ---------- Mutations ----------
+    # Each returns the resourceVersion after the write, to watch from that point.
+
+    def _mutate(self, func, *args: Any, **kwargs: Any) -> str:
+        return self._taped(("mutate", _call_target(func, args, kwargs)), lambda: self._write(func, *args, **kwargs))
+
+    def _write(self, func, *args: Any, **kwargs: Any) -> str:
+        return _mutation_rv(self.limiter, self.calls, func, *args, **kwargs)
+
+    def delete_pod(self, pod_name: str, namespace: str, grace_period: Optional[int] = None) -> str:
+        """Delete a pod (grace_period=0 for immediate)."""
+        return self._mutate(
+            self.core.delete_namespaced_pod, pod_name, namespace, grace_period_seconds=grace_period
+        )
+
+    def rollout_restart(self, kind: str, name: str, namespace: str) -> str:
+        """kubectl rollout restart: bump the restartedAt pod-template annotation."""
+        resource = _WORKLOAD_KINDS.get(kind.lower())
+        if not resource:
+            raise K8sClientError(f"rollout restart not supported for kind '{kind}'")
+        restarted_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        body = {"spec": {"template": {"metadata": {"annotations": {
+            "kubectl.kubernetes.io/restartedAt": restarted_at,
+        }}}}}
+        return self._mutate(
+            getattr(self.apps, f"patch_namespaced_{resource}"), name, namespace, body,
+            _content_type=_STRATEGIC_MERGE_PATCH,
+        )
+
+    def scale(self, kind: str, name: str, namespace: str, replicas: int) -> str:
+        """Set replicas on a Deployment or StatefulSet through its scale subresource."""
+        resource = _WORKLOAD_KINDS.get(kind.lower())
+        if resource not in ("deployment", "stateful_set"):
+            raise K8sClientError(f"scale not supported for kind '{kind}'")
+        return self._mutate(
+            getattr(self.apps, f"patch_namespaced_{resource}_scale"),
+            name, namespace, {"spec": {"replicas": replicas}},
+            _content_type=_STRATEGIC_MERGE_PATCH,
+        )
+
+    def cordon(self, node_name: str, unschedulable: bool = True) -> str:
+        """Mark a node unschedulable; cordon(node, False) uncordons it."""
+        return self._mutate(
+            self.core.patch_node, node_name, {"spec": {"unschedulable": unschedulable}},
+            _content_type=_STRATEGIC_MERGE_PATCH,
+        )
+
+    # ---------- Waits ----------
+    # Watch-driven: one list, then events from that resourceVersion; each
+    # returns a WaitResult with the receive time of the deciding event and,
+    # for condition waits, when the API server saw the condition change.
+
+    def _wait_until(
+        self,
+        kind: str,
+        namespace: Optional[str],
+        check: Callable[[List[Dict[str, Any]]], Optional[List[Any]]],
+        timeout: float,
+        label_selector: Optional[str] = None,
+        field_selector: Optional[str] = None,
+    ) -> WaitResult:
+        """_watch_until, recorded as one "wait" call (outcome ok or timeout) and taped."""
+        target = " ".join(filter(None, (kind, namespace, label_selector, field_selector)))
+        dl = _current_deadline()
+        if dl is not None:
+            timeout = dl.clip(timeout)
+        with self.calls.call("wait", target) as call:
+            if self.cassette is None:
+                result = self._watch_until(kind, namespace, check, timeout, label_selector, field_selector)
+            else:
+                result = self._taped_wait(
+                    ("wait", kind, namespace, label_selector, field_selector),
+                    check,
+                    lambda c: self._watch_until(kind, namespace, c, timeout, label_selector, field_selector),
+                )
+            call["outcome"] = "ok" if result.ok else "timeout"
+            return result
+
+    def _taped_wait(
+        self,
+        key: tuple,
+        check: Callable[[List[Dict[str, Any]]], Optional[List[Any]]],
+        run: Callable[[Callable[[List[Dict[str, Any]]], Optional[List[Any]]]], WaitResult],
+    ) -> WaitResult:
+        """
+        Tape a wait as the raw objects that satisfied it; replay re-runs check()
+        on them (so items keep their type) and advances the virtual clock by the
+        recorded elapsed time.
+        """
+        deciding: List[List[Dict[str, Any]]] = [[]]
+
+        def recording_check(objs: List[Dict[str, Any]]) -> Optional[List[Any]]:
+            hit = check(objs)
+            if hit is not None:
+                deciding[0] = objs
+            return hit
+
+        def encode(result: WaitResult) -> Dict[str, Any]:
+            return {"ok": result.ok, "elapsed": result.elapsed, "rv": result.resource_version, "objs": deciding[0]}
+
+        def decode(entry: Dict[str, Any]) -> WaitResult:
+            self.cassette.clock.sleep(entry["elapsed"])
+            if not entry["ok"]:
+                return WaitResult(False, entry["elapsed"], resource_version=entry["rv"])
+            return WaitResult(True, entry["elapsed"], time.time(), check(entry["objs"]) or [], entry["rv"])
+
+        return self._taped(key, lambda: run(recording_check), encode, decode)
+
+    def _watch_until(
+        self,
+        kind: str,
+        namespace: Optional[str],
+        check: Callable[[List[Dict[str, Any]]], Optional[List[Any]]],
+        timeout: float,
+        label_selector: Optional[str] = None,
+        field_selector: Optional[str] = None,
+    ) -> WaitResult:
+        """
+        Re-evaluate check(raw objects) after the initial list and on every watch
+        event until it returns a list (the matching objects) or timeout passes.
+        A dropped stream resumes from the last resourceVersion; 410 Gone relists.
+        """
+        func, args = self._list_call(kind, namespace or "")
+        kwargs = {k: v for k, v in (("label_selector", label_selector), ("field_selector", field_selector)) if v}
+        started = time.monotonic()
+        deadline = started + timeout
+        state: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        rv: Optional[str] = None
+
+        def done(items: List[Any]) -> WaitResult:
+            return WaitResult(True, time.monotonic() - started, time.time(), items, rv)
+
+        while True:
+            if rv is None:
+                body = _raw_list(func, args, kwargs, self.limiter, self.calls)
+                state = {_Informer._key(item): item for item in body.get("items") or []}
+                rv = _resource_version(body.get("metadata") or {})
+                hit = check(list(state.values()))
+                if hit is not None:
+                    return done(hit)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return WaitResult(False, time.monotonic() - started, resource_version=rv)
+            self.limiter.wait("watch")
+            w = watch.Watch()
+            try:
+                for event in w.stream(
+                    func, *args, **kwargs,
+                    resource_version=rv,
+                    timeout_seconds=max(1, math.ceil(remaining)),
+                    allow_watch_bookmarks=True,
+                ):
+                    obj = event["raw_object"]
+                    rv = _resource_version(obj.get("metadata") or {}) or rv
+                    if event["type"] == "DELETED":
+                        state.pop(_Informer._key(obj), None)
+                    elif event["type"] in ("ADDED", "MODIFIED"):
+                        state[_Informer._key(obj)] = obj
+                    else:
+                        continue  # BOOKMARK only advances rv
+                    hit = check(list(state.values()))
+                    if hit is not None:
+                        return done(hit)
+                    if time.monotonic() >= deadline:
+                        break
+            except ApiException as e:
+                if e.status == 410:
+                    rv = None
+                else:
+                    time.sleep(min(_Informer.RETRY_DELAY, max(0.0, deadline - time.monotonic())))
+            except Exception:
+                time.sleep(min(_Informer.RETRY_DELAY, max(0.0, deadline - time.monotonic())))
+            finally:
+                w.stop()
+
+    def wait_for_pod(
+        self,
+        predicate: Callable[[PodView], bool],
+        namespace: Optional[str] = None,
+        label_selector: Optional[str] = None,
+        field_selector: Optional[str] = None,
+        timeout: float = 180,
+        count: int = 1,
+    ) -> WaitResult:
+        """
+        Wait until at least `count` selected pods satisfy predicate(PodView).
+        items holds the matching PodViews, e.g. a replacement AMF:
+            wait_for_pod(lambda p: p.ready and not p.terminating and p.uid != old_uid, "5g", "app=amf")
+        When every match is ready, transitioned_at is when the last of them
+        turned Ready on the API server.
+        """
+        def check(objs: List[Dict[str, Any]]) -> Optional[List[PodView]]:
+            matched = [view for view in map(PodView, objs) if predicate(view)]
+            return matched if len(matched) >= count else None
+
+        result = self._wait_until("pods", namespace, check, timeout, label_selector, field_selector)
+        if result.ok and all(p.ready for p in result.items):
+            result.transitioned_at = _latest_transition(p.ready_since for p in result.items)
+        return result
+
+    def wait_for_deleted(
+        self, kind: str, name: str, namespace: Optional[str] = None, timeout: float = 180, uid: Optional[str] = None
+    ) -> WaitResult:
+        """
+        Wait until the named object is gone. With uid, a same-named replacement
+        (e.g. a StatefulSet pod) counts as the original being deleted.
+        """
+        def check(objs: List[Dict[str, Any]]) -> Optional[List[Any]]:
+            alive = [o for o in objs if not uid or (o.get("metadata") or {}).get("uid") == uid]
+            return None if alive else []
+
+        return self._wait_until(kind, namespace, check, timeout, field_selector=f"metadata.name={name}")
+
+    def wait_for_rollout(self, kind: str, name: str, namespace: str, timeout: float = 300) -> WaitResult:
+        """Wait for a Deployment/DaemonSet/StatefulSet rollout to complete (kubectl rollout status)."""
+        resource = _WORKLOAD_KINDS.get(kind.lower())
+        if not resource:
+            raise K8sClientError(f"rollout status not supported for kind '{kind}'")
+
+        def check(objs: List[Dict[str, Any]]) -> Optional[List[Any]]:
+            complete = [o for o in objs if _rollout_complete(o, resource)]
+            return complete or None
+
+        return self._wait_until(
+            _APPS_LIST_KINDS[resource], namespace, check, timeout, field_selector=f"metadata.name={name}"
+        )
+
+    def wait_for_condition(
+        self,
+        kind: str,
+        name: str,
+        condition_type: str,
+        namespace: Optional[str] = None,
+        status: str = "True",
+        timeout: float = 180,
+    ) -> WaitResult:
+        """
+        Wait until status.conditions has condition_type=status, e.g.
+        wait_for_condition("nodes", "edge", "Ready") or
+        wait_for_condition("deployments", "amf", "Available", "5g").
+        """
+        def check(objs: List[Dict[str, Any]]) -> Optional[List[Any]]:
+            met = [o for o in objs if _has_condition(o, condition_type, status)]
+            return met or None
+
+        result = self._wait_until(kind, namespace, check, timeout, field_selector=f"metadata.name={name}")
+        if result.ok:
+            result.transitioned_at = _latest_transition(_condition_since(o, condition_type) for o in result.items)
+        return result
+
     # ---------- kubectl-like commands ----------
 
     def run_command(self, args: List[str], namespace: Optional[str] = None) -> ExecResult:
@@ -189,16 +1508,26 @@ class K8sClient:
         Run kubectl command via subprocess.
         Used for operations like delete, rollout restart, etc.
         """
-        kubeconfig = os.environ.get("KUBECONFIG", "")
-        cmd = ["kubectl"]
-        if kubeconfig:
-            cmd.extend(["--kubeconfig", kubeconfig])
-        if namespace:
-            cmd.extend(["-n", namespace])
-        cmd.extend(args)
+        if self.cassette is not None:
+            return self._taped(
+                ("kubectl", namespace, args),
+                lambda: self._run_kubectl(args, namespace),
+                encode=asdict,
+                decode=lambda d: ExecResult(**d),
+            )
+        return self._run_kubectl(args, namespace)
+
+    def _run_kubectl(self, args: List[str], namespace: Optional[str]) -> ExecResult:
+        cmd = _kubectl_argv(args, namespace)
+        timeout = 60.0
+        dl = _current_deadline()
+        if dl is not None:
+            timeout = dl.clip(timeout)
+            if timeout <= 0:
+                return ExecResult(stdout="", stderr=dl.describe(), returncode=124)
         
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
             return ExecResult(
                 stdout=result.stdout,
                 stderr=result.stderr,
@@ -210,3 +1539,341 @@ class K8sClient:
             return ExecResult(stdout="", stderr="kubectl not found", returncode=127)
         except Exception as e:
             return ExecResult(stdout="", stderr=str(e), returncode=1)
+
+
+class AsyncK8sClient:
+    """
+    asyncio counterpart of K8sClient with the same getters, logs, events,
+    exec and kubectl surface as coroutines.
+
+    API calls run on a bounded worker pool over one shared K8sClient, so all
+    coroutines share its connection pool, informer cache and exec sessions.
+    Every call accepts `timeout` (seconds, via asyncio.wait_for); cancelling a
+    task releases the awaiting coroutine at once, while the worker finishes on
+    its own request/exec deadline. run_command uses an asyncio subprocess and
+    kills kubectl on timeout or cancellation.
+
+        async with AsyncK8sClient(kubeconfig) as k8s:
+            pods = await k8s.get_pods("5g")
+            logs = await asyncio.gather(*(k8s.get_pod_logs(p["metadata"]["name"], "5g") for p in pods))
+    """
+
+    def __init__(
+        self,
+        kubeconfig_path: Optional[str] = None,
+        context: Optional[str] = None,
+        max_workers: int = 32,
+        sync_client: Optional[K8sClient] = None,
+        **client_kwargs: Any,
+    ):
+        self.sync = sync_client or K8sClient(kubeconfig_path, context, **client_kwargs)
+        self._owns_sync = sync_client is None
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="k8s-async")
+
+    async def __aenter__(self) -> "AsyncK8sClient":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        self._executor.shutdown(wait=False)
+        if self._owns_sync:
+            self.sync.close()
+
+    async def _call(self, func: Callable[..., Any], *args: Any, timeout: Optional[float] = None, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        # copy_context: the worker sees the caller's test deadline and suite tag
+        fut = loop.run_in_executor(self._executor, functools.partial(contextvars.copy_context().run, func, *args, **kwargs))
+        return await asyncio.wait_for(fut, timeout)
+
+    # ---------- Informer cache ----------
+
+    async def list_pods(
+        self,
+        namespace: Optional[str] = None,
+        label_selector: Optional[str] = None,
+        field_selector: Optional[str] = None,
+        fresh: bool = False,
+        timeout: Optional[float] = None,
+    ) -> List[PodView]:
+        return await self._call(
+            self.sync.list_pods, namespace, label_selector, field_selector, fresh, timeout=timeout
+        )
+
+    async def get_nodes(
+        self, label_selector: Optional[str] = None, fresh: bool = False, timeout: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        return await self._call(self.sync.get_nodes, label_selector, fresh, timeout=timeout)
+
+    async def get_pods(
+        self,
+        namespace: Optional[str] = None,
+        label_selector: Optional[str] = None,
+        field_selector: Optional[str] = None,
+        fresh: bool = False,
+        timeout: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        return await self._call(
+            self.sync.get_pods, namespace, label_selector, field_selector, fresh, timeout=timeout
+        )
+
+    async def get_services(
+        self,
+        namespace: Optional[str] = None,
+        label_selector: Optional[str] = None,
+        fresh: bool = False,
+        timeout: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        return await self._call(self.sync.get_services, namespace, label_selector, fresh, timeout=timeout)
+
+    async def get_network_attachments(
+        self, namespace: Optional[str] = None, fresh: bool = False, timeout: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        return await self._call(self.sync.get_network_attachments, namespace, fresh, timeout=timeout)
+
+    async def get_configmaps(
+        self,
+        namespace: Optional[str] = None,
+        label_selector: Optional[str] = None,
+        fresh: bool = False,
+        timeout: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        return await self._call(self.sync.get_configmaps, namespace, label_selector, fresh, timeout=timeout)
+
+    async def get_ip_pools(
+        self, namespace: Optional[str] = None, timeout: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        return await self._call(self.sync.get_ip_pools, namespace, timeout=timeout)
+
+    async def address_index(
+        self, namespace: Optional[str] = None, fresh: bool = False, timeout: Optional[float] = None
+    ) -> AddressIndex:
+        return await self._call(self.sync.address_index, namespace, fresh, timeout=timeout)
+
+    # ---------- Logs / Events ----------
+
+    async def get_pod_logs(
+        self,
+        pod_name: str,
+        namespace: str,
+        container: Optional[str] = None,
+        tail_lines: int = 200,
+        timeout: Optional[float] = None,
+    ) -> str:
+        return await self._call(
+            self.sync.get_pod_logs, pod_name, namespace, container, tail_lines, timeout=timeout
+        )
+
+    async def get_pod_events(
+        self, pod_name: str, namespace: str, timeout: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        return await self._call(self.sync.get_pod_events, pod_name, namespace, timeout=timeout)
+
+    # ---------- Exec ----------
+
+    async def exec_in_pod(
+        self,
+        pod_name: str,
+        namespace: str,
+        command: List[str],
+        container: Optional[str] = None,
+        tty: bool = False,
+        timeout: int = 60,
+        retry_if_not_found: bool = True,
+    ) -> ExecResult:
+        """See K8sClient.exec_in_pod; a stuck stream past its deadline yields returncode 124."""
+        try:
+            return await self._call(
+                self.sync.exec_in_pod, pod_name, namespace, command, container, tty, timeout,
+                retry_if_not_found, timeout=timeout + EXEC_DEADLINE_GRACE,
+            )
+        except asyncio.TimeoutError:
+            return ExecResult(stdout="", stderr="Deadline exceeded", returncode=124)
+
+    async def exec_stream(
+        self,
+        pod_name: str,
+        namespace: str,
+        command: List[str],
+        container: Optional[str] = None,
+        timeout: int = 60,
+        stop: Iterable[Matcher] = (),
+        spill_bytes: int = DEFAULT_SPILL_BYTES,
+    ) -> AsyncExecStream:
+        """See K8sClient.exec_stream; `async for` over the chunks, `await result()`."""
+        stream = self.sync.exec_stream(pod_name, namespace, command, container, timeout, stop, spill_bytes)
+        return AsyncExecStream(stream, self._call)
+
+    async def exec_until(
+        self,
+        pod_name: str,
+        namespace: str,
+        command: List[str],
+        stop: Iterable[Matcher],
+        container: Optional[str] = None,
+        timeout: int = 60,
+    ) -> ExecResult:
+        """See K8sClient.exec_until; a stuck stream past its deadline yields returncode 124."""
+        try:
+            return await self._call(
+                self.sync.exec_until, pod_name, namespace, command, stop, container, timeout,
+                timeout=timeout + EXEC_DEADLINE_GRACE,
+            )
+        except asyncio.TimeoutError:
+            return ExecResult(stdout="", stderr="Deadline exceeded", returncode=124)
+
+    async def probe(
+        self,
+        pod_name: str,
+        namespace: str,
+        command: List[str],
+        container: Optional[str] = None,
+        timeout: int = 60,
+        ttl: Optional[float] = None,
+    ) -> ExecResult:
+        """See K8sClient.probe; shares the sync client's probe cache."""
+        try:
+            return await self._call(
+                self.sync.probe, pod_name, namespace, command, container, timeout, ttl,
+                timeout=timeout + EXEC_DEADLINE_GRACE,
+            )
+        except asyncio.TimeoutError:
+            return ExecResult(stdout="", stderr="Deadline exceeded", returncode=124)
+
+    async def probe_many(
+        self,
+        targets: Iterable[ExecTarget],
+        command: List[str],
+        container: Optional[str] = None,
+        concurrency: int = 8,
+        timeout: int = 60,
+    ) -> AsyncIterator[Tuple[Tuple[str, str], ExecResult]]:
+        """Async K8sClient.probe_many, in completion order (cache hits come back first)."""
+        keys = [_exec_target(t) for t in targets]
+        gate = asyncio.Semaphore(max(1, concurrency))
+
+        async def run(key: Tuple[str, str]) -> Tuple[Tuple[str, str], ExecResult]:
+            async with gate:
+                return key, await self.probe(key[0], key[1], command, container, timeout=timeout)
+
+        tasks = [asyncio.ensure_future(run(key)) for key in keys]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def exec_many(
+        self,
+        targets: Iterable[ExecTarget],
+        command: List[str],
+        container: Optional[str] = None,
+        concurrency: int = 8,
+        timeout: int = 60,
+    ) -> AsyncIterator[Tuple[Tuple[str, str], ExecResult]]:
+        """
+        Async K8sClient.exec_many: yields ((pod_name, namespace), ExecResult) in
+        completion order. Leaving the loop early cancels the remaining pods.
+        """
+        keys = [_exec_target(t) for t in targets]
+        gate = asyncio.Semaphore(max(1, concurrency))
+
+        async def run(key: Tuple[str, str]) -> Tuple[Tuple[str, str], ExecResult]:
+            async with gate:
+                return key, await self.exec_in_pod(key[0], key[1], command, container, timeout=timeout)
+
+        tasks = [asyncio.ensure_future(run(key)) for key in keys]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    # ---------- Mutations ----------
+
+    async def delete_pod(
+        self, pod_name: str, namespace: str, grace_period: Optional[int] = None, timeout: Optional[float] = None
+    ) -> str:
+        return await self._call(self.sync.delete_pod, pod_name, namespace, grace_period, timeout=timeout)
+
+    async def rollout_restart(self, kind: str, name: str, namespace: str, timeout: Optional[float] = None) -> str:
+        return await self._call(self.sync.rollout_restart, kind, name, namespace, timeout=timeout)
+
+    async def scale(
+        self, kind: str, name: str, namespace: str, replicas: int, timeout: Optional[float] = None
+    ) -> str:
+        return await self._call(self.sync.scale, kind, name, namespace, replicas, timeout=timeout)
+
+    async def cordon(self, node_name: str, unschedulable: bool = True, timeout: Optional[float] = None) -> str:
+        return await self._call(self.sync.cordon, node_name, unschedulable, timeout=timeout)
+
+    # ---------- Waits ----------
+    # Each wait occupies one worker thread for its duration.
+
+    async def wait_for_pod(
+        self,
+        predicate: Callable[[PodView], bool],
+        namespace: Optional[str] = None,
+        label_selector: Optional[str] = None,
+        field_selector: Optional[str] = None,
+        timeout: float = 180,
+        count: int = 1,
+    ) -> WaitResult:
+        return await self._call(
+            self.sync.wait_for_pod, predicate, namespace, label_selector, field_selector, timeout, count
+        )
+
+    async def wait_for_deleted(
+        self, kind: str, name: str, namespace: Optional[str] = None, timeout: float = 180, uid: Optional[str] = None
+    ) -> WaitResult:
+        return await self._call(self.sync.wait_for_deleted, kind, name, namespace, timeout, uid)
+
+    async def wait_for_rollout(self, kind: str, name: str, namespace: str, timeout: float = 300) -> WaitResult:
+        return await self._call(self.sync.wait_for_rollout, kind, name, namespace, timeout)
+
+    async def wait_for_condition(
+        self,
+        kind: str,
+        name: str,
+        condition_type: str,
+        namespace: Optional[str] = None,
+        status: str = "True",
+        timeout: float = 180,
+    ) -> WaitResult:
+        return await self._call(
+            self.sync.wait_for_condition, kind, name, condition_type, namespace, status, timeout
+        )
+
+    # ---------- kubectl-like commands ----------
+
+    async def run_command(
+        self, args: List[str], namespace: Optional[str] = None, timeout: float = 60
+    ) -> ExecResult:
+        """Run kubectl as an asyncio subprocess; killed on timeout or cancellation."""
+        if self.sync.cassette is not None:
+            return await self._call(self.sync.run_command, args, namespace, timeout=timeout)
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *_kubectl_argv(args, namespace),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        except FileNotFoundError:
+            return ExecResult(stdout="", stderr="kubectl not found", returncode=127)
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            return ExecResult(stdout="", stderr="Command timed out", returncode=124)
+        except asyncio.CancelledError:
+            proc.kill()
+            raise
+        return ExecResult(
+            stdout=stdout.decode(errors="replace"),
+            stderr=stderr.decode(errors="replace"),
+            returncode=proc.returncode,
+        )
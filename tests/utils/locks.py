@@ -0,0 +1,207 @@
+# utils/locks.py
+"""
+Reader/writer locks on named testbed resources, shared by every suite in the
+runner process so suites can run in parallel (run_tests.py --parallel).
+
+Resource names are free-form; the suites use
+    "ns:<namespace>"       pods/workloads in a namespace (e.g. "ns:5g")
+    "node:<node>"          a node or its host networking
+    "component:<name>"     one NF or daemon (e.g. "component:amf")
+    "dataplane"            the shared N3/N6/VXLAN data path (iperf3 load)
+    "*"                    everything
+Reads are shared, writes exclusive; "*" overlaps every name. A read-only
+check reads "*" by default, so it never overlaps chaos or load anywhere.
+
+Deadlock freedom: each holder asks for all of its locks in one request and
+gets them atomically, so nobody holds a lock while waiting for another.
+Nested hold() calls must be covered by the outer grant. Requests are granted
+in arrival order: a request waits behind any earlier conflicting request, so
+a stream of readers cannot starve a writer.
+
+Every grant is kept with its request/grant/release times for the timeline:
+render_timeline() draws a text Gantt chart, write_trace() writes Chrome trace
+JSON (open it in chrome://tracing or https://ui.perfetto.dev).
+"""
+from __future__ import annotations
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import json
+import threading
+import time
+
+
+def overlap(a: Iterable[str], b: Iterable[str]) -> bool:
+    """True if any name in a matches one in b ("*" matches everything)."""
+    b = set(b)
+    if not b:
+        return False
+    return any(r == "*" or "*" in b or r in b for r in a)
+
+
+def conflicts(reads_a: Tuple[str, ...], writes_a: Tuple[str, ...],
+              reads_b: Tuple[str, ...], writes_b: Tuple[str, ...]) -> bool:
+    """Two lock sets conflict when one writes something the other reads or writes."""
+    return overlap(writes_a, writes_b + reads_b) or overlap(writes_b, reads_a)
+
+
+def covers(outer: Iterable[str], inner: Iterable[str]) -> bool:
+    outer = set(outer)
+    return "*" in outer or set(inner) <= outer
+
+
+@dataclass(eq=False)
+class Grant:
+    """One lock request; times are time.monotonic() values (granted/released 0 until then)."""
+    owner: str
+    reads: Tuple[str, ...]
+    writes: Tuple[str, ...]
+    requested: float
+    granted: float = 0.0
+    released: float = 0.0
+    thread: int = field(default_factory=threading.get_ident)
+
+    @property
+    def waited(self) -> float:
+        return max(0.0, self.granted - self.requested)
+
+    def conflicts(self, other: "Grant") -> bool:
+        return conflicts(self.reads, self.writes, other.reads, other.writes)
+
+
+class LockManager:
+    """Grants reader/writer lock sets atomically, in arrival order."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._held: List[Grant] = []
+        self._queue: List[Grant] = []
+        self._local = threading.local()
+        self.history: List[Grant] = []
+        self.started = time.monotonic()
+
+    @classmethod
+    def shared(cls) -> "LockManager":
+        """Process-wide manager used by every TestScheduler unless given its own."""
+        global _SHARED
+        with _SHARED_LOCK:
+            if _SHARED is None:
+                _SHARED = cls()
+            return _SHARED
+
+    @contextmanager
+    def hold(self, owner: str, reads: Iterable[str] = ("*",), writes: Iterable[str] = ()) -> Iterator[Grant]:
+        """Block until all locks are free, hold them for the with-block."""
+        reads, writes = tuple(reads), tuple(writes)
+        outer: Optional[Grant] = getattr(self._local, "grant", None)
+        if outer is not None:
+            if covers(outer.reads + outer.writes, reads) and covers(outer.writes, writes):
+                yield outer
+                return
+            raise RuntimeError(
+                f"{owner}: lock request {reads}/{writes} inside {outer.owner}'s grant would hold-and-wait; "
+                f"declare all locks up front"
+            )
+        grant = Grant(owner, reads, writes, time.monotonic())
+        with self._cond:
+            self._queue.append(grant)
+            while not self._grantable(grant):
+                self._cond.wait()
+            self._queue.remove(grant)
+            self._held.append(grant)
+            grant.granted = time.monotonic()
+            self.history.append(grant)
+        self._local.grant = grant
+        try:
+            yield grant
+        finally:
+            self._local.grant = None
+            self.revoke(grant)
+
+    def revoke(self, grant: Grant) -> None:
+        """Release a grant now, e.g. for a test abandoned past its deadline. Releasing twice is a no-op."""
+        with self._cond:
+            if grant in self._held:
+                self._held.remove(grant)
+                grant.released = time.monotonic()
+                self._cond.notify_all()
+
+    def _grantable(self, grant: Grant) -> bool:
+        if any(grant.conflicts(h) for h in self._held):
+            return False
+        for waiting in self._queue:
+            if waiting is grant:
+                return True
+            if grant.conflicts(waiting):
+                return False
+        return True
+
+    def clear_history(self) -> None:
+        """Forget released grants, so the next timeline starts from now (harness daemon runs)."""
+        with self._cond:
+            self.history = [g for g in self.history if not g.released]
+            self.started = time.monotonic()
+
+    def held(self) -> List[Tuple[str, Tuple[str, ...], Tuple[str, ...]]]:
+        """(owner, reads, writes) of the grants held right now."""
+        with self._cond:
+            return [(g.owner, g.reads, g.writes) for g in self._held]
+
+    def _grants(self) -> List[Grant]:
+        with self._cond:
+            return sorted(self.history, key=lambda g: (g.granted, g.owner))
+
+    def render_timeline(self, width: int = 60) -> str:
+        """
+        One row per owner: '.' waiting, '=' holding shared locks only,
+        '#' holding an exclusive lock.
+        """
+        grants = self._grants()
+        if not grants:
+            return "No locks taken"
+        now = time.monotonic()
+        t0 = min(g.requested for g in grants)
+        span = max((g.released or now) for g in grants) - t0 or 1e-9
+        scale = width / span
+        name_w = min(40, max(len(g.owner) for g in grants))
+        lines = [f"{'':<{name_w}} |{'0s':<{width // 2}}{f'{span:.1f}s':>{width - width // 2}}|"]
+        for g in grants:
+            row = [" "] * width
+            a = int((g.requested - t0) * scale)
+            b = int((g.granted - t0) * scale)
+            c = max(b + 1, int(((g.released or now) - t0) * scale))
+            for i in range(a, min(b, width)):
+                row[i] = "."
+            mark = "#" if g.writes else "="
+            for i in range(b, min(c, width)):
+                row[i] = mark
+            owner = g.owner if len(g.owner) <= name_w else "…" + g.owner[-(name_w - 1):]
+            locks = ",".join(f"W:{w}" for w in g.writes) or ",".join(f"R:{r}" for r in g.reads)
+            lines.append(f"{owner:<{name_w}} |{''.join(row)}| {locks}")
+        lines.append(f"{'':<{name_w}}  '.' waiting  '=' shared  '#' exclusive")
+        return "\n".join(lines)
+
+    def write_trace(self, path: str) -> None:
+        """Chrome trace event JSON: one process per suite, one row per test."""
+        events: List[Dict] = []
+        pids: Dict[str, int] = {}
+        for g in self._grants():
+            suite, _, name = g.owner.partition("/")
+            pid = pids.setdefault(suite, len(pids) + 1)
+            tid = f"{name or suite}"
+            args = {"reads": list(g.reads), "writes": list(g.writes)}
+            if g.waited > 0:
+                events.append({"name": "wait", "cat": "wait", "ph": "X", "pid": pid, "tid": tid,
+                               "ts": (g.requested - self.started) * 1e6, "dur": g.waited * 1e6, "args": args})
+            end = g.released or time.monotonic()
+            events.append({"name": name or suite, "cat": "write" if g.writes else "read", "ph": "X",
+                           "pid": pid, "tid": tid, "ts": (g.granted - self.started) * 1e6,
+                           "dur": (end - g.granted) * 1e6, "args": args})
+        for suite, pid in pids.items():
+            events.append({"name": "process_name", "ph": "M", "pid": pid, "args": {"name": suite}})
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+_SHARED: Optional[LockManager] = None
+_SHARED_LOCK = threading.Lock()
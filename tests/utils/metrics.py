@@ -0,0 +1,234 @@
+# utils/metrics.py
+"""
+Per-call instrumentation for K8sClient.
+
+Every API list/get/patch, log read, exec and wait is recorded with operation,
+target, latency, response bytes and outcome into per-operation log-linear
+histograms (HdrHistogram-style: fixed relative precision, sparse buckets), and
+optionally appended as one NDJSON line to a call log. run_tests.py gives the
+shared session client one call log (or, with --isolate, each suite process its
+own via K8S_CALL_LOG) and prints the merged summary.
+"""
+from __future__ import annotations
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+import atexit
+import contextvars
+import json
+import math
+import os
+import threading
+import time
+
+from .deadline import current as _current_deadline
+
+
+class LatencyHistogram:
+    """
+    Microsecond latencies in 2**SUB_BITS linear sub-buckets per power of two,
+    so percentiles are reported within ~1/2**SUB_BITS (3%) of the true value
+    with a few hundred buckets at most.
+    """
+
+    SUB_BITS = 5
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total_us = 0
+        self.max_us = 0
+
+    @classmethod
+    def _index(cls, value: int) -> int:
+        bits = value.bit_length()
+        if bits <= cls.SUB_BITS:
+            return value
+        shift = bits - cls.SUB_BITS - 1
+        return ((shift + 1) << cls.SUB_BITS) + (value >> shift) - (1 << cls.SUB_BITS)
+
+    @classmethod
+    def _upper(cls, index: int) -> int:
+        """Highest value that maps to bucket `index`."""
+        if index < (1 << cls.SUB_BITS):
+            return index
+        shift = (index >> cls.SUB_BITS) - 1
+        top = (index & ((1 << cls.SUB_BITS) - 1)) + (1 << cls.SUB_BITS)
+        return ((top + 1) << shift) - 1
+
+    def record(self, seconds: float) -> None:
+        value = max(0, int(seconds * 1e6))
+        idx = self._index(value)
+        self.counts[idx] = self.counts.get(idx, 0) + 1
+        self.count += 1
+        self.total_us += value
+        if value > self.max_us:
+            self.max_us = value
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for idx, n in other.counts.items():
+            self.counts[idx] = self.counts.get(idx, 0) + n
+        self.count += other.count
+        self.total_us += other.total_us
+        self.max_us = max(self.max_us, other.max_us)
+
+    def percentile(self, pct: float) -> float:
+        """Latency in seconds at the given percentile (0-100)."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(pct / 100.0 * self.count))
+        seen = 0
+        for idx in sorted(self.counts):
+            seen += self.counts[idx]
+            if seen >= rank:
+                return min(self._upper(idx), self.max_us) / 1e6
+        return self.max_us / 1e6
+
+
+class CallRecorder:
+    """
+    Thread-safe sink for call records. Cheap enough to stay on: one lock,
+    a histogram update and (with a call log) one buffered NDJSON write per call.
+    """
+
+    def __init__(self, log_path: Optional[str] = None, suite: Optional[str] = None):
+        self.suite = suite
+        self.by_op: Dict[str, LatencyHistogram] = {}
+        self.outcomes: Dict[Tuple[str, str], int] = {}
+        # (op, target) -> [calls, total seconds, max seconds]
+        self.by_target: Dict[Tuple[str, str], List[float]] = {}
+        self._lock = threading.Lock()
+        self._log = None
+        self._atexit = False
+        if log_path:
+            self.set_log(log_path)
+
+    @classmethod
+    def shared(cls) -> "CallRecorder":
+        """
+        Process-wide recorder, writing to $K8S_CALL_LOG when set; every
+        K8sClient uses it unless given its own.
+        """
+        global _SHARED
+        with _SHARED_LOCK:
+            if _SHARED is None:
+                _SHARED = cls(os.environ.get("K8S_CALL_LOG"), os.environ.get("K8S_CALL_SUITE"))
+            return _SHARED
+
+    @contextmanager
+    def call(self, op: str, target: str = "") -> Iterator[Dict[str, Any]]:
+        """
+        Time the enclosed block. The yielded dict takes optional "bytes" and
+        "outcome" (default "ok"; "error" if the block raises).
+        """
+        info: Dict[str, Any] = {"bytes": 0, "outcome": "ok"}
+        start = time.monotonic()
+        try:
+            yield info
+        except BaseException:
+            info["outcome"] = "error"
+            raise
+        finally:
+            self.record(op, target, time.monotonic() - start, info["bytes"], info["outcome"])
+
+    def record(self, op: str, target: str, seconds: float, nbytes: int = 0, outcome: str = "ok") -> None:
+        dl = _current_deadline()
+        if dl is not None:
+            dl.note(op, target, seconds, outcome)
+        with self._lock:
+            self._add(op, target, seconds, outcome)
+            if self._log is not None:
+                self._log.write(json.dumps({
+                    "ts": round(time.time(), 6), "suite": _SUITE.get() or self.suite, "op": op, "target": target,
+                    "ms": round(seconds * 1000, 3), "bytes": nbytes, "outcome": outcome,
+                }) + "\n")
+
+    def _add(self, op: str, target: str, seconds: float, outcome: str) -> None:
+        hist = self.by_op.get(op)
+        if hist is None:
+            hist = self.by_op[op] = LatencyHistogram()
+        hist.record(seconds)
+        self.outcomes[(op, outcome)] = self.outcomes.get((op, outcome), 0) + 1
+        tgt = self.by_target.get((op, target))
+        if tgt is None:
+            self.by_target[(op, target)] = [1, seconds, seconds]
+        else:
+            tgt[0] += 1
+            tgt[1] += seconds
+            tgt[2] = max(tgt[2], seconds)
+
+    def set_log(self, log_path: Optional[str]) -> None:
+        """Switch the NDJSON call log (None: stop logging); the aggregates carry on."""
+        new = None
+        if log_path:
+            os.makedirs(os.path.dirname(os.path.abspath(log_path)), exist_ok=True)
+            new = open(log_path, "a", encoding="utf-8")
+            if not self._atexit:
+                atexit.register(self.close)
+                self._atexit = True
+        with self._lock:
+            old, self._log = self._log, new
+        if old is not None:
+            old.close()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+
+    @classmethod
+    def from_ndjson(cls, paths: Iterable[str]) -> "CallRecorder":
+        """Rebuild aggregates from call logs (e.g. one per suite process)."""
+        merged = cls()
+        for path in paths:
+            try:
+                with open(path, encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            rec = json.loads(line)
+                            merged._add(rec["op"], rec.get("target", ""), rec["ms"] / 1000.0, rec.get("outcome", "ok"))
+                        except (ValueError, KeyError):
+                            continue  # truncated last line of a killed suite
+            except OSError:
+                continue
+        return merged
+
+    def summary(self, top: int = 5) -> str:
+        """p50/p95/p99 per operation plus the targets with the most total time."""
+        if not self.by_op:
+            return "No K8s API calls recorded"
+        lines = [f"{'op':<14}{'calls':>7}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}{'total':>9}  failed"]
+        for op in sorted(self.by_op, key=lambda o: -self.by_op[o].total_us):
+            h = self.by_op[op]
+            failed = sum(n for (o, outcome), n in self.outcomes.items() if o == op and outcome != "ok")
+            lines.append(
+                f"{op:<14}{h.count:>7}{_ms(h.percentile(50)):>9}{_ms(h.percentile(95)):>9}"
+                f"{_ms(h.percentile(99)):>9}{_ms(h.max_us / 1e6):>9}{h.total_us / 1e6:>8.1f}s  {failed}"
+            )
+        slowest = sorted(self.by_target.items(), key=lambda kv: -kv[1][1])[:top]
+        if slowest:
+            lines.append("Slowest targets (by total time):")
+            for (op, target), (calls, total, worst) in slowest:
+                lines.append(f"  {op:<12} {target or '-':<40} {int(calls):>5} calls {total:>7.2f}s total, max {_ms(worst)}")
+        return "\n".join(lines)
+
+
+_SHARED: Optional[CallRecorder] = None
+_SHARED_LOCK = threading.Lock()
+# Suite tag for calls made in this context; wins over CallRecorder.suite so
+# suites running in parallel on one client still log under their own name.
+_SUITE: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("k8s_call_suite", default=None)
+
+
+@contextmanager
+def use_suite(name: str) -> Iterator[None]:
+    """Tag calls made in this context (and in threads run with a copy of it) with suite `name`."""
+    token = _SUITE.set(name)
+    try:
+        yield
+    finally:
+        _SUITE.reset(token)
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:.0f}ms" if seconds >= 0.01 else f"{seconds * 1000:.1f}ms"
@@ -0,0 +1,322 @@
+# utils/netprobe.py
+"""
+Structured in-pod network probes: sockets, interfaces and routes as typed
+records, with the filtering done inside the pod.
+
+  sockets     ss -H -n -a -u|-t|-S [sport = :PORT]   only the port asked about
+                                                    comes back, with no header
+  interfaces  ip -j addr|link show [dev IFACE]      iproute2 JSON
+  routes      ip -j route show
+
+Checks compare fields exactly. A UDP socket on 18805 is not port 8805, and
+10.202.0.10 is not 10.202.0.100. Images whose ss/ip lack -H/-j (old
+iproute2, busybox) get the full text table, parsed into the same records.
+
+Every command goes through K8sClient.probe(), so results are shared through
+the probe cache (utils/probes.py):
+
+    probe = NetProbe(k8s)
+    probe.sockets(smf, "5g", "udp", port=8805)   # [Socket(udp UNCONN 0.0.0.0:8805)]
+    probe.interfaces(amf, "5g", "n2")            # [Interface(n2, UP, 10.202.0.100/24)]
+    probe.routes(upf, "5g")                      # [Route(10.203.0.0/24 dev n3), ...]
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+import json
+
+from .k8s_client import AsyncK8sClient, ExecResult, K8sClient, K8sClientError
+
+PROTOCOL_FLAGS = {"udp": "-u", "tcp": "-t", "sctp": "-S"}
+SS_PROTOCOLS = ("udp", "tcp", "sctp", "raw", "u_str", "u_dgr", "u_seq", "p_raw", "p_dgr", "nl")
+
+
+@dataclass(frozen=True)
+class Socket:
+    """One `ss` row."""
+    protocol: str
+    state: str
+    local_ip: str                    # "*" / "0.0.0.0" / "::" for wildcard binds
+    local_port: Optional[int]
+    peer_ip: str = ""
+    peer_port: Optional[int] = None
+    process: str = ""
+
+    def __str__(self) -> str:
+        peer = f" -> {self.peer_ip}:{self.peer_port}" if self.peer_port is not None else ""
+        return f"{self.protocol} {self.state} {self.local_ip}:{self.local_port}{peer}"
+
+
+@dataclass(frozen=True)
+class Address:
+    ip: str
+    prefixlen: int
+    family: str = "inet"
+    scope: str = ""
+
+    def __str__(self) -> str:
+        return f"{self.ip}/{self.prefixlen}"
+
+
+@dataclass(frozen=True)
+class Interface:
+    """One `ip addr`/`ip link` entry."""
+    name: str
+    index: int = 0
+    state: str = ""                  # operstate: UP, DOWN, UNKNOWN
+    mtu: int = 0
+    mac: str = ""
+    flags: Tuple[str, ...] = ()
+    addresses: Tuple[Address, ...] = ()
+
+    @property
+    def up(self) -> bool:
+        return "UP" in self.flags
+
+    def ips(self, family: str = "inet") -> Tuple[str, ...]:
+        return tuple(a.ip for a in self.addresses if a.family == family)
+
+    def __str__(self) -> str:
+        addrs = " ".join(str(a) for a in self.addresses)
+        return f"{self.name}: {self.state or '-'} mtu {self.mtu} {self.mac}{' ' + addrs if addrs else ''}"
+
+
+@dataclass(frozen=True)
+class Route:
+    dst: str                         # "default" or a CIDR
+    dev: str = ""
+    gateway: str = ""
+    protocol: str = ""
+    scope: str = ""
+    prefsrc: str = ""
+
+    def __str__(self) -> str:
+        via = f" via {self.gateway}" if self.gateway else ""
+        src = f" src {self.prefsrc}" if self.prefsrc else ""
+        return f"{self.dst}{via} dev {self.dev}{src}"
+
+
+# ---------- commands ----------
+
+def ss_command(protocol: str, port: Optional[int] = None) -> List[str]:
+    """Headerless, numeric `ss` for one protocol, filtered to `port` in the pod."""
+    cmd = ["ss", "-H", "-n", "-a", PROTOCOL_FLAGS.get(protocol.lower(), "-t")]
+    if port is not None:
+        cmd += ["sport", "=", f":{port}"]
+    return cmd
+
+
+def legacy_ss_command(protocol: str) -> List[str]:
+    """The full socket table, for ss builds without -H or filters."""
+    return ["ss", f"{PROTOCOL_FLAGS.get(protocol.lower(), '-t')}na"]
+
+
+def ip_command(what: str, device: Optional[str] = None, as_json: bool = True) -> List[str]:
+    """`ip [-j] addr|link|route show [dev DEVICE]`."""
+    cmd = ["ip", "-j", what, "show"] if as_json else ["ip", what, "show"]
+    return cmd + ["dev", device] if device else cmd
+
+
+# ---------- parsers ----------
+
+def _split_endpoint(text: str) -> Tuple[str, Optional[int]]:
+    """'0.0.0.0:8805' / '[::]:2152' / '10.0.0.1%n4:8805' / '*:*' -> (ip, port)."""
+    host, _, port = text.rpartition(":")
+    host = host.strip("[]").split("%")[0]
+    return host, int(port) if port.isdigit() else None
+
+
+def parse_ss(text: str, protocol: str = "") -> List[Socket]:
+    """`ss -n` rows, with or without header, Netid column and users:(...) process."""
+    out = []
+    for line in text.splitlines():
+        if not line or line[0].isspace() or line.startswith("`-"):
+            continue  # blank, SCTP association endpoints
+        tokens = line.split()
+        if tokens[0] in ("Netid", "State"):
+            continue  # header
+        proto = protocol.lower()
+        if tokens[0] in SS_PROTOCOLS:
+            proto, tokens = tokens[0], tokens[1:]
+        if len(tokens) < 5:
+            continue
+        local_ip, local_port = _split_endpoint(tokens[3])
+        peer_ip, peer_port = _split_endpoint(tokens[4])
+        out.append(Socket(proto, tokens[0], local_ip, local_port, peer_ip, peer_port, " ".join(tokens[5:])))
+    return out
+
+
+def _interface_from_json(entry: Dict[str, Any]) -> Interface:
+    return Interface(
+        name=entry.get("ifname", ""),
+        index=entry.get("ifindex", 0),
+        state=entry.get("operstate", ""),
+        mtu=entry.get("mtu", 0),
+        mac=entry.get("address", ""),
+        flags=tuple(entry.get("flags") or ()),
+        addresses=tuple(
+            Address(a.get("local", ""), a.get("prefixlen", 0), a.get("family", "inet"), a.get("scope", ""))
+            for a in entry.get("addr_info") or () if a.get("local")
+        ),
+    )
+
+
+def _parse_ip_text(text: str) -> List[Interface]:
+    """Plain `ip addr show` / `ip link show` output."""
+    out: List[Interface] = []
+    current: Optional[Dict[str, Any]] = None
+
+    def flush() -> None:
+        if current is not None:
+            out.append(Interface(**dict(current, addresses=tuple(current["addresses"]))))
+
+    for line in text.splitlines():
+        if line and not line[0].isspace() and ":" in line:
+            flush()
+            index, name, rest = (line.split(":", 2) + ["", ""])[:3]
+            tokens = rest.split()
+            flags = tokens[0].strip("<>").split(",") if tokens and tokens[0].startswith("<") else []
+            current = {
+                "name": name.strip().split("@")[0],
+                "index": int(index) if index.strip().isdigit() else 0,
+                "state": tokens[tokens.index("state") + 1] if "state" in tokens[:-1] else "",
+                "mtu": int(tokens[tokens.index("mtu") + 1]) if "mtu" in tokens[:-1] else 0,
+                "mac": "",
+                "flags": tuple(f for f in flags if f),
+                "addresses": [],
+            }
+        elif current is not None:
+            tokens = line.split()
+            if tokens and tokens[0].startswith("link/") and len(tokens) > 1:
+                current["mac"] = tokens[1]
+            elif tokens and tokens[0] in ("inet", "inet6") and len(tokens) > 1:
+                ip, _, prefix = tokens[1].partition("/")
+                scope = tokens[tokens.index("scope") + 1] if "scope" in tokens[:-1] else ""
+                current["addresses"].append(Address(ip, int(prefix or 32), tokens[0], scope))
+    flush()
+    return out
+
+
+def parse_interfaces(text: str) -> List[Interface]:
+    """`ip [-j] addr|link show` output, JSON or text."""
+    if text.lstrip().startswith("["):
+        return [_interface_from_json(e) for e in json.loads(text)]
+    return _parse_ip_text(text)
+
+
+def parse_routes(text: str) -> List[Route]:
+    """`ip [-j] route show` output, JSON or text."""
+    if text.lstrip().startswith("["):
+        return [
+            Route(r.get("dst", ""), r.get("dev", ""), r.get("gateway", ""), r.get("protocol", ""),
+                  r.get("scope", ""), r.get("prefsrc", ""))
+            for r in json.loads(text)
+        ]
+    out = []
+    for line in text.splitlines():
+        tokens = line.split()
+        if not tokens:
+            continue
+        # "10.0.0.0/24 dev n3 proto kernel scope link src 10.0.0.1": key/value pairs after dst
+        opts = {k: v for k, v in zip(tokens[1:], tokens[2:]) if k in ("dev", "via", "proto", "scope", "src")}
+        out.append(Route(tokens[0], opts.get("dev", ""), opts.get("via", ""), opts.get("proto", ""),
+                         opts.get("scope", ""), opts.get("src", "")))
+    return out
+
+
+def _missing_device(result: ExecResult) -> bool:
+    return "does not exist" in result.stderr or "Cannot find device" in result.stderr
+
+
+def _failed(what: str, pod_name: str, namespace: str, result: ExecResult) -> K8sClientError:
+    return K8sClientError(f"{what} in {namespace}/{pod_name} failed (rc={result.returncode}): "
+                          f"{(result.stderr or result.stdout).strip()[:200]}")
+
+
+def _retry_legacy(result: ExecResult) -> bool:
+    # An unknown -H/-j/filter is a usage error; timeouts and a missing binary would fail again
+    return result.returncode not in (0, 124, 127)
+
+
+# ---------- probes ----------
+
+class NetProbe:
+    """Structured probes over K8sClient.probe(); K8sClientError when the command fails."""
+
+    def __init__(self, k8s: K8sClient):
+        self.k8s = k8s
+
+    def sockets(
+        self, pod_name: str, namespace: str, protocol: str = "tcp", port: Optional[int] = None,
+        container: Optional[str] = None,
+    ) -> List[Socket]:
+        """Sockets of `protocol` (bound to local `port`, if given)."""
+        result = self.k8s.probe(pod_name, namespace, ss_command(protocol, port), container)
+        if _retry_legacy(result):
+            result = self.k8s.probe(pod_name, namespace, legacy_ss_command(protocol), container)
+        if result.returncode != 0:
+            raise _failed("ss", pod_name, namespace, result)
+        return [s for s in parse_ss(result.stdout, protocol) if port is None or s.local_port == port]
+
+    def interfaces(
+        self, pod_name: str, namespace: str, device: Optional[str] = None, addresses: bool = True,
+        container: Optional[str] = None,
+    ) -> List[Interface]:
+        """Interfaces (just `device`, if given; [] if it does not exist)."""
+        what = "addr" if addresses else "link"
+        result = self.k8s.probe(pod_name, namespace, ip_command(what, device), container)
+        if _retry_legacy(result) and not _missing_device(result):
+            result = self.k8s.probe(pod_name, namespace, ip_command(what, device, as_json=False), container)
+        if result.returncode != 0:
+            if device and _missing_device(result):
+                return []
+            raise _failed(f"ip {what}", pod_name, namespace, result)
+        return parse_interfaces(result.stdout)
+
+    def routes(self, pod_name: str, namespace: str, container: Optional[str] = None) -> List[Route]:
+        result = self.k8s.probe(pod_name, namespace, ip_command("route"), container)
+        if _retry_legacy(result):
+            result = self.k8s.probe(pod_name, namespace, ip_command("route", as_json=False), container)
+        if result.returncode != 0:
+            raise _failed("ip route", pod_name, namespace, result)
+        return parse_routes(result.stdout)
+
+
+class AsyncNetProbe:
+    """NetProbe for AsyncK8sClient."""
+
+    def __init__(self, k8s: AsyncK8sClient):
+        self.k8s = k8s
+
+    async def sockets(
+        self, pod_name: str, namespace: str, protocol: str = "tcp", port: Optional[int] = None,
+        container: Optional[str] = None,
+    ) -> List[Socket]:
+        result = await self.k8s.probe(pod_name, namespace, ss_command(protocol, port), container)
+        if _retry_legacy(result):
+            result = await self.k8s.probe(pod_name, namespace, legacy_ss_command(protocol), container)
+        if result.returncode != 0:
+            raise _failed("ss", pod_name, namespace, result)
+        return [s for s in parse_ss(result.stdout, protocol) if port is None or s.local_port == port]
+
+    async def interfaces(
+        self, pod_name: str, namespace: str, device: Optional[str] = None, addresses: bool = True,
+        container: Optional[str] = None,
+    ) -> List[Interface]:
+        what = "addr" if addresses else "link"
+        result = await self.k8s.probe(pod_name, namespace, ip_command(what, device), container)
+        if _retry_legacy(result) and not _missing_device(result):
+            result = await self.k8s.probe(pod_name, namespace, ip_command(what, device, as_json=False), container)
+        if result.returncode != 0:
+            if device and _missing_device(result):
+                return []
+            raise _failed(f"ip {what}", pod_name, namespace, result)
+        return parse_interfaces(result.stdout)
+
+    async def routes(self, pod_name: str, namespace: str, container: Optional[str] = None) -> List[Route]:
+        result = await self.k8s.probe(pod_name, namespace, ip_command("route"), container)
+        if _retry_legacy(result):
+            result = await self.k8s.probe(pod_name, namespace, ip_command("route", as_json=False), container)
+        if result.returncode != 0:
+            raise _failed("ip route", pod_name, namespace, result)
+        return parse_routes(result.stdout)
@@ -0,0 +1,218 @@
+# utils/probes.py
+"""
+Memoized read-only exec probes.
+
+The same probes run in several suites of one run: `ss` for the SMF's PFCP
+port in e2e, protocols and performance, `ovs-vsctl show` in protocols and resilience,
+`ip -j link show` wherever interfaces are listed. K8sClient.probe() runs them
+through a ProbeCache, keyed on
+
+    (namespace, pod, container, command) + the pod's (uid, restart count)
+
+so one exec serves every suite until the probe's TTL runs out. The pod part
+comes from the pod cache: a recreated pod has a new uid and a restarted
+container bumps the restart count. Either one makes the entry miss and the
+probe runs again. Concurrent callers of the same probe share one exec.
+
+Only successful results (exit code 0) are kept. Any exec_in_pod/exec_many
+of a command that is not a known probe (iperf3 -s, apt-get, ...) may change
+what a probe would see, so it drops every entry of that pod.
+
+TTLs are set per command prefix in test_config.yaml global.probe_cache;
+a TTL of 0 marks a command read-only but never cached (ping, top).
+"""
+from __future__ import annotations
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, Tuple
+import threading
+import time
+
+# Command prefix -> seconds a successful result is reused (0: read-only, not cached)
+DEFAULT_TTLS: Dict[str, float] = {
+    "ss": 30,
+    "ip addr show": 60,
+    "ip link show": 60,
+    "ip route show": 60,
+    "ip -j addr show": 60,
+    "ip -j link show": 60,
+    "ip -j route show": 60,
+    "ovs-vsctl show": 30,
+    "ovs-vsctl list-br": 30,
+    "ovs-vsctl list-ports": 30,
+    "which": 600,
+    "hostname": 600,
+    "ping": 0,
+    "top": 0,
+}
+
+ProbeKey = Tuple[str, str, str, Tuple[str, ...]]     # (namespace, pod, container, command)
+Generation = Tuple[str, int]                         # (pod uid, restart count)
+
+
+class ProbeCache:
+    """TTL cache of probe results with per-pod invalidation and hit/miss counters. Thread-safe."""
+
+    def __init__(
+        self,
+        ttls: Optional[Dict[str, float]] = None,
+        enabled: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.enabled = enabled
+        self._clock = clock
+        self._ttls: Dict[Tuple[str, ...], float] = {}
+        self.set_ttls(DEFAULT_TTLS if ttls is None else ttls)
+        self._entries: Dict[ProbeKey, Tuple[Generation, float, Any, float]] = {}
+        self._inflight: Dict[Tuple[ProbeKey, Generation], threading.Event] = {}
+        self._lock = threading.Lock()
+        self._stats = self._zero()
+
+    @classmethod
+    def from_config(cls, cfg: Optional[Dict[str, Any]]) -> "ProbeCache":
+        """From test_config.yaml global.probe_cache ({enabled, ttls}); defaults when not configured."""
+        cfg = cfg or {}
+        ttls = dict(DEFAULT_TTLS)
+        ttls.update({str(k): float(v) for k, v in (cfg.get("ttls") or {}).items()})
+        return cls(ttls, enabled=bool(cfg.get("enabled", True)))
+
+    @staticmethod
+    def _zero() -> Dict[str, float]:
+        return {"hits": 0, "misses": 0, "shared": 0, "expired": 0, "invalidated": 0, "saved_s": 0.0}
+
+    def set_ttls(self, ttls: Dict[str, float]) -> None:
+        self._ttls = {tuple(prefix.split()): float(ttl) for prefix, ttl in ttls.items()}
+
+    def _match(self, command: Sequence[str]) -> Optional[float]:
+        """TTL of the longest matching prefix; None if the command is not a probe."""
+        argv = tuple(command)
+        for n in range(len(argv), 0, -1):
+            ttl = self._ttls.get(argv[:n])
+            if ttl is not None:
+                return ttl
+        return None
+
+    def ttl(self, command: Sequence[str]) -> float:
+        """Seconds to reuse a result of `command`; 0 = always run it."""
+        return (self._match(command) or 0.0) if self.enabled else 0.0
+
+    def read_only(self, command: Sequence[str]) -> bool:
+        return self._match(command) is not None
+
+    # ---------- lookups ----------
+
+    def get(self, key: ProbeKey, generation: Generation) -> Optional[Any]:
+        """Cached result, or None (counted as a miss)."""
+        with self._lock:
+            return self._get(key, generation)
+
+    def _get(self, key: ProbeKey, generation: Generation) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            gen, expires, result, cost = entry
+            if gen != generation:
+                self._stats["invalidated"] += 1
+                del self._entries[key]
+            elif self._clock() >= expires:
+                self._stats["expired"] += 1
+                del self._entries[key]
+            else:
+                self._stats["hits"] += 1
+                self._stats["saved_s"] += cost
+                return result
+        self._stats["misses"] += 1
+        return None
+
+    def put(self, key: ProbeKey, generation: Generation, result: Any, ttl: float, cost: float = 0.0) -> None:
+        if ttl > 0 and getattr(result, "returncode", 0) == 0:
+            with self._lock:
+                self._entries[key] = (generation, self._clock() + ttl, result, cost)
+
+    def run(self, key: ProbeKey, generation: Generation, ttl: float, execute: Callable[[], Any]) -> Any:
+        """Cached result of the probe, or execute() it once for all concurrent callers."""
+        flight = (key, generation)
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                waiting = self._inflight.get(flight)
+                if waiting is None:
+                    result = self._get(key, generation)
+                    if result is not None:
+                        return result
+                    done = self._inflight[flight] = threading.Event()
+                    break
+                if entry is None:
+                    self._stats["shared"] += 1
+            # Another thread is running this probe; take its result (or run it
+            # ourselves if it failed and was not cached)
+            waiting.wait()
+        try:
+            start = self._clock()
+            result = execute()
+            self.put(key, generation, result, ttl, self._clock() - start)
+            return result
+        finally:
+            with self._lock:
+                del self._inflight[flight]
+            done.set()
+
+    # ---------- invalidation ----------
+
+    def invalidate(self, namespace: Optional[str] = None, pod_name: Optional[str] = None) -> int:
+        """Drop the entries of one pod, of one namespace, or (no arguments) all; returns the count."""
+        with self._lock:
+            keys = [k for k in self._entries
+                    if (namespace is None or k[0] == namespace) and (pod_name is None or k[1] == pod_name)]
+            for k in keys:
+                del self._entries[k]
+            self._stats["invalidated"] += len(keys)
+            return len(keys)
+
+    def invalidate_pods(self, pods: Iterable[Tuple[str, str]]) -> None:
+        """Drop the entries of every (pod_name, namespace) in `pods`."""
+        targets = {(ns, name) for name, ns in pods}
+        if not targets:
+            return
+        with self._lock:
+            keys = [k for k in self._entries if (k[0], k[1]) in targets]
+            for k in keys:
+                del self._entries[k]
+            self._stats["invalidated"] += len(keys)
+
+    def clear(self) -> None:
+        """Forget all entries and counters (a new run on a resident client)."""
+        with self._lock:
+            self._entries.clear()
+            self._stats = self._zero()
+
+    # ---------- stats ----------
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self._stats, entries=len(self._entries))
+
+    def summary(self) -> str:
+        """e.g. '14 hits, 9 misses (61% hit rate), 2 invalidated, ~3.10s of exec saved'."""
+        st = self.stats()
+        lookups = st["hits"] + st["misses"]
+        if not lookups:
+            return "no probes" if self.enabled else "disabled"
+        parts = [f"{int(st['hits'])} hits, {int(st['misses'])} misses ({st['hits'] / lookups:.0%} hit rate)"]
+        if st["shared"]:
+            parts.append(f"{int(st['shared'])} shared in flight")
+        if st["expired"]:
+            parts.append(f"{int(st['expired'])} expired")
+        if st["invalidated"]:
+            parts.append(f"{int(st['invalidated'])} invalidated")
+        parts.append(f"~{st['saved_s']:.2f}s of exec saved")
+        return ", ".join(parts)
+
+
+def pod_generations(pods: Iterable[Any]) -> Dict[str, Generation]:
+    """pod name -> (uid, restart count) from PodViews."""
+    return {p.name: (p.uid, p.restarts) for p in pods}
+
+
+def probe_key(pod_name: str, namespace: str, container: Optional[str], command: Sequence[str]) -> ProbeKey:
+    return (namespace, pod_name, container or "", tuple(command))
@@ -0,0 +1,160 @@
+# utils/rate_limit.py
+"""
+Client-side API budget for K8sClient: token-bucket QPS/burst per request
+class plus a global max-in-flight cap, configured under global.api_rate_limits
+in test_config.yaml.
+
+Like kube-apiserver's own max-in-flight filter, the in-flight cap only covers
+short requests (list/get/patch/delete, log reads); watches and exec streams are
+long-running and only pay their bucket when they connect. Writes (delete,
+patch) have their own "write" bucket.
+
+Under a test deadline (utils/deadline.py) no wait outlasts it: request()
+yields False instead of a slot once the deadline passes.
+"""
+from __future__ import annotations
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+import threading
+import time
+
+from .deadline import current as _current_deadline
+
+
+class TokenBucket:
+    """qps tokens per second up to `burst`; qps <= 0 means unlimited."""
+
+    def __init__(self, qps: float = 0, burst: int = 1):
+        self.qps = float(qps or 0)
+        self.burst = max(1, int(burst or 1))
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token now; returns how long the caller must wait before using it."""
+        if self.qps <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.qps)
+            self._last = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.qps
+
+    def refund(self) -> None:
+        """Give back a token reserved for a request that was never made."""
+        if self.qps > 0:
+            with self._lock:
+                self._tokens = min(self.burst, self._tokens + 1)
+
+
+class RateLimiter:
+    """
+    Budgets keyed by request class ("list", "write", "watch", "exec", "log").
+    stats() reports per class: calls, total and max seconds spent waiting
+    on the bucket and the in-flight cap.
+    """
+
+    KINDS = ("list", "write", "watch", "exec", "log")
+
+    def __init__(self, budgets: Optional[Dict[str, Tuple[float, int]]] = None, max_inflight: int = 0):
+        budgets = budgets or {}
+        self._buckets = {kind: TokenBucket(*budgets.get(kind, (0, 1))) for kind in self.KINDS}
+        self._inflight = threading.BoundedSemaphore(max_inflight) if max_inflight > 0 else None
+        self._stats: Dict[str, Dict[str, float]] = {
+            kind: {"calls": 0, "waited_s": 0.0, "max_wait_s": 0.0} for kind in self.KINDS
+        }
+        self._stats_lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, cfg: Optional[Dict[str, Any]]) -> "RateLimiter":
+        """
+        cfg is the global.api_rate_limits mapping, e.g.
+            {"max_inflight": 16, "list": {"qps": 20, "burst": 40}, ...}
+        Missing classes are unlimited.
+        """
+        cfg = cfg or {}
+        budgets = {
+            kind: (cfg[kind].get("qps", 0), cfg[kind].get("burst", 1))
+            for kind in cls.KINDS
+            if isinstance(cfg.get(kind), dict)
+        }
+        return cls(budgets, int(cfg.get("max_inflight") or 0))
+
+    def wait(self, kind: str) -> float:
+        """
+        Block on the bucket for one long-running request (watch/exec connect),
+        at most until the test deadline; the caller checks the deadline next.
+        """
+        delay = self._buckets[kind].reserve()
+        if delay:
+            left = _left()
+            if left is not None and left < delay:
+                self._buckets[kind].refund()
+                delay = max(0.0, left)
+            time.sleep(delay)
+        self._record(kind, delay)
+        return delay
+
+    @contextmanager
+    def request(self, kind: str) -> Iterator[bool]:
+        """
+        Bucket plus an in-flight slot held for the duration of a short request.
+        Yields True with the slot, or False (no slot) if the test deadline
+        passed first; the caller must then not make the request.
+        """
+        start = time.monotonic()
+        bucket = self._buckets[kind]
+        delay = bucket.reserve()
+        left = _left()
+        if delay and left is not None and left < delay:
+            bucket.refund()
+            time.sleep(max(0.0, left))
+            self._record(kind, time.monotonic() - start)
+            yield False
+            return
+        if delay:
+            time.sleep(delay)
+        if self._inflight is None:
+            self._record(kind, delay)
+            yield True
+            return
+        left = _left()
+        acquired = self._inflight.acquire(timeout=max(0.0, left)) if left is not None else self._inflight.acquire()
+        self._record(kind, time.monotonic() - start)
+        if not acquired:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            self._inflight.release()
+
+    def _record(self, kind: str, waited: float) -> None:
+        with self._stats_lock:
+            st = self._stats[kind]
+            st["calls"] += 1
+            st["waited_s"] += waited
+            st["max_wait_s"] = max(st["max_wait_s"], waited)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._stats_lock:
+            return {kind: dict(st) for kind, st in self._stats.items()}
+
+    def summary(self) -> str:
+        """One line per used class, e.g. 'list: 120 calls, waited 1.20s (max 0.31s)'."""
+        parts = [
+            f"{kind}: {int(st['calls'])} calls, waited {st['waited_s']:.2f}s (max {st['max_wait_s']:.2f}s)"
+            for kind, st in self.stats().items()
+            if st["calls"]
+        ]
+        return "; ".join(parts) or "no API calls"
+
+
+def _left() -> Optional[float]:
+    dl = _current_deadline()
+    return None if dl is None else dl.remaining()
+
+
+UNLIMITED = RateLimiter()
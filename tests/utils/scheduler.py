@@ -0,0 +1,435 @@
+# utils/scheduler.py
+"""
+Dependency-aware test scheduler for the suites' run_all_tests().
+
+Each test is a TestSpec that names its prerequisites (after=) and the
+resources it touches. Read-only tests hold shared locks (reads, default "*",
+i.e. everything), destructive ones hold exclusive locks (writes, e.g.
+"ns:5g", "node:worker", "dataplane"). Two tests may overlap unless they touch
+the same resource and at least one of them writes it; "*" overlaps every
+name. Independent read-only tests therefore run concurrently on a worker
+pool, while chaos tests still run one at a time.
+
+The locks are taken from the process-wide LockManager (utils/locks.py), so
+the same rules hold between suites that run in parallel.
+
+Budgets: the suite gets suites.<name>.timeout seconds of wall time, and
+each test gets its own budget, capped by what is left of the suite's. The
+per-test budget is TestSpec.timeout, else suites.<name>.test_timeout, else
+global.timeout. The test runs under a Deadline (utils/deadline.py) that every
+K8sClient call honours. A test that fails after its deadline passed is
+reported as TIMEOUT, along with where its time went. A test that ignores its
+deadline is abandoned ABANDON_GRACE seconds later: its locks are revoked and
+the suite moves on. Each test runs on its own daemon thread, so an abandoned
+one keeps only that thread and its worker slot goes to the next test. Tests
+that cannot start before the suite deadline, including ones still queued on
+another suite's locks, are reported as TIMEOUT without running.
+
+A test whose prerequisite failed is skipped (and so are its own dependents).
+A prerequisite that returned None ("not configured") does not block.
+Each test's TestLogger output is buffered and printed as one block when the
+test finishes, so concurrent tests never interleave their lines.
+
+Numbers a test measures (throughput, latency, recovery time) are reported
+with TestLogger.metric() and end up in TestOutcome.metrics, which run_tests.py
+saves to the run history (utils/history.py). With $TEST_RESULTS_LOG set (for
+--isolate suite processes), outcomes are also appended there as NDJSON.
+
+Runs saved to the history put a ChangeSelector (utils/selection.py) in
+effect (use_selector). Once a test's locks are granted, the selector
+fingerprints the cluster state named by TestSpec.inputs into
+TestOutcome.inputs. Under --changed-only, a test whose last verdict was a
+pass on the same fingerprint is reported as UNCHANGED without running.
+UNCHANGED counts as passed and does not block dependents.
+"""
+from __future__ import annotations
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+import contextvars
+import json
+import os
+import threading
+import time
+
+from . import cassette
+from .deadline import deadline
+from .locks import Grant, LockManager, conflicts
+
+PASSED = "passed"
+FAILED = "failed"
+SKIPPED = "skipped"
+TIMEOUT = "timeout"
+UNCHANGED = "unchanged"
+
+
+@dataclass
+class TestSpec:
+    """One test of a suite: name, callable and scheduling constraints."""
+    name: str
+    func: Callable[[], Optional[bool]]
+    after: Tuple[str, ...] = ()
+    reads: Tuple[str, ...] = ("*",)
+    writes: Tuple[str, ...] = ()
+    timeout: Optional[float] = None  # per-test budget; None = the scheduler's default
+    inputs: Tuple[str, ...] = ()     # cluster state it reads, for --changed-only; () = always run
+
+    def conflicts(self, other: "TestSpec") -> bool:
+        return conflicts(self.reads, self.writes, other.reads, other.writes)
+
+
+@dataclass
+class Metric:
+    """A measured value; better is "higher" (throughput) or "lower" (latency, loss, durations)."""
+    name: str
+    value: float
+    unit: str = ""
+    better: str = "higher"
+
+
+@dataclass
+class TestOutcome:
+    """
+    Result of one scheduled test. start is seconds since the run began (after
+    its locks were granted); waited is time spent queued on other suites' locks.
+    """
+    name: str
+    status: str
+    start: float = 0.0
+    elapsed: float = 0.0
+    reason: str = ""
+    blocked_by: Optional[str] = None
+    waited: float = 0.0
+    budget: Optional[float] = None
+    metrics: List[Metric] = field(default_factory=list)
+    inputs: Optional[str] = None  # fingerprint of spec.inputs when a ChangeSelector is in effect
+
+
+# Metrics of the test running in this context (set by TestScheduler._run_one)
+_METRICS: contextvars.ContextVar[Optional[List[Metric]]] = contextvars.ContextVar("test_metrics", default=None)
+
+
+def record_metric(name: str, value: float, unit: str = "", better: str = "higher") -> None:
+    """Attach a measurement to the current test's outcome (no-op outside a scheduled test)."""
+    metrics = _METRICS.get()
+    if metrics is not None:
+        metrics.append(Metric(name, float(value), unit, better))
+
+
+# ChangeSelector of this run (--changed-only); None runs every test
+_SELECTOR: contextvars.ContextVar[Any] = contextvars.ContextVar("change_selector", default=None)
+
+
+@contextmanager
+def use_selector(selector: Any) -> Iterator[Any]:
+    """Let schedulers in this context (and in copies of it) skip tests the selector finds unchanged."""
+    token = _SELECTOR.set(selector)
+    try:
+        yield selector
+    finally:
+        _SELECTOR.reset(token)
+
+
+# Names of abandoned tests whose threads may still be running; run_tests.py
+# exits without joining them.
+_ABANDONED: List[str] = []
+
+
+def abandoned() -> List[str]:
+    return list(_ABANDONED)
+
+
+class TestScheduler:
+    """Runs TestSpecs on up to `workers` threads, honouring deps, locks and budgets."""
+
+    ABANDON_GRACE = 30.0  # seconds past its deadline before a test is given up on
+
+    def __init__(
+        self,
+        logger,
+        workers: int = 8,
+        suite: str = "",
+        locks: Optional[LockManager] = None,
+        suite_timeout: Optional[float] = None,
+        test_timeout: Optional[float] = None,
+    ):
+        self.logger = logger
+        # A recording/replay keeps per-key call order and one virtual clock: one test at a time
+        self.workers = 1 if cassette.in_use() else max(1, int(workers or 1))
+        self.suite = suite
+        self.locks = locks or LockManager.shared()
+        self.suite_timeout = suite_timeout
+        self.test_timeout = test_timeout
+        # test name -> (deadline, lock grant, output block) while it runs
+        self._live: Dict[str, Tuple[Any, Grant, Any]] = {}
+        self._live_lock = threading.Lock()  # the worker's finish and _abandon race for the entry
+        # Tests past their lock wait, and tests given up on before that point
+        self._started: Set[str] = set()
+        self._cancelled: Set[str] = set()
+        self._start_lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config, logger, suite: str) -> "TestScheduler":
+        """
+        Workers from suites.<suite>.workers, else global.test_workers (default 8);
+        budgets from suites.<suite>.timeout and suites.<suite>.test_timeout, else global.timeout.
+        """
+        workers = config.get(f"suites.{suite}.workers", config.get("global.test_workers", 8))
+        return cls(
+            logger, workers, suite=suite,
+            suite_timeout=config.get(f"suites.{suite}.timeout"),
+            test_timeout=config.get(f"suites.{suite}.test_timeout", config.get("global.timeout")),
+        )
+
+    def run(self, specs: List[TestSpec]) -> List[TestOutcome]:
+        """Run all specs; returns outcomes in declaration order."""
+        self._validate(specs)
+        outcomes: Dict[str, TestOutcome] = {}
+        pending = list(specs)
+        running: Dict[Future, TestSpec] = {}
+        t0 = time.monotonic()
+        suite_deadline = t0 + self.suite_timeout if self.suite_timeout else None
+
+        while pending or running:
+            held = list(running.values())
+            waiting: List[TestSpec] = []
+            for spec in pending:
+                if suite_deadline is not None and time.monotonic() >= suite_deadline:
+                    outcomes[spec.name] = self._not_started(spec, t0)
+                    continue
+                blocker = self._failed_prerequisite(spec, outcomes)
+                if blocker is not None:
+                    outcomes[spec.name] = self._skip(spec, outcomes[blocker], time.monotonic() - t0)
+                    continue
+                if any(d not in outcomes for d in spec.after):
+                    waiting.append(spec)
+                    continue
+                # A test blocked on a lock keeps it reserved, so later
+                # readers cannot starve a waiting writer.
+                if len(running) < self.workers and not any(spec.conflicts(o) for o in held):
+                    running[self._start(spec, t0, suite_deadline)] = spec
+                else:
+                    waiting.append(spec)
+                held.append(spec)
+            pending = waiting
+            if not running:
+                if pending:  # unreachable after _validate; never spin
+                    raise RuntimeError(f"scheduler stalled on {[s.name for s in pending]}")
+                break
+            done, _ = wait(running, timeout=1.0, return_when=FIRST_COMPLETED)
+            for future in done:
+                spec = running.pop(future)
+                outcomes[spec.name] = future.result()
+            past_suite_deadline = suite_deadline is not None and time.monotonic() >= suite_deadline
+            for future, spec in list(running.items()):
+                live = self._live.get(spec.name)
+                if live and live[0] is not None and live[0].remaining() < -self.ABANDON_GRACE:
+                    running.pop(future)
+                    outcome = self._abandon(spec, t0)
+                    # None: it finished since the check above, so its own outcome stands
+                    outcomes[spec.name] = outcome if outcome is not None else future.result()
+                elif past_suite_deadline and self._cancel(spec):
+                    # Still queued on another suite's locks; it returns as soon as it gets them
+                    running.pop(future)
+                    outcomes[spec.name] = self._not_started(spec, t0)
+
+        results = [outcomes[s.name] for s in specs]
+        self._log_summary(results, time.monotonic() - t0)
+        self._write_results_log(results)
+        return results
+
+    def _start(self, spec: TestSpec, t0: float, suite_deadline: Optional[float]) -> Future:
+        """Run one test on its own daemon thread; an abandoned test never holds up the next one."""
+        future: Future = Future()
+        # copy_context: tests inherit the caller's suite tag (metrics.use_suite)
+        ctx = contextvars.copy_context()
+
+        def target() -> None:
+            future.set_running_or_notify_cancel()
+            try:
+                future.set_result(ctx.run(self._run_one, spec, t0, suite_deadline))
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=target, name=f"test-{spec.name}", daemon=True).start()
+        return future
+
+    def _cancel(self, spec: TestSpec) -> bool:
+        """Give up on a test that has not got its locks yet; False once it has."""
+        with self._start_lock:
+            if spec.name in self._started:
+                return False
+            self._cancelled.add(spec.name)
+            return True
+
+    def _write_results_log(self, results: List[TestOutcome]) -> None:
+        path = os.environ.get("TEST_RESULTS_LOG")
+        if not path:
+            return
+        with open(path, "a", encoding="utf-8") as f:
+            for r in results:
+                f.write(json.dumps({"suite": self.suite, **asdict(r)}) + "\n")
+
+    def _budget(self, spec: TestSpec, now: float, suite_deadline: Optional[float]) -> Optional[float]:
+        budget = spec.timeout or self.test_timeout
+        if suite_deadline is not None:
+            left = suite_deadline - now
+            budget = left if budget is None else min(float(budget), left)
+        return budget
+
+    def _run_one(self, spec: TestSpec, t0: float, suite_deadline: Optional[float]) -> TestOutcome:
+        reason = ""
+        owner = f"{self.suite}/{spec.name}" if self.suite else spec.name
+        with self.logger.buffered() as block, self.locks.hold(owner, spec.reads, spec.writes) as grant:
+            with self._start_lock:
+                if spec.name in self._cancelled:
+                    # Already reported as not started; give the locks straight back
+                    return TestOutcome(spec.name, TIMEOUT, reason="cancelled")
+                self._started.add(spec.name)
+            start = time.monotonic()
+            budget = self._budget(spec, start, suite_deadline)
+            if budget is not None and budget <= 0:
+                # Waited on other suites' locks past the suite deadline
+                self.logger.test_start(spec.name)
+                return self._timed_out(spec, t0, start, budget, None, "suite deadline passed before it could start")
+            selector = _SELECTOR.get()
+            inputs = None
+            metrics: List[Metric] = []
+            with deadline(budget, owner) if budget is not None else nullcontext() as dl:
+                with self._live_lock:
+                    self._live[spec.name] = (dl, grant, block)
+                token = _METRICS.set(metrics)
+                try:
+                    # Fingerprinting reads the cluster: inside the budget, and a
+                    # failure fails this test rather than the suite
+                    inputs = selector.fingerprint(self.suite, spec) if selector is not None else None
+                    run_id = selector.passed_with(self.suite, spec.name, inputs) if inputs is not None else None
+                    if run_id is not None:
+                        self._take_live(spec.name)
+                        reason = f"same inputs as passing run #{run_id}"
+                        self.logger.test_unchanged(spec.name, reason)
+                        return TestOutcome(spec.name, UNCHANGED, start - t0, time.monotonic() - start, reason,
+                                           waited=grant.waited, inputs=inputs)
+                    self.logger.test_start(spec.name)
+                    result = spec.func()
+                except Exception as e:
+                    self.logger.error(f"{spec.name} failed with exception: {e}")
+                    result = False
+                finally:
+                    _METRICS.reset(token)
+                    if selector is not None and spec.writes:
+                        selector.invalidate()  # the state it changed must be fingerprinted again
+                self._take_live(spec.name)
+                if result is None:
+                    status, reason = SKIPPED, "not configured"
+                    self.logger.test_skipped(spec.name, reason)
+                elif dl is not None and dl.expired and not result:
+                    return self._timed_out(spec, t0, start, budget, dl, metrics=metrics)
+                else:
+                    status = PASSED if result else FAILED
+                    if dl is not None and dl.expired:
+                        self.logger.warning(f"{spec.name} finished {-dl.remaining():.1f}s over its {budget:.1f}s budget")
+                    self.logger.test_end(spec.name, bool(result))
+        return TestOutcome(spec.name, status, start - t0, time.monotonic() - start, reason,
+                           waited=grant.waited, budget=budget, metrics=metrics, inputs=inputs)
+
+    def _timed_out(self, spec: TestSpec, t0: float, start: float, budget: float, dl, reason: str = "",
+                   metrics: Optional[List[Metric]] = None) -> TestOutcome:
+        elapsed = time.monotonic() - start
+        if not reason:
+            reason = f"timed out after {elapsed:.1f}s (budget {budget:.1f}s): {dl.report()}"
+        self.logger.test_timeout(spec.name, reason)
+        return TestOutcome(spec.name, TIMEOUT, start - t0, elapsed, reason, budget=budget, metrics=metrics or [])
+
+    def _take_live(self, name: str) -> Optional[Tuple[Any, Grant, Any]]:
+        with self._live_lock:
+            return self._live.pop(name, None)
+
+    def _abandon(self, spec: TestSpec, t0: float) -> Optional[TestOutcome]:
+        """
+        Give up on a test that outlived its deadline: report it, free its locks,
+        leave its thread. None if the test finished first.
+        """
+        live = self._take_live(spec.name)
+        if live is None:
+            return None
+        dl, grant, block = live
+        _ABANDONED.append(f"{self.suite}/{spec.name}" if self.suite else spec.name)
+        self.locks.revoke(grant)
+        elapsed = time.monotonic() - grant.granted
+        reason = (f"abandoned after {elapsed:.1f}s, {self.ABANDON_GRACE:.0f}s past its "
+                  f"{dl.budget:.1f}s budget: {dl.report()}")
+        with self.logger.buffered() as out:
+            out.lines.extend(self.logger.detach(block))
+            self.logger.test_timeout(spec.name, reason)
+        return TestOutcome(spec.name, TIMEOUT, grant.granted - t0, elapsed, reason,
+                           waited=grant.waited, budget=dl.budget)
+
+    def _not_started(self, spec: TestSpec, t0: float) -> TestOutcome:
+        reason = f"suite deadline ({self.suite_timeout:.0f}s) passed before it could start"
+        with self.logger.buffered():
+            self.logger.test_start(spec.name)
+            self.logger.test_timeout(spec.name, reason)
+        return TestOutcome(spec.name, TIMEOUT, time.monotonic() - t0, 0.0, reason)
+
+    def _skip(self, spec: TestSpec, blocker: TestOutcome, at: float) -> TestOutcome:
+        verb = "was skipped" if blocker.blocked_by else "timed out" if blocker.status == TIMEOUT else "failed"
+        reason = f"prerequisite '{blocker.name}' {verb}"
+        with self.logger.buffered():
+            self.logger.test_start(spec.name)
+            self.logger.test_skipped(spec.name, reason)
+        return TestOutcome(spec.name, SKIPPED, at, 0.0, reason, blocked_by=blocker.name)
+
+    @staticmethod
+    def _failed_prerequisite(spec: TestSpec, outcomes: Dict[str, TestOutcome]) -> Optional[str]:
+        for dep in spec.after:
+            out = outcomes.get(dep)
+            if out is not None and (out.status in (FAILED, TIMEOUT) or out.blocked_by):
+                return dep
+        return None
+
+    @staticmethod
+    def _validate(specs: List[TestSpec]) -> None:
+        names = [s.name for s in specs]
+        if len(set(names)) != len(names):
+            raise ValueError(f"duplicate test names in {names}")
+        by_name = {s.name: s for s in specs}
+        for s in specs:
+            unknown = [d for d in s.after if d not in by_name]
+            if unknown:
+                raise ValueError(f"test '{s.name}' depends on unknown test(s) {unknown}")
+        state: Dict[str, int] = {}  # 1 = on stack, 2 = done
+
+        def visit(name: str, path: List[str]) -> None:
+            if state.get(name) == 2:
+                return
+            if state.get(name) == 1:
+                raise ValueError(f"dependency cycle: {' -> '.join(path + [name])}")
+            state[name] = 1
+            for dep in by_name[name].after:
+                visit(dep, path + [name])
+            state[name] = 2
+
+        for name in names:
+            visit(name, [])
+
+    def _log_summary(self, results: List[TestOutcome], wall: float) -> None:
+        busy = sum(r.elapsed for r in results)
+        waited = sum(r.waited for r in results)
+        timeouts = sum(r.status == TIMEOUT for r in results)
+        unchanged = sum(r.status == UNCHANGED for r in results)
+        self.logger.info(
+            f"Scheduler: {len(results)} tests on {self.workers} workers, "
+            f"{wall:.1f}s wall for {busy:.1f}s of test time"
+            + (f", {waited:.1f}s waiting on other suites' locks" if waited >= 0.05 else "")
+            + (f", {timeouts} timed out" if timeouts else "")
+            + (f", {unchanged} unchanged since their last pass" if unchanged else "")
+        )
+
+
+def tally(results: List[TestOutcome]) -> Tuple[int, int, int]:
+    """(passed, failed, skipped); timeouts count as failed, unchanged tests as passed."""
+    return (sum(r.status in (PASSED, UNCHANGED) for r in results),
+            sum(r.status in (FAILED, TIMEOUT) for r in results),
+            sum(r.status == SKIPPED for r in results))
@@ -0,0 +1,183 @@
+# utils/selection.py
+"""
+Incremental test selection for run_tests.py --changed-only.
+
+Each TestSpec names the cluster state it reads in `inputs`:
+
+  component:<name>       pods of a ComponentValidator component (uid,
+                         resourceVersion, node, image digests) and, for 5G
+                         components, their configmaps_setup ConfigMaps
+                         (<name>*-config, nf-scripts) by content hash
+  ns:<namespace>         every pod, Service, ConfigMap and NAD in it
+  configmap:<ns>/<name>  one ConfigMap's data
+  nads                   all NetworkAttachmentDefinitions (spec.config)
+  nodes                  node identity: uid, bootID, kubelet/kernel/runtime
+                         versions, Ready and unschedulable
+  ovs                    node-level OVS state: the ds-net-setup and Multus
+                         pods, the ovs-scripts ConfigMap, NADs and nodes (a
+                         reboot or a re-run setup pod rebuilds the bridges)
+
+A test's fingerprint hashes the digests of its inputs. It also hashes the
+test's own module, utils/test_helpers.py and test_config.yaml, so editing a
+test or its thresholds re-runs it. The fingerprint is stored with every
+outcome in the run history (utils/history.py). A test is skipped as
+UNCHANGED only if its latest verdict was a pass with the same fingerprint.
+Tests without inputs, and tests that write anything, always run.
+
+Digests come from the client's informer caches and are shared by all tests
+of a run. Tests that write invalidate them, so state they changed is read
+again.
+"""
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import hashlib
+import inspect
+import json
+import threading
+
+from .k8s_client import K8sClient, K8sClientError, PodView
+from .scheduler import TestSpec
+from .test_helpers import COMPONENT_SELECTORS
+
+TESTS_DIR = Path(__file__).resolve().parent.parent
+HARNESS_FILES = (TESTS_DIR / "test_config.yaml", TESTS_DIR / "utils" / "test_helpers.py")
+
+# Components outside the 5g namespace (see COMPONENT_SELECTORS)
+COMPONENT_NAMESPACES = {"multus": "kube-system", "ovs": "kube-system", "cloudcore": "kubeedge"}
+OVS_INPUTS = ("component:ovs", "component:multus", "configmap:kube-system/ovs-scripts", "nads", "nodes")
+
+
+def _hash(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _pod_state(pod: PodView) -> List[Any]:
+    return [pod.namespace, pod.name, pod.uid, pod.resource_version, pod.node,
+            sorted(cs.image_id or cs.image for cs in pod.container_statuses)]
+
+
+def _configmap_state(cm: Dict[str, Any]) -> List[Any]:
+    meta = cm.get("metadata") or {}
+    return [meta.get("namespace"), meta.get("name"), _hash([cm.get("data"), cm.get("binaryData")])]
+
+
+def _node_state(node: Dict[str, Any]) -> List[Any]:
+    # get_nodes() shape (snake_case); heartbeats and resourceVersion churn are left out
+    meta, status = node.get("metadata") or {}, node.get("status") or {}
+    info = status.get("node_info") or {}
+    ready = next((c.get("status") for c in status.get("conditions") or () if c.get("type") == "Ready"), None)
+    return [
+        meta.get("name"), meta.get("uid"), info.get("boot_id"), info.get("kubelet_version"),
+        info.get("kernel_version"), info.get("container_runtime_version"), ready,
+        bool((node.get("spec") or {}).get("unschedulable")),
+    ]
+
+
+def _nad_state(nad: Dict[str, Any]) -> List[Any]:
+    meta = nad.get("metadata") or {}
+    return [meta.get("namespace"), meta.get("name"), _hash((nad.get("spec") or {}).get("config"))]
+
+
+class ChangeSelector:
+    """
+    Fingerprints TestSpec inputs and answers whether a test already passed on
+    the same state. `client` returns the run's K8sClient (built on first use);
+    `verdicts` is RunHistory.last_verdicts().
+    """
+
+    def __init__(self, client: Callable[[], K8sClient], verdicts: Dict[Tuple[str, str], Any]):
+        self._client = client
+        self.verdicts = verdicts
+        self._digests: Dict[str, str] = {}
+        self._files: Dict[Path, str] = {}
+        self._lock = threading.Lock()
+
+    def fingerprint(self, suite: str, spec: TestSpec) -> Optional[str]:
+        """Fingerprint of spec's inputs; None if it always runs or the state can't be read."""
+        if not spec.inputs or spec.writes:
+            return None
+        try:
+            digests = sorted((name, self._digest(name)) for name in set(spec.inputs))
+        except K8sClientError:
+            return None
+        files = [self._file_hash(p) for p in (self._source(spec.func), *HARNESS_FILES)]
+        return _hash([suite, spec.name, digests, files])[:16]
+
+    def passed_with(self, suite: str, test: str, fingerprint: str) -> Optional[int]:
+        """Run id of the test's latest verdict if that was a pass on `fingerprint`."""
+        last = self.verdicts.get((suite, test))
+        if last is not None and last["status"] == "passed" and last["inputs"] == fingerprint:
+            return last["run_id"]
+        return None
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._digests.clear()
+
+    # ---------- digests ----------
+
+    def _digest(self, name: str) -> str:
+        with self._lock:
+            cached = self._digests.get(name)
+        if cached is not None:
+            return cached
+        digest = _hash(self._state(name))
+        with self._lock:
+            self._digests[name] = digest
+        return digest
+
+    def _state(self, name: str) -> Any:
+        k8s = self._client()
+        kind, _, arg = name.partition(":")
+        if kind == "component":
+            return self._component_state(k8s, arg)
+        if kind == "ns":
+            return [
+                sorted(_pod_state(p) for p in k8s.list_pods(namespace=arg)),
+                sorted(_configmap_state(c) for c in k8s.get_configmaps(namespace=arg)),
+                sorted(_nad_state(n) for n in k8s.get_network_attachments(namespace=arg)),
+                sorted([s["metadata"]["name"], s["metadata"].get("resource_version")]
+                       for s in k8s.get_services(namespace=arg)),
+            ]
+        if kind == "configmap":
+            namespace, _, cm = arg.partition("/")
+            return sorted(_configmap_state(c) for c in k8s.get_configmaps(namespace=namespace)
+                          if c["metadata"]["name"] == cm)
+        if name == "nads":
+            return sorted(_nad_state(n) for n in k8s.get_network_attachments())
+        if name == "nodes":
+            return sorted(_node_state(n) for n in k8s.get_nodes())
+        if name == "ovs":
+            return [self._digest(i) for i in OVS_INPUTS]
+        raise ValueError(f"unknown test input {name!r}")
+
+    def _component_state(self, k8s: K8sClient, component: str) -> List[Any]:
+        selector = COMPONENT_SELECTORS.get(component)
+        if selector is None:
+            raise ValueError(f"unknown component {component!r} in test inputs")
+        namespace = COMPONENT_NAMESPACES.get(component, "5g")
+        pods = sorted(_pod_state(p) for p in k8s.list_pods(namespace=namespace, label_selector=selector))
+        configmaps: Iterable[Dict[str, Any]] = ()
+        if namespace == "5g":
+            configmaps = [c for c in k8s.get_configmaps(namespace="5g")
+                          if c["metadata"]["name"] == "nf-scripts"
+                          or (c["metadata"]["name"].startswith(component)
+                              and c["metadata"]["name"].endswith("-config"))]
+        return [pods, sorted(_configmap_state(c) for c in configmaps)]
+
+    def _file_hash(self, path: Optional[Path]) -> str:
+        if path is None:
+            return ""
+        with self._lock:
+            if path not in self._files:
+                self._files[path] = hashlib.sha256(path.read_bytes()).hexdigest() if path.exists() else ""
+            return self._files[path]
+
+    @staticmethod
+    def _source(func: Callable) -> Optional[Path]:
+        try:
+            source = inspect.getsourcefile(func)
+        except TypeError:
+            return None
+        return Path(source) if source else None
@@ -1,12 +1,19 @@
 """
 Test helper utilities for 5G testbed testing
 """
+import asyncio
 import os
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Callable, Dict, Any, List, Optional, Tuple
 import yaml
 
-from .k8s_client import K8sClient
+from .addresses import DEFAULT_INTERFACE
+from .exec_stream import until_output
+from .k8s_client import AsyncK8sClient, K8sClient, PodView, WaitResult
+from .netprobe import AsyncNetProbe, Interface, NetProbe, Socket, ip_command, parse_interfaces
+from .scheduler import record_metric
 
 
 class TestConfig:
@@ -70,28 +77,115 @@ class TestLogger:
 
     def __init__(self, verbose: bool = False):
         self.verbose = verbose
+        self.scope: Optional[str] = None  # suite name, set by run_tests.py --parallel
+        self._local = threading.local()
+
+    def _emit(self, line: str):
+        block = getattr(self._local, "block", None)
+        if block is None:
+            print(line)
+        elif not block.detached:
+            block.lines.append(line)
+
+    @contextmanager
+    def buffered(self):
+        """
+        Hold this thread's output and print it as one block on exit, so tests
+        running concurrently (utils/scheduler.py) never interleave their lines.
+        """
+        block = self._local.block = _OutputBlock()
+        try:
+            yield block
+        finally:
+            self._local.block = None
+            if block.lines and not block.detached:
+                with _OUTPUT_LOCK:
+                    print("\n".join(block.lines), flush=True)
+
+    def detach(self, block: "_OutputBlock") -> List[str]:
+        """
+        Take the output another thread has buffered so far; whatever it logs
+        afterwards is dropped. Used for tests abandoned past their deadline.
+        """
+        block.detached = True
+        return list(block.lines)
 
     def info(self, message: str):
         if self.verbose:
-            print(f"ℹ️  {message}")
+            self._emit(f"ℹ️  {message}")
 
     def success(self, message: str):
-        print(f"✅ {message}")
+        self._emit(f"✅ {message}")
 
     def warning(self, message: str):
-        print(f"⚠️  {message}")
+        self._emit(f"⚠️  {message}")
 
     def error(self, message: str):
-        print(f"❌ {message}")
+        self._emit(f"❌ {message}")
+
+    def metric(self, name: str, value: float, unit: str = "", better: str = "higher"):
+        """
+        Report a measurement of the current test (saved to the run history,
+        utils/history.py). better: "higher" or "lower".
+        """
+        record_metric(name, value, unit, better)
+        self.info(f"📈 {name}: {value:.2f} {unit}".rstrip())
 
     def test_start(self, test_name: str):
-        print(f"\n🧪 Testing: {test_name}")
+        if self.scope:
+            self._emit(f"\n🧪 [{self.scope}] Testing: {test_name}")
+        else:
+            self._emit(f"\n🧪 Testing: {test_name}")
 
     def test_end(self, test_name: str, success: bool):
         if success:
-            print(f"✅ {test_name}: PASSED")
+            self._emit(f"✅ {test_name}: PASSED")
         else:
-            print(f"❌ {test_name}: FAILED")
+            self._emit(f"❌ {test_name}: FAILED")
+
+    def test_skipped(self, test_name: str, reason: str):
+        self._emit(f"⏭️  {test_name}: SKIPPED ({reason})")
+
+    def test_timeout(self, test_name: str, reason: str):
+        self._emit(f"⏰ {test_name}: TIMEOUT ({reason})")
+
+    def test_unchanged(self, test_name: str, reason: str):
+        self._emit(f"♻️  {test_name}: UNCHANGED ({reason})")
+
+
+class _OutputBlock:
+    """Lines buffered by TestLogger.buffered() for one test."""
+
+    def __init__(self):
+        self.lines: List[str] = []
+        self.detached = False
+
+
+_OUTPUT_LOCK = threading.Lock()
+
+
+# ---------- checks shared by NetworkValidator and AsyncNetworkValidator ----------
+
+def sockets_bound(sockets: List[Socket], protocol: str, port: int) -> Tuple[bool, str]:
+    out = "\n".join(str(s) for s in sockets) or f"no {protocol.lower()} socket on port {port}"
+    return bool(sockets), out
+
+
+def has_ip(ifaces: List[Interface], interface: str, expected_ip: str) -> Tuple[bool, str]:
+    ok = any(expected_ip.split("/")[0] in i.ips() for i in ifaces)
+    return ok, "\n".join(str(i) for i in ifaces) or f'Device "{interface}" does not exist'
+
+
+# Stop a ping at its first reply
+PING_STOP = (until_output("bytes from"),)
+
+
+def ping_command(target_ip: str) -> List[str]:
+    return ["ping", "-c", "3", "-W", "5", target_ip]
+
+
+def ping_ok(out: str) -> bool:
+    return (" 0% packet loss" in out) or ("bytes from" in out) or ("ttl=" in out)
 
 
 class NetworkValidator:
@@ -100,17 +194,29 @@ class NetworkValidator:
     def __init__(self, kubectl: K8sClient, config: TestConfig):
         self.kubectl = kubectl
         self.config = config
+        self.probe = NetProbe(kubectl)
+
+    def pod_ip(self, pod_name: str, namespace: str) -> str:
+        """The pod IP (what `hostname -i` prints), from the address index; "" if unknown."""
+        pod = self.kubectl.address_index(namespace).pod(namespace, pod_name)
+        return pod.pod_ip if pod is not None else ""
 
     def check_interface_ip(
         self, pod_name: str, namespace: str, interface: str, expected_ip: str, capture: bool = False
     ):
-        """Return True/False; if capture=True return (ok, output)."""
+        """
+        Whether `interface` has expected_ip, from the Multus network-status
+        annotation (no exec). Pods without the annotation fall back to
+        `ip -j addr show dev <interface>`. The address must match exactly.
+        Return True/False; if capture=True return (ok, output).
+        """
         try:
-            result = self.kubectl.exec_in_pod(
-                pod_name, namespace, ["ip", "addr", "show", interface]
-            )
-            out = result.stdout
-            ok = expected_ip in out
+            pod = self.kubectl.address_index(namespace).pod(namespace, pod_name)
+            if pod is not None and (pod.annotated or interface == DEFAULT_INTERFACE):
+                ok = expected_ip.split("/")[0] in pod.ips(interface)
+                return (ok, pod.describe(interface)) if capture else ok
+            ifaces = self.probe.interfaces(pod_name, namespace, interface)
+            ok, out = has_ip(ifaces, interface, expected_ip)
             return (ok, out) if capture else ok
         except Exception as e:
             return (False, f"ERROR: {e}") if capture else False
@@ -118,16 +224,15 @@ class NetworkValidator:
     def check_port_listening(
         self, pod_name: str, namespace: str, port: int, protocol: str = "tcp", capture: bool = False
     ):
-        """Return True/False; if capture=True return (ok, output)."""
+        """
+        Whether a `protocol` socket is bound to local `port`. ss filters on
+        the port inside the pod (utils/netprobe.py), and the probe is shared
+        across suites through the client's probe cache (utils/probes.py).
+        Return True/False; if capture=True return (ok, output).
+        """
         try:
-            if protocol.upper() == "SCTP":
-                result = self.kubectl.exec_in_pod(pod_name, namespace, ["ss", "-S", "-na"])
-            elif protocol.upper() == "UDP":
-                result = self.kubectl.exec_in_pod(pod_name, namespace, ["ss", "-unap"])
-            else:
-                result = self.kubectl.exec_in_pod(pod_name, namespace, ["ss", "-tnap"])
-            out = result.stdout
-            ok = str(port) in out
+            sockets = self.probe.sockets(pod_name, namespace, protocol, port)
+            ok, out = sockets_bound(sockets, protocol, port)
             return (ok, out) if capture else ok
         except Exception as e:
             return (False, f"ERROR: {e}") if capture else False
@@ -135,29 +240,150 @@ class NetworkValidator:
     def check_connectivity(
         self, pod1_name: str, pod2_name: str, namespace: str, target_ip: str, capture: bool = False
     ):
-        """ping - returns True/False; if capture=True return (ok, output)."""
+        """
+        ping, streamed and stopped at the first reply (utils/exec_stream.py), so a
+        reachable target answers in one round trip. Unreachable ones still take
+        the full count. Return True/False; if capture=True return (ok, output).
+        """
         try:
-            result = self.kubectl.exec_in_pod(
-                pod1_name, namespace, ["ping", "-c", "3", "-W", "5", target_ip]
-            )
+            result = self.kubectl.exec_until(pod1_name, namespace, ping_command(target_ip), PING_STOP)
             out = result.stdout
-            ok = (" 0% packet loss" in out) or ("bytes from" in out) or ("ttl=" in out)
+            ok = ping_ok(out)
             return (ok, out) if capture else ok
         except Exception as e:
             return (False, f"ERROR: {e}") if capture else False
 
 
+
+# ---------- lookups shared by ComponentValidator and AsyncComponentValidator ----------
+
+# Component -> label selector, matching the labels set by the Ansible templates
+# (nf-deployment.yaml.j2, gnb-deployment.yaml.j2, ue-statefulset.yaml.j2, ...)
+COMPONENT_SELECTORS: Dict[str, str] = {
+    "amf": "app=amf",
+    "smf": "app=smf",
+    "upf": "app in (upf-edge,upf-cloud)",
+    "upf-edge": "app=upf-edge",
+    "upf-cloud": "app=upf-cloud",
+    "nrf": "app=nrf",
+    "ausf": "app=ausf",
+    "udm": "app=udm",
+    "udr": "app=udr",
+    "pcf": "app=pcf",
+    "bsf": "app=bsf",
+    "nssf": "app=nssf",
+    "mongo": "app=mongodb",
+    "mongodb": "app=mongodb",
+    "gnb": "component=gnb",
+    "ue": "component=ue",
+    "multus": "app=multus",
+    "ovs": "app in (ds-net-setup-worker,ds-net-setup-edge)",
+    "cloudcore": "kubeedge=cloudcore",
+}
+
+
+def component_query(
+    component_name: str, phase: Optional[str] = None, node: Optional[str] = None
+) -> Tuple[Optional[str], Optional[str]]:
+    """(label_selector, field_selector) for a component lookup; no label selector for unknown components."""
+    fields = []
+    if phase:
+        fields.append(f"status.phase={phase}")
+    if node:
+        fields.append(f"spec.nodeName={node}")
+    return COMPONENT_SELECTORS.get(component_name.lower()), ",".join(fields) or None
+
+
+def component_wait_query(
+    component_name: str, predicate: Callable[[PodView], bool]
+) -> Tuple[Optional[str], Callable[[PodView], bool]]:
+    """Label selector plus predicate, folding in the name match for unknown components."""
+    selector, _ = component_query(component_name)
+    if selector:
+        return selector, predicate
+    return None, lambda pod: component_name in pod.name.lower() and predicate(pod)
+
+
+def match_name(pods: List[Dict[str, Any]], component_name: str) -> List[Dict[str, Any]]:
+    return [pod for pod in pods if component_name in pod["metadata"]["name"].lower()]
+
+
+def link_names(ifaces: List[Interface]) -> List[str]:
+    """Non-loopback interface names."""
+    return [i.name for i in ifaces if i.name and not i.name.startswith("lo")]
+
+
+def debug_status(pod_name: str, p: Dict[str, Any]) -> str:
+    phase = p["status"].get("phase")
+    restarts = sum((cs.get("restart_count", 0) or 0) for cs in p["status"].get("container_statuses") or [])
+    conds = p["status"].get("conditions", [])
+    cond_str = ", ".join([f'{c.get("type")}={c.get("status")}' for c in conds]) if conds else "n/a"
+    return f"[debug] {pod_name}: phase={phase}, restarts={restarts}, conditions=[{cond_str}]"
+
+
+def debug_container(p: Dict[str, Any]) -> Optional[str]:
+    containers = (p.get("spec", {}).get("containers") or [])
+    return containers[0]["name"] if containers else None
+
+
+def debug_logs(c_name: str, logs: str) -> str:
+    tail = "\n".join(logs.strip().splitlines()[-12:])
+    return f"[debug] logs (last 12 lines, {c_name}):\n{tail}"
+
+
+def debug_events(events: List[Dict[str, Any]]) -> str:
+    """Last 6 events as '[debug] last events:' lines; empty if none."""
+    # sort by lastTimestamp/firstTimestamp best effort
+    def _ts(ev):
+        meta = ev.get("last_timestamp") or ev.get("event_time") or ev.get("first_timestamp") or ""
+        return meta
+    short = []
+    for ev in sorted(events, key=_ts)[-6:]:
+        reason = ev.get("reason", "")
+        msg = (ev.get("message", "") or "").strip().replace("\n", " ")
+        if len(msg) > 180:
+            msg = msg[:180] + "…"
+        short.append(f"- {reason}: {msg}")
+    return "[debug] last events:\n" + "\n".join(short) if short else ""
+
+
 class ComponentValidator:
     """5G component validation utilities"""
 
+    COMPONENT_SELECTORS = COMPONENT_SELECTORS
+
     def __init__(self, kubectl: K8sClient, config: TestConfig):
         self.kubectl = kubectl
         self.config = config
 
-    def get_component_pods(self, component_name: str, namespace: str = "5g") -> List[Dict[str, Any]]:
-        """Get pods for a specific component."""
-        pods = self.kubectl.get_pods(namespace)
-        return [pod for pod in pods if component_name in pod["metadata"]["name"].lower()]
+    def get_component_pods(
+        self,
+        component_name: str,
+        namespace: str = "5g",
+        phase: Optional[str] = None,
+        node: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get pods for a specific component.
+        Known components are looked up by label selector and phase/node are
+        pushed to the API server as field selectors; unknown names fall back
+        to a pod-name substring match.
+        """
+        selector, field_selector = component_query(component_name, phase, node)
+        pods = self.kubectl.get_pods(namespace, label_selector=selector, field_selector=field_selector)
+        return pods if selector else match_name(pods, component_name)
+
+    def wait_for_component_pods(
+        self,
+        component_name: str,
+        predicate: Callable[[PodView], bool],
+        namespace: str = "5g",
+        timeout: float = 180,
+        count: int = 1,
+    ) -> WaitResult:
+        """Watch-driven wait until `count` pods of the component satisfy predicate(PodView)."""
+        selector, predicate = component_wait_query(component_name, predicate)
+        return self.kubectl.wait_for_pod(predicate, namespace, label_selector=selector, timeout=timeout, count=count)
 
     def is_component_ready(self, component_name: str, namespace: str = "5g") -> bool:
         """Check if all pods for a component are running."""
@@ -172,20 +398,26 @@ class ComponentValidator:
         if not pods:
             return []
         try:
-            result = self.kubectl.exec_in_pod(
-                pods[0]["metadata"]["name"],
-                namespace,
-                ["ip", "link", "show"],
-            )
-            interfaces: List[str] = []
-            for line in result.stdout.split("\n"):
-                if ":" in line and not line.startswith(" "):
-                    iface = line.split(":", 2)[1].strip()
-                    if iface and not iface.startswith("lo"):
-                        interfaces.append(iface)
-            return interfaces
+            return link_names(NetProbe(self.kubectl).interfaces(
+                pods[0]["metadata"]["name"], namespace, addresses=False))
         except Exception:
             return []
+
+    def get_component_interfaces_by_pod(
+        self, component_name: str, namespace: str = "5g", concurrency: int = 8
+    ) -> Dict[str, List[str]]:
+        """Interfaces of every pod of the component, probed concurrently (`ip -j link show`)."""
+        pods = self.get_component_pods(component_name, namespace, phase="Running")
+        out = {}
+        for (pod_name, _), result in self.kubectl.probe_many(pods, ip_command("link"), concurrency=concurrency):
+            try:
+                # Images without `ip -j` take the text fallback, one pod at a time
+                ifaces = parse_interfaces(result.stdout) if result.returncode == 0 else \
+                    NetProbe(self.kubectl).interfaces(pod_name, namespace, addresses=False)
+            except Exception:
+                ifaces = []
+            out[pod_name] = link_names(ifaces)
+        return out
             
     def debug_pod(self, pod_name: str, namespace: str, logger) -> None:
         """
@@ -195,50 +427,179 @@ class ComponentValidator:
         - last 6 events (reason/message trimmed)
         """
         try:
-            pods = self.kubectl.get_pods(namespace)
-            p = next((x for x in pods if x["metadata"]["name"] == pod_name), None)
+            pods = self.kubectl.get_pods(namespace, field_selector=f"metadata.name={pod_name}", fresh=True)
+            p = pods[0] if pods else None
             if not p:
                 logger.info(f"[debug] Pod {pod_name} not found in {namespace}")
                 return
-
-            phase = p["status"].get("phase")
-            restarts = sum((cs.get("restart_count", 0) or 0) for cs in p["status"].get("container_statuses") or [])
-            conds = p["status"].get("conditions", [])
-            cond_str = ", ".join([f'{c.get("type")}={c.get("status")}' for c in conds]) if conds else "n/a"
-            logger.info(f"[debug] {pod_name}: phase={phase}, restarts={restarts}, conditions=[{cond_str}]")
+            logger.info(debug_status(pod_name, p))
 
             # logs (first app container)
             try:
-                spec = p.get("spec", {})
-                containers = (spec.get("containers") or [])
-                c_name = containers[0]["name"] if containers else None
+                c_name = debug_container(p)
                 if c_name:
                     logs = self.kubectl.get_pod_logs(pod_name, namespace, container=c_name, tail_lines=200)
-                    lines = logs.strip().splitlines()
-                    tail = "\n".join(lines[-12:])
-                    logger.info(f"[debug] logs (last 12 lines, {c_name}):\n{tail}")
+                    logger.info(debug_logs(c_name, logs))
             except Exception as e:
                 logger.info(f"[debug] logs error: {e}")
 
             # last events
             try:
-                events = self.kubectl.get_pod_events(pod_name, namespace)
-                # sort by lastTimestamp/firstTimestamp best effort
-                def _ts(ev):
-                    meta = ev.get("last_timestamp") or ev.get("event_time") or ev.get("first_timestamp") or ""
-                    return meta
-                events = sorted(events, key=_ts)[-6:]
-                short = []
-                for ev in events:
-                    reason = ev.get("reason", "")
-                    msg = (ev.get("message", "") or "").strip().replace("\n", " ")
-                    if len(msg) > 180:
-                        msg = msg[:180] + "…"
-                    short.append(f"- {reason}: {msg}")
-                if short:
-                    logger.info("[debug] last events:\n" + "\n".join(short))
+                events = debug_events(self.kubectl.get_pod_events(pod_name, namespace))
+                if events:
+                    logger.info(events)
             except Exception as e:
                 logger.info(f"[debug] events error: {e}")
         except Exception as e:
             logger.info(f"[debug] debug_pod error: {e}")
 
+
+class AsyncNetworkValidator:
+    """NetworkValidator counterpart for AsyncK8sClient; same checks as coroutines."""
+
+    def __init__(self, kubectl: AsyncK8sClient, config: TestConfig):
+        self.kubectl = kubectl
+        self.config = config
+        self.probe = AsyncNetProbe(kubectl)
+
+    async def pod_ip(self, pod_name: str, namespace: str) -> str:
+        pod = (await self.kubectl.address_index(namespace)).pod(namespace, pod_name)
+        return pod.pod_ip if pod is not None else ""
+
+    async def check_interface_ip(
+        self, pod_name: str, namespace: str, interface: str, expected_ip: str, capture: bool = False
+    ):
+        """Return True/False; if capture=True return (ok, output)."""
+        try:
+            pod = (await self.kubectl.address_index(namespace)).pod(namespace, pod_name)
+            if pod is not None and (pod.annotated or interface == DEFAULT_INTERFACE):
+                ok = expected_ip.split("/")[0] in pod.ips(interface)
+                return (ok, pod.describe(interface)) if capture else ok
+            ifaces = await self.probe.interfaces(pod_name, namespace, interface)
+            ok, out = has_ip(ifaces, interface, expected_ip)
+            return (ok, out) if capture else ok
+        except Exception as e:
+            return (False, f"ERROR: {e}") if capture else False
+
+    async def check_port_listening(
+        self, pod_name: str, namespace: str, port: int, protocol: str = "tcp", capture: bool = False
+    ):
+        """Return True/False; if capture=True return (ok, output)."""
+        try:
+            sockets = await self.probe.sockets(pod_name, namespace, protocol, port)
+            ok, out = sockets_bound(sockets, protocol, port)
+            return (ok, out) if capture else ok
+        except Exception as e:
+            return (False, f"ERROR: {e}") if capture else False
+
+    async def check_connectivity(
+        self, pod1_name: str, pod2_name: str, namespace: str, target_ip: str, capture: bool = False
+    ):
+        """ping - returns True/False; if capture=True return (ok, output)."""
+        try:
+            result = await self.kubectl.exec_until(
+                pod1_name, namespace, ping_command(target_ip), PING_STOP
+            )
+            out = result.stdout
+            ok = ping_ok(out)
+            return (ok, out) if capture else ok
+        except Exception as e:
+            return (False, f"ERROR: {e}") if capture else False
+
+
+class AsyncComponentValidator:
+    """ComponentValidator counterpart for AsyncK8sClient; same lookups as coroutines."""
+
+    def __init__(self, kubectl: AsyncK8sClient, config: TestConfig):
+        self.kubectl = kubectl
+        self.config = config
+
+    async def get_component_pods(
+        self,
+        component_name: str,
+        namespace: str = "5g",
+        phase: Optional[str] = None,
+        node: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """See ComponentValidator.get_component_pods."""
+        selector, field_selector = component_query(component_name, phase, node)
+        pods = await self.kubectl.get_pods(namespace, label_selector=selector, field_selector=field_selector)
+        return pods if selector else match_name(pods, component_name)
+
+    async def is_component_ready(self, component_name: str, namespace: str = "5g") -> bool:
+        """Check if all pods for a component are running."""
+        pods = await self.get_component_pods(component_name, namespace)
+        if not pods:
+            return False
+        return all(pod["status"]["phase"] == "Running" for pod in pods)
+
+    async def wait_for_component_pods(
+        self,
+        component_name: str,
+        predicate: Callable[[PodView], bool],
+        namespace: str = "5g",
+        timeout: float = 180,
+        count: int = 1,
+    ) -> WaitResult:
+        """See ComponentValidator.wait_for_component_pods."""
+        selector, predicate = component_wait_query(component_name, predicate)
+        return await self.kubectl.wait_for_pod(
+            predicate, namespace, label_selector=selector, timeout=timeout, count=count
+        )
+
+    async def get_component_interfaces(self, component_name: str, namespace: str = "5g") -> List[str]:
+        """List non-loopback interfaces from the first pod of the component."""
+        pods = await self.get_component_pods(component_name, namespace)
+        if not pods:
+            return []
+        try:
+            return link_names(await AsyncNetProbe(self.kubectl).interfaces(
+                pods[0]["metadata"]["name"], namespace, addresses=False))
+        except Exception:
+            return []
+
+    async def get_component_interfaces_by_pod(
+        self, component_name: str, namespace: str = "5g", concurrency: int = 8
+    ) -> Dict[str, List[str]]:
+        """Interfaces of every pod of the component, probed concurrently (`ip -j link show`)."""
+        pods = await self.get_component_pods(component_name, namespace, phase="Running")
+        out = {}
+        async for (pod_name, _), result in self.kubectl.probe_many(pods, ip_command("link"), concurrency=concurrency):
+            try:
+                ifaces = parse_interfaces(result.stdout) if result.returncode == 0 else \
+                    await AsyncNetProbe(self.kubectl).interfaces(pod_name, namespace, addresses=False)
+            except Exception:
+                ifaces = []
+            out[pod_name] = link_names(ifaces)
+        return out
+
+    async def debug_pod(self, pod_name: str, namespace: str, logger) -> None:
+        """ComponentValidator.debug_pod with logs and events fetched concurrently."""
+        try:
+            pods = await self.kubectl.get_pods(namespace, field_selector=f"metadata.name={pod_name}", fresh=True)
+            p = pods[0] if pods else None
+            if not p:
+                logger.info(f"[debug] Pod {pod_name} not found in {namespace}")
+                return
+            logger.info(debug_status(pod_name, p))
+
+            c_name = debug_container(p)
+            logs, events = await asyncio.gather(
+                self.kubectl.get_pod_logs(pod_name, namespace, container=c_name, tail_lines=200)
+                if c_name else asyncio.sleep(0, result=None),
+                self.kubectl.get_pod_events(pod_name, namespace),
+                return_exceptions=True,
+            )
+            if isinstance(logs, Exception):
+                logger.info(f"[debug] logs error: {logs}")
+            elif logs is not None:
+                logger.info(debug_logs(c_name, logs))
+            if isinstance(events, Exception):
+                logger.info(f"[debug] events error: {events}")
+            else:
+                short = debug_events(events)
+                if short:
+                    logger.info(short)
+        except Exception as e:
+            logger.info(f"[debug] debug_pod error: {e}")
+